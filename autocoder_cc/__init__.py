@@ -111,20 +111,22 @@ For detailed API documentation, see the individual module docstrings.
 
 __version__ = "5.2.1"
 
-# Export primary v4.3 System-First Architecture classes
-from .orchestration import (
-    SystemExecutionHarness, 
-    Component, 
-    ComponentStatus, 
-    Connection, 
-    HarnessMetrics,
-    ComponentLifecycleState,
-    ComponentHealthStatus,
-    HealthCheckResult,
-    ComponentMetrics,
-    StreamMetrics,
-    HarnessComponent
-)
+# Export primary v4.3 System-First Architecture classes, imported on first use
+from .lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'SystemExecutionHarness': '.orchestration.harness',
+    'Component': '.orchestration.component',
+    'ComponentStatus': '.orchestration.component',
+    'Connection': '.orchestration.harness',
+    'HarnessMetrics': '.orchestration.harness',
+    'ComponentLifecycleState': '.orchestration.harness',
+    'ComponentHealthStatus': '.orchestration.harness',
+    'HealthCheckResult': '.orchestration.harness',
+    'ComponentMetrics': '.orchestration.harness',
+    'StreamMetrics': '.orchestration.harness',
+    'HarnessComponent': '.orchestration.harness',
+}, globals())
 
 __all__ = [
     'SystemExecutionHarness',
@@ -0,0 +1,5 @@
+"""
+Micro- and macro-benchmarks for Autocoder runtime hot paths.
+
+Each module is runnable with ``python -m autocoder_cc.benchmarks.<name>``.
+"""
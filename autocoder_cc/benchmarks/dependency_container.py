@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark EnhancedDependencyContainer.resolve() throughput per lifecycle.
+
+Usage:
+    python -m autocoder_cc.benchmarks.dependency_container [--iterations N] [--sample-rate R]
+"""
+import argparse
+import json
+import time
+from typing import Dict, Optional
+
+from autocoder_cc.core.dependency_container import EnhancedDependencyContainer, Lifecycle
+
+
+class Config:
+    def __init__(self):
+        self.values = {"timeout": 30}
+
+
+class Repository:
+    def __init__(self, config: Config):
+        self.config = config
+
+
+class Cache:
+    def __init__(self, config: Config, ttl: int = 60):
+        self.config = config
+        self.ttl = ttl
+
+
+class Service:
+    def __init__(self, repository: Repository, cache: Optional[Cache] = None):
+        self.repository = repository
+        self.cache = cache
+
+
+def build_container(lifecycle: Lifecycle, sample_rate: float) -> EnhancedDependencyContainer:
+    """Build a small graph whose root Service uses the lifecycle under test"""
+    container = EnhancedDependencyContainer(observability_sample_rate=sample_rate)
+    container.register(Config, Config, lifecycle=Lifecycle.SINGLETON)
+    container.register(Repository, Repository, lifecycle=lifecycle)
+    container.register(Cache, Cache, lifecycle=lifecycle)
+    container.register(Service, Service, lifecycle=lifecycle)
+    container.freeze()
+    return container
+
+
+def bench_lifecycle(lifecycle: Lifecycle, iterations: int, sample_rate: float) -> Dict[str, float]:
+    """Measure resolve() calls per second for one lifecycle"""
+    container = build_container(lifecycle, sample_rate)
+    resolve = container.resolve
+
+    def run() -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            resolve(Service)
+        return time.perf_counter() - start
+
+    if lifecycle == Lifecycle.SCOPED:
+        with container.scope("benchmark"):
+            elapsed = run()
+    else:
+        elapsed = run()
+
+    return {
+        "iterations": iterations,
+        "seconds": round(elapsed, 4),
+        "resolves_per_second": round(iterations / elapsed) if elapsed else 0,
+        "us_per_resolve": round(elapsed / iterations * 1e6, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--sample-rate", type=float, default=0.0,
+                        help="Fraction of resolutions traced and timed")
+    args = parser.parse_args()
+
+    results = {
+        lifecycle.value: bench_lifecycle(lifecycle, args.iterations, args.sample_rate)
+        for lifecycle in Lifecycle
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark healthy-path throughput while another component fails every item.
+
+Runs a healthy ComposedComponent next to a second one fed large payloads
+at a fixed rate on the same event loop. In "baseline" the second component
+processes its items successfully; in the other modes every item raises, so
+the difference in the healthy component's items/s is the cost of handling
+the failures.
+"per_error" sets the storm threshold out of reach so every failure is logged
+with full context; "aggregated" uses the configured threshold.
+
+Usage:
+    python -m autocoder_cc.benchmarks.error_storm [--items N] [--storm-rate R] [--payload-kb K] 2>/dev/null
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict, Optional
+
+import anyio
+
+from autocoder_cc.components.composed_base import ComposedComponent
+from autocoder_cc.error_handling.consistent_handler import DEAD_LETTER_PORT
+
+# Bare components: no retry backoff spreading failures out, no schema capability
+CONFIG = {"type": "Transformer", "retry_enabled": False, "schema_validation_enabled": False}
+
+
+class Healthy(ComposedComponent):
+    async def process_item(self, item: Any) -> Any:
+        return item
+
+
+class Failing(ComposedComponent):
+    async def process_item(self, item: Any) -> Any:
+        raise ValueError(f"invalid record {item['id']}")
+
+
+async def _feed(stream, items: int, payload: Optional[Dict[str, Any]] = None) -> None:
+    async with stream:
+        for i in range(items):
+            await stream.send({"id": i, **(payload or {})})
+
+
+async def _feed_at_rate(stream, rate: float, payload: Dict[str, Any]) -> None:
+    """Send `rate` items per second in 10 ms batches until cancelled"""
+    sent = 0
+    start = time.perf_counter()
+    async with stream:
+        while True:
+            due = int((time.perf_counter() - start) * rate)
+            while sent < due:
+                await stream.send({"id": sent, **payload})
+                sent += 1
+            await anyio.sleep(0.01)
+
+
+async def _drain(stream) -> None:
+    async with stream:
+        async for _ in stream:
+            pass
+
+
+async def run(mode: str, items: int, storm_rate: float, payload_kb: int, dead_letter: bool) -> Dict[str, Any]:
+    healthy = Healthy("healthy", CONFIG)
+    healthy_in, healthy.receive_streams["input"] = anyio.create_memory_object_stream(1000)
+    healthy.send_streams["output"], healthy_out = anyio.create_memory_object_stream(1000)
+
+    other = (Healthy if mode == "baseline" else Failing)("other", CONFIG)
+    if mode == "per_error":
+        other.error_handler.storm_threshold = float("inf")
+    other_in, other.receive_streams["input"] = anyio.create_memory_object_stream(1000)
+    other.send_streams["output"], other_out = anyio.create_memory_object_stream(1000)
+    if dead_letter:
+        other.send_streams[DEAD_LETTER_PORT], dead_letters = anyio.create_memory_object_stream(1000)
+    payload = {"blob": "x" * (payload_kb * 1024), "rows": list(range(1000))}
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(_drain, healthy_out)
+        tg.start_soon(other.process)
+        tg.start_soon(_feed_at_rate, other_in, storm_rate, payload)
+        tg.start_soon(_drain, other_out)
+        if dead_letter:
+            tg.start_soon(_drain, dead_letters)
+        async with anyio.create_task_group() as healthy_tg:
+            healthy_tg.start_soon(healthy.process)
+            await _feed(healthy_in, items)
+        elapsed = time.perf_counter() - start
+        tg.cancel_scope.cancel()
+
+    handler = other.error_handler
+    return {
+        "mode": mode,
+        "healthy_items_per_second": round(items / elapsed),
+        "other_items_per_second": round(other.get_status().items_processed / elapsed)
+        if mode == "baseline" else round(handler.metrics.total_errors / elapsed),
+        "failures": handler.metrics.total_errors,
+        "aggregated": handler.aggregated_errors,
+        "dead_letters": handler.dead_letters_sent,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20_000, help="Items through the healthy component")
+    parser.add_argument("--storm-rate", type=float, default=2000.0, help="Items per second sent to the second component")
+    parser.add_argument("--payload-kb", type=int, default=64, help="Size of each failing item's payload")
+    parser.add_argument("--repeat", type=int, default=3, help="Rounds per mode; the median is reported")
+    parser.add_argument("--dead-letter", action="store_true", help="Wire a dead_letter output on the failing component")
+    args = parser.parse_args()
+
+    # Interleave modes across rounds and keep each mode's median run; single runs are noisy
+    modes = ("baseline", "per_error", "aggregated")
+    runs = {mode: [] for mode in modes}
+    for _ in range(args.repeat):
+        for mode in modes:
+            runs[mode].append(anyio.run(run, mode, args.items, args.storm_rate, args.payload_kb, args.dead_letter))
+    results = [
+        sorted(runs[mode], key=lambda r: r["healthy_items_per_second"])[len(runs[mode]) // 2]
+        for mode in modes
+    ]
+    baseline = results[0]["healthy_items_per_second"]
+    for result in results[1:]:
+        result["healthy_throughput_vs_baseline"] = round(result["healthy_items_per_second"] / baseline, 3)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark FastAPIEndpoint request latency and throughput per server mode.
+
+Starts the default generated app (GET /tasks/{id} backed by an in-memory
+store living on the harness loop) in each server mode, drives it from a
+separate load-generator process over keep-alive HTTP/1.1 connections, and
+reports requests/s and latency percentiles.
+
+Usage:
+    python -m autocoder_cc.benchmarks.fastapi_endpoint [--mode M] [--connections C] [--duration S]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+from typing import Any, Dict, List
+
+import anyio
+import anyio.to_thread
+
+from autocoder_cc.components.fastapi_endpoint import SERVER_MODES, FastAPIEndpoint
+
+
+class BenchStore:
+    """Minimal in-memory store answering the endpoint's task routes"""
+
+    def __init__(self, tasks: int = 1000):
+        self.tasks = {str(i): {"id": str(i), "data": {"title": f"task {i}"}} for i in range(tasks)}
+
+    async def process_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        task = self.tasks.get(item.get("id"))
+        if task is None:
+            return {"status": "not_found"}
+        return {"status": "success", "data": task}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _client(host: str, port: int, deadline: float, latencies: List[float], errors: List[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f"GET /tasks/1 HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(1)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+def _load(host: str, port: int, connections: int, duration: float, results) -> None:
+    latencies: List[float] = []
+    errors: List[int] = []
+
+    async def main():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(_client(host, port, deadline, latencies, errors) for _ in range(connections)))
+
+    asyncio.run(main())
+    results.put((latencies, len(errors)))
+
+
+def _summary(latencies: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+
+    def pct(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 2) if ordered else 0.0
+
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "requests_per_second": round(len(ordered) / duration),
+        "latency_p50_ms": pct(0.5),
+        "latency_p99_ms": pct(0.99),
+        "latency_max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+async def bench_mode(mode: str, connections: int, duration: float, workers: int) -> Dict[str, Any]:
+    port = free_port()
+    endpoint = FastAPIEndpoint(f"bench_{mode}", {"port": port, "host": "127.0.0.1",
+                                                  "server_mode": mode, "workers": workers})
+    endpoint.set_store_component(BenchStore())
+    await endpoint._start_server()
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(endpoint.process)
+        await anyio.sleep(1.0 if mode == "workers" else 0.2)  # Let workers spawn and bind
+        loader = context.Process(target=_load, args=("127.0.0.1", port, connections, duration, results))
+        loader.start()
+        latencies, errors = await anyio.to_thread.run_sync(results.get)
+        await anyio.to_thread.run_sync(loader.join)
+        tg.cancel_scope.cancel()
+    await endpoint._stop_server()
+    return {"mode": mode, "connections": connections, **_summary(latencies, errors, duration)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=SERVER_MODES, action="append",
+                        help="Server mode(s) to benchmark (default: all)")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for workers mode")
+    args = parser.parse_args()
+
+    results = [
+        anyio.run(bench_mode, mode, args.connections, args.duration, args.workers)
+        for mode in (args.mode or ("thread", "inline", "workers"))
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Benchmark the SystemExecutionHarness data plane on canonical topologies.
+
+Each topology is wired from the built-in components through the harness'
+own streams and run for a fixed number of items in a fresh process:
+
+    linear_pipeline       source -> 4 x Transformer -> drain
+    fan_out               source -> Transformer -> 4 x Transformer -> drain
+    router_heavy          source -> 3 x Router (4 expression rules each) -> drain
+    aggregator_windowing  source -> Transformer -> Aggregator + windowing StreamProcessor -> drain
+    store_heavy           source -> Transformer -> SQLite Store (upserts) -> drain
+
+The source stamps every item and the drain measures end-to-end latency from
+that stamp (for batches and windows, from the newest item they contain).
+Reports items/s, p50/p99 latency, peak RSS and errors per topology; each
+topology runs `--repeat` times and the median run by throughput is kept.
+
+Results are appended to a JSON history (AUTOCODER_BENCHMARK_HISTORY, default
+~/.autocoder/benchmarks/harness_throughput.json) and compared with the median
+of the last `--baseline-runs` comparable runs; a topology regresses when its
+throughput drops, or its p99 latency or peak RSS grows, by more than the
+thresholds.
+
+Usage:
+    python -m autocoder_cc.benchmarks.harness_throughput [--items N] [--topology T] [--fail-on-regression] 2>/dev/null
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+STAMP = "_bench_sent"
+TOPOLOGIES = ("linear_pipeline", "fan_out", "router_heavy", "aggregator_windowing", "store_heavy")
+
+# The default SchemaValidator capability has no validate_input/validate_output, which
+# ComposedComponent.process calls; leave it off so items reach process_item
+_COMPOSED = {"schema_validation_enabled": False}
+
+
+def _newest_stamp(value: Any, depth: int = 0) -> Optional[float]:
+    """Newest source stamp inside an item, batch or wrapped message"""
+    if depth > 6:
+        return None
+    if isinstance(value, dict):
+        found = value.get(STAMP)
+        found = found if isinstance(found, float) else None
+        for nested in value.values():
+            if isinstance(nested, (dict, list)):
+                stamp = _newest_stamp(nested, depth + 1)
+                if stamp is not None and (found is None or stamp > found):
+                    found = stamp
+        return found
+    if isinstance(value, list):
+        stamps = [stamp for stamp in (_newest_stamp(v, depth + 1) for v in value) if stamp is not None]
+        return max(stamps) if stamps else None
+    return None
+
+
+def _build_topology(topology: str, workdir: str) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """Components (besides source and drain) and their connections"""
+    from autocoder_cc.components.aggregator import Aggregator
+    from autocoder_cc.components.router import Router
+    from autocoder_cc.components.store import Store
+    from autocoder_cc.components.stream_processor import StreamProcessor
+    from autocoder_cc.components.transformer import Transformer
+
+    def transformer(name: str) -> Any:
+        return Transformer(name, {"type": "Transformer", **_COMPOSED})
+
+    if topology == "linear_pipeline":
+        stages = [f"transform_{i}" for i in range(4)]
+        components = {name: transformer(name) for name in stages}
+        connections = [("source.output", "transform_0.input")]
+        connections += [(f"{a}.output", f"{b}.input") for a, b in zip(stages, stages[1:])]
+        connections.append((f"{stages[-1]}.output", "drain.input"))
+    elif topology == "fan_out":
+        components = {"split": transformer("split")}
+        connections = [("source.output", "split.input")]
+        for i in range(4):
+            components[f"branch_{i}"] = transformer(f"branch_{i}")
+            connections += [(f"split.out_{i}", f"branch_{i}.input"), (f"branch_{i}.output", f"drain.in_{i}")]
+    elif topology == "router_heavy":
+        rules = [
+            {"condition": "value < 100", "destination": "low"},
+            {"condition": "value < 1000 and category == 'a'", "destination": "mid_a"},
+            {"condition": "value < 1000", "destination": "mid"},
+            {"condition": "'urgent' in name", "destination": "urgent"},
+        ]
+        stages = [f"router_{i}" for i in range(3)]
+        components = {
+            name: Router(name, {"type": "Router", "routing_rules": rules, "default_route": "rest", **_COMPOSED})
+            for name in stages
+        }
+        connections = [("source.output", "router_0.input")]
+        connections += [(f"{a}.output", f"{b}.input") for a, b in zip(stages, stages[1:])]
+        connections.append((f"{stages[-1]}.output", "drain.input"))
+    elif topology == "aggregator_windowing":
+        components = {
+            "split": transformer("split"),
+            "aggregate": Aggregator("aggregate", {
+                "type": "Aggregator", "batch_size": 50, "aggregation_strategy": "collect", **_COMPOSED,
+            }),
+            "window": StreamProcessor("window", {
+                "variant": "windowing", "window_type": "tumbling", "window_size": 1.0, "key_field": "key",
+                "aggregations": {"events": "count", "total": {"op": "sum", "field": "value"},
+                                 STAMP: {"op": "max", "field": STAMP}},
+            }),
+        }
+        connections = [
+            ("source.output", "split.input"),
+            ("split.to_aggregate", "aggregate.input"), ("split.to_window", "window.input"),
+            ("aggregate.output", "drain.aggregated"), ("window.output", "drain.windowed"),
+        ]
+    elif topology == "store_heavy":
+        components = {
+            "prepare": transformer("prepare"),
+            "store": Store("store", {
+                "type": "Store", "storage_type": "sqlite", "database_type": "sqlite", "table_name": "bench",
+                "database_url": f"sqlite:///{os.path.join(workdir, 'bench.db')}", **_COMPOSED,
+            }),
+        }
+        connections = [("source.output", "prepare.input"), ("prepare.output", "store.input"),
+                       ("store.output", "drain.input")]
+    else:
+        raise ValueError(f"Unknown topology: {topology}")
+    return components, connections
+
+
+async def _run_topology(topology: str, items: int, payload_bytes: int, max_seconds: float) -> Dict[str, Any]:
+    import anyio
+    import psutil
+
+    from autocoder_cc.orchestration.component import Component
+    from autocoder_cc.orchestration.harness import SystemExecutionHarness
+
+    class BenchSource(Component):
+        """Sends pre-built items as fast as the pipeline accepts them, stamping each on send"""
+
+        def __init__(self, records: List[Dict[str, Any]]):
+            super().__init__("source", {})
+            self.records = records
+
+        async def process(self) -> None:
+            stream = self.send_streams["output"]
+            async with stream:
+                for record in self.records:
+                    record[STAMP] = time.perf_counter()
+                    await stream.send(record)
+
+    class BenchDrain(Component):
+        """Consumes every input port and records end-to-end latency"""
+
+        def __init__(self):
+            super().__init__("drain", {})
+            self.received = 0
+            self.latencies: List[float] = []
+            self.finished_at = 0.0
+
+        async def _drain(self, stream) -> None:
+            async for item in stream:
+                stamp = _newest_stamp(item)
+                if stamp is not None:
+                    self.latencies.append(time.perf_counter() - stamp)
+                self.received += 1
+                self.finished_at = time.perf_counter()
+
+        async def process(self) -> None:
+            async with anyio.create_task_group() as tg:
+                for stream in self.receive_streams.values():
+                    tg.start_soon(self._drain, stream)
+
+    payload = "x" * payload_bytes
+    records = [
+        {"id": i, "key": f"k{i % 100}", "value": i % 2000, "category": "ab"[i % 2],
+         "name": f"item-{i}{'-urgent' if i % 50 == 0 else ''}", "timestamp": time.time(), "payload": payload}
+        for i in range(items)
+    ]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        components, connections = _build_topology(topology, workdir)
+        source, drain = BenchSource(records), BenchDrain()
+        harness = SystemExecutionHarness(f"bench-{topology}", enable_dynamic_loading=False)
+        for name, component in {"source": source, **components, "drain": drain}.items():
+            harness.register_component(name, component)
+        for from_output, to_input in connections:
+            harness.connect(from_output, to_input)
+        for component in harness.components.values():
+            await component.setup(harness.get_context())
+
+        process = psutil.Process()
+        rss_baseline = rss_peak = process.memory_info().rss
+
+        async def sample_rss() -> None:
+            nonlocal rss_peak
+            while True:
+                rss_peak = max(rss_peak, process.memory_info().rss)
+                await anyio.sleep(0.05)
+
+        async def run(name: str, component: Any) -> None:
+            await harness._run_component(name, component)
+            # Components do not close their outputs when their input ends; do it so the stream end propagates
+            for stream in component.send_streams.values():
+                await stream.aclose()
+
+        started = time.perf_counter()
+        timed_out = True
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(sample_rss)
+            with anyio.move_on_after(max_seconds):
+                async with anyio.create_task_group() as pipeline:
+                    for name, component in harness.components.items():
+                        pipeline.start_soon(run, name, component)
+                timed_out = False
+            tg.cancel_scope.cancel()
+        elapsed = (drain.finished_at or time.perf_counter()) - started
+        rss_peak = max(rss_peak, process.memory_info().rss)
+
+        errors = sum(
+            component.stats.errors if getattr(component, "stats", None) is not None
+            else component.get_status().errors_encountered
+            for component in components.values()
+        )
+        for component in harness.components.values():
+            try:
+                await component.cleanup()
+            except Exception:
+                pass
+
+    latencies = sorted(drain.latencies)
+    return {
+        "items_in": items,
+        "items_out": drain.received,
+        "errors": errors,
+        "timed_out": timed_out,
+        "seconds": round(elapsed, 3),
+        "items_per_second": round(items / elapsed) if elapsed > 0 else 0,
+        "p50_latency_ms": round(latencies[len(latencies) // 2] * 1000, 3) if latencies else None,
+        "p99_latency_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3)
+        if latencies else None,
+        "rss_baseline_mb": round(rss_baseline / 1024 / 1024, 1),
+        "rss_peak_mb": round(rss_peak / 1024 / 1024, 1),
+    }
+
+
+def _worker(args) -> Dict[str, Any]:
+    topology, items, payload_bytes, max_seconds, log_level = args
+    os.environ["LOG_LEVEL"] = log_level
+    import anyio
+
+    return anyio.run(_run_topology, topology, items, payload_bytes, max_seconds)
+
+
+def bench_topology(topology: str, items: int, payload_bytes: int, repeat: int, max_seconds: float,
+                   log_level: str) -> Dict[str, Any]:
+    """Median-throughput run of `repeat` runs, each in a fresh process"""
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with context.Pool(1) as pool:
+            runs.append(pool.apply(_worker, ((topology, items, payload_bytes, max_seconds, log_level),)))
+    runs.sort(key=lambda run: run["items_per_second"])
+    result = dict(runs[len(runs) // 2])
+    result["items_per_second_runs"] = [run["items_per_second"] for run in runs]
+    return result
+
+
+# History and regression detection
+
+def default_history_path() -> Path:
+    return Path(os.getenv("AUTOCODER_BENCHMARK_HISTORY",
+                          Path.home() / ".autocoder" / "benchmarks" / "harness_throughput.json"))
+
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f).get("runs", [])
+
+
+def save_history(path: Path, runs: List[Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"runs": runs}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _environment() -> Dict[str, Any]:
+    return {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "host": platform.node()}
+
+
+def _comparable(run: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """Same workload on the same host and interpreter"""
+    return (run["params"] == current["params"]
+            and run["environment"]["host"] == current["environment"]["host"]
+            and run["environment"]["python"] == current["environment"]["python"])
+
+
+def detect_regressions(history: List[Dict[str, Any]], current: Dict[str, Any], baseline_runs: int,
+                       throughput_drop: float, latency_growth: float, rss_growth: float) -> List[Dict[str, Any]]:
+    """Compare each topology with the median of its last `baseline_runs` comparable runs"""
+    previous = [run for run in history if _comparable(run, current)][-baseline_runs:]
+    checks = (
+        ("items_per_second", -throughput_drop),
+        ("p99_latency_ms", latency_growth),
+        ("rss_peak_mb", rss_growth),
+    )
+    regressions = []
+    for topology, result in current["results"].items():
+        for metric, threshold in checks:
+            values = [run["results"][topology][metric] for run in previous
+                      if topology in run["results"] and run["results"][topology].get(metric) is not None]
+            if not values or result.get(metric) is None:
+                continue
+            baseline = statistics.median(values)
+            if not baseline:
+                continue
+            change = (result[metric] - baseline) / baseline
+            if (threshold < 0 and change < threshold) or (threshold > 0 and change > threshold):
+                regressions.append({
+                    "topology": topology,
+                    "metric": metric,
+                    "baseline": baseline,
+                    "current": result[metric],
+                    "change_percent": round(change * 100, 1),
+                    "baseline_runs": len(values),
+                })
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--topology", choices=TOPOLOGIES, action="append",
+                        help="Topology to benchmark (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per topology; the median is reported")
+    parser.add_argument("--max-seconds", type=float, default=120.0, help="Cut off a run after this long")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="LOG_LEVEL for the components (INFO includes per-item log lines)")
+    parser.add_argument("--history", type=Path, default=None,
+                        help="History file (default: $AUTOCODER_BENCHMARK_HISTORY or "
+                             "~/.autocoder/benchmarks/harness_throughput.json)")
+    parser.add_argument("--no-save", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--baseline-runs", type=int, default=5)
+    parser.add_argument("--throughput-drop", type=float, default=0.10,
+                        help="Regression when items/s falls by more than this fraction")
+    parser.add_argument("--latency-growth", type=float, default=0.25,
+                        help="Regression when p99 latency grows by more than this fraction")
+    parser.add_argument("--rss-growth", type=float, default=0.20,
+                        help="Regression when peak RSS grows by more than this fraction")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    topologies = args.topology or list(TOPOLOGIES)
+    current = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "environment": _environment(),
+        "params": {"items": args.items, "payload_bytes": args.payload_bytes, "log_level": args.log_level},
+        "results": {
+            topology: bench_topology(topology, args.items, args.payload_bytes, args.repeat, args.max_seconds,
+                                     args.log_level)
+            for topology in topologies
+        },
+    }
+
+    history_path = args.history or default_history_path()
+    history = load_history(history_path)
+    regressions = detect_regressions(history, current, args.baseline_runs, args.throughput_drop,
+                                     args.latency_growth, args.rss_growth)
+    if not args.no_save:
+        save_history(history_path, history + [current])
+
+    print(json.dumps({**current, "regressions": regressions, "history": str(history_path)}, indent=2))
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
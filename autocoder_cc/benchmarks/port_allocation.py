@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark allocating ports for a whole system, from parallel generation runs.
+
+Starts `--processes` processes that each allocate ports for a system of
+`--components` components against one shared state file at the same time.
+"json_flock" is the previous PortAllocator: per port, a stale-entry sweep
+(psutil.pid_exists per entry plus a full rewrite) and a reservation (full
+read and rewrite), each under flock. "port_store" is one
+PortAllocator.allocate_ports call per system. Both bind-probe chosen ports.
+Reports the slowest process' wall time and checks that no port was handed
+out twice.
+
+Usage:
+    python -m autocoder_cc.benchmarks.port_allocation [--components N] [--processes P] 2>/dev/null
+"""
+import argparse
+import fcntl
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import psutil
+
+# Keep clear of the ports real systems on this host are using
+PORT_RANGE = "20000-29999"
+
+
+def _legacy_reserve(state_file: str, port: int, system: str, component: str) -> bool:
+    """The previous per-port path: sweep stale entries, then reserve, each rewriting the file"""
+    if os.path.exists(state_file):
+        with open(state_file, "r+") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            content = f.read()
+            data = json.loads(content) if content else {"ports": {}}
+            for key in [k for k, v in data["ports"].items() if not psutil.pid_exists(v["pid"])]:
+                del data["ports"][key]
+            data["last_cleanup"] = datetime.utcnow().isoformat()
+            f.seek(0)
+            f.truncate()
+            json.dump(data, f, indent=2)
+    with open(state_file, "a+") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        f.seek(0)
+        content = f.read()
+        data = json.loads(content) if content else {"ports": {}}
+        if str(port) in data["ports"]:
+            return False
+        data["ports"][str(port)] = {"system": system, "component": component, "pid": os.getpid(),
+                                    "timestamp": datetime.utcnow().isoformat()}
+        f.seek(0)
+        f.truncate()
+        json.dump(data, f, indent=2)
+        return True
+
+
+def _run_legacy(state_file: str, system: str, components: int) -> Dict[str, Any]:
+    from autocoder_cc.resource_orchestrator import PortAllocator
+
+    allocator = PortAllocator.__new__(PortAllocator)  # Candidate order and bind probe only
+    allocator.port_range = tuple(map(int, PORT_RANGE.split("-")))
+    allocator.max_attempts = 50
+    started = time.perf_counter()
+    ports = {}
+    for i in range(components):
+        component = f"component_{i}"
+        for port in allocator._candidates(system, component):
+            if allocator._is_port_free(port) and _legacy_reserve(state_file, port, system, component):
+                ports[component] = port
+                break
+    return {"seconds": time.perf_counter() - started, "ports": list(ports.values())}
+
+
+def _run_store(state_file: str, system: str, components: int) -> Dict[str, Any]:
+    os.environ["AUTOCODER_PORT_DB"] = state_file
+    os.environ["AUTOCODER_PORT_RANGE"] = PORT_RANGE
+    from autocoder_cc.resource_orchestrator import PortAllocator
+
+    allocator = PortAllocator()
+    started = time.perf_counter()
+    ports = allocator.allocate_ports(system, [f"component_{i}" for i in range(components)])
+    return {"seconds": time.perf_counter() - started, "ports": list(ports.values())}
+
+
+def _worker(args) -> Dict[str, Any]:
+    mode, state_file, system, components = args
+    return (_run_legacy if mode == "json_flock" else _run_store)(state_file, system, components)
+
+
+def run(mode: str, components: int, processes: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "ports.json" if mode == "json_flock" else "ports.db")
+        jobs = [(mode, state_file, f"system_{p}", components) for p in range(processes)]
+        with multiprocessing.get_context("spawn").Pool(processes) as pool:
+            results: List[Dict[str, Any]] = pool.map(_worker, jobs)
+    ports = [port for result in results for port in result["ports"]]
+    slowest = max(result["seconds"] for result in results)
+    return {
+        "ports_allocated": len(ports),
+        "duplicate_ports": len(ports) - len(set(ports)),
+        "slowest_process_ms": round(slowest * 1000, 1),
+        "ms_per_port": round(slowest * 1000 / components, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=4, help="Parallel generation runs")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only benchmark the port store")
+    args = parser.parse_args()
+
+    results = {}
+    if not args.skip_legacy:
+        results["json_flock"] = run("json_flock", args.components, args.processes)
+    results["port_store"] = run("port_store", args.components, args.processes)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
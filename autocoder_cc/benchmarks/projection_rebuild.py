@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark rebuilding a CQRS projection from the event log.
+
+Writes `--events` events over `--aggregates` aggregates to a temporary
+SQLiteEventLog, then rebuilds the default projection with ProjectionEngine
+into a store that charges `--store-rtt-ms` per write call (a local Redis
+round trip). "per_event" applies and writes one event at a time, the way
+ad-hoc rebuild code does, on the first `--per-event-sample` events and
+extrapolates; "batched" is the engine's replay. Both report the projected
+time for `--target-events`.
+
+Usage:
+    python -m autocoder_cc.benchmarks.projection_rebuild [--events N] [--aggregates A] [--store-rtt-ms R] 2>/dev/null
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+import anyio
+
+from autocoder_cc.components.cqrs.projection_engine import (
+    MemoryProjectionStore, Projection, ProjectionEngine, SQLiteEventLog
+)
+
+
+class RoundTripStore(MemoryProjectionStore):
+    """Memory store with a fixed delay per write call"""
+
+    def __init__(self, rtt: float):
+        super().__init__()
+        self.rtt = rtt
+
+    async def write(self, projection, upserts, deletes, offset) -> None:
+        await anyio.sleep(self.rtt)
+        await super().write(projection, upserts, deletes, offset)
+
+
+async def _populate(log: SQLiteEventLog, events: int, aggregates: int) -> None:
+    chunk = []
+    for i in range(events):
+        chunk.append({
+            "event_id": f"evt_{i}",
+            "event_type": "order_updated",
+            "aggregate_id": f"order-{i % aggregates}",
+            "data": {"status": "open" if i % 3 else "paid", "amount": i % 997, "line": i},
+        })
+        if len(chunk) == 10_000:
+            await log.append_many(chunk)
+            chunk = []
+    await log.append_many(chunk)
+
+
+async def _per_event(log: SQLiteEventLog, store: RoundTripStore, sample: int) -> float:
+    projection = Projection("orders_naive")
+    state: Dict[str, Any] = {}
+    started = time.perf_counter()
+    done = 0
+    async for batch in log.read(0, 1000):
+        for event in batch:
+            entity_id = projection.apply(state, event)
+            await store.write(projection.name, {entity_id: state[entity_id]}, (), event["offset"])
+            done += 1
+            if done >= sample:
+                return done / (time.perf_counter() - started)
+    return done / (time.perf_counter() - started)
+
+
+async def run(events: int, aggregates: int, rtt: float, sample: int, target: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        log = await SQLiteEventLog(os.path.join(tmp, "events.db")).open()
+        started = time.perf_counter()
+        await _populate(log, events, aggregates)
+        append_rate = events / (time.perf_counter() - started)
+
+        naive_rate = await _per_event(log, RoundTripStore(rtt), min(sample, events))
+
+        store = RoundTripStore(rtt)
+        engine = ProjectionEngine(Projection("orders"), store, snapshot_every=events + 1)
+        started = time.perf_counter()
+        await engine.rebuild(log)
+        elapsed = time.perf_counter() - started
+        await log.close()
+
+    batched_rate = events / elapsed
+    return {
+        "events": events,
+        "aggregates": aggregates,
+        "append_events_per_second": round(append_rate),
+        "per_event": {
+            "events_per_second": round(naive_rate),
+            f"projected_minutes_for_{target}": round(target / naive_rate / 60, 1),
+        },
+        "batched": {
+            "events_per_second": round(batched_rate),
+            "seconds": round(elapsed, 2),
+            "store_writes": store.writes,
+            "entities": len(engine.state),
+            f"projected_minutes_for_{target}": round(target / batched_rate / 60, 1),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--aggregates", type=int, default=50_000)
+    parser.add_argument("--store-rtt-ms", type=float, default=0.2)
+    parser.add_argument("--per-event-sample", type=int, default=20_000)
+    parser.add_argument("--target-events", type=int, default=10_000_000)
+    args = parser.parse_args()
+    result = anyio.run(run, args.events, args.aggregates, args.store_rtt_ms / 1000,
+                       args.per_event_sample, args.target_events)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
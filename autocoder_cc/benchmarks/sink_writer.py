@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark Sink file output: per-record open/append/close vs RotatingFileWriter.
+
+Writes the same records both ways and reports records/s, plus the largest
+event-loop stall observed while the buffered writer is running.
+
+Usage:
+    python -m autocoder_cc.benchmarks.sink_writer [--records N] [--batch-size B] [--fsync P]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import anyio
+
+from autocoder_cc.components.sink_writer import FSYNC_POLICIES, IsoTimestampClock, RotatingFileWriter
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    return [{"id": i, "value": i * 0.5, "name": f"record-{i}"} for i in range(count)]
+
+
+def bench_open_per_record(records: List[Dict[str, Any]], directory: str) -> Dict[str, float]:
+    """The previous Sink behaviour: utcnow() and open/write/close for every record"""
+    path = os.path.join(directory, "legacy.json")
+    start = time.perf_counter()
+    for record in records:
+        output_record = {"timestamp": datetime.utcnow().isoformat(), "component": "bench", "data": record}
+        with open(path, "a") as f:
+            f.write(json.dumps(output_record) + "\n")
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 3), "records_per_second": round(len(records) / elapsed)}
+
+
+async def bench_buffered(records: List[Dict[str, Any]], directory: str, batch_size: int,
+                         fsync: str, max_file_size: int, compression: str) -> Dict[str, Any]:
+    writer = RotatingFileWriter(
+        os.path.join(directory, "buffered.json"),
+        flush_records=batch_size,
+        flush_interval=1.0,
+        fsync=fsync,
+        max_file_size=max_file_size,
+        compression=compression,
+    )
+    clock = IsoTimestampClock()
+    max_stall = 0.0
+
+    async def probe() -> None:
+        nonlocal max_stall
+        while True:
+            t0 = time.perf_counter()
+            await anyio.sleep(0.001)
+            max_stall = max(max_stall, time.perf_counter() - t0 - 0.001)
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(probe)
+        for record in records:
+            await writer.write({"timestamp": clock.now(), "component": "bench", "data": record})
+        await writer.close()
+        tg.cancel_scope.cancel()
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(len(records) / elapsed),
+        "max_event_loop_stall_ms": round(max_stall * 1000, 2),
+        **writer.get_stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="rotate")
+    parser.add_argument("--max-file-size", type=int, default=16 * 1024 * 1024)
+    parser.add_argument("--compression", default="none")
+    parser.add_argument("--directory", default=None, help="Directory to write into (default: system temp)")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only benchmark the buffered writer")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        if not args.skip_legacy:
+            results["open_per_record"] = bench_open_per_record(records, directory)
+        results["buffered"] = anyio.run(
+            bench_buffered, records, directory, args.batch_size, args.fsync,
+            args.max_file_size, args.compression
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite-backed Store read throughput against the reader pool size.
+
+Loads `--rows` items into a Store on a temporary WAL database with one
+batched upsert, then runs `--concurrency` tasks doing random point reads
+through `Store.fetch_value` for `--duration` seconds per reader count.
+Readers 0 serves reads from the writer connection, the pre-pool layout.
+Scaling past one reader needs as many free cores as readers.
+
+Usage:
+    python -m autocoder_cc.benchmarks.store_reads [--readers N [N ...]] [--rows R] [--concurrency C] [--duration S]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict
+
+import anyio
+
+from autocoder_cc.components.store import Store
+
+
+async def _reader(store: Store, rows: int, deadline: float, counts: list) -> None:
+    rng = random.Random()
+    done = 0
+    while time.perf_counter() < deadline:
+        await store.fetch_value(f"key-{rng.randrange(rows)}")
+        done += 1
+    counts.append(done)
+
+
+async def bench(readers: int, rows: int, concurrency: int, duration: float) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Store("bench_store", {
+            "storage_type": "database",
+            "database_type": "sqlite",
+            "database_url": f"sqlite:///{os.path.join(tmp, 'store.db')}",
+            "table_name": "bench_items",
+            "sqlite_readers": readers,
+        })
+        await store._connect_storage()
+        await store.store_many({"key": f"key-{i}", "value": {"n": i, "name": f"item {i}"}} for i in range(rows))
+
+        counts: list = []
+        start = time.perf_counter()
+        async with anyio.create_task_group() as tg:
+            for _ in range(concurrency):
+                tg.start_soon(_reader, store, rows, start + duration, counts)
+        elapsed = time.perf_counter() - start
+        metrics = store.db_pool.get_metrics()
+        await store.db_pool.close()
+
+    pool = metrics["readers"] or metrics["writer"]
+    return {
+        "readers": readers,
+        "reads": sum(counts),
+        "reads_per_second": round(sum(counts) / elapsed),
+        "avg_wait_ms": pool["avg_wait_ms"],
+        "avg_checkout_ms": pool["avg_checkout_ms"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, nargs="+", help="Reader pool size(s) (default: 0 1 2 4 8)")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent reading tasks")
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    results = [
+        anyio.run(bench, readers, args.rows, args.concurrency, args.duration)
+        for readers in (args.readers or (0, 1, 2, 4, 8))
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
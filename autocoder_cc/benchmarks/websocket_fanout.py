@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark WebSocket fan-out through BroadcastHub with simulated clients.
+
+Registers N in-process clients (a fraction of them deliberately slow),
+publishes messages at a fixed rate and reports publish cost and
+publish-to-delivery latency for the healthy clients. No sockets are opened:
+this measures the fan-out machinery, not the network stack.
+
+Usage:
+    python -m autocoder_cc.benchmarks.websocket_fanout [--clients N] [--messages M] [--policy P]
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import anyio
+
+from autocoder_cc.components.websocket_broadcast import SLOW_CONSUMER_POLICIES, BroadcastHub
+
+
+class SimulatedClient:
+    """Records delivery latency; slow clients take `send_delay` seconds per message.
+
+    Fast clients complete send() without yielding, as a real connection does
+    while its transport write buffer is below the high-water mark.
+    """
+
+    def __init__(self, send_delay: float = 0.0):
+        self.send_delay = send_delay
+        self.latencies: List[float] = []
+        self.closed_with = None
+
+    async def send(self, message: Any) -> None:
+        if self.send_delay:
+            await anyio.sleep(self.send_delay)
+        self.latencies.append(time.perf_counter() - message[0])
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed_with = code
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(clients: int, messages: int, rate: float, slow_fraction: float,
+              policy: str, queue_size: int) -> Dict[str, Any]:
+    hub = BroadcastHub(max_queue=queue_size, policy=policy)
+    slow_count = int(clients * slow_fraction)
+    simulated = [SimulatedClient(0.5 if i < slow_count else 0.0) for i in range(clients)]
+    publish_seconds = 0.0
+
+    async with anyio.create_task_group() as tg:
+        for client in simulated:
+            tg.start_soon(hub.drain, hub.register(client))
+        await anyio.sleep(0)
+
+        interval = 1.0 / rate
+        for i in range(messages):
+            start = time.perf_counter()
+            # Tuple payload carries its publish time; real messages are pre-encoded strings
+            hub.publish((start, i), key=i % 10)
+            publish_seconds += time.perf_counter() - start
+            await anyio.sleep(interval)
+        await anyio.sleep(0.5)
+        tg.cancel_scope.cancel()
+
+    healthy = [lat for client in simulated[slow_count:] for lat in client.latencies]
+    return {
+        "clients": clients,
+        "slow_clients": slow_count,
+        "messages": messages,
+        "policy": policy,
+        "avg_publish_ms": round(publish_seconds / messages * 1000, 3),
+        "healthy_deliveries": len(healthy),
+        "healthy_latency_p50_ms": round(percentile(healthy, 0.5) * 1000, 2),
+        "healthy_latency_p99_ms": round(percentile(healthy, 0.99) * 1000, 2),
+        "healthy_latency_max_ms": round(max(healthy, default=0.0) * 1000, 2),
+        "slow_clients_closed": sum(1 for c in simulated[:slow_count] if c.closed_with is not None),
+        **{k: v for k, v in hub.get_stats().items() if k in ("messages_dropped", "slow_disconnects")},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=20.0, help="Messages published per second")
+    parser.add_argument("--slow-fraction", type=float, default=0.01)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--policy", choices=SLOW_CONSUMER_POLICIES, default="drop_oldest")
+    args = parser.parse_args()
+
+    result = anyio.run(run, args.clients, args.messages, args.rate, args.slow_fraction,
+                       args.policy, args.queue_size)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1182,7 +1182,9 @@ class SelfHealingSystem:
     5. Retry system generation if all components pass
     """
     
-    def __init__(self, max_healing_attempts: int = 3):
+    def __init__(self, max_healing_attempts: int = 3,
+                 llm_generator: Optional[LLMComponentGenerator] = None,
+                 validation_gate: Optional[ComponentValidationGate] = None):
         # Setup logging first
         logging.basicConfig(level=logging.INFO)
         self.logger = get_logger("SelfHealingSystem")
@@ -1190,7 +1192,8 @@ class SelfHealingSystem:
         self.max_healing_attempts = max_healing_attempts
         self.analyzer = ComponentASTAnalyzer()
         self.code_generator = ASTCodeGenerator()
-        self.validation_gate = ComponentValidationGate()
+        # Batch generation passes in the system's gate, which shares a warm result cache
+        self.validation_gate = validation_gate or ComponentValidationGate()
         
         # Track healing attempts per component to prevent infinite loops
         self.component_healing_attempts = {}  # component_name -> attempt_count
@@ -1198,7 +1201,7 @@ class SelfHealingSystem:
         
         # Initialize LLM component generator - REQUIRED for healing
         try:
-            self.llm_generator = LLMComponentGenerator()
+            self.llm_generator = llm_generator or LLMComponentGenerator()
             self.logger.info("LLM component generator initialized for healing")
         except ComponentGenerationError as e:
             # FAIL FAST - No graceful degradation
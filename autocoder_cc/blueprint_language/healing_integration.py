@@ -36,6 +36,7 @@ class ValidationGateResult:
 from .ast_self_healing import SelfHealingSystem, HealingResult
 from .llm_component_generator import LLMComponentGenerator, ComponentGenerationError
 from autocoder_cc.recipes import RecipeExpander, get_recipe
+from autocoder_cc.observability.pipeline_profiler import HEALING, IO, STAGE, VALIDATION, profiled, span
 
 
 @dataclass
@@ -87,7 +88,15 @@ class HealingIntegratedGenerator:
                  output_dir: Path,
                  max_healing_attempts: int = 3,
                  strict_validation: bool = True,
-                 enable_metrics: bool = True):
+                 enable_metrics: bool = True,
+                 component_generator: Optional[LLMComponentGenerator] = None,
+                 validation_gate: Optional[ComponentValidationGate] = None):
+        """
+        Args:
+            component_generator: Optional pre-initialized LLM generator to share across systems
+            validation_gate: Optional validation gate for this system; gates hold per-system state,
+                so share a ValidationResultCache between gates rather than one gate
+        """
         
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -99,8 +108,12 @@ class HealingIntegratedGenerator:
         # Initialize subsystems
         self.blueprint_parser = SystemBlueprintParser()
         self.scaffold_generator = SystemScaffoldGenerator(output_dir)
-        self.validation_gate = ComponentValidationGate()
-        self.healing_system = SelfHealingSystem(max_healing_attempts=max_healing_attempts)
+        self.validation_gate = validation_gate or ComponentValidationGate()
+        self.healing_system = SelfHealingSystem(
+            max_healing_attempts=max_healing_attempts,
+            llm_generator=component_generator,
+            validation_gate=self.validation_gate
+        )
         
         # Initialize recipe expander for primitive-based generation
         self.recipe_expander = RecipeExpander()
@@ -112,7 +125,7 @@ class HealingIntegratedGenerator:
         
         # Initialize LLM component generator - REQUIRED
         try:
-            self.component_generator = LLMComponentGenerator()
+            self.component_generator = component_generator or LLMComponentGenerator()
         except ComponentGenerationError as e:
             # FAIL FAST - No graceful degradation
             raise RuntimeError(
@@ -125,6 +138,7 @@ class HealingIntegratedGenerator:
         logging.basicConfig(level=logging.INFO)
         self.logger = get_logger("HealingIntegratedGenerator")
     
+    @profiled("generate_system", STAGE)
     async def generate_system_with_healing(self, 
                                          blueprint_yaml: str,
                                          force_regeneration: bool = False) -> HealingPipelineResult:
@@ -157,7 +171,8 @@ class HealingIntegratedGenerator:
             self.logger.info("📋 Parsing system blueprint...")
             parse_start = time.time()
             
-            parsed_blueprint = self.blueprint_parser.parse_string(blueprint_yaml)
+            with span("parse_blueprint", STAGE):
+                parsed_blueprint = self.blueprint_parser.parse_string(blueprint_yaml)
             result.system_name = parsed_blueprint.system.name
             
             parse_time = time.time() - parse_start
@@ -188,9 +203,10 @@ class HealingIntegratedGenerator:
             self.logger.info("🏗️ Generating system scaffold...")
             generation_start = time.time()
             
-            scaffold = self.scaffold_generator.generate_system(
-                parsed_blueprint, enable_metrics=self.enable_metrics
-            )
+            with span("generate_scaffold", STAGE):
+                scaffold = self.scaffold_generator.generate_system(
+                    parsed_blueprint, enable_metrics=self.enable_metrics
+                )
             
             result.generation_time = time.time() - generation_start
             result.system_generated = True
@@ -231,7 +247,8 @@ class HealingIntegratedGenerator:
         components_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate observability.py BEFORE component generation so components can import from it
-        await self._generate_observability_before_components(system_output_dir, parsed_blueprint)
+        with span("generate_observability", STAGE):
+            await self._generate_observability_before_components(system_output_dir, parsed_blueprint)
         
         for attempt in range(self.max_healing_attempts + 1):  # +1 for initial attempt
             self.logger.info(f"\n🔄 Component validation attempt {attempt + 1}")
@@ -239,16 +256,24 @@ class HealingIntegratedGenerator:
             # Generate components if first attempt or if healing was applied
             if attempt == 0 or result.healing_results:
                 self.logger.info("   🔧 Generating components...")
-                await self._generate_components(parsed_blueprint, components_dir)
+                with span("generate_components", STAGE, attempt=attempt + 1):
+                    await self._generate_components(parsed_blueprint, components_dir)
             
             # ALWAYS validate components - NO BYPASSING
             # Validate components
             self.logger.info("   🚦 Running validation gate...")
             validation_start = time.time()
             
-            # Get the integration validation result
-            integration_result = await self.validation_gate.validate_system(
-                components_dir, parsed_blueprint.system.name
+            # Get the integration validation result (unchanged components reuse cached verdicts)
+            with span("validation_gate", VALIDATION, attempt=attempt + 1) as gate_span:
+                integration_result = await self.validation_gate.validate_system(
+                    components_dir, parsed_blueprint.system.name, bindings=parsed_blueprint.system.bindings
+                )
+                gate_span.annotate(revalidated=integration_result.revalidated_components,
+                                   reused=integration_result.reused_components)
+            self.logger.info(
+                f"   Re-tested {integration_result.revalidated_components} components, "
+                f"reused {integration_result.reused_components} cached verdicts"
             )
             
             # Convert IntegrationValidationResult to ValidationGateResult for compatibility
@@ -260,6 +285,8 @@ class HealingIntegratedGenerator:
                     "passed_components": integration_result.passed_components,
                     "failed_components": integration_result.failed_components,
                     "success_rate": integration_result.success_rate,
+                    "revalidated_components": integration_result.revalidated_components,
+                    "reused_components": integration_result.reused_components,
                     "raw_details": integration_result.details
                 },
                 component_results=[]
@@ -290,9 +317,10 @@ class HealingIntegratedGenerator:
             self.logger.info(f"   🚨 {validation_result.failed_components} components failed - attempting healing...")
             result.healing_attempts += 1
             
-            healing_success, healing_results = await self.healing_system.heal_and_validate_components(
-                components_dir, parsed_blueprint.system.name
-            )
+            with span("heal_components", HEALING, attempt=attempt + 1):
+                healing_success, healing_results = await self.healing_system.heal_and_validate_components(
+                    components_dir, parsed_blueprint.system.name
+                )
             
             result.healing_results.extend(healing_results)
             result.components_healed += len([r for r in healing_results if r.healing_successful])
@@ -371,12 +399,13 @@ class HealingIntegratedGenerator:
                     
                     if self.enable_config_validation:
                         try:
-                            validated_config = await self.config_validation_pipeline.validate_and_heal_or_fail(
-                                component_name=component.name,
-                                component_type=component.type,
-                                config=component_config,
-                                blueprint=blueprint_dict
-                            )
+                            with span("validate_config", VALIDATION, component=component.name):
+                                validated_config = await self.config_validation_pipeline.validate_and_heal_or_fail(
+                                    component_name=component.name,
+                                    component_type=component.type,
+                                    config=component_config,
+                                    blueprint=blueprint_dict
+                                )
                             # Update component config with validated/healed version
                             component_config = validated_config
                             if hasattr(component, 'config'):
@@ -440,16 +469,17 @@ class HealingIntegratedGenerator:
                         
                         # Generate component code using LLM with timeout protection
                         try:
-                            component_code = await asyncio.wait_for(
-                                self.component_generator.generate_component_implementation(
-                                    component_type=component.type,
-                                    component_name=component.name,
-                                    component_description=enhanced_description,
-                                    component_config=component_dict.get('config', {}),
-                                    class_name=component.name.replace('_', '').title()
-                                ),
-                                timeout=120.0  # 2-minute timeout for component generation
-                            )
+                            with span("generate_component", STAGE, component=component.name, type=component.type):
+                                component_code = await asyncio.wait_for(
+                                    self.component_generator.generate_component_implementation(
+                                        component_type=component.type,
+                                        component_name=component.name,
+                                        component_description=enhanced_description,
+                                        component_config=component_dict.get('config', {}),
+                                        class_name=component.name.replace('_', '').title()
+                                    ),
+                                    timeout=120.0  # 2-minute timeout for component generation
+                                )
                         except asyncio.TimeoutError:
                             self.logger.error(f"⏰ Component {component.name} generation timed out after 120 seconds")
                             # Continue with next component instead of failing entire system
@@ -463,7 +493,8 @@ class HealingIntegratedGenerator:
                         )
                     
                     # Write component file directly - wrapping already added all imports
-                    with open(component_file, 'w') as f:
+                    with span("write_component", IO, path=str(component_file), bytes=len(component_code)), \
+                            open(component_file, 'w') as f:
                         # Component code already has all necessary imports from wrap_component_with_boilerplate
                         f.write(component_code)
                     
@@ -21,6 +21,7 @@ from autocoder_cc.core.config import settings
 from autocoder_cc.error_handling import ConsistentErrorHandler
 from autocoder_cc.observability.structured_logging import get_logger
 from autocoder_cc.observability.metrics import get_metrics_collector
+from autocoder_cc.observability.pipeline_profiler import HEALING, IO, PROMPT, VALIDATION, profiled, span
 
 # Keep existing extracted modules for validation and prompting
 from .llm_generation.o3_specialized_prompts import O3PromptEngine
@@ -325,25 +326,26 @@ The base class (ComposedComponent) provides send_to_output() and receive_from_in
         Uses unified provider to eliminate hanging issues
         """
         
-        # Build enhanced context-aware prompt
-        system_prompt = self.prompt_engine.get_system_prompt(
-            component_type, 
-            self.o3_prompt_engine.get_reasoning_prefix()
-        )
-        
-        # Use enhanced prompting if system context is available
-        if system_context:
-            user_prompt = self.context_builder.build_context_aware_prompt(
-                component_type, component_name, component_description, 
-                component_config, class_name, system_context,
-                self.prompt_engine.build_component_prompt, blueprint
-            )
-        else:
-            # Fallback to original prompting for backward compatibility
-            user_prompt = self.prompt_engine.build_component_prompt(
-                component_type, component_name, component_description, 
-                component_config, class_name, blueprint
+        with span("prompt.build", PROMPT, component=component_name, context_aware=bool(system_context)):
+            # Build enhanced context-aware prompt
+            system_prompt = self.prompt_engine.get_system_prompt(
+                component_type, 
+                self.o3_prompt_engine.get_reasoning_prefix()
             )
+            
+            # Use enhanced prompting if system context is available
+            if system_context:
+                user_prompt = self.context_builder.build_context_aware_prompt(
+                    component_type, component_name, component_description, 
+                    component_config, class_name, system_context,
+                    self.prompt_engine.build_component_prompt, blueprint
+                )
+            else:
+                # Fallback to original prompting for backward compatibility
+                user_prompt = self.prompt_engine.build_component_prompt(
+                    component_type, component_name, component_description, 
+                    component_config, class_name, blueprint
+                )
         
         return await self._generate_with_unified_provider(
             system_prompt, user_prompt, component_type, component_name, class_name
@@ -364,14 +366,15 @@ The base class (ComposedComponent) provides send_to_output() and receive_from_in
         """
         
         # Build detailed prompt based on component type
-        system_prompt = self.prompt_engine.get_system_prompt(
-            component_type, 
-            self.o3_prompt_engine.get_reasoning_prefix()
-        )
-        user_prompt = self.prompt_engine.build_component_prompt(
-            component_type, component_name, component_description, 
-            component_config, class_name, blueprint
-        )
+        with span("prompt.build", PROMPT, component=component_name):
+            system_prompt = self.prompt_engine.get_system_prompt(
+                component_type, 
+                self.o3_prompt_engine.get_reasoning_prefix()
+            )
+            user_prompt = self.prompt_engine.build_component_prompt(
+                component_type, component_name, component_description, 
+                component_config, class_name, blueprint
+            )
         
         try:
             # Use unified provider with built-in fallback logic
@@ -382,7 +385,7 @@ The base class (ComposedComponent) provides send_to_output() and receive_from_in
             # Save generated code to a debug file for inspection
             import tempfile
             debug_file = os.path.join(tempfile.gettempdir(), f"debug_{component_name}.py")
-            with open(debug_file, 'w', encoding='utf-8') as f:
+            with span("write.debug_file", IO, path=debug_file), open(debug_file, 'w', encoding='utf-8') as f:
                 f.write(generated_code)
             print(f"Debug: Saved generated code to {debug_file}")
             
@@ -441,10 +444,11 @@ The base class (ComposedComponent) provides send_to_output() and receive_from_in
                 
                 # Build adaptive prompt with validation feedback
                 if attempt > 0 and validation_feedback:
-                    adapted_user_prompt = self.retry_orchestrator.build_adaptive_prompt(
-                        user_prompt, validation_feedback, attempt, 
-                        self.o3_prompt_engine.get_reasoning_prefix()
-                    )
+                    with span("prompt.adaptive_retry", PROMPT, component=component_name, attempt=attempt + 1):
+                        adapted_user_prompt = self.retry_orchestrator.build_adaptive_prompt(
+                            user_prompt, validation_feedback, attempt, 
+                            self.o3_prompt_engine.get_reasoning_prefix()
+                        )
                 else:
                     adapted_user_prompt = user_prompt
                 
@@ -621,6 +625,7 @@ The base class (ComposedComponent) provides send_to_output() and receive_from_in
             f"NO FALLBACKS AVAILABLE - LLM generation is mandatory."
         )
     
+    @profiled("heal.post_process", HEALING)
     def _post_process_generated_code(self, generated_code: str, component_name: str) -> str:
         """Post-process generated code to clean up formatting issues and fix anti-patterns"""
         import re
@@ -721,6 +726,7 @@ The base class (ComposedComponent) provides send_to_output() and receive_from_in
         
         return generated_code
     
+    @profiled("heal.syntax_repair", HEALING)
     def _auto_repair_syntax(self, code: str) -> str:
         """Auto-repair common syntax issues from LLM generation"""
         import ast
@@ -806,6 +812,7 @@ The base class (ComposedComponent) provides send_to_output() and receive_from_in
         
         return repaired_code
     
+    @profiled("validate.component_code", VALIDATION)
     def _validate_generated_code(self, code: str, component_type: str, class_name: str) -> None:
         """Validate generated code using extracted validator modules"""
         
@@ -1166,12 +1166,14 @@ def generate_system_from_description(description: str, output_dir: str = "./gene
     import asyncio
     from pathlib import Path
     from . import SystemGenerator
+    from autocoder_cc.observability.pipeline_profiler import STAGE, span
     
     print(f"🤖 Translating natural language to blueprint...")
     translator = NaturalLanguageToPydanticTranslator()
     
     # Generate blueprint YAML from natural language
-    blueprint_yaml = translator.generate_full_blueprint(description)
+    with span("translate_description", STAGE):
+        blueprint_yaml = translator.generate_full_blueprint(description)
     
     print(f"✅ Generated blueprint YAML")
     print(f"📝 Blueprint preview (first 200 chars):")
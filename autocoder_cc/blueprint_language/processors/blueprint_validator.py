@@ -139,6 +139,10 @@ class BlueprintValidator:
                 'policy': getattr(blueprint, 'policy', {})
             }
             
+            # Probe every component's external dependencies concurrently up front;
+            # the per-component checks below are then answered from the cache
+            component_registry.preflight_dependencies_sync(blueprint_dict['system']['components'])
+            
             # Validate all components can be created via registry
             for component_config in blueprint_dict['system']['components']:
                 try:
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Validation Result Cache - Content-addressed store for per-component verdicts
+
+Integration validation re-tests every component after each healing attempt,
+even when only one file changed. This store keys each component's verdict by
+the hash of its source file, the shared modules, the interface hashes of its
+direct upstream components and the validator version, so only components
+whose content or upstream contracts changed need to be re-tested. A body-only
+edit revalidates just the edited component; an interface edit also
+revalidates its direct consumers.
+"""
+import ast
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from autocoder_cc.observability import get_logger
+
+# Modules every generated component implicitly depends on
+SHARED_MODULES = ("communication.py", "observability.py", "__init__.py")
+
+
+@dataclass(frozen=True)
+class ComponentFingerprint:
+    """Identity of a component's validation inputs"""
+    component_name: str
+    file_hash: str
+    dependency_hashes: Tuple[Tuple[str, str], ...]
+    validator_version: str
+
+    @property
+    def key(self) -> str:
+        """Stable cache key for this fingerprint"""
+        deps = ",".join(f"{name}={digest}" for name, digest in self.dependency_hashes)
+        raw = f"{self.component_name}|{self.file_hash}|{deps}|{self.validator_version}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SystemFingerprints:
+    """Fingerprints and direct upstream dependencies for every component in a directory"""
+    fingerprints: Dict[str, ComponentFingerprint] = field(default_factory=dict)
+    dependencies: Dict[str, Set[str]] = field(default_factory=dict)
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's bytes"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def interface_hash(source: str) -> str:
+    """
+    SHA-256 of a module's public interface: top-level classes with their bases
+    and method signatures, and top-level function signatures. Bodies are
+    ignored. Unparseable source hashes as a whole.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def signature(node: ast.AST) -> str:
+        return f"{node.name}({ast.dump(node.args)})"
+
+    parts: List[str] = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            parts.append(signature(node))
+        elif isinstance(node, ast.ClassDef):
+            methods = [
+                signature(item) for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ]
+            bases = ",".join(ast.dump(base) for base in node.bases)
+            parts.append(f"class {node.name}({bases}):{';'.join(methods)}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _referenced_names(source: str) -> Set[str]:
+    """Collect imported module names and string literals used by a component"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return set()
+
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.add(node.module.split(".")[0])
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            names.add(node.value)
+    return names
+
+
+def dependencies_from_bindings(bindings: Iterable[Any]) -> Dict[str, Set[str]]:
+    """
+    Upstream components of each component file stem, from blueprint bindings.
+
+    A target depends on the sources bound to it, since its handling is shaped
+    by what they send; a source does not depend on its targets.
+    """
+    edges: Dict[str, Set[str]] = {}
+    for binding in bindings:
+        source = binding.from_component.lower()
+        for target in binding.to_components:
+            target = target.lower()
+            if target != source:
+                edges.setdefault(target, set()).add(source)
+    return edges
+
+
+def fingerprint_components(components_dir: Path, validator_version: str,
+                           bindings: Optional[Dict[str, Set[str]]] = None) -> SystemFingerprints:
+    """
+    Fingerprint every component module in a generated components directory.
+
+    A component depends on the shared modules, its upstream components in the
+    blueprint (`bindings`, see `dependencies_from_bindings`) and any sibling
+    component it imports or addresses by name in its source. Only direct
+    dependencies count, and only through their interface hash.
+    """
+    components_dir = Path(components_dir)
+    shared = tuple(
+        (name, hash_file(components_dir / name))
+        for name in SHARED_MODULES
+        if (components_dir / name).exists()
+    )
+
+    component_files = {
+        f.stem: f for f in sorted(components_dir.glob("*.py"))
+        if f.name not in SHARED_MODULES
+    }
+    file_hashes = {stem: hash_file(path) for stem, path in component_files.items()}
+    sources = {
+        stem: path.read_text(encoding="utf-8", errors="replace") for stem, path in component_files.items()
+    }
+    interface_hashes = {stem: interface_hash(source) for stem, source in sources.items()}
+
+    result = SystemFingerprints()
+    for stem in component_files:
+        referenced = _referenced_names(sources[stem])
+        deps = {other for other in component_files if other != stem and other in referenced}
+        if bindings:
+            deps |= {other for other in bindings.get(stem, ()) if other in component_files}
+        result.dependencies[stem] = deps
+
+    for stem in component_files:
+        upstream = sorted(result.dependencies[stem])
+        dependency_hashes = shared + tuple((name, interface_hashes[name]) for name in upstream)
+        result.fingerprints[stem] = ComponentFingerprint(
+            component_name=stem,
+            file_hash=file_hashes[stem],
+            dependency_hashes=dependency_hashes,
+            validator_version=validator_version,
+        )
+    return result
+
+
+class ValidationResultCache:
+    """
+    Store of per-component validation verdicts keyed by content fingerprint.
+
+    Verdicts are held in memory and optionally persisted as JSON so that
+    repeated runs over the same directory can reuse them.
+    """
+
+    def __init__(self, persist_path: Optional[Path] = None):
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.logger = get_logger("ValidationResultCache")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def get(self, fingerprint: ComponentFingerprint) -> Optional[Dict[str, Any]]:
+        """Return the cached verdict for a fingerprint, if any"""
+        entry = self._entries.get(fingerprint.key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, fingerprint: ComponentFingerprint, verdict: Dict[str, Any]) -> None:
+        """Record the verdict for a fingerprint"""
+        self._entries[fingerprint.key] = verdict
+
+    def partition(self, fingerprints: SystemFingerprints) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Split components into (cached verdicts by name, names needing revalidation)"""
+        cached: Dict[str, Dict[str, Any]] = {}
+        stale: List[str] = []
+        for name, fingerprint in fingerprints.fingerprints.items():
+            verdict = self.get(fingerprint)
+            if verdict is None:
+                stale.append(name)
+            else:
+                cached[name] = verdict
+        return cached, stale
+
+    def clear(self) -> None:
+        """Drop all cached verdicts"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self) -> None:
+        """Persist cached verdicts if a persist path is configured"""
+        if not self.persist_path:
+            return
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            self.persist_path.write_text(json.dumps(self._entries, default=str))
+        except OSError as e:
+            self.logger.warning(f"Could not persist validation cache to {self.persist_path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _load(self) -> None:
+        if not self.persist_path or not self.persist_path.exists():
+            return
+        try:
+            self._entries = json.loads(self.persist_path.read_text())
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable validation cache {self.persist_path}: {e}")
+            self._entries = {}
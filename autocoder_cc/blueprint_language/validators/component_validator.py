@@ -165,6 +165,11 @@ class Level2ComponentValidator:
             
             # Validate component can be created with current configuration
             try:
+                # Probe dependencies on this loop so creation reads them from the cache
+                await self.component_registry.preflight_dependencies([
+                    {'name': f"test_{component_name}", 'config': component_config}
+                ])
+                
                 # Test component creation (will be cleaned up)
                 test_component = self.component_registry.create_component(
                     component_type=component_type,
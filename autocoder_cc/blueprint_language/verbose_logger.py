@@ -16,6 +16,7 @@ from datetime import datetime
 from dataclasses import dataclass, asdict
 import traceback
 from autocoder_cc.observability.structured_logging import get_logger
+from autocoder_cc.observability.pipeline_profiler import begin_span, end_span
 
 
 @dataclass
@@ -456,12 +457,15 @@ class GenerationStepContext:
         self.step_name = step_name
         self.details = details
         self.step = None
+        self.span = None
     
     def __enter__(self):
         self.step = self.logger.start_step(self.step_id, self.step_name, **self.details)
+        self.span = begin_span(self.step_id)
         return self.step
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        end_span(self.span, exc_val)
         if exc_type is None:
             self.logger.complete_step(self.step_id)
         else:
@@ -1,19 +1,49 @@
 """Checkpoint manager for saving/restoring component state."""
 import json
+import os
 import pickle
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Hashable
 from datetime import datetime
+
+import anyio
+import anyio.to_thread
+
+from autocoder_cc.checkpoint.state import StateDelta, resolve_value
 from autocoder_cc.observability import get_logger
 
+# Entries per pickled record; bounds how long serialization holds the GIL at a time
+CHUNK_SIZE = 512
+MANIFEST = "manifest.json"
+BASE_FILE = "base.ckpt"
+CHANNELS_PREFIX = "channels-"
+
+
 class CheckpointManager:
-    """Manages checkpoints for components."""
-    
-    def __init__(self, checkpoint_dir: Path = Path("checkpoints")):
+    """Manages checkpoints for components.
+
+    Besides whole-state snapshots (`save_checkpoint`), components can be
+    checkpointed incrementally: each epoch writes only the changed keys of
+    each named state as a delta file, and deltas are periodically compacted
+    into a base file. Per component the layout is::
+
+        <checkpoint_dir>/<component>/base.ckpt
+        <checkpoint_dir>/<component>/delta-<epoch>.ckpt
+        <checkpoint_dir>/<component>/manifest.json
+
+    Items queued on the harness connections at an epoch's cut are written
+    alongside, to `<checkpoint_dir>/channels-<epoch>.ckpt`.
+
+    All file I/O and serialization for incremental checkpoints runs in a
+    worker thread, in small chunks, so the event loop keeps running.
+    """
+
+    def __init__(self, checkpoint_dir: Path = Path("checkpoints"), compact_every: int = 10):
         self.logger = get_logger("CheckpointManager")
-        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_dir = Path(checkpoint_dir)
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
-        
+        self.compact_every = compact_every
+
     def save_checkpoint(self, component_name: str, state: Dict[str, Any], 
                        metadata: Optional[Dict] = None) -> Path:
         """Save component state to checkpoint."""
@@ -33,6 +63,11 @@ class CheckpointManager:
         self.logger.info(f"Saved checkpoint: {checkpoint_file}")
         return checkpoint_file
     
+    async def save_checkpoint_async(self, component_name: str, state: Dict[str, Any],
+                                    metadata: Optional[Dict] = None) -> Path:
+        """Save a whole-state checkpoint from a worker thread."""
+        return await anyio.to_thread.run_sync(self.save_checkpoint, component_name, state, metadata)
+
     def load_checkpoint(self, checkpoint_file: Path) -> Dict[str, Any]:
         """Load checkpoint from file."""
         with open(checkpoint_file, 'rb') as f:
@@ -66,4 +101,215 @@ class CheckpointManager:
         if len(checkpoints) > keep:
             for checkpoint in checkpoints[:-keep]:
                 checkpoint.unlink()
-                self.logger.info(f"Removed old checkpoint: {checkpoint}")
\ No newline at end of file
+                self.logger.info(f"Removed old checkpoint: {checkpoint}")
+
+    # Incremental checkpoints
+
+    def component_dir(self, component_name: str) -> Path:
+        return self.checkpoint_dir / component_name
+
+    async def write_delta(self, component_name: str, epoch: int,
+                          deltas: Dict[str, StateDelta], metadata: Optional[Dict] = None) -> Path:
+        """Persist one epoch's state deltas for a component."""
+        return await anyio.to_thread.run_sync(self._write_delta_sync, component_name, epoch, deltas, metadata)
+
+    def _write_delta_sync(self, component_name: str, epoch: int,
+                          deltas: Dict[str, StateDelta], metadata: Optional[Dict]) -> Path:
+        directory = self.component_dir(component_name)
+        directory.mkdir(parents=True, exist_ok=True)
+        delta_file = directory / f"delta-{epoch:010d}.ckpt"
+        _write_records(delta_file, _delta_records(deltas, epoch, metadata))
+
+        manifest = self._read_manifest(directory)
+        # A retried epoch that never committed rewrites the same file
+        if delta_file.name not in manifest["deltas"]:
+            manifest["deltas"].append(delta_file.name)
+        manifest["epoch"] = epoch
+        manifest["metadata"] = metadata or {}
+        self._write_manifest(directory, manifest)
+        return delta_file
+
+    async def compact(self, component_name: str, force: bool = False) -> bool:
+        """Fold a component's deltas into its base file once `compact_every` have accumulated."""
+        manifest = self._read_manifest(self.component_dir(component_name))
+        if not manifest["deltas"] or (not force and len(manifest["deltas"]) < self.compact_every):
+            return False
+        await anyio.to_thread.run_sync(self._compact_sync, component_name)
+        return True
+
+    def _compact_sync(self, component_name: str) -> None:
+        directory = self.component_dir(component_name)
+        manifest = self._read_manifest(directory)
+        if not manifest["deltas"]:
+            return
+        state = self._load_state_sync(component_name)
+        base_deltas = {name: StateDelta.full(values) for name, values in state.items()}
+        _write_records(directory / BASE_FILE, _delta_records(base_deltas, manifest["epoch"], manifest["metadata"]))
+
+        compacted = manifest["deltas"]
+        manifest["deltas"] = []
+        manifest["base_epoch"] = manifest["epoch"]
+        self._write_manifest(directory, manifest)
+        for name in compacted:
+            try:
+                (directory / name).unlink()
+            except OSError:
+                pass
+        self.logger.info(f"Compacted {len(compacted)} checkpoint deltas for {component_name}")
+
+    async def load_state(self, component_name: str,
+                         max_epoch: Optional[int] = None) -> Dict[str, Dict[Hashable, Any]]:
+        """Rebuild a component's named states from its base and deltas."""
+        return await anyio.to_thread.run_sync(self._load_state_sync, component_name, max_epoch)
+
+    def _load_state_sync(self, component_name: str,
+                         max_epoch: Optional[int] = None) -> Dict[str, Dict[Hashable, Any]]:
+        directory = self.component_dir(component_name)
+        manifest = self._read_manifest(directory)
+        state: Dict[str, Dict[Hashable, Any]] = {}
+        files = ([directory / BASE_FILE] if (directory / BASE_FILE).exists() else [])
+        files += [directory / name for name in manifest["deltas"]]
+        for path in files:
+            file_epoch = _read_into(path, state, max_epoch)
+            if file_epoch is None:
+                break  # Incomplete write or past the requested epoch; later deltas build on it
+        return state
+
+    async def discard_after(self, component_name: str, epoch: int) -> None:
+        """Drop deltas newer than `epoch` (written but never committed)."""
+        await anyio.to_thread.run_sync(self._discard_after_sync, component_name, epoch)
+
+    def _discard_after_sync(self, component_name: str, epoch: int) -> None:
+        directory = self.component_dir(component_name)
+        manifest = self._read_manifest(directory)
+        keep = [name for name in manifest["deltas"] if _delta_epoch(name) <= epoch]
+        if len(keep) == len(manifest["deltas"]):
+            return
+        for name in set(manifest["deltas"]) - set(keep):
+            try:
+                (directory / name).unlink()
+            except OSError:
+                pass
+        manifest["deltas"] = keep
+        manifest["epoch"] = min(manifest["epoch"], epoch)
+        self._write_manifest(directory, manifest)
+
+    # In-flight connection items, one file per epoch
+
+    def channels_file(self, epoch: int) -> Path:
+        return self.checkpoint_dir / f"{CHANNELS_PREFIX}{epoch:010d}.ckpt"
+
+    async def write_channels(self, epoch: int, channels: Dict[str, List[Any]]) -> Path:
+        """Persist the items queued on each connection at an epoch's cut."""
+        path = self.channels_file(epoch)
+        await anyio.to_thread.run_sync(_write_records, path, _channel_records(channels, epoch))
+        return path
+
+    async def load_channels(self, epoch: int) -> Dict[str, List[Any]]:
+        """Queued items per connection recorded for `epoch` (empty if none were)."""
+        return await anyio.to_thread.run_sync(_read_channels, self.channels_file(epoch), epoch)
+
+    async def discard_channels(self, keep_epoch: int) -> None:
+        """Remove the channel files of every epoch but `keep_epoch`."""
+        await anyio.to_thread.run_sync(self._discard_channels_sync, keep_epoch)
+
+    def _discard_channels_sync(self, keep_epoch: int) -> None:
+        keep = self.channels_file(keep_epoch).name
+        for path in self.checkpoint_dir.glob(f"{CHANNELS_PREFIX}*.ckpt"):
+            if path.name != keep:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get_incremental_metadata(self, component_name: str) -> Dict[str, Any]:
+        """Manifest of a component's incremental checkpoints."""
+        return self._read_manifest(self.component_dir(component_name))
+
+    def _read_manifest(self, directory: Path) -> Dict[str, Any]:
+        path = directory / MANIFEST
+        if path.exists():
+            return json.loads(path.read_text())
+        return {"epoch": 0, "base_epoch": 0, "deltas": [], "metadata": {}}
+
+    def _write_manifest(self, directory: Path, manifest: Dict[str, Any]) -> None:
+        atomic_write_bytes(directory / MANIFEST, json.dumps(manifest, default=str).encode("utf-8"))
+
+
+def _delta_epoch(file_name: str) -> int:
+    return int(file_name[len("delta-"):-len(".ckpt")])
+
+
+def _delta_records(deltas: Dict[str, StateDelta], epoch: int, metadata: Optional[Dict]):
+    for name, delta in deltas.items():
+        yield ("state", name, delta.cleared, list(delta.deleted))
+        items = list(delta.changes.items())
+        for start in range(0, len(items), CHUNK_SIZE):
+            yield ("changes", name, [(key, resolve_value(value)) for key, value in items[start:start + CHUNK_SIZE]])
+    yield ("end", epoch, metadata or {})
+
+
+def _channel_records(channels: Dict[str, List[Any]], epoch: int):
+    for name, items in channels.items():
+        for start in range(0, len(items), CHUNK_SIZE):
+            yield ("channel", name, items[start:start + CHUNK_SIZE])
+    yield ("end", epoch, {})
+
+
+def _read_channels(path: Path, epoch: int) -> Dict[str, List[Any]]:
+    channels: Dict[str, List[Any]] = {}
+    try:
+        with open(path, "rb") as f:
+            while True:
+                record = pickle.load(f)
+                if record[0] == "channel":
+                    channels.setdefault(record[1], []).extend(record[2])
+                elif record[0] == "end":
+                    return channels if record[1] == epoch else {}
+    except (EOFError, OSError, pickle.UnpicklingError):
+        return {}
+
+
+def _write_records(path: Path, records) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        for record in records:
+            # One record per dump keeps each GIL-holding pickle call short
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_into(path: Path, state: Dict[str, Dict[Hashable, Any]], max_epoch: Optional[int]) -> Optional[int]:
+    """Apply a checkpoint file to `state`; return its epoch, or None if skipped/incomplete."""
+    pending: Dict[str, StateDelta] = {}
+    try:
+        with open(path, "rb") as f:
+            while True:
+                record = pickle.load(f)
+                kind = record[0]
+                if kind == "state":
+                    _, name, cleared, deleted = record
+                    pending[name] = StateDelta(deleted=set(deleted), cleared=cleared)
+                elif kind == "changes":
+                    _, name, items = record
+                    pending[name].changes.update(items)
+                elif kind == "end":
+                    epoch = record[1]
+                    if max_epoch is not None and epoch > max_epoch:
+                        return None
+                    for name, delta in pending.items():
+                        delta.apply_to(state.setdefault(name, {}))
+                    return epoch
+    except (EOFError, OSError, pickle.UnpicklingError):
+        return None
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,196 @@
+"""Change-tracked state containers for incremental checkpoints."""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+
+@dataclass
+class StateDelta:
+    """Changes to one named key-value state since the previous checkpoint.
+
+    `cleared` means the state was emptied before `changes` were applied.
+    """
+    changes: Dict[Hashable, Any] = field(default_factory=dict)
+    deleted: Set[Hashable] = field(default_factory=set)
+    cleared: bool = False
+
+    @classmethod
+    def full(cls, values: Dict[Hashable, Any]) -> 'StateDelta':
+        """Delta that replaces the whole state (for small state captured each time)"""
+        return cls(changes=dict(values), cleared=True)
+
+    def is_empty(self) -> bool:
+        return not (self.changes or self.deleted or self.cleared)
+
+    def merge(self, newer: 'StateDelta') -> 'StateDelta':
+        """Combine this delta with a later one into a single equivalent delta"""
+        if newer.cleared:
+            return newer
+        changes = {k: v for k, v in self.changes.items() if k not in newer.deleted}
+        changes.update(newer.changes)
+        deleted = (self.deleted - set(newer.changes)) | newer.deleted
+        return StateDelta(changes=changes, deleted=deleted, cleared=self.cleared)
+
+    def apply_to(self, target: Dict[Hashable, Any]) -> None:
+        """Apply this delta to a plain dict"""
+        if self.cleared:
+            target.clear()
+        for key in self.deleted:
+            target.pop(key, None)
+        target.update(self.changes)
+
+
+class LazyValue:
+    """Value read when the checkpoint is written rather than when it is captured.
+
+    Only suitable for state that changes monotonically (such as Bloom filter
+    bits), where persisting a slightly newer value is harmless. It avoids
+    copying large buffers on the event loop.
+    """
+    __slots__ = ("_read",)
+
+    def __init__(self, read: Callable[[], Any]):
+        self._read = read
+
+    def resolve(self) -> Any:
+        return self._read()
+
+
+def resolve_value(value: Any) -> Any:
+    """Materialize a LazyValue; other values pass through"""
+    return value.resolve() if isinstance(value, LazyValue) else value
+
+
+class TrackedDict(dict):
+    """dict that records which keys changed since the last checkpoint capture.
+
+    Values mutated in place (e.g. a list stored under a key) must be flagged
+    with `mark_dirty(key)` *before* the mutation so the change is captured
+    and any in-progress capture keeps the pre-mutation value.
+    `copy_value` detaches mutable values from the live state when captured.
+    """
+
+    def __init__(self, *args, copy_value: Optional[Callable[[Any], Any]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._copy_value = copy_value
+        self._dirty: Set[Hashable] = set(self.keys())
+        self._deleted: Set[Hashable] = set()
+        self._cleared = False
+        self._capture: Optional['PendingDelta'] = None
+
+    def _preserve(self, key: Hashable) -> None:
+        # Copy-on-write: keep the value as of the capture point before it changes
+        capture = self._capture
+        if capture is not None and key in capture.pending:
+            capture.pending.discard(key)
+            capture.changes[key] = self._copy(dict.__getitem__(self, key))
+
+    def _copy(self, value: Any) -> Any:
+        return self._copy_value(value) if self._copy_value is not None else value
+
+    def __setitem__(self, key, value):
+        self._preserve(key)
+        super().__setitem__(key, value)
+        self._dirty.add(key)
+
+    def __delitem__(self, key):
+        self._preserve(key)
+        super().__delitem__(key)
+        self._dirty.discard(key)
+        self._deleted.add(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self._preserve(key)
+            self._dirty.discard(key)
+            self._deleted.add(key)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key = next(reversed(self.keys()))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        if self._capture is not None:
+            for key in list(self._capture.pending):
+                self._preserve(key)
+        super().clear()
+        self._dirty.clear()
+        self._deleted.clear()
+        self._cleared = True
+
+    def mark_dirty(self, key: Hashable) -> None:
+        """Flag a key whose value is about to be mutated in place"""
+        if key in self:
+            self._preserve(key)
+            self._dirty.add(key)
+
+    def begin_delta(self) -> 'PendingDelta':
+        """Mark the capture point and reset change tracking in O(1).
+
+        Values are copied afterwards by `PendingDelta.collect`, a chunk at a
+        time, while writes to not-yet-copied keys preserve their old values.
+        """
+        if self._capture is not None:
+            self._capture.collect_now()
+        capture = PendingDelta(self, self._dirty, self._deleted, self._cleared)
+        self._dirty = set()
+        self._deleted = set()
+        self._cleared = False
+        self._capture = capture
+        return capture
+
+    def take_delta(self) -> StateDelta:
+        """Capture and copy changes since the previous capture in one step"""
+        return self.begin_delta().collect_now()
+
+
+class PendingDelta:
+    """Delta captured from a TrackedDict whose values are still being copied"""
+
+    def __init__(self, owner: TrackedDict, keys: Set[Hashable], deleted: Set[Hashable], cleared: bool):
+        self._owner = owner
+        self.pending = keys
+        self.changes: Dict[Hashable, Any] = {}
+        self.deleted = deleted
+        self.cleared = cleared
+
+    def _copy_chunk(self, limit: int) -> None:
+        owner = self._owner
+        changes = self.changes
+        pending = self.pending
+        for _ in range(min(limit, len(pending))):
+            key = pending.pop()
+            if key in owner:
+                changes[key] = owner._copy(dict.__getitem__(owner, key))
+
+    def _finish(self) -> StateDelta:
+        if self._owner._capture is self:
+            self._owner._capture = None
+        return StateDelta(changes=self.changes, deleted=self.deleted, cleared=self.cleared)
+
+    def discard(self) -> None:
+        """Abandon the capture without copying anything"""
+        self.pending = set()
+        self._finish()
+
+    def collect_now(self) -> StateDelta:
+        self._copy_chunk(len(self.pending))
+        return self._finish()
+
+    async def collect(self, chunk_size: int = 256) -> StateDelta:
+        """Copy captured values in chunks, yielding to the event loop between chunks"""
+        import anyio
+
+        while self.pending:
+            self._copy_chunk(chunk_size)
+            await anyio.sleep(0)
+        return self._finish()
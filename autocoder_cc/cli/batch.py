@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Batch System Generation - many systems, one warm process
+
+Generates a set of systems concurrently while sharing the expensive,
+reusable state: the LLM provider pool, prompt templates, the component
+generator and the validation result cache. Each system gets its own
+integration validation gate and output directory, and a summary report is
+written at the end.
+
+Input is either a directory (``*.yaml``/``*.yml`` blueprints and
+``*.txt``/``*.md`` descriptions) or a JSONL file whose lines contain an
+optional ``id`` plus one of ``description``, ``blueprint`` (YAML text) or
+``blueprint_path``.
+"""
+import json
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import anyio
+import anyio.to_thread
+import click
+
+from autocoder_cc.observability import get_logger
+
+logger = get_logger(__name__)
+
+BLUEPRINT_SUFFIXES = {".yaml", ".yml"}
+DESCRIPTION_SUFFIXES = {".txt", ".md"}
+
+
+@dataclass
+class BatchItem:
+    """One system to generate"""
+    item_id: str
+    description: Optional[str] = None
+    blueprint_yaml: Optional[str] = None
+    source: Optional[str] = None
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of generating one batch item"""
+    item_id: str
+    success: bool
+    system_name: Optional[str] = None
+    output_directory: Optional[str] = None
+    failure_stage: Optional[str] = None
+    error: Optional[str] = None
+    blueprint_seconds: float = 0.0
+    generation_seconds: float = 0.0
+    healing_attempts: int = 0
+
+
+@dataclass
+class BatchReport:
+    """Summary of a batch run"""
+    started_at: str
+    total: int
+    succeeded: int
+    failed: int
+    wall_seconds: float
+    concurrency: int
+    results: List[BatchItemResult] = field(default_factory=list)
+
+
+def _slugify(value: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_-]+", "_", value).strip("_")[:64] or "system"
+
+
+def load_batch_items(source: Path) -> List[BatchItem]:
+    """Read batch items from a directory or a JSONL file"""
+    source = Path(source)
+    items: List[BatchItem] = []
+
+    if source.is_dir():
+        for path in sorted(source.iterdir()):
+            if path.suffix in BLUEPRINT_SUFFIXES:
+                items.append(BatchItem(_slugify(path.stem), blueprint_yaml=path.read_text(), source=str(path)))
+            elif path.suffix in DESCRIPTION_SUFFIXES:
+                items.append(BatchItem(_slugify(path.stem), description=path.read_text().strip(), source=str(path)))
+    else:
+        items.extend(_load_jsonl_items(source))
+
+    ids = [item.item_id for item in items]
+    duplicates = {item_id for item_id in ids if ids.count(item_id) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate batch item ids: {sorted(duplicates)}")
+    return items
+
+
+def _load_jsonl_items(source: Path) -> List[BatchItem]:
+    items: List[BatchItem] = []
+    with open(source, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            item_id = _slugify(str(record.get("id", f"system_{line_number:04d}")))
+            blueprint_yaml = record.get("blueprint")
+            if record.get("blueprint_path"):
+                blueprint_path = Path(record["blueprint_path"])
+                if not blueprint_path.is_absolute():
+                    blueprint_path = source.parent / blueprint_path
+                blueprint_yaml = blueprint_path.read_text()
+            if not blueprint_yaml and not record.get("description"):
+                raise ValueError(
+                    f"{source}:{line_number}: expected 'description', 'blueprint' or 'blueprint_path'"
+                )
+            items.append(BatchItem(
+                item_id,
+                description=record.get("description"),
+                blueprint_yaml=blueprint_yaml,
+                source=f"{source}:{line_number}",
+            ))
+    return items
+
+
+class SharedGenerationContext:
+    """Warm state built once per process and shared by every system in a batch"""
+
+    def __init__(self):
+        from autocoder_cc.blueprint_language.llm_component_generator import LLMComponentGenerator
+        from autocoder_cc.blueprint_language.natural_language_to_blueprint import NaturalLanguageToPydanticTranslator
+        from autocoder_cc.blueprint_language.prompt_loader import get_prompt_loader
+        from autocoder_cc.blueprint_language.validation_result_cache import ValidationResultCache
+
+        start = time.time()
+        self.component_generator = LLMComponentGenerator()
+        # Reuse the generator's provider so translation and generation share one pool
+        self.translator = NaturalLanguageToPydanticTranslator(
+            llm_provider=self.component_generator.llm_provider
+        )
+        # Verdicts are keyed by component content, so they are safe to reuse across systems
+        self.validation_cache = ValidationResultCache()
+        self.prompt_loader = get_prompt_loader()
+        logger.info(f"Shared generation context ready in {time.time() - start:.2f}s")
+
+    def create_generator(self, output_dir: Path, max_healing_attempts: int = 3, strict_validation: bool = True):
+        """Per-system generator wired to the shared warm state"""
+        from autocoder_cc.blueprint_language.healing_integration import HealingIntegratedGenerator
+        from autocoder_cc.blueprint_language.integration_validation_gate import IntegrationValidationGate
+
+        return HealingIntegratedGenerator(
+            output_dir=output_dir,
+            max_healing_attempts=max_healing_attempts,
+            strict_validation=strict_validation,
+            enable_metrics=True,
+            component_generator=self.component_generator,
+            # The gate tracks per-system state (bindings, process-isolated components)
+            validation_gate=IntegrationValidationGate(result_cache=self.validation_cache),
+        )
+
+
+class BatchGenerator:
+    """Generates many systems concurrently in one process"""
+
+    def __init__(self, output_root: Path, concurrency: int = 4,
+                 context: Optional[SharedGenerationContext] = None,
+                 max_healing_attempts: int = 3, strict_validation: bool = True):
+        self.output_root = Path(output_root)
+        self.concurrency = concurrency
+        self.context = context or SharedGenerationContext()
+        self.max_healing_attempts = max_healing_attempts
+        self.strict_validation = strict_validation
+
+    async def run(self, items: List[BatchItem]) -> BatchReport:
+        """Generate every item and write ``batch_report.json`` under the output root"""
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        started_at = datetime.now().isoformat()
+        start = time.time()
+
+        results: Dict[str, BatchItemResult] = {}
+        limiter = anyio.CapacityLimiter(self.concurrency)
+
+        async def worker(item: BatchItem) -> None:
+            async with limiter:
+                results[item.item_id] = await self._generate_item(item)
+                status = "✅" if results[item.item_id].success else "❌"
+                logger.info(f"{status} Batch item {item.item_id} finished ({len(results)}/{len(items)})")
+
+        async with anyio.create_task_group() as tg:
+            for item in items:
+                tg.start_soon(worker, item)
+
+        ordered = [results[item.item_id] for item in items]
+        succeeded = sum(1 for r in ordered if r.success)
+        report = BatchReport(
+            started_at=started_at,
+            total=len(ordered),
+            succeeded=succeeded,
+            failed=len(ordered) - succeeded,
+            wall_seconds=time.time() - start,
+            concurrency=self.concurrency,
+            results=ordered,
+        )
+        report_path = self.output_root / "batch_report.json"
+        report_path.write_text(json.dumps(asdict(report), indent=2))
+        logger.info(f"Batch report written to {report_path}")
+        return report
+
+    async def _generate_item(self, item: BatchItem) -> BatchItemResult:
+        result = BatchItemResult(item_id=item.item_id, success=False)
+        stage = "blueprint"
+        try:
+            blueprint_yaml = item.blueprint_yaml
+            if not blueprint_yaml:
+                start = time.time()
+                # Translation is synchronous; keep it off the event loop
+                blueprint_yaml = await anyio.to_thread.run_sync(
+                    self.context.translator.generate_full_blueprint, item.description
+                )
+                result.blueprint_seconds = time.time() - start
+
+            item_dir = self.output_root / item.item_id
+            item_dir.mkdir(parents=True, exist_ok=True)
+            (item_dir / "blueprint.yaml").write_text(blueprint_yaml)
+
+            stage = "generation"
+            start = time.time()
+            generator = self.context.create_generator(
+                item_dir, self.max_healing_attempts, self.strict_validation
+            )
+            pipeline_result = await generator.generate_system_with_healing(blueprint_yaml)
+            result.generation_seconds = time.time() - start
+
+            result.success = pipeline_result.success
+            result.system_name = pipeline_result.system_name
+            result.healing_attempts = pipeline_result.healing_attempts
+            result.output_directory = str(pipeline_result.output_directory) if pipeline_result.output_directory else None
+            result.failure_stage = pipeline_result.failure_stage
+            result.error = pipeline_result.error_message
+        except Exception as e:
+            result.failure_stage = stage
+            result.error = str(e)
+            logger.error(f"Batch item {item.item_id} failed: {e}")
+        return result
+
+
+async def run_batch(source: Path, output_root: Path, concurrency: int = 4,
+                    max_healing_attempts: int = 3, strict_validation: bool = True) -> BatchReport:
+    """Load items from `source` and generate them into `output_root`"""
+    items = load_batch_items(source)
+    logger.info(f"Loaded {len(items)} batch items from {source}")
+    generator = BatchGenerator(
+        output_root, concurrency=concurrency,
+        max_healing_attempts=max_healing_attempts, strict_validation=strict_validation
+    )
+    return await generator.run(items)
+
+
+@click.command()
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--output', '-o', default='./generated_systems/batch', help='Root output directory')
+@click.option('--concurrency', '-j', default=4, show_default=True, help='Systems generated in parallel')
+@click.option('--max-healing-attempts', default=3, show_default=True, help='Healing attempts per system')
+def batch(source: str, output: str, concurrency: int, max_healing_attempts: int):
+    """Generate many systems from a directory or JSONL file in one process."""
+    from autocoder_cc.generate_deployed_system import check_llm_availability
+
+    # Same fail-hard LLM preflight as single-system generation
+    check_llm_availability()
+    click.echo(f"Batch generating from: {source}")
+    click.echo(f"Output root: {output} (concurrency {concurrency})")
+
+    report = anyio.run(run_batch, Path(source), Path(output), concurrency, max_healing_attempts)
+
+    click.echo(f"✅ {report.succeeded}/{report.total} systems generated in {report.wall_seconds:.1f}s")
+    for item in report.results:
+        if not item.success:
+            click.echo(f"❌ {item.item_id}: [{item.failure_stage}] {item.error}")
+    click.echo(f"📄 Report: {Path(output) / 'batch_report.json'}")
+    if report.failed:
+        raise SystemExit(1)
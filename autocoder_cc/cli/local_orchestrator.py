@@ -140,8 +140,8 @@ class LocalOrchestratorCLI:
             if self.debug_mode:
                 self._log_debug("Debug mode: Component creation will pause for inspection")
             
-            # Use ComponentRegistry to create all components
-            self.components = component_registry.create_system_components(blueprint_data)
+            # Use ComponentRegistry to create all components; dependencies are probed on this loop
+            self.components = await component_registry.create_system_components_async(blueprint_data)
             
             # Log each component creation
             for comp_name, component in self.components.items():
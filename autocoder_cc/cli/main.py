@@ -3,11 +3,34 @@
 Autocoder CLI - Enterprise Roadmap v3 Main Command Interface
 """
 import click
+import importlib
 from pathlib import Path
-from .local_orchestrator import run_local
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """Command group whose heavier subcommands are imported only when invoked"""
+    
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # command name -> "module:attribute"
+        self.lazy_subcommands = lazy_subcommands or {}
+    
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+    
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+            return getattr(importlib.import_module(module_name), attribute)
+        return super().get_command(ctx, cmd_name)
+
+
+# Subcommands whose modules pull in the harness, watchdog or the generation stack
+@click.group(cls=LazyGroup, lazy_subcommands={
+    "run-local": "autocoder_cc.cli.local_orchestrator:run_local",
+    "batch": "autocoder_cc.cli.batch:batch",
+    "startup-profile": "autocoder_cc.cli.startup_profile:startup_profile",
+})
 @click.version_option(version="5.2.0", prog_name="autocoder")
 def cli():
     """
@@ -25,15 +48,14 @@ def cli():
     pass
 
 
-# Add subcommands
-cli.add_command(run_local, name="run-local")
-
-
 @cli.command()
 @click.argument('description')
 @click.option('--output', '-o', default='./generated_system', help='Output directory')
 @click.option('--deploy', is_flag=True, help='Generate deployment artifacts')
-def generate(description: str, output: str, deploy: bool):
+@click.option('--profile', 'profile_path', type=click.Path(dir_okay=False, path_type=Path),
+              help='Profile generation and write a Chrome trace (chrome://tracing, Perfetto) to this file')
+@click.option('--profile-top', default=20, show_default=True, help='Hotspots listed in the profile summary')
+def generate(description: str, output: str, deploy: bool, profile_path: Path, profile_top: int):
     """Generate a system from natural language description."""
     click.echo(f"Generating system: {description}")
     click.echo(f"Output directory: {output}")
@@ -41,6 +63,10 @@ def generate(description: str, output: str, deploy: bool):
     # Implementation would call the main generation pipeline
     from autocoder_cc.blueprint_language.natural_language_to_blueprint import generate_system_from_description
     
+    if profile_path:
+        from autocoder_cc.observability.pipeline_profiler import enable_profiling
+        enable_profiling()
+    
     try:
         # Generate the system
         # By default, skip deployment unless explicitly requested with --deploy
@@ -54,6 +80,13 @@ def generate(description: str, output: str, deploy: bool):
             
     except Exception as e:
         click.echo(f"❌ Generation failed: {e}")
+    finally:
+        if profile_path:
+            from autocoder_cc.observability.pipeline_profiler import disable_profiling
+            profiler = disable_profiling()
+            profiler.write(profile_path)
+            click.echo(f"\n{profiler.format_summary(profile_top)}")
+            click.echo(f"\nTrace: {profile_path} (folded stacks: {profile_path.with_suffix('.folded')})")
 
 
 @cli.command()
@@ -159,6 +192,39 @@ def migrate(target_version: str, list_versions: bool, current: bool, status: boo
         click.echo(f"❌ Migration failed: {e}")
 
 
+@cli.command('profile-resources')
+@click.argument('component_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--items', default=2000, show_default=True, help='Synthetic items sent to each component')
+@click.option('--rate', type=float, help='Offered load in items/s (default: as fast as accepted)')
+@click.option('--payload-bytes', default=256, show_default=True, help='Payload size of synthetic items')
+@click.option('--samples', type=click.Path(exists=True, dir_okay=False),
+              help='JSON Lines file of representative items to replay instead of synthetic ones')
+@click.option('--profiles-dir', help='Profile store (default: $AUTOCODER_RESOURCE_PROFILES_DIR or ~/.autocoder/resource_profiles)')
+def profile_resources(component_dir: str, items: int, rate: float, payload_bytes: int, samples: str, profiles_dir: str):
+    """Measure generated components under synthetic load and store resource profiles."""
+    import json
+    from autocoder_cc.resource_orchestrator.resource_profiling import profile_components
+
+    sample_items = None
+    if samples:
+        with open(samples) as f:
+            sample_items = [json.loads(line) for line in f if line.strip()]
+
+    profiles = profile_components(component_dir, items, rate, payload_bytes, profiles_dir, sample_items)
+    if not profiles:
+        click.echo(f"❌ No components profiled in {component_dir}")
+        return
+
+    for profile in profiles:
+        allocation = f"{profile.allocation_rate_mb_s} MB/s" if profile.allocation_rate_mb_s is not None else "n/a"
+        click.echo(
+            f"{profile.component_name} ({profile.component_type}) v{profile.version}: "
+            f"{profile.throughput_items_per_s} items/s, {profile.cpu_ms_per_item} ms CPU/item, "
+            f"{profile.cpu_percent}% CPU, {profile.memory_mb} MB, alloc {allocation}"
+        )
+    click.echo(f"✅ Stored {len(profiles)} profiles; ResourceEstimator uses them while the component code is unchanged")
+
+
 @cli.group()
 def vr1():
     """VR1 Boundary-Termination Validation commands."""
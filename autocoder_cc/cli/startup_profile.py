@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Startup Profile - where a generated system's cold start goes
+
+Imports a generated system's entry point in a fresh interpreter with
+``python -X importtime`` and turns the output into an import tree: which
+modules were loaded, by whom, and how long each took on its own (self) and
+including everything it imported (cumulative). Importing never runs the
+system itself as long as its entry point keeps the usual
+``if __name__ == "__main__":`` guard.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+
+
+@dataclass
+class ImportNode:
+    """One module import with its self and cumulative time in microseconds"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    children: List["ImportNode"] = field(default_factory=list)
+
+    def to_dict(self, min_us: int = 0) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "self_ms": round(self.self_us / 1000, 2),
+            "cumulative_ms": round(self.cumulative_us / 1000, 2),
+            "children": [child.to_dict(min_us) for child in self.children if child.cumulative_us >= min_us],
+        }
+
+
+def parse_importtime(output: str) -> List[ImportNode]:
+    """
+    Build the import tree from ``-X importtime`` output.
+
+    Lines come in completion order, so a module's imports are listed before
+    it, one indentation level deeper.
+    """
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        depth = (len(indent) - 1) // 2
+        node = ImportNode(module, int(self_us), int(cumulative_us), pending.pop(depth + 1, []))
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def _walk(nodes: List[ImportNode]):
+    for node in nodes:
+        yield node
+        yield from _walk(node.children)
+
+
+def resolve_targets(system_path: Path) -> Tuple[List[str], List[str]]:
+    """(sys.path entries, modules to import) for a generated system directory or file"""
+    if system_path.is_file():
+        return [str(system_path.parent)], [system_path.stem]
+    for entry in ("main.py", "app.py"):
+        if (system_path / entry).exists():
+            return [str(system_path)], [Path(entry).stem]
+    components = system_path / "components"
+    if components.is_dir():
+        modules = sorted(path.stem for path in components.glob("*.py") if not path.name.startswith("__"))
+        return [str(system_path), str(components)], modules
+    raise click.UsageError(f"No main.py, app.py or components/ found in {system_path}")
+
+
+def profile_imports(modules: List[str], paths: List[str] = (),
+                    env: Optional[Dict[str, str]] = None) -> Tuple[List[ImportNode], float]:
+    """Import `modules` in a fresh interpreter; returns the import tree and the wall time in ms"""
+    script = (
+        "import sys, time\n"
+        f"sys.path[:0] = {list(paths)!r}\n"
+        "started = time.perf_counter()\n"
+        f"for name in {modules!r}:\n"
+        "    __import__(name)\n"
+        "print('__wall_ms__', (time.perf_counter() - started) * 1000)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True, text=True, cwd=paths[0] if paths else None,
+        env={**os.environ, **(env or {})},
+    )
+    wall = re.search(r"^__wall_ms__ ([\d.]+)$", result.stdout, re.MULTILINE)
+    if result.returncode != 0 or wall is None:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise click.ClickException(f"Importing {', '.join(modules)} failed: {error}")
+    return parse_importtime(result.stderr), float(wall.group(1))
+
+
+def summarize(roots: List[ImportNode], wall_ms: float, top: int) -> Dict[str, Any]:
+    """Totals, the slowest modules by self time and self time per top-level package"""
+    nodes = list(_walk(roots))
+    packages: Dict[str, int] = {}
+    for node in nodes:
+        package = node.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + node.self_us
+    return {
+        "wall_ms": round(wall_ms, 1),
+        "modules_imported": len(nodes),
+        "import_ms": round(sum(root.cumulative_us for root in roots) / 1000, 1),
+        "slowest_modules": [
+            {"module": node.module, "self_ms": round(node.self_us / 1000, 2)}
+            for node in sorted(nodes, key=lambda n: -n.self_us)[:top]
+        ],
+        "by_package": [
+            {"package": package, "self_ms": round(us / 1000, 1)}
+            for package, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+    }
+
+
+def _echo_tree(nodes: List[ImportNode], min_us: int, max_depth: int, depth: int = 0) -> None:
+    for node in sorted(nodes, key=lambda n: -n.cumulative_us):
+        if node.cumulative_us < min_us:
+            continue
+        click.echo(f"{node.cumulative_us / 1000:9.1f} ms {node.self_us / 1000:8.1f} ms  {'  ' * depth}{node.module}")
+        if depth + 1 < max_depth:
+            _echo_tree(node.children, min_us, max_depth, depth + 1)
+
+
+@click.command()
+@click.argument('system_path', type=click.Path(exists=True, path_type=Path))
+@click.option('--module', '-m', 'modules', multiple=True,
+              help='Module(s) to import instead of the system entry point (e.g. autocoder_cc.components)')
+@click.option('--min-ms', default=5.0, show_default=True, help='Hide subtrees cheaper than this')
+@click.option('--depth', default=6, show_default=True, help='Maximum tree depth shown')
+@click.option('--top', default=15, show_default=True, help='Entries in the slowest-module tables')
+@click.option('--eager', is_flag=True, help='Profile with AUTOCODER_EAGER_IMPORTS=1 for comparison')
+@click.option('--json', 'as_json', is_flag=True, help='Print the full report as JSON')
+def startup_profile(system_path: Path, modules: Tuple[str, ...], min_ms: float, depth: int, top: int,
+                    eager: bool, as_json: bool):
+    """Report the import-time tree of a generated system's cold start."""
+    if modules:
+        paths, targets = [str(system_path if system_path.is_dir() else system_path.parent)], list(modules)
+    else:
+        paths, targets = resolve_targets(system_path)
+
+    roots, wall_ms = profile_imports(targets, paths, {"AUTOCODER_EAGER_IMPORTS": "1"} if eager else None)
+    summary = summarize(roots, wall_ms, top)
+    min_us = int(min_ms * 1000)
+
+    if as_json:
+        summary["tree"] = [root.to_dict(min_us) for root in roots if root.cumulative_us >= min_us]
+        click.echo(json.dumps(summary, indent=2))
+        return
+
+    click.echo(f"Imported {', '.join(targets)}: {summary['wall_ms']} ms wall, "
+               f"{summary['modules_imported']} modules")
+    click.echo(f"\n{'cumulative':>12} {'self':>11}  module")
+    _echo_tree(roots, min_us, depth)
+    click.echo("\nSlowest modules (self time):")
+    for entry in summary["slowest_modules"]:
+        click.echo(f"  {entry['self_ms']:8.1f} ms  {entry['module']}")
+    click.echo("\nBy top-level package (self time):")
+    for entry in summary["by_package"]:
+        click.echo(f"  {entry['self_ms']:8.1f} ms  {entry['package']}")
@@ -3,16 +3,22 @@
 Autocoder V5.2 System-First Architecture Components Package
 """
 # UnifiedComponent removed - use ComposedComponent instead
-from .api_endpoint import APIEndpoint
-from .model import Model
-from .store import Store
-from .v5_enhanced_store import V5EnhancedStore
-from .accumulator import Accumulator
-from .controller import Controller
-from .stream_processor import StreamProcessor
-from .fastapi_endpoint import FastAPIEndpoint
-from .message_bus import MessageBusSource
-from .composed_base import ComposedComponent
+# Exports are imported on first use, so a generated component importing
+# composed_base does not load FastAPI, database drivers or message buses
+from autocoder_cc.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'APIEndpoint': '.api_endpoint',
+    'Model': '.model',
+    'Store': '.store',
+    'V5EnhancedStore': '.v5_enhanced_store',
+    'Accumulator': '.accumulator',
+    'Controller': '.controller',
+    'StreamProcessor': '.stream_processor',
+    'FastAPIEndpoint': '.fastapi_endpoint',
+    'MessageBusSource': '.message_bus',
+    'ComposedComponent': '.composed_base',
+}, globals())
 # NO queue_source import - Enterprise Roadmap v2 forbids queue bridges
 
 __all__ = [
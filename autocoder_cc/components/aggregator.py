@@ -11,6 +11,7 @@ import time
 from typing import Dict, Any, List, Optional, Callable, Union
 from .composed_base import ComposedComponent
 from autocoder_cc.validation.config_requirement import ConfigRequirement, ConfigType
+from autocoder_cc.checkpoint.state import StateDelta
 
 
 class Aggregator(ComposedComponent):
@@ -345,9 +346,6 @@ class Aggregator(ComposedComponent):
                 if len(self.buffer) >= self.batch_size:
                     result = await self._flush_buffer_internal(reason="size")
                     
-                    # Record successful processing
-                    self.metrics_collector.record_items_processed()
-                    
                     self.structured_logger.debug(
                         f"Item processed and batch flushed due to size",
                         operation="item_processing",
@@ -372,15 +370,15 @@ class Aggregator(ComposedComponent):
                 return None  # No output yet, still buffering
         
         except Exception as e:
-            # Don't increment error count here if it was already incremented in aggregate_items
-            self.metrics_collector.record_error(e.__class__.__name__)
-            
-            self.structured_logger.error(
-                f"Item processing failed: {e}",
-                operation="item_processing",
-                error=e,
-                tags={"item": str(item)}
-            )
+            # The item itself is never rendered here; during an error storm the
+            # error handler aggregates failures instead of logging each one
+            if not self.error_handler.in_error_storm:
+                self.structured_logger.error(
+                    f"Item processing failed: {e}",
+                    operation="item_processing",
+                    error=e,
+                    tags={"item_type": type(item).__name__}
+                )
             
             # Re-raise to allow error handling upstream
             raise
@@ -418,6 +416,24 @@ class Aggregator(ComposedComponent):
             # Event loop might be closed
             pass
     
+    def checkpoint_delta(self) -> Dict[str, StateDelta]:
+        """Current batch; bounded by batch_size so it is captured whole"""
+        return {
+            "batch": StateDelta.full({
+                "buffer": list(self.buffer),
+                "batch_age_seconds": time.time() - self.last_flush_time,
+            }),
+            "stats": StateDelta.full(self.aggregation_stats),
+        }
+    
+    def restore_checkpoint(self, state: Dict[str, Dict[str, Any]]) -> None:
+        """Reload the in-progress batch from a checkpoint"""
+        batch = state.get("batch", {})
+        self.buffer = list(batch.get("buffer", []))
+        self.last_flush_time = time.time() - batch.get("batch_age_seconds", 0)
+        self.aggregation_stats.update(state.get("stats", {}))
+        self.aggregation_stats["items_in_current_batch"] = len(self.buffer)
+    
     def get_aggregation_stats(self) -> Dict[str, Any]:
         """Get aggregation statistics"""
         # Update current batch age
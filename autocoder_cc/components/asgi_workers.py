@@ -0,0 +1,283 @@
+"""
+Multi-process serving for FastAPIEndpoint.
+
+Worker processes accept HTTP connections on a shared SO_REUSEPORT socket
+(one listening socket per worker; the kernel balances connections) and
+forward each request over a local Unix socket to the harness process. There,
+`IPCDispatcher` runs the endpoint's ASGI app on the harness event loop, so
+request handlers keep direct access to harness components while HTTP
+parsing and connection handling scale across cores. The app's lifespan
+(startup/shutdown handlers) runs in the harness process too, around the
+dispatcher, and its state is passed to every forwarded request; each worker
+runs the lifespan of its own forwarding app.
+
+Requests and responses cross the IPC channel as length-prefixed marshal
+frames. Responses are buffered whole; streaming responses and WebSocket
+routes are not forwarded.
+"""
+import marshal
+import os
+import socket
+import struct
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import anyio
+from anyio.abc import ByteStream
+
+from autocoder_cc.observability import get_logger
+
+_LENGTH = struct.Struct("!I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+def supports_reuse_port() -> bool:
+    return hasattr(socket, "SO_REUSEPORT")
+
+
+def create_listen_socket(host: str, port: int, reuse_port: bool = False, backlog: int = 2048) -> socket.socket:
+    """Listening TCP socket for uvicorn's `sockets=` argument.
+
+    The protocol must be IPPROTO_TCP explicitly: asyncio only sets
+    TCP_NODELAY on accepted connections whose socket reports it, and without
+    it keep-alive responses stall on delayed ACKs (~40 ms per request).
+    Bind errors raise OSError rather than exiting like uvicorn's bind_socket.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+# ------------------------------------------------------------------ framing
+
+async def send_frame(stream: ByteStream, payload: Any) -> None:
+    data = marshal.dumps(payload)
+    await stream.send(_LENGTH.pack(len(data)) + data)
+
+
+async def _receive_exactly(stream: ByteStream, size: int, buffer: bytearray) -> bytes:
+    while len(buffer) < size:
+        buffer.extend(await stream.receive(max(65536, size - len(buffer))))
+    data = bytes(buffer[:size])
+    del buffer[:size]
+    return data
+
+
+async def receive_frame(stream: ByteStream, buffer: bytearray) -> Any:
+    (size,) = _LENGTH.unpack(await _receive_exactly(stream, _LENGTH.size, buffer))
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"IPC frame of {size} bytes exceeds limit")
+    return marshal.loads(await _receive_exactly(stream, size, buffer))
+
+
+# ------------------------------------------------------- harness process side
+
+class IPCDispatcher:
+    """Serves forwarded requests by calling the ASGI app on the harness loop"""
+
+    def __init__(self, app: Callable, path: str, root_path: str = ""):
+        self.app = app
+        self.path = path
+        self.root_path = root_path
+        self.logger = get_logger("IPCDispatcher")
+        self.requests_served = 0
+        # Lifespan state, copied into each request scope as uvicorn does
+        self.state: Dict[str, Any] = {}
+
+    async def serve(self, *, task_status=anyio.TASK_STATUS_IGNORED) -> None:
+        async with self.lifespan():
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            listener = await anyio.create_unix_listener(self.path)
+            os.chmod(self.path, 0o600)
+            task_status.started()
+            try:
+                await listener.serve(self._handle_connection)
+            finally:
+                await listener.aclose()
+                try:
+                    os.unlink(self.path)
+                except OSError:
+                    pass
+
+    @asynccontextmanager
+    async def lifespan(self):
+        """Run the app's ASGI lifespan: startup before serving, shutdown after"""
+        to_app, app_receive = anyio.create_memory_object_stream(1)
+        app_send, from_app = anyio.create_memory_object_stream(1)
+        scope = {"type": "lifespan", "asgi": {"version": "3.0", "spec_version": "2.0"}, "state": self.state}
+
+        # Shielded so cancelling the dispatcher still lets the app run its shutdown
+        app_scope = anyio.CancelScope(shield=True)
+
+        async def run_app() -> None:
+            async with app_send:
+                with app_scope:
+                    try:
+                        await self.app(scope, app_receive.receive, app_send.send)
+                    except Exception as e:
+                        # Like uvicorn's lifespan="auto": an app without lifespan support is served anyway
+                        self.logger.debug(f"ASGI lifespan unsupported or failed: {e}")
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(run_app)
+            await to_app.send({"type": "lifespan.startup"})
+            try:
+                message = await from_app.receive()
+            except anyio.EndOfStream:
+                message = None
+            if message is not None and message["type"] == "lifespan.startup.failed":
+                raise RuntimeError(f"ASGI lifespan startup failed: {message.get('message', '')}")
+            try:
+                yield
+            finally:
+                if message is not None:
+                    with anyio.CancelScope(shield=True), anyio.move_on_after(10):
+                        await to_app.send({"type": "lifespan.shutdown"})
+                        try:
+                            await from_app.receive()
+                        except anyio.EndOfStream:
+                            pass
+                app_scope.cancel()
+
+    async def _handle_connection(self, stream: ByteStream) -> None:
+        buffer = bytearray()
+        async with stream:
+            while True:
+                try:
+                    request = await receive_frame(stream, buffer)
+                except (anyio.EndOfStream, anyio.BrokenResourceError, anyio.ClosedResourceError):
+                    return
+                await send_frame(stream, await self._call_app(request))
+                self.requests_served += 1
+
+    async def _call_app(self, request: Tuple) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        method, scheme, path, query_string, headers, body, client, server, http_version = request
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": http_version,
+            "method": method,
+            "scheme": scheme,
+            "path": path,
+            "raw_path": path.encode("latin-1"),
+            "query_string": query_string,
+            "root_path": self.root_path,
+            "headers": [tuple(header) for header in headers],
+            "client": tuple(client) if client else None,
+            "server": tuple(server) if server else None,
+            "state": self.state.copy(),
+        }
+        body_sent = False
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal body_sent
+            if body_sent:
+                await anyio.sleep_forever()  # Client disconnects are not forwarded
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = [(bytes(k), bytes(v)) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(bytes(message.get("body", b"")))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception as e:
+            self.logger.error(f"Forwarded request {method} {path} failed: {e}")
+            return 500, [(b"content-type", b"text/plain")], b"Internal Server Error"
+        return status, response_headers, b"".join(chunks)
+
+
+# -------------------------------------------------------- worker process side
+
+class IPCForwardingApp:
+    """ASGI app for worker processes: forwards each HTTP request to the harness"""
+
+    def __init__(self, ipc_path: str, pool_size: int = 64):
+        self.ipc_path = ipc_path
+        self.pool_size = pool_size
+        self._idle: List[Tuple[ByteStream, bytearray]] = []
+        self._slots: Optional[anyio.Semaphore] = None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await self._close_pool()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return  # WebSocket routes are only served in inline mode
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            body.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        request = (
+            scope["method"], scope.get("scheme", "http"), scope["path"], scope.get("query_string", b""),
+            [(bytes(k), bytes(v)) for k, v in scope.get("headers", [])], bytes(body),
+            list(scope["client"]) if scope.get("client") else None,
+            list(scope["server"]) if scope.get("server") else None,
+            scope.get("http_version", "1.1"),
+        )
+        try:
+            status, headers, response_body = await self._forward(request)
+        except (OSError, anyio.EndOfStream, anyio.BrokenResourceError):
+            status, headers, response_body = 502, [(b"content-type", b"text/plain")], b"Harness unavailable"
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": response_body})
+
+    async def _forward(self, request: Tuple) -> Tuple:
+        if self._slots is None:
+            self._slots = anyio.Semaphore(self.pool_size)
+        async with self._slots:
+            if self._idle:
+                stream, buffer = self._idle.pop()
+            else:
+                stream, buffer = await anyio.connect_unix(self.ipc_path), bytearray()
+            try:
+                await send_frame(stream, request)
+                response = await receive_frame(stream, buffer)
+            except BaseException:
+                await anyio.aclose_forcefully(stream)
+                raise
+            self._idle.append((stream, buffer))
+            return response
+
+    async def _close_pool(self) -> None:
+        while self._idle:
+            stream, _ = self._idle.pop()
+            await stream.aclose()
+
+
+def run_worker(host: str, port: int, ipc_path: str, pool_size: int = 64, log_level: str = "warning") -> None:
+    """Worker process entry point: serve HTTP on a SO_REUSEPORT socket and forward to the harness"""
+    import uvicorn
+
+    sock = create_listen_socket(host, port, reuse_port=True)
+    config = uvicorn.Config(IPCForwardingApp(ipc_path, pool_size), log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
@@ -8,10 +8,9 @@ Implements centralized component discovery and validation with fail-hard princip
 from typing import Dict, Type, List, Any, Optional
 import logging
 import subprocess
-import socket
-import requests
 from datetime import datetime
 from .composed_base import ComposedComponent
+from .dependency_preflight import DependencyPreflight, PreflightReport
 from ..validation import ConstraintValidator, ValidationResult, ValidationError
 from ..exceptions import SignatureMismatch
 from pathlib import Path
@@ -62,6 +61,13 @@ class ComponentRegistry:
         # External service dependencies tracking
         self._external_dependencies: Dict[str, List[Dict[str, Any]]] = {}
         
+        # Concurrent, TTL-cached probes behind every dependency check
+        self._preflight = DependencyPreflight(
+            timeout=float(os.getenv("AUTOCODER_PREFLIGHT_TIMEOUT", "5.0")),
+            ttl=float(os.getenv("AUTOCODER_PREFLIGHT_TTL", "30.0"))
+        )
+        self.last_preflight_report: Optional[PreflightReport] = None
+        
         # Constraint validator for policy evaluation
         self._constraint_validator = ConstraintValidator()
         
@@ -535,9 +541,9 @@ class ComponentRegistry:
             except OSError:
                 pass
     
-    def _validate_external_dependencies(self, component_name: str, config: Dict[str, Any]) -> None:
-        """Validate external service dependencies are available"""
-        # Extract dependencies from config
+    def _extract_external_dependencies(self, component_name: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Collect the external dependencies declared in a component config"""
+        name = component_name
         dependencies = []
         
         # Check for database dependencies
@@ -630,6 +636,12 @@ class ComponentRegistry:
                 'required': True
             })
         
+        return dependencies
+    
+    def _validate_external_dependencies(self, component_name: str, config: Dict[str, Any]) -> None:
+        """Validate external service dependencies are available (probes are cached by the preflight)"""
+        dependencies = self._extract_external_dependencies(component_name, config)
+        
         # Store dependencies for this component
         self._external_dependencies[component_name] = dependencies
         
@@ -674,130 +686,45 @@ class ComponentRegistry:
     
     def _check_database_availability(self, dependency: Dict[str, Any]) -> bool:
         """Check database connectivity"""
-        connection_string = dependency.get('connection_string', '')
-        db_type = dependency.get('name', '')
-        
-        if not connection_string:
-            return False
-        
-        # Parse connection details for basic connectivity check
-        try:
-            if 'postgresql://' in connection_string or 'postgres://' in connection_string:
-                # Extract host and port for PostgreSQL
-                import re
-                match = re.search(r'://[^@]*@([^:/]+):?(\d+)?/', connection_string)
-                if match:
-                    host = match.group(1)
-                    port = int(match.group(2)) if match.group(2) else 5432
-                    return self._check_tcp_connectivity(host, port)
-                    
-            elif 'mysql://' in connection_string:
-                # Extract host and port for MySQL
-                import re
-                match = re.search(r'://[^@]*@([^:/]+):?(\d+)?/', connection_string)
-                if match:
-                    host = match.group(1)
-                    port = int(match.group(2)) if match.group(2) else 3306
-                    return self._check_tcp_connectivity(host, port)
-                    
-            elif 'redis://' in connection_string:
-                # Extract host and port for Redis
-                import re
-                match = re.search(r'://[^@]*@?([^:/]+):?(\d+)?/?', connection_string)
-                if match:
-                    host = match.group(1)
-                    port = int(match.group(2)) if match.group(2) else 6379
-                    return self._check_tcp_connectivity(host, port)
-            
-            # For SQLite or unknown, assume available
-            return True
-            
-        except Exception as e:
-            self.logger.debug(f"Database connectivity check failed: {e}")
-            return False
+        return self._preflight.is_available(dependency)
     
     def _check_message_queue_availability(self, dependency: Dict[str, Any]) -> bool:
-        """Check message queue connectivity"""
-        brokers = dependency.get('brokers', [])
-        mq_type = dependency.get('name', '')
-        
-        if not brokers:
-            return False
-        
-        # Check at least one broker is reachable
-        for broker in brokers:
-            try:
-                if ':' in broker:
-                    host, port_str = broker.split(':', 1)
-                    port = int(port_str)
-                else:
-                    host = broker
-                    # Default ports by type
-                    if mq_type == 'kafka':
-                        port = 9092
-                    elif mq_type == 'rabbitmq':
-                        port = 5672
-                    elif mq_type == 'redis_pubsub':
-                        port = 6379
-                    else:
-                        port = 9092  # Default to Kafka port
-                
-                if self._check_tcp_connectivity(host, port):
-                    return True
-                    
-            except Exception as e:
-                self.logger.debug(f"Message queue broker check failed for {broker}: {e}")
-                continue
-        
-        return False
+        """Check message queue connectivity (any reachable broker)"""
+        return self._preflight.is_available(dependency)
     
     def _check_external_service_availability(self, dependency: Dict[str, Any]) -> bool:
         """Check external service availability"""
-        endpoint = dependency.get('endpoint', '')
-        
-        if not endpoint:
-            return False
+        return self._preflight.is_available(dependency)
+    
+    def _collect_dependencies(self, components: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            component.get('name', f"component_{index}"):
+                self._extract_external_dependencies(component.get('name', ''), component.get('config', {}))
+            for index, component in enumerate(components)
+        }
+    
+    def _record_preflight(self, report: PreflightReport) -> PreflightReport:
+        self.last_preflight_report = report
+        if report.probes:
+            self.logger.info(f"Dependency preflight breakdown: {report.to_dict()}")
+        return report
+    
+    async def preflight_dependencies(self, components: List[Dict[str, Any]]) -> PreflightReport:
+        """
+        Probe the external dependencies of all blueprint components concurrently.
         
-        try:
-            # For HTTP/HTTPS endpoints, do a basic connectivity check
-            if endpoint.startswith('http://') or endpoint.startswith('https://'):
-                response = requests.head(endpoint, timeout=5)
-                return response.status_code < 500  # Accept any non-server-error response
-            else:
-                # For other protocols, check basic TCP connectivity
-                # Extract host and port
-                if '://' in endpoint:
-                    protocol_part = endpoint.split('://', 1)[1]
-                else:
-                    protocol_part = endpoint
-                
-                if ':' in protocol_part:
-                    host, port_str = protocol_part.split(':', 1)
-                    # Remove path if present
-                    if '/' in port_str:
-                        port_str = port_str.split('/')[0]
-                    port = int(port_str)
-                    return self._check_tcp_connectivity(host, port)
-                else:
-                    # Default to port 80 for HTTP-like services
-                    host = protocol_part.split('/')[0]
-                    return self._check_tcp_connectivity(host, 80)
-                    
-        except Exception as e:
-            self.logger.debug(f"External service check failed for {endpoint}: {e}")
-            return False
+        Distinct endpoints are probed once; results are cached so the per-component
+        checks during creation do not probe again.
+        """
+        dependencies = self._collect_dependencies(components)
+        report = await self._preflight.run(dependencies)
+        return self._record_preflight(report)
     
-    def _check_tcp_connectivity(self, host: str, port: int, timeout: float = 5.0) -> bool:
-        """Check TCP connectivity to host:port"""
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            return result == 0
-        except (socket.error, OSError, socket.timeout) as e:
-            logger.debug(f"TCP connectivity check failed for {host}:{port}: {e}")
-            return False
+    def preflight_dependencies_sync(self, components: List[Dict[str, Any]]) -> PreflightReport:
+        """Blocking preflight_dependencies for synchronous callers"""
+        dependencies = self._collect_dependencies(components)
+        report = self._preflight.run_sync(dependencies)
+        return self._record_preflight(report)
     
     def _enforce_fail_hard_behavior(self, component_instance: ComposedComponent) -> None:
         """Enforce fail-hard behavior - component cannot start with missing dependencies"""
@@ -895,6 +822,9 @@ class ComponentRegistry:
         
         self.logger.info(f"🏗️ Creating {len(system_components)} components via registry-driven pipeline")
         
+        # Probe all dependencies at once; per-component checks below hit the cache
+        self.preflight_dependencies_sync(system_components)
+        
         for component_config in system_components:
             component_instance = self.create_component_from_blueprint(component_config)
             components[component_instance.name] = component_instance
@@ -902,6 +832,11 @@ class ComponentRegistry:
         self.logger.info(f"✅ All {len(components)} system components created via registry")
         return components
     
+    async def create_system_components_async(self, blueprint_data: Dict[str, Any]) -> Dict[str, ComposedComponent]:
+        """create_system_components for async callers: probes on the running loop instead of blocking it"""
+        await self.preflight_dependencies(blueprint_data.get('system', {}).get('components', []))
+        return self.create_system_components(blueprint_data)
+    
     def clear_registry(self) -> None:
         """Clear all registered components (for testing)"""
         
@@ -6,8 +6,10 @@ Pure composition over inheritance with capability-based design
 import time
 from typing import Dict, Any, Optional, List, Type
 from autocoder_cc.orchestration.component import Component
-from autocoder_cc.error_handling.consistent_handler import handle_errors, ConsistentErrorHandler
+from autocoder_cc.orchestration.request_reply import CORRELATION_FIELD
+from autocoder_cc.error_handling.consistent_handler import handle_errors, ConsistentErrorHandler, DEAD_LETTER_PORT
 from autocoder_cc.observability import get_logger, get_metrics_collector, get_tracer
+from autocoder_cc.observability.component_stats import ComponentStats
 from autocoder_cc.validation.config_requirement import ConfigRequirement
 
 
@@ -36,6 +38,8 @@ class ComposedComponent(Component):
         self.structured_logger = get_logger(f"component.{self.name}", component=self.name)
         self.metrics_collector = get_metrics_collector(self.name)
         self.tracer = get_tracer(self.name)
+        # Per-item accounting; the harness exports it into metrics_collector periodically
+        self.stats = ComponentStats(self.name)
         
         # Composed capabilities - initialized based on config
         self.capabilities: Dict[str, Any] = {}
@@ -182,7 +186,7 @@ class ComposedComponent(Component):
                 try:
                     # Start item processing span  
                     with self.tracer.span("item.process") as item_span_id:
-                        start_time = time.time()
+                        start_time = time.perf_counter()
                         
                         # Apply rate limiting capability if enabled
                         if 'rate_limiter' in self.capabilities and self.capabilities['rate_limiter']:
@@ -204,44 +208,54 @@ class ComposedComponent(Component):
                         if result is not None and 'schema_validator' in self.capabilities and self.capabilities['schema_validator']:
                             result = self.capabilities['schema_validator'].validate_output(result)
                         
+                        # Carry a request's correlation ID onto dict results so the reply can be routed back
+                        if isinstance(result, dict) and isinstance(item, dict) and CORRELATION_FIELD in item \
+                                and CORRELATION_FIELD not in result:
+                            result = {**result, CORRELATION_FIELD: item[CORRELATION_FIELD]}
+                        
                         # Send result to output streams
                         if result is not None and self.send_streams:
                             for output_name, output_stream in self.send_streams.items():
-                                await output_stream.send(result)
+                                if output_name != DEAD_LETTER_PORT:
+                                    await output_stream.send(result)
                         
-                        # Record successful processing metrics
-                        processing_time = (time.time() - start_time) * 1000
-                        self.metrics_collector.record_items_processed()
-                        self.metrics_collector.record_processing_time(processing_time)
+                        # Record successful processing in the lock-free stats block
+                        elapsed = time.perf_counter() - start_time
+                        self.stats.record_processed(elapsed)
                         
                         self.structured_logger.debug(
                             f"Processed item successfully",
                             operation="item_processed",
-                            metrics={'processing_time_ms': processing_time}
+                            metrics={'processing_time_ms': elapsed * 1000}
                         )
                         
                         self.increment_processed()
                         
                 except Exception as e:
-                    # Record error metrics
-                    self.metrics_collector.record_error(e.__class__.__name__)
-                    
-                    self.structured_logger.error(
-                        f"Item processing failed",
-                        error=e,
-                        operation="item_processing_error",
-                        tags={'error_type': e.__class__.__name__}
-                    )
+                    # Record error metrics, component status and the harness circuit breaker
+                    self.stats.record_error(e.__class__.__name__)
+                    self.record_item_failure(str(e))
                     
                     # Add error to current span
                     if item_span_id:
                         self.tracer.add_span_log(item_span_id, f"Processing error: {e}", "error")
                     
-                    await self.error_handler.handle_exception(
-                        e, 
-                        context={"item": str(item), "component_type": self.component_type},
-                        operation="process_item"
+                    # Failed items go to the dead_letter output if wired; during an error storm the
+                    # handler aggregates instead of logging, and the item is never stringified in full
+                    dead_lettered = await self.error_handler.handle_item_failure(
+                        e,
+                        item,
+                        operation="process_item",
+                        dead_letter=self.send_streams.get(DEAD_LETTER_PORT),
+                        context={"component_type": self.component_type}
                     )
+                    if not dead_lettered and not self.error_handler.in_error_storm:
+                        self.structured_logger.error(
+                            f"Item processing failed",
+                            error=e,
+                            operation="item_processing_error",
+                            tags={'error_type': e.__class__.__name__}
+                        )
                 finally:
                     # Release rate limiter if capability enabled
                     if 'rate_limiter' in self.capabilities and self.capabilities['rate_limiter']:
@@ -332,6 +346,7 @@ class ComposedComponent(Component):
             **base_health,
             'component_type': self.component_type,
             'capabilities': capability_health,
+            'stats': self.stats.snapshot(),
             'composition_model': 'capability_based'
         }
     
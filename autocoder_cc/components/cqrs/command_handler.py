@@ -12,9 +12,12 @@ Implements Step 6 of Enterprise Roadmap v2: Full CQRS implementation.
 import anyio
 import json
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, List
 from datetime import datetime
 from autocoder_cc.components.composed_base import ComposedComponent
+from autocoder_cc.components.cqrs.projection_engine import SQLiteEventLog
+from autocoder_cc.components.cqrs.query_cache import LIST_QUERIES_TAG
 
 
 class CommandHandler(ComposedComponent):
@@ -26,6 +29,13 @@ class CommandHandler(ComposedComponent):
     2. Executes business logic 
     3. Publishes events to message bus
     4. Does NOT return data (commands don't return query results)
+    
+    Each event lists the query-cache tags it makes stale under 'invalidates'
+    (by default its aggregate and all list queries). Events are also sent on the optional 'events'
+    output so a QueryHandler in the same system can invalidate its cache
+    without a message-bus round trip. With `event_log_path` configured, each
+    command's events are first appended to an SQLiteEventLog in one
+    transaction, giving them offsets a ProjectionEngine can replay from.
     """
     
     def __init__(self, name: str, config: Dict[str, Any] = None):
@@ -37,6 +47,8 @@ class CommandHandler(ComposedComponent):
         self.message_bus_url = config.get('message_bus_url', generator_settings.get_rabbitmq_url())
         self.exchange_name = config.get('exchange_name', 'commands')
         self.event_exchange_name = config.get('event_exchange_name', 'events')
+        self.event_log_path = config.get('event_log_path')
+        self.event_log: Optional[SQLiteEventLog] = None
         
         # Statistics
         self.commands_processed = 0
@@ -63,6 +75,9 @@ class CommandHandler(ComposedComponent):
             
             self.logger.info(f"CommandHandler {self.name} connected to message bus")
             
+            if self.event_log_path and self.event_log is None:
+                self.event_log = await SQLiteEventLog(self.event_log_path).open()
+            
             # Process commands from input streams
             async for command_data in self.receive_streams['commands']:
                 await self._handle_command(command_data)
@@ -73,10 +88,13 @@ class CommandHandler(ComposedComponent):
         finally:
             if hasattr(self, 'connection'):
                 await self.connection.close()
+            if self.event_log is not None:
+                await self.event_log.close()
+                self.event_log = None
     
     async def _handle_command(self, command_data: Dict[str, Any]) -> None:
         """Handle a single command"""
-        command_id = command_data.get('command_id', f"cmd_{anyio.get_cancelled_exc_class().time()}")
+        command_id = command_data.get('command_id', f"cmd_{time.time()}")
         command_type = command_data.get('command_type', 'unknown')
         
         try:
@@ -94,9 +112,10 @@ class CommandHandler(ComposedComponent):
             
             if execution_result['success']:
                 # Publish success events
-                for event in execution_result.get('events', []):
-                    await self._publish_event(event)
-                    self.events_published += 1
+                events = execution_result.get('events', [])
+                for event in events:
+                    self._tag_event(event, command_data)
+                await self._publish_events(events)
                 
                 self.commands_processed += 1
                 self.logger.info(f"Command {command_id} processed successfully")
@@ -152,8 +171,34 @@ class CommandHandler(ComposedComponent):
             'events': [event]
         }
     
+    def _tag_event(self, event: Dict[str, Any], command_data: Dict[str, Any]) -> None:
+        """
+        Record the query-cache tags an event invalidates.
+        Override to add domain-specific tags (e.g. list queries over the aggregate type).
+        """
+        if 'invalidates' in event:
+            return
+        aggregate_id = event.get('aggregate_id', command_data.get('aggregate_id'))
+        event['invalidates'] = [f"aggregate:{aggregate_id}"] if aggregate_id is not None else []
+        event['invalidates'].append(LIST_QUERIES_TAG)
+    
+    async def _publish_events(self, events: List[Dict[str, Any]]) -> None:
+        """Log a command's events in one append, then publish them in order"""
+        if not events:
+            return
+        if self.event_log is not None:
+            await self.event_log.append_many(events)
+        # Sequential, so subscribers see a command's events in the order they happened
+        for event in events:
+            await self._publish_event(event)
+        if 'events' in self.send_streams:
+            for event in events:
+                await self.send_streams['events'].send(event)
+        self.events_published += len(events)
+    
     async def _publish_event(self, event_data: Dict[str, Any]) -> None:
         """Publish event to event exchange"""
+        import aio_pika
         try:
             routing_key = f"events.{event_data.get('event_type', 'unknown')}"
             
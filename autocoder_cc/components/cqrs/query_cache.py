@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Two-tier Query Cache
+====================
+
+Read-side cache for QueryHandler: an in-process LRU with TTL (L1) in front
+of Redis (L2).
+
+- Concurrent misses for the same key share one computation (single-flight),
+  so a popular query that expires is recomputed once, not once per caller.
+- Every cached entry carries tags. Each tag has a Redis set of the keys
+  tagged with it, so invalidating an aggregate or query type deletes exactly
+  those keys instead of pattern-scanning the keyspace with KEYS.
+- Where a pattern is unavoidable, keys are walked with cursor-based SCAN.
+
+L1 entries are shared objects: callers must not mutate cached results.
+L1 only sees invalidations made through this process, so its TTL is kept
+short and bounds how stale another replica's invalidation can leave it.
+"""
+import fnmatch
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import anyio
+
+from autocoder_cc.observability.structured_logging import get_logger
+
+MISSING = object()
+
+# Tag carried by query results not scoped to one aggregate (lists, searches,
+# counts); every state-changing event invalidates it
+LIST_QUERIES_TAG = "queries:list"
+
+
+class LocalCache:
+    """In-process LRU with per-entry TTL and a tag index"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return MISSING
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = (), ttl: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl)), value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, key: str) -> None:
+        self._remove(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def invalidate_matching(self, pattern: str) -> int:
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "completed")
+
+    def __init__(self):
+        self.event = anyio.Event()
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self.completed = False
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls for the same key"""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run `fn` once for all concurrent callers of `key`; returns (result, shared)"""
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                break
+            await call.event.wait()
+            if call.completed:
+                self.shared += 1
+                if call.error is not None:
+                    raise call.error
+                return call.result, True
+            # The leader was cancelled: the next waiter takes over
+
+        call = self._calls[key] = _Call()
+        try:
+            call.result = await fn()
+            call.completed = True
+            return call.result, False
+        except Exception as e:
+            call.error = e
+            call.completed = True
+            raise
+        finally:
+            del self._calls[key]
+            call.event.set()
+
+
+class QueryCache:
+    """L1 LRU in front of Redis, with single-flight misses and tag invalidation"""
+
+    def __init__(self, redis, key_prefix: str = "", ttl: int = 3600,
+                 l1_max_entries: int = 1024, l1_ttl: float = 5.0, scan_count: int = 500):
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.scan_count = scan_count
+        self.l1 = LocalCache(l1_max_entries, l1_ttl)
+        self.flights = SingleFlight()
+        self.logger = get_logger(f"QueryCache.{key_prefix.rstrip(':') or 'default'}")
+        # Bumped by every invalidation; results computed across one are not cached
+        self._generation = 0
+
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.keys_invalidated = 0
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}tag:{tag}"
+
+    # ------------------------------------------------------------ reads
+
+    async def get(self, key: str) -> Any:
+        """Cached value from L1 or Redis, or MISSING"""
+        value = self.l1.get(key)
+        if value is not MISSING:
+            self.l1_hits += 1
+            return value
+        value = await self._redis_get(key)
+        if value is not MISSING:
+            self.l2_hits += 1
+            self.l1.set(key, value)
+        return value
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                             tags: Iterable[str] = (), ttl: Optional[int] = None) -> Tuple[Any, str]:
+        """Return (value, source) with source one of l1, redis, computed or shared"""
+        value = self.l1.get(key)
+        if value is not MISSING:
+            self.l1_hits += 1
+            return value, "l1"
+        tags = tuple(tags)
+
+        async def load() -> Tuple[Any, str]:
+            cached = await self._redis_get(key)
+            if cached is not MISSING:
+                self.l2_hits += 1
+                self.l1.set(key, cached, tags)
+                return cached, "redis"
+            self.misses += 1
+            generation = self._generation
+            result = await compute()
+            if generation == self._generation:
+                await self.set(key, result, tags, ttl)
+            return result, "computed"
+
+        (value, source), shared = await self.flights.do(key, load)
+        return value, ("shared" if shared else source)
+
+    # ------------------------------------------------------------ writes
+
+    async def set(self, key: str, value: Any, tags: Iterable[str] = (), ttl: Optional[int] = None) -> None:
+        ttl = ttl or self.ttl
+        tags = tuple(tags)
+        self.l1.set(key, value, tags, ttl)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(key, ttl, json.dumps(value, default=str))
+            for tag in tags:
+                pipe.sadd(self.tag_key(tag), key)
+                pipe.expire(self.tag_key(tag), ttl)
+            await pipe.execute()
+        except Exception as e:
+            self.logger.warning(f"Cache write error for key {key}: {e}")
+
+    async def _redis_get(self, key: str) -> Any:
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            self.logger.warning(f"Cache read error for key {key}: {e}")
+            return MISSING
+        return json.loads(raw) if raw else MISSING
+
+    # ------------------------------------------------------------ invalidation
+
+    async def invalidate_keys(self, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        self._generation += 1
+        self.invalidations += 1
+        for key in keys:
+            self.l1.invalidate(key)
+        return await self._delete(keys)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete every entry carrying one of `tags`, using the tag sets"""
+        tags = list(tags)
+        if not tags:
+            return 0
+        self._generation += 1
+        self.invalidations += 1
+        self.l1.invalidate_tags(tags)
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        keys: Set[str] = set()
+        try:
+            for tag_key in tag_keys:
+                keys.update(await self.redis.smembers(tag_key))
+            await self.redis.delete(*tag_keys)
+        except Exception as e:
+            self.logger.warning(f"Cache invalidation error for tags {tags}: {e}")
+            return 0
+        return await self._delete(list(keys))
+
+    async def invalidate_matching(self, pattern: str) -> int:
+        """Delete entries whose key matches a glob pattern, walking Redis with SCAN"""
+        self._generation += 1
+        self.invalidations += 1
+        self.l1.invalidate_matching(pattern)
+        deleted = 0
+        batch: List[str] = []
+        async for key in self.scan(pattern):
+            batch.append(key)
+            if len(batch) >= self.scan_count:
+                deleted += await self._delete(batch)
+                batch = []
+        return deleted + await self._delete(batch)
+
+    async def scan(self, pattern: str, limit: Optional[int] = None):
+        """Iterate keys matching `pattern` with cursor-based SCAN"""
+        seen = 0
+        try:
+            async for key in self.redis.scan_iter(match=pattern, count=self.scan_count):
+                yield key
+                seen += 1
+                if limit is not None and seen >= limit:
+                    return
+        except Exception as e:
+            self.logger.warning(f"Cache scan error for pattern {pattern}: {e}")
+
+    async def _delete(self, keys: List[str]) -> int:
+        if not keys:
+            return 0
+        try:
+            deleted = await self.redis.delete(*keys)
+        except Exception as e:
+            self.logger.warning(f"Cache delete error: {e}")
+            return 0
+        self.keys_invalidated += deleted
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.l1_hits + self.l2_hits + self.misses + self.flights.shared
+        return {
+            "l1_entries": len(self.l1),
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "shared_misses": self.flights.shared,
+            "in_flight": len(self.flights),
+            "hit_rate": (lookups - self.misses) / lookups if lookups else 0,
+            "l1_evictions": self.l1.evictions,
+            "invalidations": self.invalidations,
+            "keys_invalidated": self.keys_invalidated,
+        }
@@ -12,9 +12,11 @@ Implements Step 6 of Enterprise Roadmap v2: Full CQRS implementation.
 import anyio
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 from datetime import datetime
 from autocoder_cc.components.composed_base import ComposedComponent
+from autocoder_cc.components.cqrs.query_cache import QueryCache, MISSING, LIST_QUERIES_TAG
 
 
 class QueryHandler(ComposedComponent):
@@ -26,6 +28,15 @@ class QueryHandler(ComposedComponent):
     2. Reads from Redis or read-optimized store
     3. Returns projection data
     4. Does NOT modify state (queries are read-only)
+    
+    Queries are handled concurrently (up to `max_concurrent_queries`), so
+    results are sent as they complete; each carries its query_id.
+    
+    Results are cached in a QueryCache (in-process LRU in front of Redis).
+    Cached queries are tagged with their query type and aggregate id, or as
+    list queries when they have no id; events from a CommandHandler arriving
+    on the optional 'events' input invalidate the matching tags and all list
+    queries.
     """
     
     def __init__(self, name: str, config: Dict[str, Any] = None):
@@ -37,6 +48,15 @@ class QueryHandler(ComposedComponent):
         self.redis_url = config.get('redis_url', generator_settings.get_redis_url())
         self.redis_key_prefix = config.get('redis_key_prefix', f'{name}:')
         self.cache_ttl = config.get('cache_ttl', 3600)  # 1 hour default
+        self.l1_cache_size = config.get('l1_cache_size', 1024)
+        self.l1_cache_ttl = config.get('l1_cache_ttl', 5.0)
+        self.max_concurrent_queries = config.get('max_concurrent_queries', 64)
+        # event_type -> query types whose cached results the event makes stale
+        self.invalidate_on: Dict[str, List[str]] = config.get('invalidate_on', {})
+        
+        # Set before process() to use an existing client (e.g. tests.tools.fake_redis.FakeRedis)
+        self.redis = None
+        self.cache: Optional[QueryCache] = None
         
         # Statistics
         self.queries_processed = 0
@@ -47,34 +67,94 @@ class QueryHandler(ComposedComponent):
     
     async def process(self) -> None:
         """Process queries from input streams"""
+        owns_redis = self.redis is None
         try:
-            # Connect to Redis for read models
-            import aioredis
-            self.redis = await aioredis.from_url(
-                self.redis_url,
-                encoding='utf-8',
-                decode_responses=True
-            )
-            
-            self.logger.info(f"QueryHandler {self.name} connected to Redis")
+            if owns_redis:
+                # Connect to Redis for read models
+                import aioredis
+                self.redis = await aioredis.from_url(
+                    self.redis_url,
+                    encoding='utf-8',
+                    decode_responses=True
+                )
+                self.logger.info(f"QueryHandler {self.name} connected to Redis")
+            self._ensure_cache()
             
-            # Process queries from input streams
-            async for query_data in self.receive_streams['queries']:
-                result = await self._handle_query(query_data)
+            async with anyio.create_task_group() as tg:
+                if 'events' in self.receive_streams:
+                    tg.start_soon(self._process_events)
                 
-                # Send result to output stream
-                await self.send_streams['results'].send(result)
+                # Process queries from input streams concurrently, so identical
+                # misses in flight together share one computation
+                limiter = anyio.CapacityLimiter(self.max_concurrent_queries)
+                async with anyio.create_task_group() as queries:
+                    async for query_data in self.receive_streams['queries']:
+                        token = object()
+                        # Stop reading while the limiter is full
+                        await limiter.acquire_on_behalf_of(token)
+                        queries.start_soon(self._dispatch_query, query_data, limiter, token)
+                tg.cancel_scope.cancel()
                 
         except Exception as e:
             self.logger.error(f"QueryHandler {self.name} failed: {e}")
             raise
         finally:
-            if hasattr(self, 'redis'):
+            if owns_redis and self.redis is not None:
                 await self.redis.close()
+                self.redis = None
+    
+    async def _dispatch_query(self, query_data: Dict[str, Any], limiter: anyio.CapacityLimiter,
+                              token: object) -> None:
+        """Handle one query and send its result to the output stream"""
+        try:
+            result = await self._handle_query(query_data)
+        finally:
+            limiter.release_on_behalf_of(token)
+        await self.send_streams['results'].send(result)
+    
+    def _ensure_cache(self) -> QueryCache:
+        if self.cache is None or self.cache.redis is not self.redis:
+            self.cache = QueryCache(
+                self.redis,
+                key_prefix=self.redis_key_prefix,
+                ttl=self.cache_ttl,
+                l1_max_entries=self.l1_cache_size,
+                l1_ttl=self.l1_cache_ttl
+            )
+        return self.cache
+    
+    async def _process_events(self) -> None:
+        """Invalidate cached results made stale by command events"""
+        async for event in self.receive_streams['events']:
+            tags = self._invalidation_tags(event)
+            if tags:
+                deleted = await self.cache.invalidate_tags(tags)
+                self.logger.debug(f"Event {event.get('event_type')} invalidated {deleted} cached entries")
+    
+    def _invalidation_tags(self, event: Dict[str, Any]) -> List[str]:
+        """Tags made stale by an event; override for domain-specific rules"""
+        tags = list(event.get('invalidates', []))
+        if not tags and event.get('aggregate_id') is not None:
+            tags.append(f"aggregate:{event['aggregate_id']}")
+        # Any state change can alter a list, search or count result
+        if LIST_QUERIES_TAG not in tags:
+            tags.append(LIST_QUERIES_TAG)
+        tags.extend(f"query:{query_type}" for query_type in self.invalidate_on.get(event.get('event_type'), []))
+        return tags
+    
+    def _query_tags(self, query_type: str, params: Dict[str, Any]) -> List[str]:
+        """Tags attached to a cached query result"""
+        tags = [f"query:{query_type}"]
+        for field in ('aggregate_id', 'id'):
+            if params.get(field) is not None:
+                tags.append(f"aggregate:{params[field]}")
+        if len(tags) == 1:
+            tags.append(LIST_QUERIES_TAG)
+        return tags
     
     async def _handle_query(self, query_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle a single query"""
-        query_id = query_data.get('query_id', f"qry_{anyio.get_cancelled_exc_class().time()}")
+        query_id = query_data.get('query_id', f"qry_{time.time()}")
         query_type = query_data.get('query_type', 'unknown')
         
         try:
@@ -137,80 +217,64 @@ class QueryHandler(ComposedComponent):
         query_type = query_data.get('query_type')
         query_params = query_data.get('params', {})
         
-        # Try to get data from cache first
-        cache_key = self._build_cache_key(query_type, query_params)
-        cached_data = await self._get_from_cache(cache_key)
-        
-        if cached_data is not None:
-            self.cache_hits += 1
-            self.logger.debug(f"Cache hit for query {query_type}")
+        async def compute() -> Dict[str, Any]:
+            # Default implementation - subclasses should override
+            self.logger.warning(f"Default query execution for {query_type} - should be overridden")
             return {
-                'data': cached_data,
-                'metadata': {
-                    'source': 'cache',
-                    'cache_key': cache_key
-                }
+                'query_type': query_type,
+                'params': query_params,
+                'message': 'Default query response - implement _execute_query in subclass',
+                'timestamp': datetime.utcnow().isoformat()
             }
         
-        self.cache_misses += 1
-        
-        # Default implementation - subclasses should override
-        self.logger.warning(f"Default query execution for {query_type} - should be overridden")
-        
-        # Generate default response
-        result_data = {
-            'query_type': query_type,
-            'params': query_params,
-            'message': 'Default query response - implement _execute_query in subclass',
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        
-        # Cache the result
-        await self._set_cache(cache_key, result_data)
-        
+        return await self._cached_query(query_type, query_params, compute)
+    
+    async def _cached_query(self, query_type: str, params: Dict[str, Any],
+                            compute: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        """
+        Serve a query from the cache tiers, computing it at most once per key
+        across concurrent callers. Subclasses overriding _execute_query call
+        this with their own compute function.
+        """
+        cache_key = self._build_cache_key(query_type, params)
+        data, source = await self._ensure_cache().get_or_compute(
+            cache_key, compute, tags=self._query_tags(query_type, params)
+        )
+        if source == 'computed':
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+            self.logger.debug(f"Cache hit ({source}) for query {query_type}")
         return {
-            'data': result_data,
+            'data': data,
             'metadata': {
-                'source': 'computed',
+                'source': 'computed' if source == 'computed' else 'cache',
+                'cache_tier': source,
                 'cache_key': cache_key
             }
         }
     
     async def _get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get data from Redis cache"""
-        try:
-            cached_json = await self.redis.get(cache_key)
-            if cached_json:
-                return json.loads(cached_json)
-            return None
-        except Exception as e:
-            self.logger.warning(f"Cache read error for key {cache_key}: {e}")
-            return None
+        """Get data from the in-process cache or Redis"""
+        value = await self._ensure_cache().get(cache_key)
+        return None if value is MISSING else value
     
-    async def _set_cache(self, cache_key: str, data: Dict[str, Any]) -> None:
-        """Set data in Redis cache"""
-        try:
-            await self.redis.setex(
-                cache_key,
-                self.cache_ttl,
-                json.dumps(data, default=str)
-            )
-            self.logger.debug(f"Cached data for key {cache_key}")
-        except Exception as e:
-            self.logger.warning(f"Cache write error for key {cache_key}: {e}")
+    async def _set_cache(self, cache_key: str, data: Dict[str, Any], tags: List[str] = ()) -> None:
+        """Set data in both cache tiers"""
+        await self._ensure_cache().set(cache_key, data, tags)
+        self.logger.debug(f"Cached data for key {cache_key}")
+    
+    async def _invalidate_tags(self, tags: List[str]) -> int:
+        """Invalidate cache entries carrying any of the tags"""
+        deleted = await self._ensure_cache().invalidate_tags(tags)
+        self.logger.info(f"Invalidated {deleted} cache entries tagged {tags}")
+        return deleted
     
     async def _invalidate_cache(self, pattern: str) -> int:
-        """Invalidate cache entries matching pattern"""
-        try:
-            keys = await self.redis.keys(f"{self.redis_key_prefix}{pattern}")
-            if keys:
-                deleted = await self.redis.delete(*keys)
-                self.logger.info(f"Invalidated {deleted} cache entries matching {pattern}")
-                return deleted
-            return 0
-        except Exception as e:
-            self.logger.warning(f"Cache invalidation error for pattern {pattern}: {e}")
-            return 0
+        """Invalidate cache entries matching pattern (SCAN-based; prefer _invalidate_tags)"""
+        deleted = await self._ensure_cache().invalidate_matching(f"{self.redis_key_prefix}{pattern}")
+        self.logger.info(f"Invalidated {deleted} cache entries matching {pattern}")
+        return deleted
     
     def _build_cache_key(self, query_type: str, params: Dict[str, Any]) -> str:
         """Build cache key from query type and parameters"""
@@ -223,26 +287,39 @@ class QueryHandler(ComposedComponent):
         else:
             return f"{self.redis_key_prefix}{query_type}"
     
+    def _projection_index_key(self, projection_name: str) -> str:
+        return f"{self.redis_key_prefix}projection_index:{projection_name}"
+    
     async def _get_projection_data(self, projection_name: str, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get projection data for specific entity"""
         projection_key = f"{self.redis_key_prefix}projection:{projection_name}:{entity_id}"
         return await self._get_from_cache(projection_key)
     
+    async def _set_projection_data(self, projection_name: str, entity_id: str, data: Dict[str, Any]) -> None:
+        """Write projection data and record the entity in the projection's index set"""
+        projection_key = f"{self.redis_key_prefix}projection:{projection_name}:{entity_id}"
+        await self._set_cache(projection_key, data, [f"aggregate:{entity_id}", f"projection:{projection_name}"])
+        try:
+            await self.redis.sadd(self._projection_index_key(projection_name), entity_id)
+        except Exception as e:
+            self.logger.warning(f"Projection index write error for {projection_name}: {e}")
+    
     async def _list_projection_entities(self, projection_name: str, limit: int = 100) -> List[str]:
-        """List entity IDs for a projection"""
+        """List entity IDs for a projection from its index set, scanning only if there is none"""
+        cache = self._ensure_cache()
         try:
-            pattern = f"{self.redis_key_prefix}projection:{projection_name}:*"
-            keys = await self.redis.keys(pattern)
-            
-            # Extract entity IDs from keys
             entity_ids = []
-            prefix_len = len(f"{self.redis_key_prefix}projection:{projection_name}:")
-            
-            for key in keys[:limit]:
-                entity_id = key[prefix_len:]
+            async for entity_id in self.redis.sscan_iter(self._projection_index_key(projection_name),
+                                                         count=cache.scan_count):
                 entity_ids.append(entity_id)
+                if len(entity_ids) >= limit:
+                    return entity_ids
+            if entity_ids:
+                return entity_ids
             
-            return entity_ids
+            # Projections written without the index: walk the keyspace with SCAN
+            prefix = f"{self.redis_key_prefix}projection:{projection_name}:"
+            return [key[len(prefix):] async for key in cache.scan(f"{prefix}*", limit=limit)]
             
         except Exception as e:
             self.logger.warning(f"Error listing projection entities: {e}")
@@ -259,5 +336,6 @@ class QueryHandler(ComposedComponent):
             'queries_processed': self.queries_processed,
             'cache_hits': self.cache_hits,
             'cache_misses': self.cache_misses,
-            'cache_hit_rate': cache_hit_rate
+            'cache_hit_rate': cache_hit_rate,
+            'cache': self.cache.get_stats() if self.cache else None
         }
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""
+External dependency preflight for ComponentRegistry.
+
+Components declare databases, message queues and external services in
+their config. Before components are created, `DependencyPreflight` reduces
+those declarations to the distinct network probes they need (a TCP connect
+or an HTTP HEAD per endpoint), runs every probe concurrently, and caches
+each result for a short TTL. Forty components sharing one database cost one
+probe, and a system whose endpoints are down waits one timeout instead of
+one per component.
+
+Probe semantics match the registry's original synchronous checks: database
+and generic endpoints must accept a TCP connection, HTTP(S) services must
+answer HEAD with a status below 500, and a message queue is available when
+any of its brokers accepts a connection.
+
+Async callers use `run` (or `is_available_async`). `run_sync` serves
+synchronous callers; called from a running event loop (e.g. a component
+constructor) it probes on a helper thread with its own loop, blocking the
+calling loop for at most one probe timeout, so async code should await
+`run` first and let the synchronous checks read the cache.
+"""
+import inspect
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import anyio
+import anyio.to_thread
+import sniffio
+
+from autocoder_cc.observability.structured_logging import get_logger
+
+# ("tcp", "host:port") or ("http", url)
+ProbeKey = Tuple[str, str]
+
+_DEFAULT_BROKER_PORTS = {"kafka": 9092, "rabbitmq": 5672, "redis_pubsub": 6379}
+_DATABASE_PORTS = (("postgresql://", 5432), ("postgres://", 5432), ("mysql://", 3306))
+
+# anyio 4.1 renamed to_thread.run_sync's `cancellable` to `abandon_on_cancel`
+_ABANDON_ON_CANCEL = (
+    {"abandon_on_cancel": True}
+    if "abandon_on_cancel" in inspect.signature(anyio.to_thread.run_sync).parameters
+    else {"cancellable": True}
+)
+
+
+@dataclass
+class ProbeResult:
+    key: ProbeKey
+    available: bool
+    latency_ms: float
+    checked_at: float
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "probe": f"{self.key[0]}:{self.key[1]}",
+            "available": self.available,
+            "latency_ms": round(self.latency_ms, 2),
+            "error": self.error,
+        }
+
+
+@dataclass
+class PreflightReport:
+    """Consolidated outcome of one preflight run"""
+    wall_time_ms: float
+    probes: List[ProbeResult]
+    cached_probes: int
+    failures: Dict[str, List[str]] = field(default_factory=dict)  # component -> "type:name"
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "wall_time_ms": round(self.wall_time_ms, 2),
+            "probes_run": len(self.probes) - self.cached_probes,
+            "probes_cached": self.cached_probes,
+            "probe_latency_ms_total": round(sum(p.latency_ms for p in self.probes), 2),
+            "probes": [p.to_dict() for p in sorted(self.probes, key=lambda p: -p.latency_ms)],
+            "failures": self.failures,
+        }
+
+
+def _host_port(target: str, default_port: int) -> ProbeKey:
+    host, _, port = target.partition(":")
+    return "tcp", f"{host}:{int(port.split('/')[0]) if port else default_port}"
+
+
+def dependency_probes(dependency: Dict[str, Any]) -> Tuple[List[ProbeKey], bool]:
+    """Probes for a dependency (any one passing suffices) and the verdict when there are none"""
+    dep_type = dependency.get("type")
+    if dep_type == "database":
+        connection_string = dependency.get("connection_string", "")
+        if not connection_string:
+            return [], False
+        for scheme, port in _DATABASE_PORTS:
+            if scheme in connection_string:
+                match = re.search(r"://[^@]*@([^:/]+):?(\d+)?/", connection_string)
+                return ([("tcp", f"{match.group(1)}:{int(match.group(2) or port)}")], False) if match else ([], True)
+        if "redis://" in connection_string:
+            match = re.search(r"://[^@]*@?([^:/]+):?(\d+)?/?", connection_string)
+            return ([("tcp", f"{match.group(1)}:{int(match.group(2) or 6379)}")], False) if match else ([], True)
+        return [], True  # SQLite and unknown schemes need no network
+    if dep_type == "message_queue":
+        default_port = _DEFAULT_BROKER_PORTS.get(dependency.get("name", ""), 9092)
+        probes = []
+        for broker in dependency.get("brokers", []):
+            try:
+                probes.append(_host_port(broker, default_port))
+            except ValueError:
+                continue
+        return probes, False
+    if dep_type == "external_service":
+        endpoint = dependency.get("endpoint", "")
+        if not endpoint:
+            return [], False
+        if endpoint.startswith(("http://", "https://")):
+            return [("http", endpoint)], False
+        target = endpoint.split("://", 1)[-1]
+        try:
+            return [_host_port(target.split("/")[0] if ":" not in target else target, 80)], False
+        except ValueError:
+            return [], False
+    raise ValueError(f"Unknown dependency type '{dep_type}'")
+
+
+class DependencyPreflight:
+    """Concurrent, deduplicated, TTL-cached dependency probes"""
+
+    def __init__(self, timeout: float = 5.0, ttl: float = 30.0, max_concurrency: int = 64):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_concurrency = max_concurrency
+        self.logger = get_logger("DependencyPreflight")
+        self._results: Dict[ProbeKey, ProbeResult] = {}
+        # Keyed by thread as well: an anyio.Event belongs to the loop that created it,
+        # and each thread runs at most one loop at a time
+        self._in_flight: Dict[Tuple[int, ProbeKey], anyio.Event] = {}
+        # Cache is shared with the sync path, which probes on its own thread
+        self._lock = threading.Lock()
+        self.probes_run = 0
+
+    def cached(self, key: ProbeKey) -> Optional[ProbeResult]:
+        with self._lock:
+            result = self._results.get(key)
+        if result is not None and time.monotonic() - result.checked_at < self.ttl:
+            return result
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    # ------------------------------------------------------------ probes
+
+    async def _tcp(self, target: str) -> None:
+        host, _, port = target.rpartition(":")
+        stream = await anyio.connect_tcp(host, int(port))
+        await stream.aclose()
+
+    def _http(self, url: str) -> None:
+        import requests  # Only systems with HTTP dependencies pay for importing it
+
+        response = requests.head(url, timeout=self.timeout)
+        if response.status_code >= 500:
+            raise ConnectionError(f"HTTP {response.status_code}")
+
+    async def probe(self, key: ProbeKey) -> ProbeResult:
+        """Probe one endpoint, reusing a fresh cached result or an in-flight probe on this loop"""
+        flight_key = (threading.get_ident(), key)
+        while True:
+            result = self.cached(key)
+            if result is not None:
+                return result
+            event = self._in_flight.get(flight_key)
+            if event is None:
+                break
+            await event.wait()
+
+        self._in_flight[flight_key] = event = anyio.Event()
+        started = time.perf_counter()
+        error = None
+        try:
+            try:
+                with anyio.fail_after(self.timeout):
+                    if key[0] == "http":
+                        await anyio.to_thread.run_sync(self._http, key[1], **_ABANDON_ON_CANCEL)
+                    else:
+                        await self._tcp(key[1])
+            except TimeoutError:
+                error = f"timed out after {self.timeout}s"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            result = ProbeResult(key, error is None, (time.perf_counter() - started) * 1000, time.monotonic(), error)
+            with self._lock:
+                self._results[key] = result
+            self.probes_run += 1
+            return result
+        finally:
+            # Waiters re-check the cache, so the result is stored before they wake
+            del self._in_flight[flight_key]
+            event.set()
+
+    # ------------------------------------------------------------ runs
+
+    @staticmethod
+    def _plan(dependencies: Dict[str, List[Dict[str, Any]]]):
+        plans: Dict[str, List[Tuple[Dict[str, Any], List[ProbeKey], bool]]] = {}
+        keys = set()
+        for component, deps in dependencies.items():
+            plans[component] = []
+            for dep in deps:
+                if not dep.get("required", True):
+                    continue
+                probes, default = dependency_probes(dep)
+                plans[component].append((dep, probes, default))
+                keys.update(probes)
+        return plans, keys
+
+    @staticmethod
+    def _report(plans, results: Dict[ProbeKey, ProbeResult], cached: int, started: float) -> PreflightReport:
+        failures: Dict[str, List[str]] = {}
+        for component, plan in plans.items():
+            for dep, probes, default in plan:
+                available = any(results[key].available for key in probes) if probes else default
+                if not available:
+                    failures.setdefault(component, []).append(f"{dep['type']}:{dep.get('name', 'unknown')}")
+        return PreflightReport((time.perf_counter() - started) * 1000, list(results.values()), cached, failures)
+
+    async def run(self, dependencies: Dict[str, List[Dict[str, Any]]]) -> PreflightReport:
+        """Probe every distinct endpoint behind `component -> dependencies` concurrently"""
+        started = time.perf_counter()
+        plans, keys = self._plan(dependencies)
+        results = {key: result for key in keys if (result := self.cached(key)) is not None}
+        cached = len(results)
+        limiter = anyio.CapacityLimiter(self.max_concurrency)
+
+        async def run_probe(key: ProbeKey) -> None:
+            async with limiter:
+                results[key] = await self.probe(key)
+
+        async with anyio.create_task_group() as tg:
+            for key in keys - results.keys():
+                tg.start_soon(run_probe, key)
+
+        report = self._report(plans, results, cached, started)
+        if keys and cached < len(keys):
+            self.logger.info(
+                f"Preflight: {len(keys)} endpoints for {len(dependencies)} components in "
+                f"{report.wall_time_ms:.0f}ms ({cached} cached, {len(report.failures)} components failing)"
+            )
+        return report
+
+    def run_sync(self, dependencies: Dict[str, List[Dict[str, Any]]]) -> PreflightReport:
+        """
+        Blocking `run` for synchronous callers.
+
+        Fresh cached results are returned directly. Otherwise, from a running
+        event loop the probes run on a helper thread with its own loop, since
+        the caller cannot await; that blocks the calling loop until they finish.
+        """
+        started = time.perf_counter()
+        plans, keys = self._plan(dependencies)
+        results = {key: result for key in keys if (result := self.cached(key)) is not None}
+        if len(results) == len(keys):
+            return self._report(plans, results, len(results), started)
+        try:
+            library = sniffio.current_async_library()
+        except sniffio.AsyncLibraryNotFoundError:
+            return anyio.run(self.run, dependencies)
+        self.logger.debug(
+            f"Probing {len(keys) - len(results)} endpoints from a running {library} loop on a helper thread; "
+            f"await run() first to avoid blocking it"
+        )
+        outcome: Dict[str, Any] = {}
+
+        def target() -> None:
+            try:
+                outcome["report"] = anyio.run(self.run, dependencies)
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target, name="dependency-preflight", daemon=True)
+        thread.start()
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["report"]
+
+    def is_available(self, dependency: Dict[str, Any]) -> bool:
+        """Synchronous single-dependency check; served from the cache when fresh"""
+        probes, default = dependency_probes(dependency)
+        if not probes:
+            return default
+        results = [self.cached(key) for key in probes]
+        if all(result is not None for result in results):
+            return any(result.available for result in results)
+        return self.run_sync({"_": [dict(dependency, required=True)]}).ok
+
+    async def is_available_async(self, dependency: Dict[str, Any]) -> bool:
+        """`is_available` for async callers"""
+        probes, default = dependency_probes(dependency)
+        if not probes:
+            return default
+        return (await self.run({"_": [dict(dependency, required=True)]})).ok
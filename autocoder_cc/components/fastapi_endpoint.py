@@ -1,15 +1,46 @@
 #!/usr/bin/env python3
 """FastAPIEndpoint component base – provides FastAPI + uvicorn server startup for generated APIEndpoint components."""
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import anyio
+import anyio.to_thread
+import contextlib
+import multiprocessing
+import os
+import socket
+import tempfile
 import threading
 import uvicorn
 from fastapi import FastAPI
 from .api_endpoint import APIEndpoint
+from .asgi_workers import IPCDispatcher, create_listen_socket, run_worker, supports_reuse_port
 from autocoder_cc.error_handling import ConsistentErrorHandler, handle_errors
+from autocoder_cc.validation.config_requirement import ConfigRequirement, ConfigType
+
+SERVER_MODES = ("thread", "inline", "workers")
+
+
+class _EmbeddedServer(uvicorn.Server):
+    """uvicorn server running inside the harness loop; signal handling stays with the harness"""
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        yield
+
+    def install_signal_handlers(self) -> None:
+        pass
+
 
 class FastAPIEndpoint(APIEndpoint):
-    """Concrete APIEndpoint implementation that spins up a FastAPI application via uvicorn."""
+    """Concrete APIEndpoint implementation that spins up a FastAPI application via uvicorn.
+
+    server_mode:
+      - "thread" (default): uvicorn runs its own loop in a daemon thread.
+      - "inline": uvicorn serves from the harness task group on the harness
+        event loop, so handlers call other components directly.
+      - "workers": `workers` processes accept connections on a SO_REUSEPORT
+        socket and forward requests over a Unix socket to the app running
+        on the harness loop, where the app's lifespan also runs.
+    """
 
     def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
         super().__init__(name, config or {})
@@ -25,6 +56,20 @@ class FastAPIEndpoint(APIEndpoint):
         self.store_component = None  # Store component binding
         self.running = False  # Component lifecycle state
         
+        config = config or {}
+        self.server_mode = config.get("server_mode", "thread")
+        if self.server_mode not in SERVER_MODES:
+            raise ValueError(f"FastAPIEndpoint {name}: server_mode must be one of {SERVER_MODES}")
+        if self.server_mode == "workers" and not supports_reuse_port():
+            raise ValueError(f"FastAPIEndpoint {name}: workers mode needs SO_REUSEPORT, unavailable on this platform")
+        self.workers = config.get("workers") or os.cpu_count() or 1
+        self.ipc_path = config.get("ipc_path") or os.path.join(
+            tempfile.gettempdir(), f"autocoder-{name}-{os.getpid()}.sock"
+        )
+        self._sockets: List[socket.socket] = []
+        self._worker_processes: List[multiprocessing.Process] = []
+        self._dispatcher: Optional[IPCDispatcher] = None
+        
         # Setup consistent error handling (inherits from APIEndpoint which already has error_handler)
         # But we override with FastAPIEndpoint-specific handler
         self.error_handler = ConsistentErrorHandler(f"FastAPIEndpoint.{name}")
@@ -135,7 +180,22 @@ class FastAPIEndpoint(APIEndpoint):
             
             self.logger.info(f"FastAPI app created for {self.name} with task endpoints and input validation")
 
+        if self.server_mode == "workers":
+            # Workers bind the port themselves; requests reach the app through the dispatcher in process()
+            self.running = True
+            self.logger.info(f"API {self.name} setup on {self.host}:{self.port} with {self.workers} workers")
+            return
+
         config = uvicorn.Config(self.app, host=self.host, port=self.port, log_level="info")
+        if self.server_mode == "inline":
+            # Bind now so port conflicts surface during setup; process() serves on the harness loop
+            self._uvicorn_server = _EmbeddedServer(config=config)
+            self._sockets = [create_listen_socket(self.host, self.port)]
+            self.running = True
+            self.server = self._uvicorn_server
+            self.logger.info(f"API {self.name} setup on {self.host}:{self.port} (serving on the harness loop)")
+            return
+
         self._uvicorn_server = uvicorn.Server(config=config)
 
         def _run():
@@ -157,16 +217,104 @@ class FastAPIEndpoint(APIEndpoint):
         
         self.logger.info(f"API {self.name} setup on {self.host}:{self.port}")
 
+    @handle_errors(component_name="FastAPIEndpoint", operation="process")
+    async def process(self) -> None:
+        """Serve HTTP according to server_mode until cancelled or stopped."""
+        if self.server_mode == "inline" and self._uvicorn_server is not None:
+            await self._serve_inline()
+        elif self.server_mode == "workers" and self.app is not None:
+            await self._serve_workers()
+        else:
+            # Thread mode serves from its own thread; just live as long as the harness
+            await anyio.sleep_forever()
+
+    async def _serve_inline(self) -> None:
+        server = self._uvicorn_server
+        try:
+            await server.serve(sockets=self._sockets)
+        except anyio.get_cancelled_exc_class():
+            # Harness cancellation skips uvicorn's own shutdown; close listeners and connections
+            with anyio.CancelScope(shield=True), anyio.move_on_after(5):
+                if server.started:
+                    await server.shutdown(sockets=self._sockets)
+            raise
+        finally:
+            self._close_sockets()
+
+    async def _serve_workers(self) -> None:
+        self._dispatcher = IPCDispatcher(self.app, self.ipc_path)
+        context = multiprocessing.get_context("spawn")
+        try:
+            async with anyio.create_task_group() as tg:
+                await tg.start(self._dispatcher.serve)
+                for _ in range(self.workers):
+                    process = context.Process(
+                        target=run_worker, args=(self.host, self.port, self.ipc_path), daemon=True
+                    )
+                    process.start()
+                    self._worker_processes.append(process)
+                self.logger.info(
+                    f"API {self.name} serving {self.host}:{self.port} from {self.workers} worker processes"
+                )
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self._stop_workers()
+
+    async def _stop_workers(self) -> None:
+        processes, self._worker_processes = self._worker_processes, []
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+        def _join():
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.kill()
+
+        await anyio.to_thread.run_sync(_join)
+
+    def _close_sockets(self) -> None:
+        for sock in self._sockets:
+            sock.close()
+        self._sockets = []
+
     @handle_errors(component_name="FastAPIEndpoint", operation="stop_server")
     async def _stop_server(self):
         if self._uvicorn_server is not None:
             self._uvicorn_server.should_exit = True
         if self._server_thread is not None:
             self._server_thread.join(timeout=5)
+        if self._worker_processes:
+            await self._stop_workers()
         self.running = False
         self.server_task = None
         self.logger.info(f"API {self.name} cleanup complete")
     
+    @classmethod
+    def get_config_requirements(cls) -> List[ConfigRequirement]:
+        """APIEndpoint requirements plus server mode settings"""
+        return super().get_config_requirements() + [
+            ConfigRequirement(
+                name="server_mode",
+                type="str",
+                description="thread: server thread with its own loop; inline: serve on the harness loop; workers: SO_REUSEPORT worker processes",
+                required=False,
+                default="thread",
+                options=list(SERVER_MODES),
+                semantic_type=ConfigType.STRING
+            ),
+            ConfigRequirement(
+                name="workers",
+                type="int",
+                description="Worker processes for workers mode (defaults to the CPU count)",
+                required=False,
+                depends_on={"server_mode": "workers"},
+                semantic_type=ConfigType.INTEGER,
+                validator=lambda x: x > 0
+            )
+        ]
+
     def set_store_component(self, store_component):
         """Set the store component for data operations (from reference pattern)"""
         self.store_component = store_component
@@ -491,12 +491,15 @@ class Filter(ComposedComponent):
             self.filter_stats["filter_errors"] += 1
             self.metrics_collector.record_error(e.__class__.__name__)
             
-            self.structured_logger.error(
-                f"Item processing failed: {e}",
-                operation="item_processing",
-                error=e,
-                tags={"item": str(item)}
-            )
+            # The item itself is never rendered here; during an error storm the
+            # error handler aggregates failures instead of logging each one
+            if not self.error_handler.in_error_storm:
+                self.structured_logger.error(
+                    f"Item processing failed: {e}",
+                    operation="item_processing",
+                    error=e,
+                    tags={"item_type": type(item).__name__}
+                )
             
             # Re-raise to allow error handling upstream
             raise
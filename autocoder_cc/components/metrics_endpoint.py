@@ -296,6 +296,27 @@ class ProductionMetricsEndpoint(MetricsEndpoint):
                     state_value = {"closed": 0, "open": 1, "half_open": 2}.get(cb_data.get("state", "closed"), 0)
                     prometheus_lines.append(f'circuit_breaker_state{{component="{comp_name}"}} {state_value}')
                 
+                # Per-connection stream metrics
+                stream_metrics = metrics.get('streaming', {}).get('stream_metrics', {})
+                for metric, metric_type, field, help_text in (
+                    ("stream_queue_depth", "gauge", "buffer_size", "Items queued on the connection"),
+                    ("stream_buffer_capacity", "gauge", "capacity", "Connection buffer size"),
+                    ("stream_items_received_total", "counter", "items_received", "Items consumed from the connection"),
+                    ("stream_throughput_per_second", "gauge", "throughput_per_second", "Items consumed per second"),
+                    ("stream_send_blocked_seconds_total", "counter", "send_blocked_seconds", "Time producers spent blocked on a full buffer"),
+                    ("stream_oldest_item_age_seconds", "gauge", "oldest_item_age_seconds", "Age of the oldest queued item (consumer lag)"),
+                ):
+                    prometheus_lines.append(f"# HELP {metric} {help_text}")
+                    prometheus_lines.append(f"# TYPE {metric} {metric_type}")
+                    for conn_name, conn_data in stream_metrics.items():
+                        prometheus_lines.append(f'{metric}{{connection="{conn_name}"}} {conn_data[field]}')
+                
+                bottleneck = metrics.get('streaming', {}).get('bottleneck')
+                prometheus_lines.append("# HELP pipeline_bottleneck Stage currently limiting the pipeline (1=bottleneck)")
+                prometheus_lines.append("# TYPE pipeline_bottleneck gauge")
+                if bottleneck:
+                    prometheus_lines.append(f'pipeline_bottleneck{{component="{bottleneck["component"]}"}} 1')
+                
                 # Trace metrics
                 prometheus_lines.append("# HELP active_traces_total Number of active distributed traces")
                 prometheus_lines.append("# TYPE active_traces_total gauge")
@@ -7,6 +7,7 @@ Routes messages based on configurable conditions and rules
 import anyio
 import logging
 import re
+import time
 from typing import Dict, Any, List, Optional, Callable
 from .composed_base import ComposedComponent
 from autocoder_cc.validation.config_requirement import ConfigRequirement, ConfigType
@@ -310,12 +311,9 @@ class Router(ComposedComponent):
                 "original_message": item,
                 "destination": destination,
                 "router_name": self.name,
-                "routing_timestamp": anyio.get_cancelled_exc_class().time()
+                "routing_timestamp": time.time()
             }
             
-            # Record successful routing
-            self.metrics_collector.record_items_processed()
-            
             self.structured_logger.debug(
                 f"Item successfully routed to {destination}",
                 operation="item_routing",
@@ -329,14 +327,16 @@ class Router(ComposedComponent):
         
         except Exception as e:
             self.routing_stats["routing_errors"] += 1
-            self.metrics_collector.record_error(e.__class__.__name__)
             
-            self.structured_logger.error(
-                f"Item routing failed: {e}",
-                operation="item_routing",
-                error=e,
-                tags={"item": str(item)}
-            )
+            # The item itself is never rendered here; during an error storm the
+            # error handler aggregates failures instead of logging each one
+            if not self.error_handler.in_error_storm:
+                self.structured_logger.error(
+                    f"Item routing failed: {e}",
+                    operation="item_routing",
+                    error=e,
+                    tags={"item_type": type(item).__name__}
+                )
             
             # Re-raise to allow error handling upstream
             raise
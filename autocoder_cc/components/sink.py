@@ -3,8 +3,10 @@
 Sink component for Autocoder V5.2 System-First Architecture
 """
 import anyio
+import os
 from typing import Dict, Any, Optional, List
 from .composed_base import ComposedComponent
+from .sink_writer import IsoTimestampClock, RotatingFileWriter
 from autocoder_cc.error_handling import ConsistentErrorHandler, handle_errors
 from autocoder_cc.validation.config_requirement import ConfigRequirement, ConfigType
 
@@ -19,6 +21,9 @@ class Sink(ComposedComponent):
         super().__init__(name, config)
         self.component_type = "Sink"
         self.collected_data = []
+        # Default file output for generated sinks: opened lazily, kept open, flushed in batches
+        self._file_writer: Optional[RotatingFileWriter] = None
+        self._timestamps = IsoTimestampClock()
         
         # Note: ConsistentErrorHandler already initialized in ComposedComponent
 
@@ -61,8 +66,12 @@ class Sink(ComposedComponent):
             # Process all available input streams (not just 'input')
             if self.receive_streams:
                 async with anyio.create_task_group() as tg:
-                    for stream_name, stream in self.receive_streams.items():
-                        tg.start_soon(self._process_stream, stream_name, stream)
+                    tg.start_soon(self._run_flush_timer)
+                    async with anyio.create_task_group() as streams:
+                        for stream_name, stream in self.receive_streams.items():
+                            streams.start_soon(self._process_stream, stream_name, stream)
+                    tg.cancel_scope.cancel()
+                await self._close_file_writer()
             else:
                 self.logger.warning("No input stream configured")
                 
@@ -75,6 +84,55 @@ class Sink(ComposedComponent):
             self.record_error(str(e))
             raise
     
+    async def _run_flush_timer(self) -> None:
+        """Flush buffered file output on the configured interval while streams are idle"""
+        while True:
+            await anyio.sleep(self._output_setting("flush_interval", 10.0))
+            if self._file_writer is not None:
+                try:
+                    await self._file_writer.flush()
+                except Exception as e:
+                    await self.error_handler.handle_exception(
+                        e,
+                        context={"component": self.name, "writer_stats": self._file_writer.get_stats()},
+                        operation="file_flush"
+                    )
+
+    def _output_setting(self, key: str, default: Any) -> Any:
+        # Per-output settings override the component-level ones
+        output_config = self.config.get("output", {}) if self.config else {}
+        return output_config.get(key, self.config.get(key, default) if self.config else default)
+
+    def _get_file_writer(self) -> RotatingFileWriter:
+        if self._file_writer is None:
+            output_config = self.config.get("output", {})
+            filepath = os.path.join(
+                output_config.get("directory", "./output"),
+                output_config.get("filename", f"{self.name}_output.json")
+            )
+            self._file_writer = RotatingFileWriter(
+                filepath,
+                flush_records=self._output_setting("batch_size", 100),
+                flush_interval=self._output_setting("flush_interval", 10.0),
+                fsync=self._output_setting("fsync_policy", "rotate"),
+                max_file_size=self._output_setting("max_file_size", 1073741824),
+                rotate_interval=self._output_setting("rotate_interval", None),
+                compression=self._output_setting("compression", "none"),
+                max_rotated_files=self._output_setting("max_rotated_files", None),
+            )
+            self.logger.info(f"Sink {self.name} writing to {filepath}")
+        return self._file_writer
+
+    async def _close_file_writer(self) -> None:
+        if self._file_writer is not None:
+            writer, self._file_writer = self._file_writer, None
+            await writer.close()
+            self._status.metadata["file_output"] = writer.get_stats()
+
+    async def cleanup(self) -> None:
+        """Flush and close buffered file output"""
+        await self._close_file_writer()
+
     async def _process_stream(self, stream_name: str, stream):
         """Process a single input stream using the shared base class method"""
         try:
@@ -96,40 +154,21 @@ class Sink(ComposedComponent):
         class_name = self.__class__.__name__
         if class_name.startswith('Generated'):
             # Generated component - provide working default implementation
-            self.logger.info(f"Generated component {class_name} using default file sink")
-            
-            # Provide working default output for generated components
             output_config = self.config.get("output", {})
             output_type = output_config.get("type", "file")
             
             if output_type == "file":
-                # File output implementation
-                import json
-                import os
-                from datetime import datetime
-                
-                output_dir = output_config.get("directory", "./output")
-                os.makedirs(output_dir, exist_ok=True)
-                
-                filename = output_config.get("filename", f"{self.name}_output.json")
-                filepath = os.path.join(output_dir, filename)
-                
-                # Append data to file with timestamp
-                output_record = {
-                    "timestamp": datetime.utcnow().isoformat(),
+                # Buffered append with timestamp; the writer batches, rotates and flushes off-loop
+                await self._get_file_writer().write({
+                    "timestamp": self._timestamps.now(),
                     "component": self.name,
-                    "data": data
-                }
-                
-                with open(filepath, "a") as f:
-                    f.write(json.dumps(output_record) + "\n")
-                
-                self.logger.info(f"Data written to {filepath}")
+                    "data": inputs
+                })
                 
             elif output_type == "console":
                 # Console output implementation
                 import json
-                print(f"[{self.name}] {json.dumps(data, indent=2)}")
+                print(f"[{self.name}] {json.dumps(inputs, indent=2)}")
                 self.logger.info("Data written to console")
                 
             elif output_type == "memory":
@@ -137,14 +176,14 @@ class Sink(ComposedComponent):
                 if not hasattr(self, "_collected_data"):
                     self._collected_data = []
                 self._collected_data.append({
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "data": data
+                    "timestamp": self._timestamps.now(),
+                    "data": inputs
                 })
                 self.logger.info(f"Data collected in memory ({len(self._collected_data)} items)")
                 
             else:
                 # Default: log the data
-                self.logger.info(f"Sink output: {data}")
+                self.logger.info(f"Sink output: {inputs}")
             
             return True
         else:
@@ -208,7 +247,7 @@ class Sink(ComposedComponent):
                 description="Compression format for output files",
                 required=False,
                 default="none",
-                options=["none", "gzip", "snappy", "lz4", "zstd"],
+                options=["none", "gzip", "bz2", "xz"],
                 depends_on={"output_format": ["json", "csv", "parquet"]}
             ),
             ConfigRequirement(
@@ -245,6 +284,31 @@ class Sink(ComposedComponent):
                 depends_on={"output_destination": ["file://", "s3://", "gs://", "hdfs://"]},
                 validator=lambda x: x > 0
             ),
+            ConfigRequirement(
+                name="fsync_policy",
+                type="str",
+                description="When to fsync file output: never, on rotation/close, or after every flush",
+                required=False,
+                default="rotate",
+                options=["never", "rotate", "always"],
+                depends_on={"output_destination": ["file://"]}
+            ),
+            ConfigRequirement(
+                name="rotate_interval",
+                type="float",
+                description="Maximum age in seconds of an output file before rotation",
+                required=False,
+                depends_on={"output_destination": ["file://"]},
+                validator=lambda x: x > 0
+            ),
+            ConfigRequirement(
+                name="max_rotated_files",
+                type="int",
+                description="Number of rotated output files to keep (all if unset)",
+                required=False,
+                depends_on={"output_destination": ["file://"]},
+                validator=lambda x: x > 0
+            ),
             ConfigRequirement(
                 name="authentication",
                 type="dict",
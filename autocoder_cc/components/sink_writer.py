@@ -0,0 +1,209 @@
+"""
+Buffered, rotating file writer for Sink output.
+
+Records are serialized into an in-memory buffer on the event loop and
+written to a persistently open file from a worker thread, in batches, when
+the buffer reaches `flush_records` or `flush_interval` seconds pass. The
+active file is rotated by size and/or age; rotated files are optionally
+compressed (also off the event loop).
+"""
+import bz2
+import gzip
+import json
+import lzma
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import anyio
+import anyio.to_thread
+
+from autocoder_cc.observability import get_logger
+
+FSYNC_POLICIES = ("never", "rotate", "always")
+
+# Shared encoder: json.dumps(default=...) would build a new JSONEncoder per record
+_encode_json = json.JSONEncoder(default=str).encode
+
+# Compressors for rotated files: suffix and file opener
+COMPRESSORS = {
+    "gzip": (".gz", gzip.open),
+    "bz2": (".bz2", bz2.open),
+    "xz": (".xz", lzma.open),
+}
+
+
+class IsoTimestampClock:
+    """ISO-8601 UTC timestamps, re-formatted at most once per `resolution` seconds"""
+
+    def __init__(self, resolution: float = 0.001):
+        self.resolution = resolution
+        self._last = 0.0
+        self._value = ""
+
+    def now(self) -> str:
+        t = time.time()
+        if t - self._last >= self.resolution:
+            self._last = t
+            self._value = datetime.fromtimestamp(t, tz=timezone.utc).replace(tzinfo=None).isoformat()
+        return self._value
+
+
+class RotatingFileWriter:
+    """
+    Append-only line writer with batched flushes and size/time rotation.
+
+    fsync policy:
+      - "never":  leave durability to the OS page cache
+      - "rotate": fsync when a file is closed or rotated (default)
+      - "always": fsync after every flush
+    """
+
+    def __init__(self,
+                 path: str,
+                 flush_records: int = 100,
+                 flush_interval: float = 10.0,
+                 fsync: str = "rotate",
+                 max_file_size: Optional[int] = None,
+                 rotate_interval: Optional[float] = None,
+                 compression: Optional[str] = None,
+                 max_rotated_files: Optional[int] = None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got '{fsync}'")
+        if compression in (None, "none"):
+            compression = None
+        elif compression not in COMPRESSORS:
+            raise ValueError(
+                f"Unsupported compression '{compression}'; supported: none, {', '.join(COMPRESSORS)}"
+            )
+        self.path = Path(path)
+        self.flush_records = max(1, flush_records)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_file_size = max_file_size
+        self.rotate_interval = rotate_interval
+        self.compression = compression
+        self.max_rotated_files = max_rotated_files
+        self.logger = get_logger(f"RotatingFileWriter.{self.path.name}")
+
+        self._buffer: List[str] = []
+        self._file = None
+        self._file_size = 0
+        self._file_opened_at = 0.0
+        self._last_flush = time.monotonic()
+        # Serializes worker-thread writes so batches land in order
+        self._lock = anyio.Lock()
+
+        self.records_written = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.rotations = 0
+
+    # ---------------------------------------------------------------- writes
+
+    async def write(self, record: Any) -> None:
+        """Buffer one record as a JSON line; flush if the batch is full or due"""
+        self._buffer.append(_encode_json(record) + "\n")
+        if len(self._buffer) >= self.flush_records or \
+                time.monotonic() - self._last_flush >= self.flush_interval:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered records from a worker thread"""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        async with self._lock:
+            await anyio.to_thread.run_sync(self._write_batch, batch)
+
+    async def close(self) -> None:
+        """Flush remaining records and close the active file"""
+        await self.flush()
+        async with self._lock:
+            await anyio.to_thread.run_sync(self._close_file)
+
+    # ------------------------------------------------------- worker thread
+
+    def _write_batch(self, batch: List[str]) -> None:
+        data = "".join(batch).encode("utf-8")
+        if self._file is not None and self._should_rotate(len(data)):
+            self._rotate()
+        if self._file is None:
+            self._open_file()
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync == "always":
+            os.fsync(self._file.fileno())
+        self._file_size += len(data)
+        self.records_written += len(batch)
+        self.bytes_written += len(data)
+        self.flushes += 1
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self.max_file_size is not None and self._file_size > 0 and \
+                self._file_size + incoming > self.max_file_size:
+            return True
+        return self.rotate_interval is not None and \
+            time.time() - self._file_opened_at >= self.rotate_interval
+
+    def _open_file(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Unbuffered: batches are already joined, so each flush is one write syscall
+        self._file = open(self.path, "ab", buffering=0)
+        self._file_size = self._file.seek(0, os.SEEK_END)
+        self._file_opened_at = time.time()
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def _rotate(self) -> None:
+        self._close_file()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        os.replace(self.path, rotated)
+        if self.compression is not None:
+            rotated = self._compress(rotated)
+        self.rotations += 1
+        self.logger.info(f"Rotated {self.path.name} -> {rotated.name}")
+        if self.max_rotated_files is not None:
+            self._prune()
+
+    def _compress(self, source: Path) -> Path:
+        suffix, opener = COMPRESSORS[self.compression]
+        target = source.with_name(source.name + suffix)
+        with open(source, "rb") as src, opener(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+        if self.fsync != "never":
+            with open(target, "rb") as f:
+                os.fsync(f.fileno())
+        source.unlink()
+        return target
+
+    def _prune(self) -> None:
+        rotated = sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}*"))
+        rotated = [p for p in rotated if p != self.path]
+        for old in rotated[:-self.max_rotated_files]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "buffered_records": len(self._buffer),
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "flushes": self.flushes,
+            "rotations": self.rotations,
+            "current_file_size": self._file_size,
+        }
@@ -3,11 +3,14 @@
 Store component for Autocoder Production Architecture
 """
 import anyio
+import copy
 import json
 from typing import Dict, Any, Optional, List
 from .composed_base import ComposedComponent
 from autocoder_cc.error_handling import ConsistentErrorHandler, handle_errors
 from autocoder_cc.validation.config_requirement import ConfigRequirement, ConfigType
+from autocoder_cc.checkpoint.state import StateDelta, TrackedDict
+from autocoder_cc.database.pool import open_pool_from_url
 
 
 class Store(ComposedComponent):
@@ -23,13 +26,15 @@ class Store(ComposedComponent):
         super().__init__(name, config)
         self.component_type = "Store"
         self.db_client = None
+        self.db_pool = None  # Pooled PostgreSQL/SQLite access
         self.database_type = None
         self.connection_url = None
         
         # Add CRUD operations attributes from reference pattern
         self.storage_type = config.get("storage_type", "memory") if config else "memory"
-        self._items = {}
-        self.tasks = {}  # Task storage for TaskStore functionality
+        # Change-tracked so memory storage can be checkpointed incrementally
+        self._items = TrackedDict(copy_value=copy.copy)
+        self.tasks = TrackedDict(copy_value=copy.copy)  # Task storage for TaskStore functionality
         self._next_id = 1  # Next ID for task/item generation
         self.running = False  # Component lifecycle state
         
@@ -56,6 +61,8 @@ class Store(ComposedComponent):
                         
                         if self.database_type == 'postgresql':
                             self.connection_url = f"postgresql://{user}:{password}@{host}:{port}/{database}"
+                        elif self.database_type == 'sqlite':
+                            self.connection_url = f"sqlite:///{config.get('database_path', database + '.db')}"
                         elif self.database_type == 'mysql':
                             self.connection_url = f"mysql://{user}:{password}@{host}:{port}/{database}"
                     except ImportError:
@@ -94,6 +101,15 @@ class Store(ComposedComponent):
                 default=10,
                 semantic_type=ConfigType.INTEGER,
                 validator=lambda x: 1 <= x <= 100
+            ),
+            ConfigRequirement(
+                name="sqlite_readers",
+                type="int",
+                description="SQLite reader connections serving queries next to the single writer",
+                required=False,
+                default=4,
+                semantic_type=ConfigType.INTEGER,
+                validator=lambda x: 0 <= x <= 64
             )
         ]
 
@@ -120,6 +136,9 @@ class Store(ComposedComponent):
     async def cleanup(self):
         """Cleanup store - disconnect from database or clear memory storage"""
         try:
+            if self.db_pool:
+                await self.db_pool.close()
+                self.db_pool = None
             if self.db_client:
                 await self.db_client.disconnect()
             await super().cleanup()
@@ -139,14 +158,16 @@ class Store(ComposedComponent):
     async def _connect_storage(self):
         """Initialize real database client based on configuration"""
         try:
-            import databases
-            
-            self.db_client = databases.Database(self.connection_url)
-            await self.db_client.connect()
+            if self.database_type in ('postgresql', 'sqlite'):
+                self.db_pool = await open_pool_from_url(
+                    self.connection_url,
+                    size=self.config.get('connection_pool_size', 10),
+                    readers=self.config.get('sqlite_readers', 4)
+                )
             
             # Create table if it doesn't exist
             if self.database_type == 'postgresql':
-                await self.db_client.execute(f"""
+                await self.db_pool.execute(f"""
                     CREATE TABLE IF NOT EXISTS {self.table_name} (
                         id SERIAL PRIMARY KEY,
                         key VARCHAR(255) UNIQUE NOT NULL,
@@ -155,7 +176,21 @@ class Store(ComposedComponent):
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
+            elif self.database_type == 'sqlite':
+                await self.db_pool.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {self.table_name} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        key TEXT UNIQUE NOT NULL,
+                        value TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
             elif self.database_type == 'mysql':
+                # No pooled MySQL driver; keep the databases library client
+                import databases
+                self.db_client = databases.Database(self.connection_url)
+                await self.db_client.connect()
                 await self.db_client.execute(f"""
                     CREATE TABLE IF NOT EXISTS {self.table_name} (
                         id INT AUTO_INCREMENT PRIMARY KEY,
@@ -217,26 +252,15 @@ class Store(ComposedComponent):
         This performs real INSERT/UPDATE operations for production readiness.
         """
         try:
-            if not self.db_client:
+            if not self.db_client and not self.db_pool:
                 raise RuntimeError("Database client not connected")
             
-            # Extract key and value from input data
-            key = data.get('key', f"auto_key_{self._status.items_processed}")
-            value = data.get('value', data)
-            
-            # Convert value to JSON string for storage
-            value_json = json.dumps(value) if not isinstance(value, str) else value
+            key, value_json = self._key_value(data)
             
             # Perform INSERT or UPDATE based on database type
-            if self.database_type == 'postgresql':
-                # Use PostgreSQL UPSERT (INSERT ... ON CONFLICT)
-                query = f"""
-                    INSERT INTO {self.table_name} (key, value, updated_at) 
-                    VALUES (:key, :value, CURRENT_TIMESTAMP)
-                    ON CONFLICT (key) 
-                    DO UPDATE SET value = :value, updated_at = CURRENT_TIMESTAMP
-                """
-                await self.db_client.execute(query, {"key": key, "value": value_json})
+            if self.db_pool:
+                # PostgreSQL and SQLite share the INSERT ... ON CONFLICT upsert
+                await self.db_pool.execute(self._upsert_query(), {"key": key, "value": value_json})
                 
             elif self.database_type == 'mysql':
                 # Use MySQL ON DUPLICATE KEY UPDATE
@@ -271,6 +295,39 @@ class Store(ComposedComponent):
                 "original_data": data
             }
     
+    def _key_value(self, data: Dict[str, Any]):
+        """Storage key and JSON-encoded value for an input item"""
+        key = data.get('key', f"auto_key_{self._status.items_processed}")
+        value = data.get('value', data)
+        return key, json.dumps(value) if not isinstance(value, str) else value
+    
+    def _upsert_query(self) -> str:
+        return f"""
+            INSERT INTO {self.table_name} (key, value, updated_at)
+            VALUES (:key, :value, CURRENT_TIMESTAMP)
+            ON CONFLICT (key)
+            DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+        """
+    
+    async def store_many(self, items: List[Dict[str, Any]]) -> int:
+        """Upsert a batch of items in one transaction (pooled databases only)"""
+        if not self.db_pool:
+            raise RuntimeError("Batch storage requires a pooled PostgreSQL or SQLite connection")
+        rows = [dict(zip(("key", "value"), self._key_value(item))) for item in items]
+        return await self.db_pool.execute_many(self._upsert_query(), rows)
+    
+    async def fetch_value(self, key: str) -> Any:
+        """Read a stored value by key; SQLite serves this from its reader connections"""
+        if not self.db_pool:
+            raise RuntimeError("Database reads require a pooled PostgreSQL or SQLite connection")
+        row = await self.db_pool.fetch_one(
+            f"SELECT value FROM {self.table_name} WHERE key = :key", {"key": key}
+        )
+        if row is None:
+            return None
+        value = row["value"]
+        return json.loads(value) if isinstance(value, str) else value
+    
     async def process_item(self, item: Any) -> Any:
         """Process CRUD operations on tasks (from reference pattern)"""
         try:
@@ -301,6 +358,7 @@ class Store(ComposedComponent):
                 if task_id in self.tasks:
                     # Update task data while preserving id
                     updated_data = {**self.tasks[task_id]["data"], **item["data"]}
+                    self.tasks.mark_dirty(task_id)
                     self.tasks[task_id]["data"] = updated_data
                     return {"status": "success", "data": self.tasks[task_id]}
                 else:
@@ -335,9 +393,29 @@ class Store(ComposedComponent):
             "storage_type": self.storage_type,
             "healthy": True,
             "task_count": len(self.tasks),
-            "next_id": self._next_id
+            "next_id": self._next_id,
+            "database_pool": self.db_pool.get_metrics() if self.db_pool else None
         }
     
+    def checkpoint_delta(self) -> Dict[str, Any]:
+        """Changes to memory storage since the previous checkpoint"""
+        if self.storage_type != "memory":
+            return {}  # Database-backed stores persist themselves
+        return {
+            "items": self._items.begin_delta(),
+            "tasks": self.tasks.begin_delta(),
+            "counters": StateDelta.full({"next_id": self._next_id}),
+        }
+    
+    def restore_checkpoint(self, state: Dict[str, Dict[Any, Any]]) -> None:
+        """Reload memory storage from a checkpoint"""
+        if self.storage_type != "memory":
+            return
+        self._items = TrackedDict(state.get("items", {}), copy_value=copy.copy)
+        self.tasks = TrackedDict(state.get("tasks", {}), copy_value=copy.copy)
+        self._next_id = state.get("counters", {}).get("next_id", self._next_id)
+        self.logger.info(f"Store {self.name} restored {len(self._items)} items and {len(self.tasks)} tasks")
+    
     def get(self, item_id):
         """Get an item by ID (from reference pattern)"""
         return self._items.get(item_id)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Memory-bounded deduplication for StreamProcessor
+
+Keys are reduced to 64-bit hashes instead of being stored as strings.
+Two strategies share one interface (`check_and_add`):
+
+- ExactDeduplicator: hashed keys in time-rotated generations of
+  insertion-ordered dicts. The only errors are 64-bit hash collisions,
+  which are negligible.
+- BloomDeduplicator: rotating Bloom filters sized from an expected item
+  count and a false-positive budget, or from a fixed memory budget.
+  Memory does not depend on stream length. For example, 1B events per
+  7-day TTL at a 1% false-positive budget needs about 2.1 GB with the
+  default 4 generations. `memory_budget_bytes` caps this instead.
+  A generation that reaches its share of `expected_items` rotates early,
+  so a burst shortens how long keys are remembered rather than
+  overfilling a filter past its false-positive budget.
+
+With a TTL, a key is remembered for at least `ttl` seconds after it is
+first seen. State is split into `generations` buckets, each spanning
+ttl / (generations - 1) seconds, and the oldest bucket is dropped
+whenever a new one starts.
+"""
+import hashlib
+import math
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from autocoder_cc.checkpoint.state import LazyValue, StateDelta
+
+DEDUP_MODES = ("exact", "probabilistic")
+
+# Bloom filter checkpoint granularity: 4 KiB pages of bits
+PAGE_SHIFT = 15
+PAGE_BYTES = (1 << PAGE_SHIFT) // 8
+
+
+def hash_key_64(value: str) -> int:
+    """Stable 64-bit hash of a dedup key"""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def bloom_bits_for(expected_items: int, false_positive_rate: float) -> int:
+    """Bits a single Bloom filter needs for `expected_items` at the given false-positive rate"""
+    return max(64, math.ceil(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+
+
+class _Generations:
+    """Time-based (and optionally count-based) rotation of per-generation state"""
+
+    def __init__(self, ttl: Optional[float], generations: int, factory: Callable[[], Any],
+                 clock: Callable[[], float]):
+        if ttl is not None and generations < 2:
+            raise ValueError("TTL-based deduplication needs at least 2 generations")
+        self.ttl = ttl
+        self.factory = factory
+        self.clock = clock
+        self.size = generations if ttl is not None else 1
+        self.interval = ttl / (generations - 1) if ttl is not None else None
+        self.buckets: Deque[Any] = deque([factory()])
+        # Stable generation ids identify buckets in checkpoints
+        self.ids: Deque[int] = deque([0])
+        self.next_id = 1
+        self.rotated_at = clock()
+        self.rotations = 0
+
+    def rotate(self, now: float) -> List[int]:
+        """Start new generations for every elapsed interval; returns ids of dropped ones"""
+        if self.interval is None or now - self.rotated_at < self.interval:
+            return []
+        # Catch up on every interval that elapsed while the stream was idle
+        steps = int((now - self.rotated_at) // self.interval)
+        self.rotated_at += steps * self.interval
+        dropped = []
+        for _ in range(min(steps, self.size)):
+            dropped.extend(self._start_generation())
+        return dropped
+
+    def advance(self, now: float) -> List[int]:
+        """Start a new generation immediately; returns the id of the dropped one, if any"""
+        self.rotated_at = now
+        return self._start_generation()
+
+    def _start_generation(self) -> List[int]:
+        self.buckets.appendleft(self.factory())
+        self.ids.appendleft(self.next_id)
+        self.next_id += 1
+        self.rotations += 1
+        if len(self.buckets) > self.size:
+            self.buckets.pop()
+            return [self.ids.pop()]
+        return []
+
+    @property
+    def current(self) -> Any:
+        return self.buckets[0]
+
+    @property
+    def current_id(self) -> int:
+        return self.ids[0]
+
+    def export(self) -> Dict[str, Any]:
+        return {"ids": list(self.ids), "next_id": self.next_id,
+                "rotated_at": self.rotated_at, "rotations": self.rotations}
+
+    def restore(self, exported: Dict[str, Any]) -> None:
+        ids = exported.get("ids") or [0]
+        self.ids = deque(ids)
+        self.buckets = deque(self.factory() for _ in ids)
+        self.next_id = exported.get("next_id", max(ids) + 1)
+        self.rotated_at = exported.get("rotated_at", self.rotated_at)
+        self.rotations = exported.get("rotations", 0)
+
+
+class ExactDeduplicator:
+    """Exact deduplication over 64-bit key hashes with optional TTL
+
+    Each generation is a dict used as an insertion-ordered set, so a
+    checkpoint segment is just a range of positions in it: the hashes are
+    never held a second time for checkpointing.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, generations: int = 4,
+                 clock: Callable[[], float] = time.time):
+        self._generations = _Generations(ttl, generations, dict, clock)
+        self.clock = clock
+        self.checked = 0
+        self.duplicates = 0
+        # Checkpoint tracking: hashes already captured per generation, and the
+        # (generation id, segment number) keys persisted for each generation
+        self._captured: Dict[int, int] = {}
+        self._segment_keys: Dict[int, List[Tuple[int, int]]] = {}
+        self._dropped_segments: Set[Tuple[int, int]] = set()
+        self._segment_number = 0
+
+    def check_and_add(self, key: str, now: Optional[float] = None) -> bool:
+        """Return True if `key` has not been seen within the TTL, recording it"""
+        self._rotate(self.clock() if now is None else now)
+        digest = hash_key_64(key)
+        self.checked += 1
+        for bucket in self._generations.buckets:
+            if digest in bucket:
+                self.duplicates += 1
+                return False
+        self._generations.current[digest] = None
+        return True
+
+    def _rotate(self, now: float) -> None:
+        for generation_id in self._generations.rotate(now):
+            self._captured.pop(generation_id, None)
+            self._dropped_segments.update(self._segment_keys.pop(generation_id, ()))
+
+    def checkpoint_delta(self) -> Dict[str, StateDelta]:
+        """Hashes added since the previous checkpoint, as append-only segments
+
+        Only position ranges are recorded here; the writer slices them out
+        of the generation later. Generations are append-only, so a range
+        still holds exactly the hashes it held at capture.
+        """
+        changes = {}
+        for generation_id, bucket in zip(self._generations.ids, self._generations.buckets):
+            start = self._captured.get(generation_id, 0)
+            end = len(bucket)
+            if end > start:
+                segment_key = (generation_id, self._segment_number)
+                self._segment_number += 1
+                changes[segment_key] = LazyValue(
+                    lambda bucket=bucket, start=start, end=end: list(islice(bucket, start, end))
+                )
+                self._segment_keys.setdefault(generation_id, []).append(segment_key)
+                self._captured[generation_id] = end
+        delta = StateDelta(changes=changes, deleted=self._dropped_segments)
+        self._dropped_segments = set()
+        return {
+            "segments": delta,
+            "generations": StateDelta.full({**self._generations.export(), "segment_number": self._segment_number,
+                                            "checked": self.checked, "duplicates": self.duplicates}),
+        }
+
+    def restore(self, state: Dict[str, Dict[Any, Any]]) -> None:
+        """Rebuild hash sets from checkpointed segments"""
+        generations = state.get("generations", {})
+        self._generations.restore(generations)
+        self._segment_number = generations.get("segment_number", 0)
+        self.checked = generations.get("checked", 0)
+        self.duplicates = generations.get("duplicates", 0)
+        buckets = dict(zip(self._generations.ids, self._generations.buckets))
+        self._segment_keys = {}
+        for (generation_id, number), hashes in state.get("segments", {}).items():
+            bucket = buckets.get(generation_id)
+            if bucket is not None:
+                bucket.update(dict.fromkeys(hashes))
+                self._segment_keys.setdefault(generation_id, []).append((generation_id, number))
+        # Everything restored is already persisted
+        self._captured = {generation_id: len(bucket) for generation_id, bucket in buckets.items()}
+        self._dropped_segments = set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tracked keys and duplicate counters"""
+        return {
+            "mode": "exact",
+            "tracked_keys": sum(len(bucket) for bucket in self._generations.buckets),
+            "generations": len(self._generations.buckets),
+            "rotations": self._generations.rotations,
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+        }
+
+
+class _BloomFilter:
+    __slots__ = ("bits", "count")
+
+    def __init__(self, num_bits: int):
+        self.bits = bytearray((num_bits + 7) // 8)
+        self.count = 0
+
+
+class BloomDeduplicator:
+    """Probabilistic deduplication with rotating Bloom filters and a fixed memory footprint"""
+
+    def __init__(self, expected_items: int = 1_000_000, false_positive_rate: float = 0.001,
+                 ttl: Optional[float] = None, generations: int = 4,
+                 memory_budget_bytes: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        filters = generations if ttl is not None else 1
+        # Each generation holds roughly its share of the items seen per TTL
+        self.items_per_filter = max(1, math.ceil(expected_items / max(filters - 1, 1)))
+        # Lookups consult every filter, so split the false-positive budget across them
+        self.target_false_positive_rate = false_positive_rate
+        per_filter_rate = false_positive_rate / filters
+        if memory_budget_bytes is not None:
+            self.num_bits = max(64, memory_budget_bytes * 8 // filters)
+        else:
+            self.num_bits = bloom_bits_for(self.items_per_filter, per_filter_rate)
+        self.num_hashes = max(1, round(self.num_bits / self.items_per_filter * math.log(2)))
+        self._generations = _Generations(ttl, generations, lambda: _BloomFilter(self.num_bits), clock)
+        self.clock = clock
+        self.checked = 0
+        self.duplicates = 0
+        # Checkpoint tracking: pages written since the last checkpoint, and every page persisted
+        self._dirty_pages: Set[int] = set()
+        self._persisted_pages: Dict[int, Set[int]] = {}
+        self._dropped_pages: Set[Tuple[int, int]] = set()
+        self._pending: Dict[int, Tuple[_BloomFilter, Set[int]]] = {}
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def check_and_add(self, key: str, now: Optional[float] = None) -> bool:
+        """Return True if `key` is (probably) new within the TTL, recording it"""
+        now = self.clock() if now is None else now
+        self._rotate(now)
+        positions = self._positions(key)
+        self.checked += 1
+        for bloom in self._generations.buckets:
+            bits = bloom.bits
+            if all(bits[p >> 3] & (1 << (p & 7)) for p in positions):
+                self.duplicates += 1
+                return False
+        current = self._generations.current
+        bits = current.bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self._dirty_pages.update(p >> PAGE_SHIFT for p in positions)
+        current.count += 1
+        # A burst would overfill the filter; start the next generation early instead.
+        # Without a TTL there is a single filter and nothing may be forgotten.
+        if current.count >= self.items_per_filter and self._generations.interval is not None:
+            self._rotate(now, full=True)
+        return True
+
+    def _rotate(self, now: float, full: bool = False) -> None:
+        current_id = self._generations.current_id
+        current = self._generations.current
+        dropped = self._generations.advance(now) if full else self._generations.rotate(now)
+        if self._generations.current_id != current_id and self._dirty_pages:
+            # Pages of the outgoing generation no longer change; persist them next checkpoint
+            self._pending_pages(current_id, current)
+        for generation_id in dropped:
+            self._dropped_pages.update((generation_id, page) for page in self._persisted_pages.pop(generation_id, ()))
+            self._pending.pop(generation_id, None)
+
+    def _pending_pages(self, generation_id: int, bloom: _BloomFilter) -> None:
+        self._pending.setdefault(generation_id, (bloom, set()))[1].update(self._dirty_pages)
+        self._dirty_pages = set()
+
+    def checkpoint_delta(self) -> Dict[str, StateDelta]:
+        """Dirty 4 KiB pages since the previous checkpoint
+
+        Page bytes are read lazily by the checkpoint writer. Bloom bits only
+        ever get set, so a page read slightly later is still a valid snapshot.
+        """
+        if self._dirty_pages:
+            self._pending_pages(self._generations.current_id, self._generations.current)
+        changes = {}
+        for generation_id, (bloom, pages) in self._pending.items():
+            persisted = self._persisted_pages.setdefault(generation_id, set())
+            for page in pages:
+                start = page * PAGE_BYTES
+                changes[(generation_id, page)] = LazyValue(
+                    lambda bits=bloom.bits, start=start: bytes(bits[start:start + PAGE_BYTES])
+                )
+                persisted.add(page)
+        self._pending.clear()
+        delta = StateDelta(changes=changes, deleted=self._dropped_pages)
+        self._dropped_pages = set()
+        counts = {generation_id: bloom.count
+                  for generation_id, bloom in zip(self._generations.ids, self._generations.buckets)}
+        return {
+            "pages": delta,
+            "generations": StateDelta.full({**self._generations.export(), "counts": counts,
+                                            "num_bits": self.num_bits,
+                                            "checked": self.checked, "duplicates": self.duplicates}),
+        }
+
+    def restore(self, state: Dict[str, Dict[Any, Any]]) -> None:
+        """Rebuild filter bits from checkpointed pages"""
+        generations = state.get("generations", {})
+        if generations.get("num_bits", self.num_bits) != self.num_bits:
+            raise ValueError("Checkpointed Bloom filter was sized differently; cannot restore")
+        self._generations.restore(generations)
+        counts = generations.get("counts", {})
+        self.checked = generations.get("checked", 0)
+        self.duplicates = generations.get("duplicates", 0)
+        blooms = dict(zip(self._generations.ids, self._generations.buckets))
+        for generation_id, bloom in blooms.items():
+            bloom.count = counts.get(generation_id, 0)
+        self._persisted_pages = {}
+        for (generation_id, page), data in state.get("pages", {}).items():
+            bloom = blooms.get(generation_id)
+            if bloom is not None:
+                start = page * PAGE_BYTES
+                bloom.bits[start:start + len(data)] = data
+                self._persisted_pages.setdefault(generation_id, set()).add(page)
+
+    def estimated_false_positive_rate(self) -> float:
+        """False-positive probability implied by the current fill of every filter"""
+        miss = 1.0
+        for bloom in self._generations.buckets:
+            miss *= 1 - (1 - math.exp(-self.num_hashes * bloom.count / self.num_bits)) ** self.num_hashes
+        return 1 - miss
+
+    def projected_false_positive_rate(self) -> float:
+        """False-positive probability once every filter holds its expected share of items"""
+        per_filter = (1 - math.exp(-self.num_hashes * self.items_per_filter / self.num_bits)) ** self.num_hashes
+        return 1 - (1 - per_filter) ** self._generations.size
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._generations.size * ((self.num_bits + 7) // 8)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sizing, fill and duplicate counters"""
+        return {
+            "mode": "probabilistic",
+            "memory_bytes": self.memory_bytes,
+            "bits_per_filter": self.num_bits,
+            "hash_functions": self.num_hashes,
+            "generations": len(self._generations.buckets),
+            "rotations": self._generations.rotations,
+            "target_false_positive_rate": self.target_false_positive_rate,
+            "projected_false_positive_rate": self.projected_false_positive_rate(),
+            "estimated_false_positive_rate": self.estimated_false_positive_rate(),
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+        }
+
+
+def create_deduplicator(mode: str = "exact", ttl: Optional[float] = None, generations: int = 4,
+                        expected_items: int = 1_000_000, false_positive_rate: float = 0.001,
+                        memory_budget_bytes: Optional[int] = None):
+    """Build a deduplicator for a StreamProcessor dedup mode"""
+    if mode == "exact":
+        return ExactDeduplicator(ttl=ttl, generations=generations)
+    if mode == "probabilistic":
+        return BloomDeduplicator(
+            expected_items=expected_items,
+            false_positive_rate=false_positive_rate,
+            ttl=ttl,
+            generations=generations,
+            memory_budget_bytes=memory_budget_bytes,
+        )
+    raise ValueError(f"Unknown dedup_mode '{mode}'. Available: {list(DEDUP_MODES)}")
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Bounded-state interval join for StreamProcessor
+
+Keeps each side of a keyed stream join for a limited time: an item joins
+every item on the other side whose timestamp falls inside
+``[t + lower_bound, t + upper_bound]`` (one-to-many), and is evicted once
+its per-side TTL passes. Eviction is driven by a min-heap of expiry times.
+When a side holds more than ``max_state_size`` entries in memory, the
+entries closest to expiry are spilled to a SQLite file and still take
+part in matching until they expire.
+
+In-memory state supports incremental checkpoints. Spilled entries are only
+kept across restarts when `spill_path` points at a persistent file.
+"""
+import heapq
+import itertools
+import os
+import pickle
+import sqlite3
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from autocoder_cc.checkpoint.state import PendingDelta, StateDelta, TrackedDict
+
+SIDES = ("left", "right")
+
+
+class _JoinEntry:
+    __slots__ = ("timestamp", "expire_at", "seq", "item")
+
+    def __init__(self, timestamp: float, expire_at: float, seq: int, item: Any):
+        self.timestamp = timestamp
+        self.expire_at = expire_at
+        self.seq = seq
+        self.item = item
+
+
+class JoinSpillStore:
+    """SQLite-backed overflow storage for join state"""
+
+    def __init__(self, path: Optional[str] = None):
+        self._owns_file = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="autocoder_join_", suffix=".sqlite")
+            os.close(fd)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS join_spill ("
+            "side TEXT NOT NULL, join_key TEXT NOT NULL, timestamp REAL NOT NULL, "
+            "expire_at REAL NOT NULL, payload BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS join_spill_key ON join_spill (side, join_key, timestamp)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS join_spill_expiry ON join_spill (side, expire_at)")
+        self._counts = {side: 0 for side in SIDES}
+        self._next_expiry = {side: float("inf") for side in SIDES}
+        # A persistent spill file may already hold entries from a previous run
+        for side, count, next_expiry in self._conn.execute(
+            "SELECT side, COUNT(*), MIN(expire_at) FROM join_spill GROUP BY side"
+        ):
+            self._counts[side] = count
+            self._next_expiry[side] = next_expiry
+
+    @staticmethod
+    def _key(key: Any) -> str:
+        return repr(key)
+
+    def put_many(self, side: str, entries: List[Tuple[Any, _JoinEntry]]) -> None:
+        """Spill (key, entry) pairs for one side"""
+        self._conn.executemany(
+            "INSERT INTO join_spill (side, join_key, timestamp, expire_at, payload) VALUES (?, ?, ?, ?, ?)",
+            [
+                (side, self._key(key), entry.timestamp, entry.expire_at,
+                 pickle.dumps(entry.item, protocol=pickle.HIGHEST_PROTOCOL))
+                for key, entry in entries
+            ],
+        )
+        self._counts[side] += len(entries)
+        self._next_expiry[side] = min(self._next_expiry[side], min(entry.expire_at for _, entry in entries))
+
+    def fetch(self, side: str, key: Any, low: float, high: float, now: float) -> List[Tuple[float, Any]]:
+        """Unexpired spilled items for a key with timestamps in [low, high]"""
+        if not self._counts[side]:
+            return []
+        rows = self._conn.execute(
+            "SELECT timestamp, payload FROM join_spill INDEXED BY join_spill_key "
+            "WHERE side = ? AND join_key = ? AND timestamp BETWEEN ? AND ? AND expire_at >= ?",
+            (side, self._key(key), low, high, now),
+        ).fetchall()
+        return [(timestamp, pickle.loads(payload)) for timestamp, payload in rows]
+
+    def evict(self, side: str, now: float) -> int:
+        """Delete expired spilled entries and return how many were removed"""
+        # Skip the round trip until the earliest spilled entry can have expired
+        if not self._counts[side] or now <= self._next_expiry[side]:
+            return 0
+        removed = self._conn.execute(
+            "DELETE FROM join_spill WHERE side = ? AND expire_at < ?", (side, now)
+        ).rowcount
+        self._counts[side] -= removed
+        next_expiry = self._conn.execute(
+            "SELECT MIN(expire_at) FROM join_spill WHERE side = ?", (side,)
+        ).fetchone()[0]
+        self._next_expiry[side] = float("inf") if next_expiry is None else next_expiry
+        return removed
+
+    def count(self, side: str) -> int:
+        return self._counts[side]
+
+    def close(self) -> None:
+        self._conn.close()
+        if self._owns_file:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+
+
+def _export_entries(entries: List[_JoinEntry]) -> List[Tuple[float, float, Any]]:
+    return [(e.timestamp, e.expire_at, e.item) for e in entries]
+
+
+class JoinSideState:
+    """Buffered items of one join side, keyed by join key, with TTL eviction and spill"""
+
+    def __init__(self, side: str, ttl: float, max_state_size: Optional[int], spill_store_factory):
+        self.side = side
+        self.ttl = ttl
+        self.max_state_size = max_state_size
+        self._spill_store_factory = spill_store_factory
+        self._entries: Dict[Any, List[_JoinEntry]] = TrackedDict(copy_value=_export_entries)
+        self._expiry: List[Tuple[float, int, Any]] = []
+        self._sequence = itertools.count()
+        self.size = 0
+        self.evictions = 0
+        self.spilled = 0
+
+    def add(self, key: Any, timestamp: float, item: Any) -> None:
+        entry = _JoinEntry(timestamp, timestamp + self.ttl, next(self._sequence), item)
+        entries = self._entries.get(key)
+        if entries is None:
+            self._entries[key] = [entry]
+        else:
+            self._entries.mark_dirty(key)
+            entries.append(entry)
+        heapq.heappush(self._expiry, (entry.expire_at, entry.seq, key))
+        self.size += 1
+        if self.max_state_size is not None and self.size > self.max_state_size:
+            # Spill in batches so the store is not hit on every insert
+            self._spill(max(self.size - self.max_state_size, self.max_state_size // 10))
+
+    def matches(self, key: Any, low: float, high: float, now: float) -> List[Tuple[float, Any]]:
+        """Items for `key` with timestamps in [low, high], in memory and spilled"""
+        found = [
+            (entry.timestamp, entry.item)
+            for entry in self._entries.get(key, ())
+            if low <= entry.timestamp <= high
+        ]
+        store = self._spill_store_factory(create=False)
+        if store is not None:
+            found.extend(store.fetch(self.side, key, low, high, now))
+        return found
+
+    def evict(self, now: float) -> int:
+        """Drop entries whose TTL has passed"""
+        removed = 0
+        expiry = self._expiry
+        while expiry and expiry[0][0] < now:
+            _, seq, key = heapq.heappop(expiry)
+            if self._remove(key, seq) is not None:
+                removed += 1
+        store = self._spill_store_factory(create=False)
+        if store is not None:
+            removed += store.evict(self.side, now)
+        self.evictions += removed
+        return removed
+
+    def _remove(self, key: Any, seq: int) -> Optional[_JoinEntry]:
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        for i, entry in enumerate(entries):
+            if entry.seq == seq:
+                self._entries.mark_dirty(key)
+                del entries[i]
+                if not entries:
+                    del self._entries[key]
+                self.size -= 1
+                return entry
+        return None
+
+    def _spill(self, count: int) -> None:
+        # Entries closest to expiry are the least likely to match new arrivals
+        spilled: List[Tuple[Any, _JoinEntry]] = []
+        while count > 0 and self._expiry:
+            _, seq, key = heapq.heappop(self._expiry)
+            entry = self._remove(key, seq)
+            if entry is not None:
+                spilled.append((key, entry))
+                count -= 1
+        if spilled:
+            self._spill_store_factory(create=True).put_many(self.side, spilled)
+            self.spilled += len(spilled)
+
+    def checkpoint_delta(self) -> PendingDelta:
+        """Keys whose buffered entries changed since the previous checkpoint"""
+        return self._entries.begin_delta()
+
+    def restore(self, entries: Dict[Any, List[Tuple[float, float, Any]]]) -> None:
+        """Rebuild buffered entries and the expiry heap from a checkpoint"""
+        self._entries = TrackedDict(copy_value=_export_entries)
+        self._expiry = []
+        self.size = 0
+        for key, exported in entries.items():
+            restored = []
+            for timestamp, expire_at, item in exported:
+                entry = _JoinEntry(timestamp, expire_at, next(self._sequence), item)
+                restored.append(entry)
+                self._expiry.append((expire_at, entry.seq, key))
+            self._entries[key] = restored
+            self.size += len(restored)
+        heapq.heapify(self._expiry)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._expiry.clear()
+        self.size = 0
+
+
+class IntervalJoinState:
+    """Two-sided interval join state with per-side TTL and bounded memory"""
+
+    def __init__(self,
+                 lower_bound: float = -60.0,
+                 upper_bound: float = 60.0,
+                 left_ttl: Optional[float] = None,
+                 right_ttl: Optional[float] = None,
+                 max_state_size: Optional[int] = None,
+                 spill_path: Optional[str] = None):
+        if lower_bound > upper_bound:
+            raise ValueError("join lower_bound must not exceed upper_bound")
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.spill_path = spill_path
+        self._spill_store: Optional[JoinSpillStore] = None
+        # A left item can still match rights up to upper_bound later (and vice versa)
+        default_left_ttl = max(upper_bound, 0.0)
+        default_right_ttl = max(-lower_bound, 0.0)
+        self.sides = {
+            "left": JoinSideState("left", left_ttl if left_ttl is not None else default_left_ttl,
+                                  max_state_size, self._get_spill_store),
+            "right": JoinSideState("right", right_ttl if right_ttl is not None else default_right_ttl,
+                                   max_state_size, self._get_spill_store),
+        }
+        self.current_time = float("-inf")
+        self.matches_emitted = 0
+
+    def _get_spill_store(self, create: bool) -> Optional[JoinSpillStore]:
+        if self._spill_store is None and create:
+            self._spill_store = JoinSpillStore(self.spill_path)
+        return self._spill_store
+
+    def add(self, side: str, key: Any, timestamp: float, item: Any) -> List[Tuple[Any, Any]]:
+        """Buffer an item and return the (left, right) pairs it completes"""
+        if timestamp > self.current_time:
+            self.current_time = timestamp
+        self.evict(self.current_time)
+
+        if side == "left":
+            other = self.sides["right"]
+            candidates = other.matches(key, timestamp + self.lower_bound, timestamp + self.upper_bound,
+                                       self.current_time)
+            pairs = [(item, right) for _, right in sorted(candidates, key=lambda c: c[0])]
+        else:
+            other = self.sides["left"]
+            candidates = other.matches(key, timestamp - self.upper_bound, timestamp - self.lower_bound,
+                                       self.current_time)
+            pairs = [(left, item) for _, left in sorted(candidates, key=lambda c: c[0])]
+
+        self.sides[side].add(key, timestamp, item)
+        self.matches_emitted += len(pairs)
+        return pairs
+
+    def evict(self, now: float) -> int:
+        """Evict expired entries on both sides"""
+        return sum(state.evict(now) for state in self.sides.values())
+
+    def advance_time(self, now: float) -> int:
+        """Timer tick: move the join clock forward and evict"""
+        if now > self.current_time:
+            self.current_time = now
+        return self.evict(self.current_time)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """State size, spill and eviction counters per side"""
+        stats: Dict[str, Any] = {"matches_emitted": self.matches_emitted}
+        for side, state in self.sides.items():
+            stats[f"{side}_state_size"] = state.size
+            stats[f"{side}_spilled_size"] = self._spill_store.count(side) if self._spill_store else 0
+            stats[f"{side}_spilled_total"] = state.spilled
+            stats[f"{side}_evictions"] = state.evictions
+        return stats
+
+    def checkpoint_delta(self) -> Dict[str, Any]:
+        """Per-side buffered entries changed since the previous checkpoint, plus the join clock"""
+        deltas = {side: state.checkpoint_delta() for side, state in self.sides.items()}
+        deltas["clock"] = StateDelta.full({
+            "current_time": self.current_time,
+            "matches_emitted": self.matches_emitted,
+            "counters": {side: (state.evictions, state.spilled) for side, state in self.sides.items()},
+        })
+        return deltas
+
+    def restore(self, state: Dict[str, Dict[Any, Any]]) -> None:
+        """Reload buffered entries from a checkpoint"""
+        for side, side_state in self.sides.items():
+            side_state.restore(state.get(side, {}))
+        clock = state.get("clock", {})
+        self.current_time = clock.get("current_time", self.current_time)
+        self.matches_emitted = clock.get("matches_emitted", 0)
+        for side, (evictions, spilled) in clock.get("counters", {}).items():
+            self.sides[side].evictions = evictions
+            self.sides[side].spilled = spilled
+        if self.spill_path and os.path.exists(self.spill_path):
+            self._get_spill_store(create=True)
+
+    def close(self) -> None:
+        for state in self.sides.values():
+            state.clear()
+        if self._spill_store is not None:
+            self._spill_store.close()
+            self._spill_store = None
@@ -5,11 +5,14 @@ StreamProcessor Component - Handles windowing, joining, and deduplication operat
 
 import anyio
 import time
-from typing import Any, Dict, List, Optional, Set
-from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+from collections import defaultdict
 from autocoder_cc.orchestration.component import Component
 from autocoder_cc.error_handling.consistent_handler import ConsistentErrorHandler, handle_errors
 from autocoder_cc.validation.config_requirement import ConfigRequirement, ConfigType
+from autocoder_cc.components.stream_windowing import WindowingEngine, build_aggregates, coerce_timestamp
+from autocoder_cc.components.stream_join import IntervalJoinState
+from autocoder_cc.components.stream_dedup import BloomDeduplicator, create_deduplicator
 
 
 class StreamProcessor(Component):
@@ -17,9 +20,11 @@ class StreamProcessor(Component):
     StreamProcessor component for advanced stream operations.
     
     Supports three variants:
-    - windowing: Groups items into time-based windows
-    - joining: Joins items from two input streams
-    - deduplication: Removes duplicate items from stream
+    - windowing: Groups items into tumbling, sliding or session windows
+      (event or processing time) with incremental aggregates
+    - joining: Interval-joins items from two input streams (one-to-many, TTL-bounded state)
+    - deduplication: Removes duplicate items within a TTL using hashed keys
+      (exact or Bloom-filter based, memory-bounded)
     """
     
     def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
@@ -32,21 +37,60 @@ class StreamProcessor(Component):
         # Variant-specific state
         if self.variant == 'windowing':
             self.window_size = self.config.get('window_size', 5.0)  # seconds
-            self.window_data = deque()
-            self.last_window_time = time.time()
+            event_time = self.config.get('time_characteristic', 'processing') == 'event'
+            self.windowing = WindowingEngine(
+                window_type=self.config.get('window_type', 'tumbling'),
+                window_size=self.window_size,
+                window_slide=self.config.get('window_slide'),
+                session_gap=self.config.get('session_gap'),
+                aggregates=build_aggregates(self.config.get('aggregations')),
+                key_field=self.config.get('key_field'),
+                timestamp_field=self.config.get('timestamp_field', 'timestamp'),
+                event_time=event_time,
+                max_out_of_orderness=self.config.get('max_out_of_orderness', 0.0),
+                allowed_lateness=self.config.get('allowed_lateness', 0.0),
+                idle_timeout=self.config.get('idle_timeout', self.window_size if event_time else None),
+            )
+            # Timer tick that closes windows even when no items arrive
+            self.timer_interval = self.config.get('timer_interval', min(1.0, self.window_size / 4))
             
         elif self.variant == 'joining':
-            self.left_buffer = {}  # key -> item
-            self.right_buffer = {}  # key -> item
             self.join_key = self.config.get('join_key', 'id')
+            self.event_time = self.config.get('time_characteristic', 'processing') == 'event'
+            self.timestamp_field = self.config.get('timestamp_field', 'timestamp')
+            join_window = self.config.get('join_window', 60.0)  # seconds
+            self.join_state = IntervalJoinState(
+                lower_bound=self.config.get('join_lower_bound', -join_window),
+                upper_bound=self.config.get('join_upper_bound', join_window),
+                left_ttl=self.config.get('left_ttl'),
+                right_ttl=self.config.get('right_ttl'),
+                max_state_size=self.config.get('max_state_size'),
+                spill_path=self.config.get('spill_path'),
+            )
+            self.eviction_interval = self.config.get('eviction_interval', 1.0)
             
         elif self.variant == 'deduplication':
-            self.seen_items: Set[str] = set()
             self.dedup_key = self.config.get('dedup_key', None)  # If None, use entire item
+            self.deduplicator = create_deduplicator(
+                mode=self.config.get('dedup_mode', 'exact'),
+                ttl=self.config.get('dedup_ttl'),  # seconds; None remembers keys forever
+                generations=self.config.get('dedup_generations', 4),
+                expected_items=self.config.get('expected_items', 1_000_000),
+                false_positive_rate=self.config.get('false_positive_rate', 0.001),
+                memory_budget_bytes=self.config.get('memory_budget_bytes'),
+            )
     
     async def setup(self, harness_context: Optional[Dict[str, Any]] = None) -> None:
         """Initialize StreamProcessor"""
         self.logger.info(f"StreamProcessor '{self.name}' initialized with variant: {self.variant}")
+        if self.variant == 'deduplication' and isinstance(self.deduplicator, BloomDeduplicator):
+            stats = self.deduplicator.get_stats()
+            if stats['projected_false_positive_rate'] > stats['target_false_positive_rate']:
+                self.logger.warning(
+                    f"Dedup memory budget of {stats['memory_bytes']} bytes gives a projected false-positive "
+                    f"rate of {stats['projected_false_positive_rate']:.4g}, above the "
+                    f"{stats['target_false_positive_rate']} target"
+                )
         self._status.is_running = True
 
     @classmethod
@@ -78,6 +122,33 @@ class StreamProcessor(Component):
                 default=1,
                 semantic_type=ConfigType.INTEGER,
                 validator=lambda x: x > 0
+            ),
+            ConfigRequirement(
+                name="window_type",
+                type="str",
+                description="Window assignment for the windowing variant",
+                required=False,
+                default="tumbling",
+                options=["tumbling", "sliding", "session"],
+                semantic_type=ConfigType.STRING
+            ),
+            ConfigRequirement(
+                name="time_characteristic",
+                type="str",
+                description="Whether windows use item timestamps or arrival time",
+                required=False,
+                default="processing",
+                options=["event", "processing"],
+                semantic_type=ConfigType.STRING
+            ),
+            ConfigRequirement(
+                name="allowed_lateness",
+                type="float",
+                description="Seconds after window close during which late items still update it",
+                required=False,
+                default=0.0,
+                semantic_type=ConfigType.FLOAT,
+                validator=lambda x: x >= 0
             )
         ]
 
@@ -101,122 +172,113 @@ class StreamProcessor(Component):
             )
     
     async def _process_windowing(self) -> None:
-        """Process windowing variant - group items into time windows"""
-        self.logger.info("Starting windowing stream processing")
+        """Process windowing variant - assign items to windows and emit on watermark/timer"""
+        self.logger.info(f"Starting {self.windowing.window_type} windowing stream processing")
         
-        async for item in self.receive_streams.get('input', []):
-            try:
-                current_time = time.time()
-                self.window_data.append((current_time, item))
-                
-                self.logger.info(f"Received item for windowing: {item}")
-                
-                # Check if window should be emitted
-                if current_time - self.last_window_time >= self.window_size:
-                    await self._emit_window()
-                    self.last_window_time = current_time
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._run_window_timer)
+            async for item in self.receive_streams.get('input', []):
+                try:
+                    await self._emit_windows(self.windowing.add(item))
+                    self.increment_processed()
+                except Exception as e:
+                    await self.error_handler.handle_exception(
+                        e,
+                        context={"item": str(item), "window_stats": self.windowing.get_stats()},
+                        operation="windowing_item_processing"
+                    )
+            tg.cancel_scope.cancel()
                 
-                self.increment_processed()
-            except Exception as e:
-                await self.error_handler.handle_exception(
-                    e,
-                    context={"item": str(item), "window_size": self.window_size, "window_data_count": len(self.window_data)},
-                    operation="windowing_item_processing"
-                )
-                
-        # Emit final window when stream ends
+        # Emit remaining windows when stream ends
         try:
-            if self.window_data:
-                await self._emit_window()
+            await self._emit_windows(self.windowing.flush())
         except Exception as e:
             await self.error_handler.handle_exception(
                 e,
-                context={"final_window_data_count": len(self.window_data)},
+                context={"window_stats": self.windowing.get_stats()},
                 operation="windowing_final_window_emission"
             )
     
-    async def _emit_window(self) -> None:
-        """Emit current window as aggregated result"""
-        if not self.window_data:
-            return
-        
-        # Collect all items in current window
-        window_items = []
-        for timestamp, item in self.window_data:
-            window_items.append(item)
-        
-        if window_items:
-            window_result = {
-                'window_start': self.last_window_time,
-                'window_end': time.time(),
-                'items': window_items,
-                'count': len(window_items)
-            }
-            
-            self.logger.info(f"Window creation event: emitting window with {len(window_items)} items")
-            
+    async def _run_window_timer(self) -> None:
+        """Advance time periodically so idle streams still close their windows"""
+        while True:
+            await anyio.sleep(self.timer_interval)
+            try:
+                await self._emit_windows(self.windowing.advance_time())
+            except Exception as e:
+                await self.error_handler.handle_exception(
+                    e,
+                    context={"window_stats": self.windowing.get_stats()},
+                    operation="windowing_timer"
+                )
+    
+    async def _emit_windows(self, window_results: List[Dict[str, Any]]) -> None:
+        """Emit closed (or late-updated) window results"""
+        for window_result in window_results:
+            self.logger.debug(
+                f"Window emission: key={window_result['key']} "
+                f"[{window_result['window_start']}, {window_result['window_end']}) count={window_result['count']}"
+            )
             if 'output' in self.send_streams:
                 await self.send_streams['output'].send(window_result)
-            
-            # Clear window data after emission
-            self.window_data.clear()
     
     async def _process_joining(self) -> None:
-        """Process joining variant - join items from two streams"""
+        """Process joining variant - interval-join items from two streams"""
         self.logger.info("Starting joining stream processing")
         
         try:
-            # Use task group to process both streams concurrently
             async with anyio.create_task_group() as tg:
-                if 'left' in self.receive_streams:
-                    tg.start_soon(self._process_left_stream)
-                if 'right' in self.receive_streams:
-                    tg.start_soon(self._process_right_stream)
+                tg.start_soon(self._run_join_eviction)
+                # Use task group to process both streams concurrently
+                async with anyio.create_task_group() as streams:
+                    if 'left' in self.receive_streams:
+                        streams.start_soon(self._process_join_stream, 'left')
+                    if 'right' in self.receive_streams:
+                        streams.start_soon(self._process_join_stream, 'right')
+                tg.cancel_scope.cancel()
         except Exception as e:
             await self.error_handler.handle_exception(
                 e,
-                context={"left_buffer_size": len(self.left_buffer), "right_buffer_size": len(self.right_buffer), "join_key": self.join_key},
+                context={"join_state": self.join_state.get_stats(), "join_key": self.join_key},
                 operation="joining_stream_processing"
             )
+        finally:
+            self._status.metadata['join_state'] = self.join_state.get_stats()
     
-    async def _process_left_stream(self) -> None:
-        """Process left stream for joining"""
-        async for item in self.receive_streams['left']:
+    async def _process_join_stream(self, side: str) -> None:
+        """Buffer items from one side and emit every pair they complete"""
+        async for item in self.receive_streams[side]:
             key = item.get(self.join_key) if isinstance(item, dict) else str(item)
-            self.left_buffer[key] = item
-            
-            self.logger.info(f"Left stream item received: {item}")
+            pairs = self.join_state.add(side, key, self._join_timestamp(item), item)
             
-            # Check for match in right buffer
-            if key in self.right_buffer:
-                await self._emit_joined_item(key)
+            if pairs:
+                await self._emit_joined_pairs(key, pairs)
             else:
-                self.logger.info(f"Left item with key {key} has no match in right stream yet")
+                self.logger.debug(f"{side.capitalize()} item with key {key} has no match yet")
             
             self.increment_processed()
     
-    async def _process_right_stream(self) -> None:
-        """Process right stream for joining"""
-        async for item in self.receive_streams['right']:
-            key = item.get(self.join_key) if isinstance(item, dict) else str(item)
-            self.right_buffer[key] = item
-            
-            self.logger.info(f"Right stream item received: {item}")
-            
-            # Check for match in left buffer
-            if key in self.left_buffer:
-                await self._emit_joined_item(key)
-            else:
-                self.logger.info(f"Right item with key {key} has no match in left stream yet")
-            
-            self.increment_processed()
+    def _join_timestamp(self, item: Any) -> float:
+        if self.event_time and isinstance(item, dict):
+            timestamp = coerce_timestamp(item.get(self.timestamp_field))
+            if timestamp is not None:
+                return timestamp
+        return time.time()
     
-    async def _emit_joined_item(self, key: str) -> None:
-        """Emit joined item from both streams"""
-        left_item = self.left_buffer.pop(key, None)
-        right_item = self.right_buffer.pop(key, None)
-        
-        if left_item is not None and right_item is not None:
+    async def _run_join_eviction(self) -> None:
+        """Evict expired join state periodically so unmatched keys do not accumulate"""
+        while True:
+            await anyio.sleep(self.eviction_interval)
+            now = self.join_state.current_time if self.event_time else time.time()
+            evicted = self.join_state.advance_time(now)
+            stats = self.join_state.get_stats()
+            self._status.metadata['join_state'] = stats
+            if evicted:
+                self.logger.debug(f"Evicted {evicted} expired join entries: {stats}")
+    
+    async def _emit_joined_pairs(self, key: Any, pairs: List[Any]) -> None:
+        """Emit joined items for every matched (left, right) pair"""
+        for left_item, right_item in pairs:
             joined_item = {
                 'join_key': key,
                 'left': left_item,
@@ -224,8 +286,6 @@ class StreamProcessor(Component):
                 'joined_at': time.time()
             }
             
-            self.logger.info(f"Emitting joined item: {joined_item}")
-            
             if 'output' in self.send_streams:
                 await self.send_streams['output'].send(joined_item)
     
@@ -243,10 +303,8 @@ class StreamProcessor(Component):
                 
                 self.logger.info(f"Received item for deduplication: {item}")
                 
-                # Check if we've seen this item before
-                if dedup_value not in self.seen_items:
-                    self.seen_items.add(dedup_value)
-                    
+                # Check if we've seen this item before (within the TTL)
+                if self.deduplicator.check_and_add(dedup_value):
                     self.logger.info(f"Unique item - sending to output stream: {item}")
                     
                     if 'output' in self.send_streams:
@@ -258,15 +316,38 @@ class StreamProcessor(Component):
             except Exception as e:
                 await self.error_handler.handle_exception(
                     e,
-                    context={"item": str(item), "dedup_key": self.dedup_key, "seen_items_count": len(self.seen_items)},
+                    context={"item": str(item), "dedup_key": self.dedup_key, "dedup_stats": self.deduplicator.get_stats()},
                     operation="deduplication_item_processing"
                 )
     
+    def _state_engine(self) -> Any:
+        if self.variant == 'windowing':
+            return self.windowing
+        if self.variant == 'joining':
+            return self.join_state
+        if self.variant == 'deduplication':
+            return self.deduplicator
+        return None
+    
+    def checkpoint_delta(self) -> Dict[str, Any]:
+        """Variant state changed since the previous checkpoint"""
+        engine = self._state_engine()
+        return engine.checkpoint_delta() if engine is not None else {}
+    
+    def restore_checkpoint(self, state: Dict[str, Dict[Any, Any]]) -> None:
+        """Restore variant state (windows, join buffers or dedup filters) from a checkpoint"""
+        engine = self._state_engine()
+        if engine is not None:
+            engine.restore(state)
+            self.logger.info(f"StreamProcessor '{self.name}' restored {self.variant} state from checkpoint")
+    
     async def cleanup(self) -> None:
         """Cleanup StreamProcessor resources"""
         # Emit final window if windowing
-        if self.variant == 'windowing' and self.window_data:
-            await self._emit_window()
+        if self.variant == 'windowing' and self.windowing.active_windows:
+            await self._emit_windows(self.windowing.flush())
+        elif self.variant == 'joining':
+            self.join_state.close()
         
         self.logger.info(f"StreamProcessor '{self.name}' cleanup completed")
         self._status.is_running = False
\ No newline at end of file
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Event-time windowing engine for StreamProcessor
+
+Assigns items to tumbling, sliding or session windows per key, tracks a
+watermark with bounded out-of-orderness and allowed lateness, and keeps
+only incremental aggregate state per window (no per-window item lists).
+Window closure is timer-driven: `advance_time` lets an idle stream close
+its windows without waiting for the next item.
+
+The engine is synchronous and does no I/O; callers feed items with
+`add` / `advance_time` and forward the returned window results.
+"""
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from autocoder_cc.checkpoint.state import StateDelta, TrackedDict
+
+WINDOW_TYPES = ("tumbling", "sliding", "session")
+
+
+class WindowAggregate:
+    """Incremental aggregate: O(1) state per window
+
+    Subclasses implement `create`, `add`, `merge` and `result`. `add` and
+    `merge` return the new accumulator so immutable values can be used.
+    """
+
+    def __init__(self, field: Optional[str] = None):
+        self.field = field
+
+    def extract(self, item: Any) -> Any:
+        """Value this aggregate consumes from an item"""
+        if self.field is None:
+            return item
+        if isinstance(item, dict):
+            return item.get(self.field)
+        return getattr(item, self.field, None)
+
+    def create(self) -> Any:
+        raise NotImplementedError
+
+    def add(self, acc: Any, value: Any) -> Any:
+        raise NotImplementedError
+
+    def merge(self, a: Any, b: Any) -> Any:
+        raise NotImplementedError
+
+    def result(self, acc: Any) -> Any:
+        return acc
+
+
+class CountAggregate(WindowAggregate):
+    def create(self):
+        return 0
+
+    def add(self, acc, value):
+        return acc + 1 if self.field is None or value is not None else acc
+
+    def merge(self, a, b):
+        return a + b
+
+
+class SumAggregate(WindowAggregate):
+    def create(self):
+        return 0
+
+    def add(self, acc, value):
+        return acc + value if value is not None else acc
+
+    def merge(self, a, b):
+        return a + b
+
+
+class MinAggregate(WindowAggregate):
+    def create(self):
+        return None
+
+    def add(self, acc, value):
+        if value is None:
+            return acc
+        return value if acc is None or value < acc else acc
+
+    def merge(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return a if a <= b else b
+
+
+class MaxAggregate(WindowAggregate):
+    def create(self):
+        return None
+
+    def add(self, acc, value):
+        if value is None:
+            return acc
+        return value if acc is None or value > acc else acc
+
+    def merge(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return a if a >= b else b
+
+
+class AvgAggregate(WindowAggregate):
+    def create(self):
+        return (0, 0)
+
+    def add(self, acc, value):
+        if value is None:
+            return acc
+        return (acc[0] + value, acc[1] + 1)
+
+    def merge(self, a, b):
+        return (a[0] + b[0], a[1] + b[1])
+
+    def result(self, acc):
+        return acc[0] / acc[1] if acc[1] else None
+
+
+class ReduceAggregate(WindowAggregate):
+    """Custom reduction with a binary function (and optional merge function for sessions)"""
+
+    def __init__(self, function: Callable[[Any, Any], Any], initial: Any = None,
+                 field: Optional[str] = None, merge_function: Optional[Callable[[Any, Any], Any]] = None):
+        super().__init__(field)
+        self.function = function
+        self.initial = initial
+        self.merge_function = merge_function or function
+
+    def create(self):
+        return self.initial
+
+    def add(self, acc, value):
+        if acc is None:
+            return value
+        return self.function(acc, value)
+
+    def merge(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return self.merge_function(a, b)
+
+
+class CollectAggregate(WindowAggregate):
+    """Materializes items; O(n) state, only for consumers that need raw items"""
+
+    def create(self):
+        return []
+
+    def add(self, acc, value):
+        acc.append(value)
+        return acc
+
+    def merge(self, a, b):
+        return a + b
+
+
+AGGREGATE_TYPES = {
+    "count": CountAggregate,
+    "sum": SumAggregate,
+    "min": MinAggregate,
+    "max": MaxAggregate,
+    "avg": AvgAggregate,
+    "collect": CollectAggregate,
+}
+
+
+def build_aggregates(spec: Optional[Dict[str, Any]]) -> Dict[str, WindowAggregate]:
+    """
+    Build aggregates from config.
+
+    Each entry maps an output name to an op name (``"count"``), a dict such
+    as ``{"op": "sum", "field": "amount"}`` or
+    ``{"op": "reduce", "function": callable, "initial": 0}``, or a
+    ready-made WindowAggregate.
+    """
+    aggregates: Dict[str, WindowAggregate] = {}
+    for name, entry in (spec or {}).items():
+        if isinstance(entry, WindowAggregate):
+            aggregates[name] = entry
+            continue
+        if isinstance(entry, str):
+            entry = {"op": entry}
+        op = entry.get("op")
+        if op == "reduce":
+            if not callable(entry.get("function")):
+                raise ValueError(f"Aggregation '{name}' requires a callable 'function'")
+            aggregates[name] = ReduceAggregate(
+                entry["function"], entry.get("initial"), entry.get("field"), entry.get("merge_function")
+            )
+        elif op in AGGREGATE_TYPES:
+            aggregates[name] = AGGREGATE_TYPES[op](entry.get("field"))
+        else:
+            raise ValueError(
+                f"Unknown aggregation op '{op}' for '{name}'. "
+                f"Available: {sorted(AGGREGATE_TYPES) + ['reduce']}"
+            )
+    return aggregates
+
+
+def coerce_timestamp(value: Any) -> Optional[float]:
+    """Convert an event timestamp (epoch seconds, datetime or ISO string) to epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    raise ValueError(f"Unsupported timestamp type: {type(value).__name__}")
+
+
+class _WindowState:
+    __slots__ = ("key", "start", "end", "count", "accs", "fired", "alive")
+
+    def __init__(self, key: Any, start: float, end: float, accs: List[Any]):
+        self.key = key
+        self.start = start
+        self.end = end
+        self.count = 0
+        self.accs = accs
+        self.fired = False
+        self.alive = True
+
+
+_FIRE = 0
+_PURGE = 1
+
+
+class WindowingEngine:
+    """Keyed event-time windows with watermarks, allowed lateness and timer-driven firing"""
+
+    def __init__(self,
+                 window_type: str = "tumbling",
+                 window_size: float = 5.0,
+                 window_slide: Optional[float] = None,
+                 session_gap: Optional[float] = None,
+                 aggregates: Optional[Dict[str, WindowAggregate]] = None,
+                 key_field: Optional[str] = None,
+                 timestamp_field: Optional[str] = "timestamp",
+                 event_time: bool = True,
+                 max_out_of_orderness: float = 0.0,
+                 allowed_lateness: float = 0.0,
+                 idle_timeout: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        if window_type not in WINDOW_TYPES:
+            raise ValueError(f"Unknown window_type '{window_type}'. Available: {list(WINDOW_TYPES)}")
+        if window_type == "session":
+            if not session_gap or session_gap <= 0:
+                raise ValueError("Session windows require a positive session_gap")
+        elif window_size <= 0:
+            raise ValueError("window_size must be positive")
+        if window_type == "sliding" and (not window_slide or window_slide <= 0):
+            raise ValueError("Sliding windows require a positive window_slide")
+
+        self.window_type = window_type
+        self.window_size = window_size
+        self.window_slide = window_slide
+        self.session_gap = session_gap
+        self.aggregates = list((aggregates or {}).items())
+        self.key_field = key_field
+        self.timestamp_field = timestamp_field
+        self.event_time = event_time
+        self.max_out_of_orderness = max_out_of_orderness
+        self.allowed_lateness = allowed_lateness
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+
+        self.watermark = -math.inf
+        self._max_event_time = -math.inf
+        self._last_event_wallclock: Optional[float] = None
+
+        # Fixed windows by (key, start); sessions as a per-key list sorted by start.
+        # Change-tracked so checkpoints only capture windows touched since the last one.
+        self._windows: Dict[Tuple[Any, float], _WindowState] = TrackedDict(copy_value=self._export)
+        self._sessions: Dict[Any, List[_WindowState]] = TrackedDict(copy_value=self._export_sessions)
+        self._timers: List[Tuple[float, int, int, _WindowState]] = []
+        self._sequence = itertools.count()
+
+        self.events_processed = 0
+        self.late_events_dropped = 0
+        self.late_updates = 0
+        self.windows_fired = 0
+
+    # ------------------------------------------------------------------ input
+
+    def _key_of(self, item: Any) -> Any:
+        if self.key_field is None:
+            return None
+        if isinstance(item, dict):
+            return item.get(self.key_field)
+        return getattr(item, self.key_field, None)
+
+    def _timestamp_of(self, item: Any, now: float) -> float:
+        if not self.event_time or self.timestamp_field is None:
+            return now
+        value = item.get(self.timestamp_field) if isinstance(item, dict) else getattr(item, self.timestamp_field, None)
+        ts = coerce_timestamp(value)
+        return now if ts is None else ts
+
+    def add(self, item: Any, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Add one item and return any window results it causes to be emitted"""
+        now = self.clock() if now is None else now
+        timestamp = self._timestamp_of(item, now)
+        key = self._key_of(item)
+        self.events_processed += 1
+        self._last_event_wallclock = now
+
+        results: List[Dict[str, Any]] = []
+        if self.window_type == "session":
+            self._add_to_session(key, timestamp, item, results)
+        else:
+            for start in self._window_starts(timestamp):
+                self._add_to_window(key, start, start + self.window_size, item, results)
+
+        if timestamp > self._max_event_time:
+            self._max_event_time = timestamp
+            if self.event_time:
+                self._advance_watermark(timestamp - self.max_out_of_orderness, results)
+            else:
+                self._advance_watermark(timestamp, results)
+        return results
+
+    def _window_starts(self, timestamp: float) -> Iterable[float]:
+        if self.window_type == "tumbling":
+            return (timestamp - timestamp % self.window_size,)
+        slide = self.window_slide
+        last_start = timestamp - timestamp % slide
+        starts = []
+        start = last_start
+        while start > timestamp - self.window_size:
+            starts.append(start)
+            start -= slide
+        return starts
+
+    def _is_expired(self, end: float) -> bool:
+        return end + self.allowed_lateness <= self.watermark
+
+    def _new_state(self, key: Any, start: float, end: float) -> _WindowState:
+        state = _WindowState(key, start, end, [agg.create() for _, agg in self.aggregates])
+        heapq.heappush(self._timers, (end, next(self._sequence), _FIRE, state))
+        return state
+
+    def _accumulate(self, state: _WindowState, item: Any) -> None:
+        self._touch(state)
+        state.count += 1
+        accs = state.accs
+        for i, (_, agg) in enumerate(self.aggregates):
+            accs[i] = agg.add(accs[i], agg.extract(item))
+
+    def _touch(self, state: _WindowState) -> None:
+        # Called before each in-place update so an in-flight checkpoint keeps the old value
+        if self.window_type == "session":
+            self._sessions.mark_dirty(state.key)
+        else:
+            self._windows.mark_dirty((state.key, state.start))
+
+    def _add_to_window(self, key: Any, start: float, end: float, item: Any,
+                       results: List[Dict[str, Any]]) -> None:
+        if self._is_expired(end):
+            self.late_events_dropped += 1
+            return
+        state = self._windows.get((key, start))
+        if state is None:
+            state = self._new_state(key, start, end)
+            self._windows[(key, start)] = state
+        self._accumulate(state, item)
+        if state.fired:
+            # Late but within allowed lateness: emit an updated result
+            self.late_updates += 1
+            results.append(self._result(state, late=True))
+
+    def _add_to_session(self, key: Any, timestamp: float, item: Any,
+                        results: List[Dict[str, Any]]) -> None:
+        end = timestamp + self.session_gap
+        if self._is_expired(end):
+            self.late_events_dropped += 1
+            return
+
+        sessions = self._sessions.setdefault(key, [])
+        self._sessions.mark_dirty(key)
+        overlapping = [s for s in sessions if s.start <= end and timestamp <= s.end]
+        if not overlapping:
+            state = self._new_state(key, timestamp, end)
+            sessions.append(state)
+            sessions.sort(key=lambda s: s.start)
+            self._accumulate(state, item)
+            return
+
+        target = overlapping[0]
+        was_fired = any(s.fired for s in overlapping)
+        new_start = min(timestamp, min(s.start for s in overlapping))
+        new_end = max(end, max(s.end for s in overlapping))
+        for other in overlapping[1:]:
+            # Merge bridged sessions into the first; their timers become stale
+            target.count += other.count
+            for i, (_, agg) in enumerate(self.aggregates):
+                target.accs[i] = agg.merge(target.accs[i], other.accs[i])
+            other.alive = False
+            sessions.remove(other)
+        target.start = new_start
+        end_changed = new_end != target.end
+        target.end = new_end
+        target.fired = was_fired
+        # Fired sessions need a fresh purge deadline; open ones a fresh fire timer
+        if was_fired:
+            heapq.heappush(self._timers, (new_end + self.allowed_lateness, next(self._sequence), _PURGE, target))
+        elif end_changed:
+            heapq.heappush(self._timers, (new_end, next(self._sequence), _FIRE, target))
+        self._accumulate(target, item)
+        if target.fired:
+            self.late_updates += 1
+            results.append(self._result(target, late=True))
+
+    # ----------------------------------------------------------------- timers
+
+    def advance_time(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Timer tick: advance the watermark for idle or processing-time streams"""
+        now = self.clock() if now is None else now
+        results: List[Dict[str, Any]] = []
+        if not self.event_time:
+            self._advance_watermark(now, results)
+        elif (self.idle_timeout is not None and self._last_event_wallclock is not None
+              and now - self._last_event_wallclock >= self.idle_timeout):
+            # Idle source: assume event time keeps pace with wall-clock time
+            idle_for = now - self._last_event_wallclock
+            self._advance_watermark(self._max_event_time + idle_for - self.max_out_of_orderness, results)
+        return results
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """End of stream: fire every pending window"""
+        results: List[Dict[str, Any]] = []
+        self._advance_watermark(math.inf, results)
+        return results
+
+    def _advance_watermark(self, watermark: float, results: List[Dict[str, Any]]) -> None:
+        if watermark <= self.watermark:
+            return
+        self.watermark = watermark
+        timers = self._timers
+        while timers and timers[0][0] <= watermark:
+            fire_at, _, kind, state = heapq.heappop(timers)
+            if not state.alive:
+                continue
+            if kind == _FIRE:
+                if state.end != fire_at or state.fired:
+                    continue  # Superseded by a session extension
+                self._touch(state)
+                state.fired = True
+                self.windows_fired += 1
+                results.append(self._result(state, late=False))
+                if self.allowed_lateness > 0:
+                    heapq.heappush(timers, (state.end + self.allowed_lateness, next(self._sequence), _PURGE, state))
+                else:
+                    self._purge(state)
+            elif state.end + self.allowed_lateness == fire_at:
+                self._purge(state)
+
+    def _purge(self, state: _WindowState) -> None:
+        state.alive = False
+        if self.window_type == "session":
+            sessions = self._sessions.get(state.key)
+            if sessions is not None:
+                self._sessions.mark_dirty(state.key)
+                sessions.remove(state)
+                if not sessions:
+                    del self._sessions[state.key]
+        else:
+            self._windows.pop((state.key, state.start), None)
+
+    def _result(self, state: _WindowState, late: bool) -> Dict[str, Any]:
+        return {
+            "key": state.key,
+            "window_type": self.window_type,
+            "window_start": state.start,
+            "window_end": state.end,
+            "count": state.count,
+            "aggregates": {
+                name: agg.result(state.accs[i]) for i, (name, agg) in enumerate(self.aggregates)
+            },
+            "late": late,
+        }
+
+    # ------------------------------------------------------------ checkpoint
+
+    @staticmethod
+    def _export(state: _WindowState) -> Tuple:
+        # Copy accumulators so later in-place updates do not leak into the snapshot
+        accs = [acc.copy() if isinstance(acc, list) else acc for acc in state.accs]
+        return (state.key, state.start, state.end, state.count, accs, state.fired)
+
+    @classmethod
+    def _export_sessions(cls, sessions: List[_WindowState]) -> List[Tuple]:
+        return [cls._export(s) for s in sessions]
+
+    def checkpoint_delta(self) -> Dict[str, Any]:
+        """Windows changed since the previous checkpoint plus engine clocks and counters"""
+        if self.window_type == "session":
+            windows = self._sessions.begin_delta()
+        else:
+            windows = self._windows.begin_delta()
+        return {
+            "windows": windows,
+            "clock": StateDelta.full({
+                "watermark": self.watermark,
+                "max_event_time": self._max_event_time,
+                "events_processed": self.events_processed,
+                "late_events_dropped": self.late_events_dropped,
+                "late_updates": self.late_updates,
+                "windows_fired": self.windows_fired,
+            }),
+        }
+
+    def restore(self, state: Dict[str, Dict[Any, Any]]) -> None:
+        """Rebuild windows and timers from checkpointed state"""
+        clock = state.get("clock", {})
+        self.watermark = clock.get("watermark", -math.inf)
+        self._max_event_time = clock.get("max_event_time", -math.inf)
+        self.events_processed = clock.get("events_processed", 0)
+        self.late_events_dropped = clock.get("late_events_dropped", 0)
+        self.late_updates = clock.get("late_updates", 0)
+        self.windows_fired = clock.get("windows_fired", 0)
+
+        self._windows = TrackedDict(copy_value=self._export)
+        self._sessions = TrackedDict(copy_value=self._export_sessions)
+        self._timers = []
+        for key, exported in state.get("windows", {}).items():
+            if self.window_type == "session":
+                self._sessions[key] = [self._import(entry) for entry in exported]
+            else:
+                self._windows[key] = self._import(exported)
+
+    def _import(self, exported: Tuple) -> _WindowState:
+        key, start, end, count, accs, fired = exported
+        state = _WindowState(key, start, end, list(accs))
+        state.count = count
+        state.fired = fired
+        if fired:
+            heapq.heappush(self._timers, (end + self.allowed_lateness, next(self._sequence), _PURGE, state))
+        else:
+            heapq.heappush(self._timers, (end, next(self._sequence), _FIRE, state))
+        return state
+
+    # ---------------------------------------------------------------- metrics
+
+    @property
+    def active_windows(self) -> int:
+        """Windows currently holding state"""
+        return len(self._windows) + sum(len(s) for s in self._sessions.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine counters for observability"""
+        return {
+            "window_type": self.window_type,
+            "watermark": self.watermark,
+            "active_windows": self.active_windows,
+            "pending_timers": len(self._timers),
+            "events_processed": self.events_processed,
+            "windows_fired": self.windows_fired,
+            "late_updates": self.late_updates,
+            "late_events_dropped": self.late_events_dropped,
+        }
@@ -19,6 +19,7 @@ from enum import Enum
 
 # Import base Store class
 from .store import Store
+from autocoder_cc.database.pool import open_pool_from_url
 
 
 class DatabaseConfigurationError(Exception):
@@ -161,7 +162,7 @@ class V5EnhancedStore(Store):
                     connection_string=self.connection_string
                 )
             
-            # Initialize real connection pool using databases library
+            # Initialize connection pool on the shared pooled database layer
             self.connection_pool = V5DatabaseConnectionPool(
                 database_type=self.database_type,
                 connection_string=self.connection_string,
@@ -445,7 +446,7 @@ class V5EnhancedStore(Store):
                 result = await connection.execute(query, values)
                 
                 # Record metrics
-                await self.performance_monitor.record_operation("store", time.time() - start_time)
+                self.performance_monitor.record_operation("store", time.time() - start_time)
                 
                 self.logger.info(f"Data stored with ID: {operation_id}")
                 return {"operation_id": operation_id, "status": "stored", "rows_affected": 1}
@@ -743,34 +744,32 @@ class V5MigrationManager:
 
 class V5DatabaseConnectionPool:
     """
-    Real database connection pool using the databases library.
-    Supports PostgreSQL, MySQL, and SQLite.
+    Database connection pool backed by the shared pooled layer
+    (autocoder_cc.database.pool). Supports PostgreSQL, MySQL and SQLite;
+    SQLite reads are served by a pool of reader connections next to one writer.
     """
     
     def __init__(self, database_type: str, connection_string: str, pool_config: Dict[str, Any]):
         self.database_type = database_type
         self.connection_string = connection_string
-        self.pool_config = pool_config
+        self.pool_config = pool_config or {}
         self.logger = get_logger(f"V5DatabaseConnectionPool.{database_type}")
-        
-        # Initialize the database connection
-        try:
-            import databases
-            self.database = databases.Database(connection_string)
-            self._is_connected = False
-        except ImportError:
-            self.logger.error("databases library not available. Install with: pip install databases")
-            raise DatabaseConnectionError(
-                "databases library is required but not installed. "
-                "Install with: pip install databases[postgresql] or databases[mysql] or databases[sqlite]"
-            )
+        self.pool = None
+        self._lock = anyio.Lock()
     
     async def connect(self):
         """Connect to the database"""
-        if self.database and not self._is_connected:
+        async with self._lock:
+            if self.pool is not None:
+                return
             try:
-                await self.database.connect()
-                self._is_connected = True
+                self.pool = await open_pool_from_url(
+                    self.connection_string,
+                    size=self.pool_config.get('max_connections', self.pool_config.get('size', 10)),
+                    readers=self.pool_config.get('readers', 4),
+                    statement_cache_size=self.pool_config.get('statement_cache_size', 128),
+                    timeout=self.pool_config.get('timeout', 30.0)
+                )
                 self.logger.info(f"Connected to {self.database_type} database")
             except Exception as e:
                 self.logger.error(f"Failed to connect to database: {e}")
@@ -778,28 +777,30 @@ class V5DatabaseConnectionPool:
     
     async def disconnect(self):
         """Disconnect from the database"""
-        if self.database and self._is_connected:
+        if self.pool is not None:
             try:
-                await self.database.disconnect()
-                self._is_connected = False
+                await self.pool.close()
                 self.logger.info(f"Disconnected from {self.database_type} database")
             except Exception as e:
                 self.logger.error(f"Failed to disconnect from database: {e}")
+            finally:
+                self.pool = None
     
     async def acquire(self):
-        """Acquire a connection from the pool"""
-        if not self._is_connected:
+        """Acquire a connection handle; each statement checks out a pooled connection"""
+        if self.pool is None:
             await self.connect()
-        
-        # Since __init__ now raises DatabaseConnectionError if databases library
-        # is unavailable, self.database is guaranteed to exist if we reach here
-        return DatabaseConnection(self.database)
+        return DatabaseConnection(self.pool)
     
     async def release(self, connection):
         """Release a connection back to the pool"""
-        # For databases library, connections are automatically managed
+        # Pooled connections are returned after every statement
         pass
     
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool checkout metrics"""
+        return self.pool.get_metrics() if self.pool is not None else {}
+    
     async def cleanup(self):
         """Cleanup connection pool resources"""
         try:
@@ -810,10 +811,10 @@ class V5DatabaseConnectionPool:
 
 
 class DatabaseConnection:
-    """Real database connection wrapper"""
+    """Connection handle routing writes to the writer and reads to the reader pool"""
     
-    def __init__(self, database):
-        self.database = database
+    def __init__(self, pool):
+        self.pool = pool
     
     async def __aenter__(self):
         return self
@@ -823,15 +824,19 @@ class DatabaseConnection:
     
     async def execute(self, query: str, values: Dict[str, Any] = None):
         """Execute a query"""
-        return await self.database.execute(query, values or {})
+        return await self.pool.execute(query, values or {})
+    
+    async def execute_many(self, query: str, values: List[Dict[str, Any]]):
+        """Execute a query once per set of values in one transaction"""
+        return await self.pool.execute_many(query, values)
     
     async def fetch_all(self, query: str, values: Dict[str, Any] = None):
         """Fetch all results from a query"""
-        return await self.database.fetch_all(query, values or {})
+        return await self.pool.fetch_all(query, values or {})
     
     async def fetch_one(self, query: str, values: Dict[str, Any] = None):
         """Fetch one result from a query"""
-        return await self.database.fetch_one(query, values or {})
+        return await self.pool.fetch_one(query, values or {})
 
 
 
@@ -6,7 +6,9 @@ import anyio
 import json
 import websockets
 from typing import Any, Dict, Set, Optional, List
+from urllib.parse import parse_qs, urlparse
 from ..components.composed_base import ComposedComponent
+from .websocket_broadcast import BroadcastHub, ClientChannel, SLOW_CONSUMER_POLICIES
 from autocoder_cc.validation.config_requirement import ConfigRequirement, ConfigType
 
 
@@ -22,15 +24,23 @@ class WebSocketComponent(ComposedComponent):
         self.host = config.get('host', '0.0.0.0')
         self.max_connections = config.get('max_connections', 100)
         self.heartbeat_interval = config.get('heartbeat_interval', 30)
+        self.message_format = config.get('message_format', 'json')
+        # Items are routed to subscribers of item[topic_field]; coalescing keeps the latest per item[coalesce_key]
+        self.topic_field = config.get('topic_field', 'topic')
+        self.coalesce_key = config.get('coalesce_key')
         
-        # Connection tracking
+        # Connection tracking; each client gets a bounded send queue drained by its own task
         self._connected_clients: Set[websockets.WebSocketServerProtocol] = set()
+        self._hub = BroadcastHub(
+            max_queue=config.get('send_queue_size', 1000),
+            policy=config.get('slow_consumer_policy', 'drop_oldest')
+        )
         self._server = None
         self._heartbeat_task = None
         
         self.logger.info(f"WebSocket component initialized on {self.host}:{self.port}")
     
-    async def handle_connection(self, websocket: websockets.WebSocketServerProtocol, path: str):
+    async def handle_connection(self, websocket: websockets.WebSocketServerProtocol, path: str = ""):
         """Handle new WebSocket connection"""
         # Check max connections limit
         if len(self._connected_clients) >= self.max_connections:
@@ -38,83 +48,114 @@ class WebSocketComponent(ComposedComponent):
             await websocket.close(code=1008, reason="Max connections reached")
             return
         
-        # Add to connected clients
+        # Add to connected clients; topics may be given as ?topics=a,b on the connection URL
         self._connected_clients.add(websocket)
+        channel = self._hub.register(websocket, self._topics_from_path(path or getattr(websocket, "path", "")))
         self.logger.info(f"Client connected from {websocket.remote_address}. Total clients: {len(self._connected_clients)}")
         
         try:
-            # Handle incoming messages
-            async for message in websocket:
-                self.logger.debug(f"Received message: {message[:100]}...")
-                # Echo or process message as needed
-                # Could emit to process_item for further processing
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(self._drain_client, channel, tg.cancel_scope)
+                # Handle incoming messages (subscription control)
+                async for message in websocket:
+                    self.logger.debug(f"Received message: {message[:100]}...")
+                    self._handle_client_message(channel, message)
+                tg.cancel_scope.cancel()
         except websockets.exceptions.ConnectionClosed:
             self.logger.info("Client connection closed normally")
         except Exception as e:
             self.logger.error(f"Error handling connection: {e}")
         finally:
             # Clean up on disconnect
+            self._hub.unregister(channel)
             self._connected_clients.discard(websocket)
             self.logger.info(f"Client disconnected. Total clients: {len(self._connected_clients)}")
     
+    async def _drain_client(self, channel: ClientChannel, connection_scope: anyio.CancelScope):
+        """Send queued messages to one client; ends the connection when the hub drops it"""
+        try:
+            await self._hub.drain(channel)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            connection_scope.cancel()
+    
+    @staticmethod
+    def _topics_from_path(path: str) -> List[str]:
+        query = parse_qs(urlparse(path).query)
+        return [topic for value in query.get("topics", []) for topic in value.split(",") if topic]
+    
+    def _handle_client_message(self, channel: ClientChannel, message: Any) -> None:
+        """Apply {"action": "subscribe"|"unsubscribe", "topics": [...]} control messages"""
+        try:
+            request = json.loads(message)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(request, dict):
+            return
+        topics = request.get("topics", [])
+        if isinstance(topics, str):
+            topics = [topics]
+        if request.get("action") == "subscribe":
+            self._hub.subscribe(channel, topics)
+        elif request.get("action") == "unsubscribe":
+            self._hub.unsubscribe(channel, topics)
+    
     async def _send_heartbeat(self):
         """Send periodic heartbeat to all connected clients"""
         while True:
             try:
                 await anyio.sleep(self.heartbeat_interval)
                 if self._connected_clients:
-                    # Send ping to all clients
+                    # Ping all clients concurrently so a stalled one cannot hold up the rest
                     disconnected = set()
-                    for client in self._connected_clients:
+                    
+                    async def ping(client):
                         try:
-                            await client.ping()
-                        except websockets.exceptions.ConnectionClosed:
+                            with anyio.fail_after(self.heartbeat_interval):
+                                await client.ping()
+                        except (websockets.exceptions.ConnectionClosed, TimeoutError):
                             disconnected.add(client)
                     
+                    async with anyio.create_task_group() as tg:
+                        for client in list(self._connected_clients):
+                            tg.start_soon(ping, client)
+                    
                     # Clean up disconnected clients
                     self._connected_clients -= disconnected
                     
                     if disconnected:
                         self.logger.info(f"Cleaned up {len(disconnected)} disconnected clients")
-            except asyncio.CancelledError:
-                break
             except Exception as e:
                 self.logger.error(f"Error in heartbeat: {e}")
     
     async def process_item(self, item: Any) -> Any:
-        """Process item by broadcasting to all connected WebSocket clients"""
+        """Process item by queueing it for every interested WebSocket client"""
         try:
-            # Convert item to JSON if needed
-            if isinstance(item, str):
+            # Encode once per broadcast; every client queue shares the same payload
+            if isinstance(item, (str, bytes)):
                 message = item
             else:
                 message = json.dumps(item)
+            if self.message_format == "binary" and isinstance(message, str):
+                message = message.encode("utf-8")
             
-            # Broadcast to all connected clients
-            if self._connected_clients:
-                # Send to all clients, tracking disconnected ones
-                disconnected = set()
-                sent_count = 0
-                
-                for client in self._connected_clients:
-                    try:
-                        await client.send(message)
-                        sent_count += 1
-                    except websockets.exceptions.ConnectionClosed:
-                        disconnected.add(client)
-                    except Exception as e:
-                        self.logger.error(f"Error sending to client: {e}")
-                        disconnected.add(client)
-                
-                # Clean up disconnected clients
-                self._connected_clients -= disconnected
+            # Enqueue for connected clients; per-client tasks do the sending
+            if len(self._hub):
+                topic = key = None
+                if isinstance(item, dict):
+                    topic = item.get(self.topic_field)
+                    if self.coalesce_key:
+                        key = item.get(self.coalesce_key)
+                disconnects_before = self._hub.slow_disconnects
+                sent_count = self._hub.publish(message, topic=topic, key=key)
                 
                 self.logger.debug(f"Broadcast message to {sent_count} clients")
                 self.increment_processed()
                 
                 return {
                     "broadcast_to": sent_count,
-                    "disconnected": len(disconnected),
+                    "disconnected": self._hub.slow_disconnects - disconnects_before,
                     "message": item
                 }
             else:
@@ -156,6 +197,39 @@ class WebSocketComponent(ComposedComponent):
                 semantic_type=ConfigType.INTEGER,
                 validator=lambda x: x > 0
             ),
+            ConfigRequirement(
+                name="send_queue_size",
+                type="int",
+                description="Maximum queued outbound messages per client",
+                required=False,
+                default=1000,
+                semantic_type=ConfigType.INTEGER,
+                validator=lambda x: x > 0
+            ),
+            ConfigRequirement(
+                name="slow_consumer_policy",
+                type="str",
+                description="What to do when a client's send queue is full",
+                required=False,
+                default="drop_oldest",
+                options=list(SLOW_CONSUMER_POLICIES),
+                semantic_type=ConfigType.STRING
+            ),
+            ConfigRequirement(
+                name="topic_field",
+                type="str",
+                description="Item field naming the topic; subscribed clients only receive their topics",
+                required=False,
+                default="topic",
+                semantic_type=ConfigType.STRING
+            ),
+            ConfigRequirement(
+                name="coalesce_key",
+                type="str",
+                description="Item field identifying superseding updates for the coalesce policy",
+                required=False,
+                semantic_type=ConfigType.STRING
+            ),
             ConfigRequirement(
                 name="message_format",
                 type="str",
@@ -199,6 +273,8 @@ class WebSocketComponent(ComposedComponent):
             await self._server.wait_closed()
             
         # Close all client connections
+        for channel in list(self._hub.channels()):
+            self._hub.unregister(channel)
         for client in self._connected_clients:
             await client.close()
         
@@ -0,0 +1,219 @@
+"""
+Per-client fan-out for WebSocketComponent.
+
+`BroadcastHub.publish` enqueues a pre-encoded message on every interested
+client's bounded queue without awaiting anything, so one slow client never
+delays the others or the pipeline. Each client's queue is drained by its own
+sender task (`BroadcastHub.drain`). When a queue is full the hub applies
+the slow-consumer policy:
+
+  - "drop_oldest": discard the oldest queued message
+  - "coalesce":    keep only the latest message per coalesce key (falling
+                   back to dropping the oldest key when still full)
+  - "disconnect":  close the client with code 1008
+
+Clients without subscriptions receive every message; subscribed clients
+only receive messages for their topics. Messages without a topic go to all.
+"""
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, Optional, Set
+
+import anyio
+
+from autocoder_cc.observability import get_logger
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# Close code for clients that cannot keep up (RFC 6455 "policy violation")
+SLOW_CONSUMER_CLOSE_CODE = 1008
+
+
+class ClientChannel:
+    """Outbound queue and subscriptions of one connected client"""
+
+    __slots__ = ("client", "topics", "queue", "coalesced", "closing", "evicted",
+                 "sent", "dropped", "_wakeup", "_waiting")
+
+    def __init__(self, client: Any, coalesce: bool):
+        self.client = client
+        self.topics: Set[str] = set()
+        # Coalescing queues are keyed so a newer message replaces a queued one in place
+        self.queue = None if coalesce else deque()
+        self.coalesced: Optional[OrderedDict] = OrderedDict() if coalesce else None
+        self.closing = False
+        self.evicted = False  # Closed by the hub as a slow consumer
+        self.sent = 0
+        self.dropped = 0
+        self._wakeup = anyio.Event()
+        self._waiting = False
+
+    def __len__(self) -> int:
+        return len(self.coalesced) if self.coalesced is not None else len(self.queue)
+
+    def wake(self) -> None:
+        # Only an idle sender needs waking; a busy one re-checks its queue before waiting
+        if self._waiting:
+            self._waiting = False
+            self._wakeup.set()
+
+    async def wait(self) -> None:
+        self._waiting = True
+        try:
+            await self._wakeup.wait()
+        finally:
+            self._waiting = False
+        self._wakeup = anyio.Event()
+
+    def pop(self) -> Any:
+        if self.coalesced is not None:
+            return self.coalesced.popitem(last=False)[1]
+        return self.queue.popleft()
+
+
+class BroadcastHub:
+    """Topic-aware fan-out to per-client bounded queues"""
+
+    def __init__(self, max_queue: int = 1000, policy: str = "drop_oldest"):
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"slow_consumer_policy must be one of {SLOW_CONSUMER_POLICIES}, got '{policy}'")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.logger = get_logger("BroadcastHub")
+        self._channels: Dict[Any, ClientChannel] = {}
+        self._broadcast: Set[ClientChannel] = set()  # Channels without subscriptions
+        self._by_topic: Dict[str, Set[ClientChannel]] = {}
+
+        self.messages_published = 0
+        self.messages_dropped = 0
+        self.slow_disconnects = 0
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    # ------------------------------------------------------------ clients
+
+    def register(self, client: Any, topics: Iterable[str] = ()) -> ClientChannel:
+        channel = ClientChannel(client, coalesce=self.policy == "coalesce")
+        self._channels[client] = channel
+        self._broadcast.add(channel)
+        self.subscribe(channel, topics)
+        return channel
+
+    def unregister(self, channel: ClientChannel) -> None:
+        self._channels.pop(channel.client, None)
+        self._broadcast.discard(channel)
+        for topic in channel.topics:
+            subscribers = self._by_topic.get(topic)
+            if subscribers is not None:
+                subscribers.discard(channel)
+                if not subscribers:
+                    del self._by_topic[topic]
+        channel.topics.clear()
+        channel.closing = True
+        channel.wake()
+
+    def subscribe(self, channel: ClientChannel, topics: Iterable[str]) -> None:
+        for topic in topics:
+            channel.topics.add(topic)
+            self._by_topic.setdefault(topic, set()).add(channel)
+        if channel.topics:
+            self._broadcast.discard(channel)
+
+    def unsubscribe(self, channel: ClientChannel, topics: Iterable[str]) -> None:
+        for topic in topics:
+            channel.topics.discard(topic)
+            subscribers = self._by_topic.get(topic)
+            if subscribers is not None:
+                subscribers.discard(channel)
+                if not subscribers:
+                    del self._by_topic[topic]
+        if not channel.topics and channel.client in self._channels:
+            self._broadcast.add(channel)
+
+    def channels(self) -> Iterable[ClientChannel]:
+        return self._channels.values()
+
+    # ---------------------------------------------------------- publishing
+
+    def publish(self, message: Any, topic: Optional[str] = None, key: Any = None) -> int:
+        """Enqueue an already-encoded message for every interested client; never blocks"""
+        self.messages_published += 1
+        if topic is None:
+            targets: Iterable[ClientChannel] = self._channels.values()
+        else:
+            subscribers = self._by_topic.get(topic)
+            targets = self._broadcast if not subscribers else (
+                self._broadcast | subscribers if self._broadcast else subscribers
+            )
+        queued = 0
+        slow = []
+        for channel in targets:
+            if channel.closing:
+                continue
+            if self._enqueue(channel, message, key):
+                queued += 1
+            else:
+                slow.append(channel)
+        for channel in slow:
+            self._disconnect_slow(channel)
+        return queued
+
+    def _enqueue(self, channel: ClientChannel, message: Any, key: Any) -> bool:
+        if channel.coalesced is not None:
+            pending = channel.coalesced
+            slot = key if key is not None else object()
+            if slot in pending:
+                pending[slot] = message  # Newer value supersedes the queued one
+                return True
+            if len(pending) >= self.max_queue:
+                pending.popitem(last=False)
+                self._dropped(channel)
+            pending[slot] = message
+        else:
+            if len(channel.queue) >= self.max_queue:
+                if self.policy == "disconnect":
+                    return False
+                channel.queue.popleft()
+                self._dropped(channel)
+            channel.queue.append(message)
+        channel.wake()
+        return True
+
+    def _dropped(self, channel: ClientChannel) -> None:
+        channel.dropped += 1
+        self.messages_dropped += 1
+
+    def _disconnect_slow(self, channel: ClientChannel) -> None:
+        self.slow_disconnects += 1
+        self.logger.warning(f"Disconnecting slow WebSocket client ({len(channel)} messages queued)")
+        channel.evicted = True
+        self.unregister(channel)
+
+    # ------------------------------------------------------------- sending
+
+    async def drain(self, channel: ClientChannel) -> None:
+        """Sender task for one client: send queued messages until the channel closes"""
+        client = channel.client
+        while True:
+            while len(channel) and not channel.closing:
+                await client.send(channel.pop())
+                channel.sent += 1
+            if channel.closing:
+                break
+            await channel.wait()
+        if channel.evicted:
+            await client.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Slow consumer")
+
+    def get_stats(self) -> Dict[str, Any]:
+        depths = [len(channel) for channel in self._channels.values()]
+        return {
+            "clients": len(self._channels),
+            "topics": len(self._by_topic),
+            "policy": self.policy,
+            "max_queue": self.max_queue,
+            "messages_published": self.messages_published,
+            "messages_dropped": self.messages_dropped,
+            "slow_disconnects": self.slow_disconnects,
+            "max_queue_depth": max(depths, default=0),
+            "queued_messages": sum(depths),
+        }
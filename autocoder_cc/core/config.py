@@ -143,6 +143,8 @@ class Settings(BaseSettings):
     CIRCUIT_BREAKER_THRESHOLD: Optional[int] = Field(default=None, env="CIRCUIT_BREAKER_THRESHOLD", description="Failures before circuit opens")
     CIRCUIT_BREAKER_RECOVERY_TIME: Optional[int] = Field(default=None, env="CIRCUIT_BREAKER_RECOVERY_TIME", description="Time before attempting recovery (seconds)")
     ERROR_CONTEXT_MAX_LENGTH: Optional[int] = Field(default=None, env="ERROR_CONTEXT_MAX_LENGTH", description="Maximum length for error context strings")
+    ERROR_STORM_THRESHOLD: Optional[int] = Field(default=None, env="ERROR_STORM_THRESHOLD", description="Item failures per second above which errors are aggregated instead of logged individually")
+    ERROR_AGGREGATION_INTERVAL: Optional[float] = Field(default=None, env="ERROR_AGGREGATION_INTERVAL", description="Seconds between aggregated error summaries during an error storm")
     
     # Docker and Deployment Settings
     DOCKER_REGISTRY: str = "docker.io"
@@ -309,6 +311,10 @@ class Settings(BaseSettings):
             self.CIRCUIT_BREAKER_RECOVERY_TIME = 30
         if self.ERROR_CONTEXT_MAX_LENGTH is None:
             self.ERROR_CONTEXT_MAX_LENGTH = 1000
+        if self.ERROR_STORM_THRESHOLD is None:
+            self.ERROR_STORM_THRESHOLD = 10
+        if self.ERROR_AGGREGATION_INTERVAL is None:
+            self.ERROR_AGGREGATION_INTERVAL = 10.0
             
         # Monitoring endpoints
         if self.TRACING_ENDPOINT is None:
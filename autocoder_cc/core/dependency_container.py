@@ -6,9 +6,10 @@ Provides centralized dependency injection with interface-based registration,
 lifecycle management, circular dependency detection, and visualization.
 """
 import logging
-from typing import Dict, Any, Type, TypeVar, Optional, Callable, List, Set, Union
+from typing import Dict, Any, Type, TypeVar, Optional, Callable, List, Set, Tuple, Union
 from abc import ABC, abstractmethod
 import inspect
+import itertools
 from collections import defaultdict
 import weakref
 from enum import Enum
@@ -90,6 +91,8 @@ class DependencyRegistration:
         self.metadata = metadata or DependencyMetadata()
         self.instance = None  # For singletons
         self.dependencies: List[Type] = []  # Extracted dependencies
+        # Compiled constructor plan: (param_name, dependency_type, required)
+        self._plan: Optional[List[Tuple[str, Optional[Type], bool]]] = None
         self._extract_dependencies()
         
     def _extract_dependencies(self):
@@ -116,59 +119,93 @@ class DependencyRegistration:
             # Some types might not have inspectable constructors
             pass
     
-    def create_instance(self, container: 'EnhancedDependencyContainer') -> Any:
-        """Create instance with dependency injection"""
-        start_time = time.time()
+    def compile_plan(self) -> List[Tuple[str, Optional[Type], bool]]:
+        """
+        Compile the constructor signature into a cached resolution plan.
+        
+        Reflection happens once per registration; subsequent creations only
+        walk the plan and look up dependencies in the container.
+        """
+        if self._plan is not None:
+            return self._plan
+        
+        plan: List[Tuple[str, Optional[Type], bool]] = []
+        if not self.factory:
+            sig = inspect.signature(self.implementation.__init__)
+            for param_name, param in sig.parameters.items():
+                if param_name == 'self' or param.kind in (
+                    inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD
+                ):
+                    continue
+                
+                # Unannotated parameters are left to the constructor, which raises
+                # TypeError for a missing required argument
+                required = param.default == inspect.Parameter.empty \
+                    and param.annotation != inspect.Parameter.empty
+                dep_type = None
+                
+                # Get type hint for dependency resolution
+                if param.annotation != inspect.Parameter.empty:
+                    dep_type = param.annotation
+                    
+                    # Handle Optional types
+                    if hasattr(dep_type, '__origin__'):
+                        if dep_type.__origin__ is Union:
+                            # Get first non-None type from Optional
+                            args = [t for t in dep_type.__args__ if t is not type(None)]
+                            if args:
+                                dep_type = args[0]
+                        else:
+                            dep_type = dep_type.__origin__
+                    
+                    if not inspect.isclass(dep_type):
+                        dep_type = None
+                
+                plan.append((param_name, dep_type, required))
+        
+        self._plan = plan
+        return plan
+    
+    def create_instance(self, container: 'EnhancedDependencyContainer', timed: bool = True) -> Any:
+        """
+        Create instance with dependency injection.
+        
+        Args:
+            container: Container used to resolve constructor dependencies
+            timed: Whether to record resolution timing in the metadata
+        """
+        start_time = time.perf_counter() if timed else 0.0
         
         try:
             if self.factory:
                 instance = self.factory(container)
             else:
-                # Extract constructor dependencies
-                sig = inspect.signature(self.implementation.__init__)
                 kwargs = {}
-                
-                for param_name, param in sig.parameters.items():
-                    if param_name == 'self':
-                        continue
-                        
-                    # Get type hint for dependency resolution
-                    if param.annotation != inspect.Parameter.empty:
-                        dep_type = param.annotation
-                        
-                        # Handle Optional types
-                        if hasattr(dep_type, '__origin__'):
-                            if dep_type.__origin__ is Union:
-                                # Get first non-None type from Optional
-                                args = [t for t in dep_type.__args__ if t is not type(None)]
-                                if args:
-                                    dep_type = args[0]
-                            else:
-                                dep_type = dep_type.__origin__
-                        
-                        # Resolve dependency
-                        if inspect.isclass(dep_type) and container.has_registration(dep_type):
-                            kwargs[param_name] = container.resolve(dep_type)
-                        elif param.default == inspect.Parameter.empty:
-                            raise ValueError(
-                                f"Cannot resolve required dependency {param_name}: {dep_type} "
-                                f"for {self.implementation.__name__}"
-                            )
+                for param_name, dep_type, required in self._plan or self.compile_plan():
+                    # Resolve dependency
+                    if dep_type is not None and dep_type in container._registrations:
+                        kwargs[param_name] = container.resolve(dep_type)
+                    elif required:
+                        raise ValueError(
+                            f"Cannot resolve required dependency {param_name}: {dep_type} "
+                            f"for {self.implementation.__name__}"
+                        )
                 
                 instance = self.implementation(**kwargs)
             
             # Update metadata
-            elapsed_ms = (time.time() - start_time) * 1000
             self.metadata.resolution_count += 1
             self.metadata.last_resolved_at = datetime.now()
-            
-            # Update rolling average
-            if self.metadata.average_resolution_time_ms == 0:
-                self.metadata.average_resolution_time_ms = elapsed_ms
-            else:
-                self.metadata.average_resolution_time_ms = (
-                    self.metadata.average_resolution_time_ms * 0.9 + elapsed_ms * 0.1
-                )
+            if timed:
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                
+                # Update rolling average
+                if self.metadata.average_resolution_time_ms == 0:
+                    self.metadata.average_resolution_time_ms = elapsed_ms
+                else:
+                    self.metadata.average_resolution_time_ms = (
+                        self.metadata.average_resolution_time_ms * 0.9 + elapsed_ms * 0.1
+                    )
             
             return instance
             
@@ -191,17 +228,30 @@ class EnhancedDependencyContainer:
     lifecycle management, circular dependency detection, and visualization.
     """
     
-    def __init__(self):
+    def __init__(self, observability_sample_rate: float = 0.0):
+        """
+        Args:
+            observability_sample_rate: Fraction of resolutions (0.0-1.0) that open a
+                tracing span and record timing metrics. Defaults to off so the hot
+                resolve() path carries no observability overhead.
+        """
         self._registrations: Dict[Type, DependencyRegistration] = {}
         self._aliases: Dict[str, Type] = {}
         self._scopes: Dict[str, DependencyScope] = {}
         self._current_scope: Optional[str] = None
         self._resolution_stack: List[Type] = []
         self._lock = threading.RLock()
+        self._frozen = False
         
-        # Performance tracking
-        self._total_resolutions = 0
+        # Performance tracking. next() on itertools.count is atomic under the GIL,
+        # so the lock-free singleton path can count without a lock; each read
+        # consumes one value, which _counter_reads subtracts back out.
+        self._resolution_counter = itertools.count()
+        self._counter_reads = 0
+        self._resolutions_reported = 0
+        self._sampled_resolutions = 0
         self._total_resolution_time_ms = 0.0
+        self.set_observability_sample_rate(observability_sample_rate)
         
         # Observability
         self.logger = get_logger(self.__class__.__name__)
@@ -233,6 +283,7 @@ class EnhancedDependencyContainer:
             description: Optional description for documentation
         """
         with self._lock:
+            self._check_not_frozen(interface)
             if not implementation and not factory:
                 raise ValueError(
                     "Either implementation or factory must be provided"
@@ -340,6 +391,7 @@ class EnhancedDependencyContainer:
         description: Optional[str] = None
     ) -> None:
         """Register an existing instance as a singleton"""
+        self._check_not_frozen(interface)
         metadata = DependencyMetadata(description=description)
         
         registration = DependencyRegistration(
@@ -380,6 +432,12 @@ class EnhancedDependencyContainer:
         """
         Resolve a dependency from the container.
         
+        Already-built singletons are returned without taking the container
+        lock. Other resolutions use the registration's compiled constructor
+        plan. Every resolution is counted; the tracing span and timing metrics
+        are only recorded for sampled resolutions, and the resolution count is
+        reported to metrics in aggregate on sampled resolutions and get_statistics().
+        
         Args:
             interface: The interface type to resolve
             alias: Optional alias to resolve instead of interface
@@ -391,15 +449,20 @@ class EnhancedDependencyContainer:
             ValueError: If dependency not registered
             CircularDependencyError: If circular dependency detected
         """
+        # Resolve alias if provided
+        if alias:
+            interface = self._aliases.get(alias)
+            if interface is None:
+                raise ValueError(f"No registration found for alias: {alias}")
+        
+        # Lock-free read path: a built singleton never changes once published
+        registration = self._registrations.get(interface)
+        if registration is not None and registration.instance is not None \
+                and registration.lifecycle is Lifecycle.SINGLETON:
+            next(self._resolution_counter)
+            return registration.instance
+        
         with self._lock:
-            start_time = time.time()
-            
-            # Resolve alias if provided
-            if alias:
-                if alias not in self._aliases:
-                    raise ValueError(f"No registration found for alias: {alias}")
-                interface = self._aliases[alias]
-            
             if interface not in self._registrations:
                 raise ValueError(
                     f"No registration found for {interface.__name__}"
@@ -414,7 +477,12 @@ class EnhancedDependencyContainer:
             
             try:
                 registration = self._registrations[interface]
+                next(self._resolution_counter)
                 
+                if not self._should_sample():
+                    return self._create_instance(registration, timed=False)
+                
+                start_time = time.perf_counter()
                 with self.tracer.span(
                     f"resolve_{interface.__name__}",
                     tags={
@@ -422,37 +490,96 @@ class EnhancedDependencyContainer:
                         "has_factory": registration.factory is not None
                     }
                 ):
-                    instance = self._create_instance(registration)
+                    instance = self._create_instance(registration, timed=True)
                 
                 # Update statistics
-                elapsed_ms = (time.time() - start_time) * 1000
-                self._total_resolutions += 1
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                self._sampled_resolutions += 1
                 self._total_resolution_time_ms += elapsed_ms
                 
-                self.metrics.increment("dependencies_resolved")
                 self.metrics.gauge(
                     "resolution_time_ms",
                     elapsed_ms,
                     tags={"interface": interface.__name__}
                 )
+                self._report_resolutions()
                 
                 return instance
                 
             finally:
                 self._resolution_stack.pop()
     
+    def _total_resolutions(self) -> int:
+        """Resolutions counted so far (call with the container lock held)"""
+        total = next(self._resolution_counter) - self._counter_reads
+        self._counter_reads += 1
+        return total
+    
+    def _report_resolutions(self) -> int:
+        """Report resolutions since the last call to the dependencies_resolved counter; returns the total"""
+        with self._lock:
+            total = self._total_resolutions()
+            if total > self._resolutions_reported:
+                self.metrics.counter("dependencies_resolved", total - self._resolutions_reported)
+                self._resolutions_reported = total
+            return total
+    
+    def set_observability_sample_rate(self, rate: float) -> None:
+        """Set the fraction of resolutions that are traced and timed (0 disables)"""
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0.0 and 1.0, got {rate}")
+        # Deterministic 1-in-N sampling keeps the hot path to a counter check
+        self._sample_interval = round(1 / rate) if rate > 0 else 0
+        self._sample_counter = 0
+    
+    def _should_sample(self) -> bool:
+        """Whether the current resolution should be traced and timed"""
+        if not self._sample_interval:
+            return False
+        self._sample_counter += 1
+        if self._sample_counter >= self._sample_interval:
+            self._sample_counter = 0
+            return True
+        return False
+    
+    def freeze(self) -> None:
+        """
+        Compile every registration's constructor plan and reject further registrations.
+        
+        Validation findings are logged; missing required dependencies still fail at resolve time.
+        """
+        with self._lock:
+            for error in self.validate_registrations():
+                self.logger.warning(f"Dependency validation: {error}")
+            for registration in self._registrations.values():
+                registration.compile_plan()
+            self._frozen = True
+            self.logger.info(f"Dependency container frozen with {len(self._registrations)} registrations")
+    
+    @property
+    def is_frozen(self) -> bool:
+        """Whether the container has been frozen"""
+        return self._frozen
+    
+    def _check_not_frozen(self, interface: Type) -> None:
+        if self._frozen:
+            raise RuntimeError(
+                f"Cannot register {interface.__name__}: dependency container is frozen"
+            )
+    
     def _create_instance(
         self,
-        registration: DependencyRegistration
+        registration: DependencyRegistration,
+        timed: bool = True
     ) -> Any:
         """Create instance based on lifecycle"""
         if registration.lifecycle == Lifecycle.SINGLETON:
             if registration.instance is None:
-                registration.instance = registration.create_instance(self)
+                registration.instance = registration.create_instance(self, timed)
             return registration.instance
             
         elif registration.lifecycle == Lifecycle.TRANSIENT:
-            return registration.create_instance(self)
+            return registration.create_instance(self, timed)
             
         elif registration.lifecycle == Lifecycle.SCOPED:
             if not self._current_scope:
@@ -464,7 +591,7 @@ class EnhancedDependencyContainer:
             scope = self._scopes[self._current_scope]
             return scope.get_or_create(
                 registration.interface.__name__,
-                lambda: registration.create_instance(self)
+                lambda: registration.create_instance(self, timed)
             )
     
     def has_registration(self, interface: Type) -> bool:
@@ -617,10 +744,11 @@ class EnhancedDependencyContainer:
                 ]
             },
             "performance": {
-                "total_resolutions": self._total_resolutions,
+                "total_resolutions": self._report_resolutions(),
+                "sampled_resolutions": self._sampled_resolutions,
                 "average_resolution_time_ms": (
-                    self._total_resolution_time_ms / self._total_resolutions
-                    if self._total_resolutions > 0 else 0
+                    self._total_resolution_time_ms / self._sampled_resolutions
+                    if self._sampled_resolutions > 0 else 0
                 )
             },
             "top_resolved": self._get_top_resolved(5)
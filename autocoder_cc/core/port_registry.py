@@ -4,11 +4,13 @@ Port Registry - Centralized port management for system generation
 Implements Phase 2A: Single source of truth for port allocation and coordination
 """
 
+import itertools
 import random
 import threading
-from typing import Dict, Set, Optional, List, Tuple
+from typing import Dict, Iterator, Set, Optional, List, Tuple
 from dataclasses import dataclass, field
 from autocoder_cc.observability import get_logger
+from autocoder_cc.core.port_store import PortStore, get_port_store
 
 logger = get_logger(__name__)
 
@@ -32,6 +34,9 @@ class PortRegistry:
     
     Features:
     - Thread-safe port allocation
+    - Host-level reservations in the shared PortStore, so parallel
+      generation processes never receive the same port
+    - Bulk allocation of a system's ports in one locked transaction
     - Conflict detection and resolution
     - Port availability validation
     - Cleanup on system generation failure
@@ -41,7 +46,8 @@ class PortRegistry:
     def __init__(self, 
                  port_range_start: int = 8000,
                  port_range_end: int = 65535,
-                 reserved_ports: Optional[Set[int]] = None):
+                 reserved_ports: Optional[Set[int]] = None,
+                 store: Optional[PortStore] = None):
         """
         Initialize port registry with configurable port ranges
         
@@ -49,6 +55,7 @@ class PortRegistry:
             port_range_start: Starting port for allocation range
             port_range_end: Ending port for allocation range  
             reserved_ports: Set of ports that should never be allocated
+            store: Reservation backend (default: the host-level PortStore)
         """
         self.port_range_start = port_range_start
         self.port_range_end = port_range_end
@@ -56,7 +63,8 @@ class PortRegistry:
             22, 80, 443, 3306, 5432, 6379, 8080, 9090, 9200, 9300
         }
         
-        # Thread-safe storage
+        # Thread-safe storage; the store is the source of truth across processes
+        self._store = store or get_port_store()
         self._lock = threading.RLock()
         self._allocated_ports: Dict[int, PortAllocation] = {}
         self._component_ports: Dict[str, int] = {}
@@ -92,37 +100,61 @@ class PortRegistry:
                 logger.info(f"Component '{component_name}' already has port {existing_port}")
                 return existing_port
             
-            # Try preferred port first
-            if preferred_port and self._is_port_available(preferred_port):
-                port = preferred_port
-                logger.info(f"Allocated preferred port {port} for {component_name}")
-            else:
-                # Find next available port
-                port = self._find_available_port(component_type)
-                if port is None:
-                    raise RuntimeError(f"No available ports for component '{component_name}'")
-                
-                logger.info(f"Allocated port {port} for {component_name} ({component_type})")
+            try:
+                port = self._reserve(system_id, {component_name: component_type}, {component_name: preferred_port})[component_name]
+            except RuntimeError:
+                raise RuntimeError(f"No available ports for component '{component_name}'")
             
-            # Record allocation
-            allocation = PortAllocation(
-                component_name=component_name,
+            logger.info(f"Allocated port {port} for {component_name} ({component_type})")
+            return port
+    
+    def allocate_ports(self,
+                       components: Dict[str, Optional[str]],
+                       system_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Allocate ports for many components in one transaction
+        
+        Args:
+            components: Component name -> component type (or None)
+            system_id: ID of the system the components belong to
+            
+        Returns:
+            Dict mapping component name to allocated port
+            
+        Raises:
+            RuntimeError: If any component gets no port; none are allocated then
+        """
+        with self._lock:
+            ports = {name: self._component_ports[name] for name in components if name in self._component_ports}
+            pending = {name: component_type for name, component_type in components.items() if name not in ports}
+            if pending:
+                ports.update(self._reserve(system_id, pending))
+                logger.info(f"Allocated {len(pending)} ports for system '{system_id}'")
+            return ports
+    
+    def _reserve(self, system_id: Optional[str], components: Dict[str, Optional[str]],
+                 preferred: Optional[Dict[str, Optional[int]]] = None) -> Dict[str, int]:
+        """Reserve ports in the store and record them locally (caller holds the lock)"""
+        preferred = preferred or {}
+        ports = self._store.reserve(
+            system_id or "",
+            {name: self._candidate_ports(component_type, preferred.get(name))
+             for name, component_type in components.items()},
+        )
+        for name, port in ports.items():
+            self._allocated_ports[port] = PortAllocation(
+                component_name=name,
                 port=port,
                 allocated_at=0,  # Will be set in __post_init__
                 system_id=system_id,
-                component_type=component_type
+                component_type=components[name]
             )
-            
-            self._allocated_ports[port] = allocation
-            self._component_ports[component_name] = port
+            self._component_ports[name] = port
             
             # Track system-level allocations
             if system_id:
-                if system_id not in self._system_ports:
-                    self._system_ports[system_id] = []
-                self._system_ports[system_id].append(port)
-            
-            return port
+                self._system_ports.setdefault(system_id, []).append(port)
+        return ports
     
     def deallocate_port(self, port: int) -> bool:
         """
@@ -154,6 +186,7 @@ class PortRegistry:
                 if not self._system_ports[system_id]:
                     del self._system_ports[system_id]
             
+            self._store.release([port])
             logger.info(f"Deallocated port {port} from component '{component_name}'")
             return True
     
@@ -186,17 +219,17 @@ class PortRegistry:
             Number of ports deallocated
         """
         with self._lock:
-            if system_id not in self._system_ports:
+            for port in self._system_ports.pop(system_id, []):
+                allocation = self._allocated_ports.pop(port, None)
+                if allocation is not None:
+                    self._component_ports.pop(allocation.component_name, None)
+            
+            # Includes reservations made for the system by other processes
+            deallocated_count = self._store.release_system(system_id)
+            if not deallocated_count:
                 logger.info(f"No ports allocated for system '{system_id}'")
                 return 0
             
-            ports_to_cleanup = self._system_ports[system_id].copy()
-            deallocated_count = 0
-            
-            for port in ports_to_cleanup:
-                if self.deallocate_port(port):
-                    deallocated_count += 1
-            
             logger.info(f"Cleaned up {deallocated_count} ports for system '{system_id}'")
             return deallocated_count
     
@@ -237,7 +270,7 @@ class PortRegistry:
             True if port is available, False otherwise
         """
         with self._lock:
-            return self._is_port_available(port)
+            return self._is_port_available(port) and not self._store.taken([port])
     
     def get_allocation_info(self, port: int) -> Optional[PortAllocation]:
         """
@@ -275,9 +308,10 @@ class PortRegistry:
         with self._lock:
             available = []
             unavailable = []
+            taken = self._store.taken(ports)
             
             for port in ports:
-                if self._is_port_available(port):
+                if port not in taken and self._is_port_available(port):
                     available.append(port)
                 else:
                     unavailable.append(port)
@@ -294,16 +328,21 @@ class PortRegistry:
             return False
         return True
     
-    def _find_available_port(self, component_type: Optional[str] = None) -> Optional[int]:
+    def _candidate_ports(self, component_type: Optional[str] = None,
+                         preferred_port: Optional[int] = None) -> Iterator[int]:
         """
-        Find next available port in range
+        Ports to try for a component, in order
         
         Args:
             component_type: Component type for port range optimization
+            preferred_port: Port to try first
             
-        Returns:
-            Available port number or None if no ports available
+        Yields:
+            Ports in range that are not reserved or allocated by this registry
         """
+        if preferred_port and self._is_port_available(preferred_port):
+            yield preferred_port
+        
         # Component type specific port ranges for better organization
         if component_type == "APIEndpoint":
             search_start = 8000
@@ -319,20 +358,11 @@ class PortRegistry:
         search_start = max(search_start, self.port_range_start)
         search_end = min(search_end, self.port_range_end)
         
-        # Random starting point to avoid clustering
+        # Random starting point to avoid clustering, wrapping around to the start of the range
         start_port = random.randint(search_start, search_end)
-        
-        # Search from random start to end of range
-        for port in range(start_port, search_end + 1):
+        for port in itertools.chain(range(start_port, search_end + 1), range(search_start, start_port)):
             if self._is_port_available(port):
-                return port
-        
-        # Search from beginning of range to random start
-        for port in range(search_start, start_port):
-            if self._is_port_available(port):
-                return port
-        
-        return None
+                yield port
     
     def __str__(self) -> str:
         """String representation of port registry status"""
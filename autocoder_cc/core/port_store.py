@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Port Store - host-level port reservations shared by every allocator
+
+PortRegistry and the generation-time PortAllocator both reserve ports here,
+so parallel generation runs on one host never hand out the same port.
+
+Reservations live in a small SQLite database (WAL mode) with one row per
+port. A whole system's ports are reserved in a single `BEGIN IMMEDIATE`
+transaction: the taken set is read once, every component gets a port, and
+the rows are inserted together, all or nothing. SQLite's write lock is the
+cross-process lock, held for that one transaction instead of once per port.
+
+Stale cleanup is incremental: at most every `cleanup_interval` seconds the
+transaction checks each distinct owning PID once (not once per row) and
+drops reservations of dead processes and ones older than `max_age`.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+import psutil
+
+from autocoder_cc.observability import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ports (
+    port INTEGER PRIMARY KEY,
+    system TEXT NOT NULL,
+    component TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    allocated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ports_owner ON ports (system, component);
+CREATE INDEX IF NOT EXISTS ports_pid ON ports (pid);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL);
+"""
+
+
+class PortsExhaustedError(RuntimeError):
+    """No free port for one or more components; nothing was reserved"""
+
+    def __init__(self, system: str, components: List[str]):
+        self.system = system
+        self.components = components
+        super().__init__(f"No available ports for {', '.join(components)} in system '{system}'")
+
+
+class PortStore:
+    """SQLite-backed port reservations, safe across threads and processes"""
+
+    def __init__(self, path: str, max_age: float = 7 * 24 * 3600, cleanup_interval: float = 60.0,
+                 busy_timeout: float = 30.0):
+        self.path = path
+        self.max_age = max_age
+        self.cleanup_interval = cleanup_interval
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction holding SQLite's database lock from the first statement"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _cleanup_stale(self, conn: sqlite3.Connection, now: float) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_cleanup'").fetchone()
+        if row is not None and now - row[0] < self.cleanup_interval:
+            return 0
+        pids = [pid for (pid,) in conn.execute("SELECT DISTINCT pid FROM ports")]
+        dead = [pid for pid in pids if pid != self._pid and not psutil.pid_exists(pid)]
+        removed = 0
+        if dead:
+            removed += conn.execute(
+                f"DELETE FROM ports WHERE pid IN ({','.join('?' * len(dead))})", dead
+            ).rowcount
+        removed += conn.execute("DELETE FROM ports WHERE allocated_at < ?", (now - self.max_age,)).rowcount
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_cleanup', ?)", (now,))
+        if removed:
+            logger.info(f"Released {removed} stale port reservations ({len(dead)} dead processes)")
+        return removed
+
+    def reserve(self, system: str, candidates: Dict[str, Iterable[int]],
+                is_free: Optional[Callable[[int], bool]] = None) -> Dict[str, int]:
+        """
+        Reserve one port per component of `system` in a single transaction.
+
+        `candidates` maps each component to the ports to try, in order; they are
+        consumed lazily, so a generator over a whole range is fine. A component
+        that already holds a port in `system` keeps it. `is_free` is an extra
+        check (such as a bind probe) for candidates not reserved by anyone.
+
+        Raises:
+            PortsExhaustedError: if any component gets no port; nothing is reserved
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._cleanup_stale(conn, now)
+            existing = dict(conn.execute("SELECT component, port FROM ports WHERE system = ?", (system,)))
+            taken: Set[int] = {port for (port,) in conn.execute("SELECT port FROM ports")}
+
+            result: Dict[str, int] = {}
+            missing: List[str] = []
+            for component, ports in candidates.items():
+                port = existing.get(component)
+                if port is None:
+                    port = next((p for p in ports if p not in taken and (is_free is None or is_free(p))), None)
+                if port is None:
+                    missing.append(component)
+                    continue
+                taken.add(port)
+                result[component] = port
+            if missing:
+                raise PortsExhaustedError(system, missing)
+
+            # Re-reserving refreshes owner and age, so a restarted system keeps its ports
+            conn.executemany(
+                "INSERT INTO ports (port, system, component, pid, allocated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (port) DO UPDATE SET pid = excluded.pid, allocated_at = excluded.allocated_at",
+                [(port, system, component, self._pid, now) for component, port in result.items()],
+            )
+        return result
+
+    def release(self, ports: Iterable[int]) -> int:
+        ports = list(ports)
+        if not ports:
+            return 0
+        with self._transaction() as conn:
+            return conn.executemany("DELETE FROM ports WHERE port = ?", [(port,) for port in ports]).rowcount
+
+    def release_system(self, system: str) -> int:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM ports WHERE system = ?", (system,)).rowcount
+
+    def taken(self, ports: Iterable[int]) -> Set[int]:
+        """The subset of `ports` reserved by anyone on this host"""
+        ports = list(ports)
+        taken: Set[int] = set()
+        with self._lock:
+            for start in range(0, len(ports), 500):
+                chunk = ports[start:start + 500]
+                taken.update(port for (port,) in self._conn.execute(
+                    f"SELECT port FROM ports WHERE port IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        return taken
+
+    def allocations(self, system: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = "SELECT port, system, component, pid, allocated_at FROM ports"
+        params: tuple = ()
+        if system is not None:
+            query += " WHERE system = ?"
+            params = (system,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY port", params).fetchall()
+        return [
+            {"port": port, "system": system, "component": component, "pid": pid, "allocated_at": allocated_at}
+            for port, system, component, pid, allocated_at in rows
+        ]
+
+
+_stores: Dict[str, PortStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_port_store(path: Optional[str] = None) -> PortStore:
+    """Shared PortStore for `path` (default: AUTOCODER_PORT_DB or ~/.autocoder/allocated_ports.db)"""
+    if path is None:
+        path = os.getenv("AUTOCODER_PORT_DB", "~/.autocoder/allocated_ports.db")
+    if path != ":memory:":
+        path = str(Path(path).expanduser())
+    with _stores_lock:
+        store = _stores.get(path)
+        # A forked child must not share its parent's connection
+        if store is None or store._pid != os.getpid():
+            store = _stores[path] = PortStore(path)
+        return store
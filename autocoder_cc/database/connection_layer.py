@@ -1,21 +1,11 @@
-"""Database connection layer for port-based components."""
-import asyncio
-from typing import Dict, Any, Optional, List
+"""Database connection layer for port-based components.
+
+SQL databases are served by the pools in `autocoder_cc.database.pool`.
+"""
+from typing import Dict, Any, Optional, List, Iterable, Sequence
 from dataclasses import dataclass
 from autocoder_cc.observability import get_logger
-
-# Try to import database libraries if available
-try:
-    import asyncpg  # PostgreSQL
-    HAS_ASYNCPG = True
-except ImportError:
-    HAS_ASYNCPG = False
-
-try:
-    import aiosqlite  # SQLite
-    HAS_AIOSQLITE = True
-except ImportError:
-    HAS_AIOSQLITE = False
+from autocoder_cc.database.pool import DatabasePool, open_pool, HAS_ASYNCPG, HAS_AIOSQLITE
 
 try:
     from motor.motor_asyncio import AsyncIOMotorClient  # MongoDB
@@ -30,6 +20,8 @@ class DatabaseConfig:
     connection_string: str
     pool_size: int = 10
     timeout: int = 30
+    readers: int = 4  # SQLite reader connections next to the single writer
+    statement_cache_size: int = 128
 
 class DatabaseConnectionLayer:
     """Manages database connections for components."""
@@ -43,25 +35,18 @@ class DatabaseConnectionLayer:
         """Create database connection."""
         self.logger.info(f"Connecting to {config.db_type} database: {name}")
         
-        if config.db_type == 'postgres':
-            if not HAS_ASYNCPG:
-                raise ImportError("asyncpg not installed. Install with: pip install asyncpg")
-            pool = await asyncpg.create_pool(
+        if config.db_type in ('postgres', 'sqlite'):
+            pool = await open_pool(
+                config.db_type,
                 config.connection_string,
-                min_size=1,
-                max_size=config.pool_size,
-                command_timeout=config.timeout
+                size=config.pool_size,
+                readers=config.readers,
+                statement_cache_size=config.statement_cache_size,
+                timeout=config.timeout
             )
             self.pools[name] = pool
             return pool
             
-        elif config.db_type == 'sqlite':
-            if not HAS_AIOSQLITE:
-                raise ImportError("aiosqlite not installed. Install with: pip install aiosqlite")
-            conn = await aiosqlite.connect(config.connection_string)
-            self.connections[name] = conn
-            return conn
-            
         elif config.db_type == 'mongodb':
             if not HAS_MOTOR:
                 raise ImportError("motor not installed. Install with: pip install motor")
@@ -86,25 +71,39 @@ class DatabaseConnectionLayer:
         
         self.logger.info(f"Disconnected: {name}")
     
-    async def execute(self, name: str, query: str, *args) -> Any:
-        """Execute database query."""
+    def _pool(self, name: str) -> DatabasePool:
         if name in self.pools:
-            # PostgreSQL
-            async with self.pools[name].acquire() as conn:
-                return await conn.fetch(query, *args)
-                
-        elif name in self.connections:
-            conn = self.connections[name]
-            if HAS_AIOSQLITE and hasattr(conn, 'execute'):
-                # SQLite
-                cursor = await conn.execute(query, args)
-                return await cursor.fetchall()
-            else:
-                # MongoDB - needs different approach
-                raise NotImplementedError("Use MongoDB client directly")
-        
+            return self.pools[name]
+        if name in self.connections:
+            # MongoDB - needs different approach
+            raise NotImplementedError("Use MongoDB client directly")
         raise KeyError(f"No connection named: {name}")
     
+    async def execute(self, name: str, query: str, *args) -> Any:
+        """Execute database query on the write connection and return its rows."""
+        pool = self._pool(name)
+        async with pool.acquire(write=True) as conn:
+            if pool.dialect == 'postgres':
+                return await conn.fetch(query, *args)
+            return list(await conn.execute_fetchall(query, args))
+    
+    async def fetch(self, name: str, query: str, *args) -> List[Any]:
+        """Run a read-only query; SQLite spreads these over its reader connections."""
+        return await self._pool(name).fetch_all(query, args)
+    
+    async def execute_many(self, name: str, query: str, args: Iterable[Sequence[Any]]) -> int:
+        """Execute one statement for each argument tuple in a single transaction."""
+        return await self._pool(name).execute_many(query, args)
+    
+    async def copy_records(self, name: str, table: str, columns: Sequence[str],
+                           records: Iterable[Sequence[Any]]) -> int:
+        """Bulk-load rows into a table (COPY on PostgreSQL)."""
+        return await self._pool(name).copy_records(table, columns, records)
+    
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Pool checkout metrics per connection name."""
+        return {name: pool.get_metrics() for name, pool in self.pools.items()}
+    
     async def disconnect_all(self):
         """Close all connections."""
         for name in list(self.pools.keys()):
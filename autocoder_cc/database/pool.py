@@ -0,0 +1,512 @@
+"""
+Pooled database access shared by Store, V5EnhancedStore and the connection layer.
+
+`open_pool` returns a `DatabasePool` for a database URL or `DatabaseConfig`:
+
+  - SQLite: one writer connection plus N reader connections on a WAL
+    database. aiosqlite runs each connection on its own thread and sqlite3
+    releases the GIL while stepping a statement, so point reads scale with
+    the reader count while writes stay serialized through the writer.
+    In-memory databases cannot be shared between connections and use the
+    writer for everything.
+  - PostgreSQL: an asyncpg pool; bulk loads use COPY.
+  - MySQL: the `databases` library's pool (aiomysql underneath), the path
+    Store and V5EnhancedStore used before this module existed.
+
+Prepared statements are cached per connection by the drivers themselves
+(sqlite3's `cached_statements`, asyncpg's `statement_cache_size`), both LRUs
+keyed on the SQL text; the pool sizes them and keeps the text stable, so a
+repeated query is prepared once per connection.
+
+Queries use `:name` placeholders with a mapping of values (the convention
+Store and V5EnhancedStore already follow) or the driver's positional style
+with a sequence. For PostgreSQL named placeholders are rewritten to `$n`
+once per distinct query. MySQL accepts named placeholders only.
+"""
+import re
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import anyio
+
+from autocoder_cc.observability import get_logger
+
+try:
+    import asyncpg  # PostgreSQL
+    HAS_ASYNCPG = True
+except ImportError:
+    HAS_ASYNCPG = False
+
+try:
+    import aiosqlite  # SQLite
+    HAS_AIOSQLITE = True
+except ImportError:
+    HAS_AIOSQLITE = False
+
+try:
+    import databases  # MySQL
+    HAS_DATABASES = True
+except ImportError:
+    HAS_DATABASES = False
+
+Values = Optional[Union[Mapping[str, Any], Sequence[Any]]]
+
+_clock = time.perf_counter
+
+# Names accepted for each backend, including the URL schemes Store configs use
+DB_TYPE_ALIASES = {
+    "sqlite": "sqlite", "sqlite3": "sqlite",
+    "postgres": "postgres", "postgresql": "postgres", "postgresql+asyncpg": "postgres",
+    "mysql": "mysql", "mysql+aiomysql": "mysql",
+}
+
+
+def parse_database_url(url: str) -> Tuple[str, str]:
+    """Split a database URL into (db_type, driver target).
+
+    `sqlite:///relative.db`, `sqlite:////abs/path.db` and `sqlite://` (in
+    memory) give a file path; PostgreSQL URLs give an asyncpg DSN and MySQL
+    URLs are passed to the `databases` library unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    db_type = DB_TYPE_ALIASES.get(scheme.lower()) if sep else None
+    if db_type == "sqlite":
+        path = rest[1:] if rest.startswith("/") else rest
+        return "sqlite", path or ":memory:"
+    if db_type == "postgres":
+        return "postgres", f"postgresql://{rest}"
+    if db_type == "mysql":
+        return "mysql", url
+    raise ValueError(f"Unsupported database URL: {url.split('@')[-1]}")
+
+
+@lru_cache(maxsize=1024)
+def _named_to_positional(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """Rewrite `:name` placeholders to `$n`; `::type` casts are left alone"""
+    names: List[str] = []
+
+    def replace(match: "re.Match") -> str:
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return re.sub(r"(?<![:\w]):([A-Za-z_]\w*)", replace, query), tuple(names)
+
+
+@dataclass
+class PoolMetrics:
+    """Checkout statistics for one group of connections"""
+    size: int
+    in_use: int = 0
+    peak_in_use: int = 0
+    checkouts: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    held_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        checkouts = max(1, self.checkouts)
+        return {
+            "size": self.size,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "avg_wait_ms": round(self.wait_seconds / checkouts * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            "avg_checkout_ms": round(self.held_seconds / checkouts * 1000, 3),
+        }
+
+
+class _ConnectionSlots:
+    """Fixed set of connections handed out one task at a time"""
+
+    def __init__(self, connections: List[Any]):
+        self.connections = list(connections)
+        self._idle = list(connections)
+        self._available = anyio.Semaphore(len(connections))
+        self.metrics = PoolMetrics(size=len(connections))
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[Any]:
+        metrics = self.metrics
+        started = _clock()
+        if self._available.value == 0:
+            metrics.waits += 1
+        await self._available.acquire()
+        acquired = _clock()
+        waited = acquired - started
+        metrics.wait_seconds += waited
+        if waited > metrics.max_wait_seconds:
+            metrics.max_wait_seconds = waited
+        metrics.checkouts += 1
+        metrics.in_use += 1
+        if metrics.in_use > metrics.peak_in_use:
+            metrics.peak_in_use = metrics.in_use
+        connection = self._idle.pop()
+        try:
+            yield connection
+        finally:
+            self._idle.append(connection)
+            metrics.in_use -= 1
+            metrics.held_seconds += _clock() - acquired
+            self._available.release()
+
+
+class DatabasePool:
+    """Common interface of the pooled backends"""
+
+    dialect = ""
+
+    def __init__(self, statement_cache_size: int = 128):
+        self.statement_cache_size = statement_cache_size
+        self.logger = get_logger(f"DatabasePool.{self.dialect}")
+        self.batches = 0
+        self.batched_rows = 0
+
+    async def open(self) -> "DatabasePool":
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    def acquire(self, write: bool = True):
+        """Async context manager checking out a raw driver connection"""
+        raise NotImplementedError
+
+    async def execute(self, query: str, values: Values = None) -> Any:
+        raise NotImplementedError
+
+    async def fetch_all(self, query: str, values: Values = None) -> List[Any]:
+        raise NotImplementedError
+
+    async def fetch_one(self, query: str, values: Values = None) -> Optional[Any]:
+        rows = await self.fetch_all(query, values)
+        return rows[0] if rows else None
+
+    async def execute_many(self, query: str, values: Iterable[Values]) -> int:
+        """Run one statement for every set of values in a single transaction"""
+        raise NotImplementedError
+
+    async def copy_records(self, table: str, columns: Sequence[str], records: Iterable[Sequence[Any]]) -> int:
+        """Bulk-load rows: COPY on PostgreSQL, one batched insert on SQLite"""
+        raise NotImplementedError
+
+    def get_metrics(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def __aenter__(self) -> "DatabasePool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class SQLitePool(DatabasePool):
+    """One WAL writer plus a pool of query-only reader connections"""
+
+    dialect = "sqlite"
+
+    def __init__(self, path: str, readers: int = 4, statement_cache_size: int = 128, timeout: float = 30.0):
+        super().__init__(statement_cache_size)
+        if not HAS_AIOSQLITE:
+            raise ImportError("aiosqlite not installed. Install with: pip install aiosqlite")
+        self.path = path
+        self.in_memory = path == ":memory:" or path.startswith("file::memory:")
+        self.reader_count = 0 if self.in_memory else max(0, readers)
+        self.timeout = timeout
+        self._writer: Optional[_ConnectionSlots] = None
+        self._readers: Optional[_ConnectionSlots] = None
+
+    async def _connect(self, query_only: bool) -> Any:
+        connection = await aiosqlite.connect(
+            self.path, isolation_level=None, timeout=self.timeout,
+            cached_statements=self.statement_cache_size,
+        )
+        connection.row_factory = sqlite3.Row
+        if not self.in_memory:
+            await connection.execute("PRAGMA journal_mode=WAL")
+            await connection.execute("PRAGMA synchronous=NORMAL")
+        if query_only:
+            await connection.execute("PRAGMA query_only=ON")
+        return connection
+
+    async def open(self) -> "SQLitePool":
+        # The writer first: it creates the file and switches it to WAL
+        self._writer = _ConnectionSlots([await self._connect(query_only=False)])
+        if self.reader_count:
+            self._readers = _ConnectionSlots([await self._connect(query_only=True)
+                                              for _ in range(self.reader_count)])
+        self.logger.info(f"Opened SQLite pool on {self.path}: 1 writer, {self.reader_count} readers")
+        return self
+
+    async def close(self) -> None:
+        for slots in (self._readers, self._writer):
+            if slots:
+                for connection in slots.connections:
+                    await connection.close()
+        self._readers = self._writer = None
+
+    def acquire(self, write: bool = True):
+        if write or self._readers is None:
+            return self._writer.checkout()
+        return self._readers.checkout()
+
+    async def execute(self, query: str, values: Values = None) -> int:
+        async with self._writer.checkout() as connection:
+            cursor = await connection.execute(query, values or ())
+            rowcount = cursor.rowcount
+            await cursor.close()
+            return rowcount
+
+    async def fetch_all(self, query: str, values: Values = None) -> List[sqlite3.Row]:
+        async with self.acquire(write=False) as connection:
+            return list(await connection.execute_fetchall(query, values or ()))
+
+    async def execute_many(self, query: str, values: Iterable[Values]) -> int:
+        values = list(values)
+        async with self._writer.checkout() as connection:
+            await connection.execute("BEGIN")
+            try:
+                await connection.executemany(query, values)
+            except BaseException:
+                await connection.execute("ROLLBACK")
+                raise
+            await connection.execute("COMMIT")
+        self.batches += 1
+        self.batched_rows += len(values)
+        return len(values)
+
+    async def copy_records(self, table: str, columns: Sequence[str], records: Iterable[Sequence[Any]]) -> int:
+        placeholders = ", ".join("?" for _ in columns)
+        return await self.execute_many(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", records
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "dialect": self.dialect,
+            "statement_cache_size": self.statement_cache_size,
+            "writer": self._writer.metrics.to_dict() if self._writer else None,
+            "readers": self._readers.metrics.to_dict() if self._readers else None,
+            "batches": self.batches,
+            "batched_rows": self.batched_rows,
+        }
+
+
+class PostgresPool(DatabasePool):
+    """asyncpg pool; every connection serves reads and writes"""
+
+    dialect = "postgres"
+
+    def __init__(self, dsn: str, size: int = 10, statement_cache_size: int = 128, timeout: float = 30.0):
+        super().__init__(statement_cache_size)
+        if not HAS_ASYNCPG:
+            raise ImportError("asyncpg not installed. Install with: pip install asyncpg")
+        self.dsn = dsn
+        self.size = size
+        self.timeout = timeout
+        self._pool = None
+        self.metrics = PoolMetrics(size=size)
+
+    async def open(self) -> "PostgresPool":
+        self._pool = await asyncpg.create_pool(
+            self.dsn, min_size=1, max_size=self.size, command_timeout=self.timeout,
+            statement_cache_size=self.statement_cache_size,
+        )
+        self.logger.info(f"Opened PostgreSQL pool: up to {self.size} connections")
+        return self
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @asynccontextmanager
+    async def acquire(self, write: bool = True) -> AsyncIterator[Any]:
+        metrics = self.metrics
+        started = _clock()
+        if metrics.in_use >= metrics.size:
+            metrics.waits += 1
+        async with self._pool.acquire() as connection:
+            acquired = _clock()
+            waited = acquired - started
+            metrics.wait_seconds += waited
+            if waited > metrics.max_wait_seconds:
+                metrics.max_wait_seconds = waited
+            metrics.checkouts += 1
+            metrics.in_use += 1
+            if metrics.in_use > metrics.peak_in_use:
+                metrics.peak_in_use = metrics.in_use
+            try:
+                yield connection
+            finally:
+                metrics.in_use -= 1
+                metrics.held_seconds += _clock() - acquired
+
+    @staticmethod
+    def _bind(query: str, values: Values) -> Tuple[str, Sequence[Any]]:
+        if isinstance(values, Mapping):
+            query, names = _named_to_positional(query)
+            return query, [values[name] for name in names]
+        return query, values or ()
+
+    async def execute(self, query: str, values: Values = None) -> str:
+        query, args = self._bind(query, values)
+        async with self.acquire() as connection:
+            return await connection.execute(query, *args)
+
+    async def fetch_all(self, query: str, values: Values = None) -> List[Any]:
+        query, args = self._bind(query, values)
+        async with self.acquire(write=False) as connection:
+            return await connection.fetch(query, *args)
+
+    async def fetch_one(self, query: str, values: Values = None) -> Optional[Any]:
+        query, args = self._bind(query, values)
+        async with self.acquire(write=False) as connection:
+            return await connection.fetchrow(query, *args)
+
+    async def execute_many(self, query: str, values: Iterable[Values]) -> int:
+        rows = [self._bind(query, v) for v in values]
+        if not rows:
+            return 0
+        async with self.acquire() as connection:
+            # asyncpg runs executemany atomically
+            await connection.executemany(rows[0][0], [args for _, args in rows])
+        self.batches += 1
+        self.batched_rows += len(rows)
+        return len(rows)
+
+    async def copy_records(self, table: str, columns: Sequence[str], records: Iterable[Sequence[Any]]) -> int:
+        records = [tuple(record) for record in records]
+        async with self.acquire() as connection:
+            await connection.copy_records_to_table(table, records=records, columns=list(columns))
+        self.batches += 1
+        self.batched_rows += len(records)
+        return len(records)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "dialect": self.dialect,
+            "statement_cache_size": self.statement_cache_size,
+            "connections": self.metrics.to_dict(),
+            "batches": self.batches,
+            "batched_rows": self.batched_rows,
+        }
+
+
+class MySQLPool(DatabasePool):
+    """`databases` library pool over aiomysql; queries take `:name` placeholders"""
+
+    dialect = "mysql"
+
+    def __init__(self, url: str, size: int = 10, statement_cache_size: int = 128, timeout: float = 30.0):
+        super().__init__(statement_cache_size)
+        if not HAS_DATABASES:
+            raise ImportError("databases not installed. Install with: pip install databases[mysql]")
+        self.url = url
+        self.size = size
+        self.timeout = timeout
+        self._database = None
+        self.metrics = PoolMetrics(size=size)
+
+    async def open(self) -> "MySQLPool":
+        self._database = databases.Database(self.url, min_size=1, max_size=self.size,
+                                            connect_timeout=int(self.timeout))
+        await self._database.connect()
+        self.logger.info(f"Opened MySQL pool: up to {self.size} connections")
+        return self
+
+    async def close(self) -> None:
+        if self._database is not None:
+            await self._database.disconnect()
+            self._database = None
+
+    @asynccontextmanager
+    async def acquire(self, write: bool = True) -> AsyncIterator[Any]:
+        metrics = self.metrics
+        started = _clock()
+        if metrics.in_use >= metrics.size:
+            metrics.waits += 1
+        async with self._database.connection() as connection:
+            acquired = _clock()
+            waited = acquired - started
+            metrics.wait_seconds += waited
+            if waited > metrics.max_wait_seconds:
+                metrics.max_wait_seconds = waited
+            metrics.checkouts += 1
+            metrics.in_use += 1
+            if metrics.in_use > metrics.peak_in_use:
+                metrics.peak_in_use = metrics.in_use
+            try:
+                yield connection
+            finally:
+                metrics.in_use -= 1
+                metrics.held_seconds += _clock() - acquired
+
+    async def execute(self, query: str, values: Values = None) -> Any:
+        async with self.acquire() as connection:
+            return await connection.execute(query, values or {})
+
+    async def fetch_all(self, query: str, values: Values = None) -> List[Any]:
+        async with self.acquire(write=False) as connection:
+            return await connection.fetch_all(query, values or {})
+
+    async def fetch_one(self, query: str, values: Values = None) -> Optional[Any]:
+        async with self.acquire(write=False) as connection:
+            return await connection.fetch_one(query, values or {})
+
+    async def execute_many(self, query: str, values: Iterable[Values]) -> int:
+        values = list(values)
+        if not values:
+            return 0
+        async with self.acquire() as connection:
+            async with connection.transaction():
+                await connection.execute_many(query, values)
+        self.batches += 1
+        self.batched_rows += len(values)
+        return len(values)
+
+    async def copy_records(self, table: str, columns: Sequence[str], records: Iterable[Sequence[Any]]) -> int:
+        names = [f"c{i}" for i in range(len(columns))]
+        placeholders = ", ".join(f":{name}" for name in names)
+        return await self.execute_many(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            [dict(zip(names, record)) for record in records]
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "dialect": self.dialect,
+            "statement_cache_size": self.statement_cache_size,
+            "connections": self.metrics.to_dict(),
+            "batches": self.batches,
+            "batched_rows": self.batched_rows,
+        }
+
+
+async def open_pool(db_type: str, target: str, *, size: int = 10, readers: int = 4,
+                    statement_cache_size: int = 128, timeout: float = 30.0) -> DatabasePool:
+    """Open a pool for `target` (a SQLite path, PostgreSQL DSN or MySQL URL)"""
+    backend = DB_TYPE_ALIASES.get(db_type.lower())
+    if backend == "sqlite":
+        pool: DatabasePool = SQLitePool(target, readers=readers, statement_cache_size=statement_cache_size,
+                                        timeout=timeout)
+    elif backend == "postgres":
+        pool = PostgresPool(target, size=size, statement_cache_size=statement_cache_size, timeout=timeout)
+    elif backend == "mysql":
+        pool = MySQLPool(target, size=size, statement_cache_size=statement_cache_size, timeout=timeout)
+    else:
+        raise ValueError(f"Unsupported database type for pooling: {db_type}")
+    return await pool.open()
+
+
+async def open_pool_from_url(url: str, **options: Any) -> DatabasePool:
+    db_type, target = parse_database_url(url)
+    return await open_pool(db_type, target, **options)
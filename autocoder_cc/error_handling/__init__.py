@@ -10,7 +10,9 @@ from .consistent_handler import (
     handle_errors,
     ErrorMetrics,
     get_global_error_metrics,
-    register_error_handler
+    register_error_handler,
+    render_payload,
+    DEAD_LETTER_PORT
 )
 
 __all__ = [
@@ -19,5 +21,7 @@ __all__ = [
     "handle_errors",
     "ErrorMetrics",
     "get_global_error_metrics",
-    "register_error_handler"
+    "register_error_handler",
+    "render_payload",
+    "DEAD_LETTER_PORT"
 ]
\ No newline at end of file
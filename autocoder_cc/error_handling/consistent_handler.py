@@ -47,10 +47,26 @@ try:
 except Exception as e:
     await handler.handle_exception(e, context={"operation": "risky_op", "data": data})
 ```
+
+### Per-Item Failures in Stream Loops
+```python
+try:
+    result = await self.process_item(item)
+except Exception as e:
+    # Never raises; dead-letters the item and logs (or aggregates during an error storm)
+    await handler.handle_item_failure(e, item, dead_letter=self.send_streams.get(DEAD_LETTER_PORT))
+```
+
+Above `settings.ERROR_STORM_THRESHOLD` failures per second, item failures are
+no longer logged one by one: each error signature (exception type, operation,
+raising line) is counted and one summary with the first and last sample is
+logged per `settings.ERROR_AGGREGATION_INTERVAL`. Payloads are only rendered
+for logged samples, through a size-bounded repr.
 """
 
 import asyncio
 import logging
+import reprlib
 import traceback
 import time
 import sys
@@ -62,6 +78,42 @@ from dataclasses import dataclass, field
 from autocoder_cc.exceptions import AutocoderError, ErrorCategory, SeverityLevel
 from autocoder_cc.core.config import settings
 
+# Output port that receives items whose processing failed
+DEAD_LETTER_PORT = "dead_letter"
+
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 3
+_payload_repr.maxdict = 20
+_payload_repr.maxlist = _payload_repr.maxtuple = _payload_repr.maxset = 10
+_payload_repr.maxstring = _payload_repr.maxother = 200
+
+
+def render_payload(value: Any, max_length: Optional[int] = None) -> str:
+    """Size-bounded repr: large payloads are never stringified in full"""
+    max_length = max_length or settings.ERROR_CONTEXT_MAX_LENGTH
+    text = _payload_repr.repr(value)
+    return text if len(text) <= max_length else text[:max_length - 3] + "..."
+
+
+def error_signature(exception: BaseException, operation: Optional[str]) -> tuple:
+    """Exception type, operation and raising line identify one kind of failure"""
+    tb = exception.__traceback__
+    while tb is not None and tb.tb_next is not None:
+        tb = tb.tb_next
+    location = f"{tb.tb_frame.f_code.co_filename}:{tb.tb_lineno}" if tb is not None else ""
+    return type(exception).__name__, operation, location
+
+
+class _ErrorAggregate:
+    """Count plus first and last raw sample of one error signature in an interval"""
+
+    __slots__ = ("count", "first", "last")
+
+    def __init__(self, sample: tuple):
+        self.count = 1
+        self.first = sample
+        self.last = sample
+
 
 @dataclass
 class ErrorMetrics:
@@ -96,6 +148,18 @@ class ConsistentErrorHandler:
         self.retry_delay = 1.0
         self.enable_auto_recovery = True
         
+        # Error-storm handling for per-item failures (see handle_item_failure)
+        self.storm_threshold = settings.ERROR_STORM_THRESHOLD
+        self.aggregation_interval = settings.ERROR_AGGREGATION_INTERVAL
+        self._rate_window_start = 0.0
+        self._rate_window_errors = 0
+        self._storming = False
+        self._aggregates: Dict[tuple, _ErrorAggregate] = {}
+        self._aggregation_start = time.monotonic()
+        self.aggregated_errors = 0
+        self.dead_letters_sent = 0
+        self.dead_letters_dropped = 0
+        
     async def handle_exception(
         self,
         exception: Exception,
@@ -149,6 +213,122 @@ class ConsistentErrorHandler:
         else:
             raise exception
     
+    async def handle_item_failure(
+        self,
+        exception: Exception,
+        item: Any,
+        operation: str = "process_item",
+        dead_letter: Optional[Any] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Record a failed stream item without raising, so one bad item cannot stop a loop.
+        
+        The item goes to `dead_letter` (an object send stream) when given, and is
+        then omitted from logs. Below the storm threshold each failure is logged
+        with truncated context; above it failures are aggregated per signature.
+        Context values are only rendered when they are actually logged.
+        Returns True if the item was dead-lettered.
+        """
+        now = time.monotonic()
+        self._update_error_metrics(exception)
+        
+        dead_lettered = dead_letter is not None and self._send_dead_letter(dead_letter, exception, item, operation)
+        sample = (exception, None if dead_lettered else item, context, time.time())
+        
+        if self._note_error_rate(now):
+            signature = error_signature(exception, operation)
+            aggregate = self._aggregates.get(signature)
+            if aggregate is None:
+                self._aggregates[signature] = _ErrorAggregate(sample)
+            else:
+                aggregate.count += 1
+                aggregate.last = sample
+            self.aggregated_errors += 1
+        else:
+            category, severity = self._categorize_error(exception)
+            error_context = self._build_error_context(exception, self._render_sample(sample), operation)
+            self._log_error(exception, error_context, category, severity)
+        
+        if now - self._aggregation_start >= self.aggregation_interval:
+            self.flush_error_summary(now)
+        return dead_lettered
+    
+    def _note_error_rate(self, now: float) -> bool:
+        """Count a failure in the current one-second window; True while storming"""
+        if now - self._rate_window_start >= 1.0:
+            # A storm lasts while the previous full window was above threshold
+            self._storming = self._rate_window_errors >= self.storm_threshold and now - self._rate_window_start < 2.0
+            self._rate_window_start = now
+            self._rate_window_errors = 0
+        self._rate_window_errors += 1
+        if self._rate_window_errors >= self.storm_threshold:
+            if not self._storming:
+                self.logger.warning(f"{self.component_name}: error storm (>= {self.storm_threshold} failures/s), "
+                                    f"aggregating errors every {self.aggregation_interval}s")
+            self._storming = True
+        return self._storming
+    
+    @property
+    def in_error_storm(self) -> bool:
+        return self._storming and time.monotonic() - self._rate_window_start < 2.0
+    
+    def _send_dead_letter(self, stream: Any, exception: Exception, item: Any, operation: str) -> bool:
+        record = {
+            "item": item,
+            "error_type": type(exception).__name__,
+            "error": self._truncate_string(str(exception), settings.ERROR_CONTEXT_MAX_LENGTH),
+            "component": self.component_name,
+            "operation": operation,
+            "timestamp": time.time()
+        }
+        try:
+            stream.send_nowait(record)
+        except Exception:
+            # Full or closed: never block the failing loop on its dead-letter consumer
+            self.dead_letters_dropped += 1
+            return False
+        self.dead_letters_sent += 1
+        return True
+    
+    def _render_sample(self, sample: tuple) -> Dict[str, Any]:
+        exception, item, context, timestamp = sample
+        rendered = {"error_timestamp": timestamp}
+        if item is not None:
+            rendered["item"] = render_payload(item)
+        else:
+            rendered["dead_lettered"] = True
+        for key, value in (context or {}).items():
+            rendered[key] = value if isinstance(value, (int, float, bool)) else render_payload(value)
+        return rendered
+    
+    def flush_error_summary(self, now: Optional[float] = None) -> int:
+        """Log one summary per aggregated error signature and start a new interval"""
+        now = now or time.monotonic()
+        aggregates, self._aggregates = self._aggregates, {}
+        interval = now - self._aggregation_start
+        self._aggregation_start = now
+        for (error_type, operation, location), aggregate in aggregates.items():
+            first_exc = aggregate.first[0]
+            last_exc = aggregate.last[0]
+            self.logger.error(
+                f"[AGGREGATED] {self.component_name}: {aggregate.count}x {error_type} in {operation} "
+                f"over {interval:.1f}s (last: {self._truncate_string(str(last_exc), 200)})",
+                extra={"error_summary": {
+                    "component": self.component_name,
+                    "exception_type": error_type,
+                    "operation": operation,
+                    "location": location,
+                    "count": aggregate.count,
+                    "interval_seconds": round(interval, 3),
+                    "first": {"message": self._truncate_string(str(first_exc), 200),
+                              **self._render_sample(aggregate.first)},
+                    "last": {"message": self._truncate_string(str(last_exc), 200),
+                             **self._render_sample(aggregate.last)},
+                }}
+            )
+        return len(aggregates)
+    
     def _build_error_context(
         self,
         exception: Exception,
@@ -331,6 +511,9 @@ class ConsistentErrorHandler:
     
     def get_metrics(self) -> ErrorMetrics:
         """Get current error metrics."""
+        # Monitoring polls this, so summaries still appear once a storm stops
+        if self._aggregates and time.monotonic() - self._aggregation_start >= self.aggregation_interval:
+            self.flush_error_summary()
         return self.metrics
 
 
@@ -373,33 +556,34 @@ def handle_errors(
         auto_retry: Whether to attempt automatic retry
     """
     def decorator(func):
+        op_name = operation or func.__name__
+        
+        # The handler is only built when the call fails, keeping the success path free of it
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            handler = ConsistentErrorHandler(component_name)
-            op_name = operation or func.__name__
-            
             try:
                 return await func(*args, **kwargs)
             except Exception as e:
+                handler = ConsistentErrorHandler(component_name)
                 return await handler.handle_exception(
                     e, 
-                    context={"args": str(args), "kwargs": str(kwargs)},
+                    context={"args": render_payload(args), "kwargs": render_payload(kwargs)},
                     operation=op_name,
                     auto_retry=auto_retry
                 )
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            handler = ConsistentErrorHandler(component_name)
-            op_name = operation or func.__name__
-            
             try:
                 return func(*args, **kwargs)
             except Exception as e:
                 # For sync functions, we can't use async recovery
+                handler = ConsistentErrorHandler(component_name)
                 handler._update_error_metrics(e)
                 category, severity = handler._categorize_error(e)
-                context = handler._build_error_context(e, {"args": str(args), "kwargs": str(kwargs)}, op_name)
+                context = handler._build_error_context(
+                    e, {"args": render_payload(args), "kwargs": render_payload(kwargs)}, op_name
+                )
                 handler._log_error(e, context, category, severity)
                 
                 # No fallback mechanisms - fail fast principle
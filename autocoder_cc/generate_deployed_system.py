@@ -723,9 +723,35 @@ def display_success_summary(description: str, generated_system, total_time: floa
         print("📝 NOTE: System is fully functional despite missing tests (pipeline robustness working)")
 
 
+async def run_batch_mode():
+    """Batch mode: generate every system listed in a directory or JSONL file in one process"""
+    from autocoder_cc.cli.batch import run_batch
+    
+    args = sys.argv[1:]
+    index = args.index('--batch')
+    if index + 1 >= len(args):
+        print("❌ Error: --batch requires a directory or JSONL file")
+        sys.exit(1)
+    source = Path(args[index + 1])
+    output = Path(args[args.index('--output') + 1]) if '--output' in args else Path("./generated_systems/batch")
+    concurrency = int(args[args.index('--concurrency') + 1]) if '--concurrency' in args else 4
+    
+    check_llm_availability()
+    report = await run_batch(source, output, concurrency=concurrency)
+    
+    print(f"\n📦 BATCH COMPLETE: {report.succeeded}/{report.total} systems in {report.wall_seconds:.1f}s")
+    print(f"   Report: {output / 'batch_report.json'}")
+    if report.failed:
+        sys.exit(1)
+
+
 async def main():
     """Main entry point - always does complete end-to-end pipeline"""
     
+    if '--batch' in sys.argv:
+        await run_batch_mode()
+        return
+    
     # Add fallback mode for testing
     minimal_mode = len(sys.argv) > 1 and '--minimal' in sys.argv
     
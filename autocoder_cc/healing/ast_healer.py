@@ -14,6 +14,8 @@ from pathlib import Path
 import textwrap
 from dataclasses import dataclass
 
+from autocoder_cc.observability.pipeline_profiler import HEALING, profiled
+
 
 @dataclass
 class HealingResult:
@@ -40,6 +42,7 @@ class ASTHealer:
     def __init__(self):
         self.logger = get_logger("ASTHealer")
     
+    @profiled("heal.ast_syntax", HEALING)
     def heal_syntax_errors(self, code: str) -> HealingResult:
         """
         Attempt to heal syntax errors in Python code.
@@ -232,6 +235,7 @@ class ASTHealer:
                 error_message=f"Failed to inject error handling: {e}"
             )
     
+    @profiled("heal.ast_component", HEALING)
     def heal_component_code(self, code: str, issues: List[str]) -> HealingResult:
         """
         Apply all relevant healing based on detected issues.
@@ -0,0 +1,58 @@
+"""
+Lazy package exports (PEP 562)
+
+Package `__init__` modules re-export names from their submodules for
+convenience. Importing those submodules eagerly means `import
+autocoder_cc.components.composed_base` also pays for the generation
+pipeline, LLM clients and every other component, which dominates the cold
+start of a generated service. `lazy_exports` installs a module-level
+`__getattr__` that imports the defining submodule on first access instead.
+
+Set `AUTOCODER_EAGER_IMPORTS=1` to import every export up front, e.g. to
+surface import errors at build time or to warm a long-running process.
+"""
+import importlib
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str],
+                 namespace: Dict[str, Any]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build `__getattr__` and `__dir__` for `package`.
+
+    Args:
+        package: The package's `__name__`
+        exports: Exported name -> module defining it (relative to `package` when it starts with ".")
+        namespace: The package's `globals()`; resolved names are cached there
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package module
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            if name.startswith("__"):
+                raise AttributeError(f"module {package!r} has no attribute {name!r}")
+            # Submodules used to be bound as attributes by the eager imports
+            try:
+                value = importlib.import_module(f"{package}.{name}")
+            except ModuleNotFoundError as e:
+                if e.name != f"{package}.{name}":
+                    raise
+                raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+            namespace[name] = value
+            return value
+        value = getattr(importlib.import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    if os.getenv("AUTOCODER_EAGER_IMPORTS", "").lower() in ("1", "true", "yes"):
+        for name in exports:
+            __getattr__(name)
+
+    return __getattr__, __dir__
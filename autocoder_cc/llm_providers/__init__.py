@@ -15,6 +15,7 @@ from .base_provider import (
 )
 from .provider_registry import LLMProviderRegistry
 from .multi_provider_manager import MultiProviderManager
+from .request_scheduler import LLMRequestScheduler, ProviderLimits
 
 __all__ = [
     'LLMProviderInterface',
@@ -24,5 +25,7 @@ __all__ = [
     'LLMProviderUnavailableError',
     'LLMProviderRateLimitError',
     'LLMProviderRegistry',
-    'MultiProviderManager'
+    'MultiProviderManager',
+    'LLMRequestScheduler',
+    'ProviderLimits'
 ]
\ No newline at end of file
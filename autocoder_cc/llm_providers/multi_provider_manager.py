@@ -8,6 +8,8 @@ from ..observability.cost_controls import CostCircuitBreaker, create_cost_circui
 from ..observability.monitoring_alerts import ProductionMonitor, create_production_monitor
 from .circuit_breaker import get_circuit_breaker
 from .model_registry import get_model_registry, ModelCapability
+from .request_scheduler import LLMRequestScheduler
+from ..observability.pipeline_profiler import LLM, record_span
 import logging
 
 class MultiProviderManager:
@@ -44,6 +46,17 @@ class MultiProviderManager:
         
         # Initialize model registry
         self.model_registry = get_model_registry()
+        
+        # Optional budget-aware scheduler: enabled when per-provider rate limits are configured
+        # e.g. {"rate_limits": {"gemini": {"requests_per_minute": 60, "tokens_per_minute": 1000000}}}
+        rate_limits = config.get("rate_limits")
+        self.scheduler: Optional[LLMRequestScheduler] = None
+        if rate_limits or config.get("scheduler_enabled", False):
+            self.scheduler = LLMRequestScheduler(
+                limits=rate_limits,
+                rate_limit_cooldown=config.get("rate_limit_cooldown", 10.0)
+            )
+        self.default_completion_tokens = config.get("default_completion_tokens", 2048)
     
     async def _check_provider_health(self, provider_name: str, provider: LLMProviderInterface, skip_cache: bool = False) -> bool:
         """Check provider health with caching and circuit breaker protection"""
@@ -96,6 +109,9 @@ class MultiProviderManager:
         # Use dynamic provider selection based on task requirements
         providers_to_try = self._select_providers_for_task(request)
         
+        if self.scheduler:
+            return await self._generate_scheduled(request, providers_to_try)
+        
         for attempt in range(self.max_retries):
             for provider_name in providers_to_try:
                 provider = self.registry.get_provider(provider_name)
@@ -159,6 +175,90 @@ class MultiProviderManager:
         
         raise LLMProviderError("All providers failed after maximum retries")
     
+    async def _generate_scheduled(self, request: LLMRequest, providers_to_try: List[str]) -> LLMResponse:
+        """Generate through the budget-aware scheduler
+        
+        Instead of trying providers in order and backing off after rate limits, each
+        attempt waits in the scheduler's priority queue until some eligible provider
+        has request/token budget, then uses whichever provider the scheduler picks.
+        A rate-limited provider is paused and the request is re-queued immediately.
+        """
+        prompt = request.system_prompt + request.user_prompt
+        estimated_tokens = len(prompt) // 4 + (request.max_tokens or self.default_completion_tokens)
+        priority = int(request.metadata.get("priority", 0)) if request.metadata else 0
+        max_attempts = self.max_retries * max(len(providers_to_try), 1)
+        
+        for attempt in range(max_attempts):
+            eligible = {}
+            for provider_name in providers_to_try:
+                provider = self.registry.get_provider(provider_name)
+                if not provider:
+                    self.logger.warning(f"Provider {provider_name} not registered")
+                    continue
+                
+                estimated_cost = provider.estimate_cost(
+                    len(prompt), request.model_override or provider.default_model
+                )
+                allowed, reason = self.cost_breaker.check_request_allowed(estimated_cost, provider_name)
+                if not allowed:
+                    self.logger.warning(f"Request blocked by cost controls: {reason}")
+                    self.cost_breaker.record_failure(f"Cost limit exceeded: {reason}")
+                    continue
+                
+                if not await self._check_provider_health(provider_name, provider, skip_cache=(attempt == 0)):
+                    self.logger.debug(f"Provider {provider_name} failed health check, skipping")
+                    continue
+                
+                eligible[provider_name] = provider
+            
+            if not eligible:
+                break
+            
+            lease = await self.scheduler.acquire(list(eligible), estimated_tokens, priority)
+            record_span("llm.queue_wait", LLM, lease.queue_wait, provider=lease.provider)
+            provider_name = lease.provider
+            provider = eligible[provider_name]
+            
+            try:
+                model = request.model_override or getattr(provider, 'default_model', None) or 'gpt-4-turbo'
+                adapted_request = self._adapt_request_for_provider(request, provider_name, model)
+                
+                self.logger.info(
+                    f"Attempting generation with {provider_name} (attempt {attempt + 1}, "
+                    f"queued {lease.queue_wait:.2f}s)"
+                )
+                response = await provider.generate(adapted_request)
+            except LLMProviderRateLimitError as e:
+                self.logger.warning(f"Rate limit hit for {provider_name}: {e}")
+                self.monitor.metrics.record_rate_limit(provider_name)
+                await self.scheduler.release(
+                    lease, actual_tokens=0, rate_limited=True,
+                    retry_after=getattr(e, "retry_after", None)
+                )
+                continue
+            except LLMProviderError as e:
+                self.logger.error(f"Provider {provider_name} error: {e}")
+                await self.scheduler.release(
+                    lease, actual_tokens=0, failed=True, retry_after=self.retry_delay
+                )
+                continue
+            except BaseException:
+                await self.scheduler.release(lease, failed=True)
+                raise
+            
+            await self.scheduler.release(lease, actual_tokens=response.tokens_used)
+            self.cost_breaker.record_request(response.cost_usd, provider_name)
+            self.logger.info(f"Successful generation with {provider_name} (actual cost: ${response.cost_usd:.6f})")
+            return response
+        
+        raise LLMProviderError("All providers failed after maximum retries")
+    
+    def get_scheduler_metrics(self) -> Dict[str, Any]:
+        """Get scheduler queue depth, wait times and per-provider budget usage"""
+        if not self.scheduler:
+            return {"enabled": False}
+        return {"enabled": True, **self.scheduler.get_metrics()}
+    
     def get_provider_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all providers"""
         stats = {}
@@ -215,6 +315,7 @@ class MultiProviderManager:
             'cost_controls': cost_usage,
             'cost_summary': cost_summary,
             'rate_limits': rate_limit_data,
+            'scheduler': self.get_scheduler_metrics(),
             'generation': {
                 'success_rate': self.monitor.metrics.generation_success_rate,
                 'avg_time': self.monitor.metrics.avg_generation_time,
@@ -0,0 +1,350 @@
+"""Provider-aware request scheduler for LLM calls
+
+Tracks each provider's requests-per-minute and tokens-per-minute budgets and
+admits requests from a priority queue only when a provider has budget for
+them. Among providers with budget, work is routed by observed latency,
+in-flight load and remaining budget so parallel generation saturates quotas
+without tripping provider rate limits.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..observability.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Sliding window over which provider quotas are expressed
+BUDGET_WINDOW_SECONDS = 60.0
+
+
+@dataclass
+class ProviderLimits:
+    """Quota configuration for a single provider (None means unlimited)"""
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    max_concurrency: Optional[int] = None
+
+
+@dataclass
+class ProviderBudget:
+    """Sliding-window usage and latency tracking for one provider"""
+    limits: ProviderLimits
+    usage: Deque[Tuple[float, int]] = field(default_factory=deque)
+    tokens_in_window: int = 0
+    in_flight: int = 0
+    paused_until: float = 0.0
+    latency_ewma: Optional[float] = None
+    completed: int = 0
+    rate_limited: int = 0
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - BUDGET_WINDOW_SECONDS
+        while self.usage and self.usage[0][0] <= cutoff:
+            _, tokens = self.usage.popleft()
+            self.tokens_in_window -= tokens
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until this provider can admit a request of `tokens` (0 if now)"""
+        self._expire(now)
+        waits = [max(0.0, self.paused_until - now)]
+
+        limits = self.limits
+        if limits.max_concurrency is not None and self.in_flight >= limits.max_concurrency:
+            # Freed by a release, which notifies waiters; poll as a fallback
+            waits.append(1.0)
+
+        if limits.requests_per_minute is not None and len(self.usage) >= limits.requests_per_minute:
+            index = len(self.usage) - limits.requests_per_minute
+            waits.append(self.usage[index][0] + BUDGET_WINDOW_SECONDS - now)
+
+        if limits.tokens_per_minute is not None and self.tokens_in_window + tokens > limits.tokens_per_minute:
+            # Oversized requests are admitted once the window is empty rather than starving forever
+            if self.usage:
+                excess = self.tokens_in_window + tokens - limits.tokens_per_minute
+                freed = 0
+                for timestamp, used in self.usage:
+                    freed += used
+                    if freed >= excess:
+                        waits.append(timestamp + BUDGET_WINDOW_SECONDS - now)
+                        break
+
+        return max(waits)
+
+    def remaining_fraction(self) -> float:
+        """Smallest remaining share of any configured quota (1.0 if unlimited)"""
+        fractions = [1.0]
+        limits = self.limits
+        if limits.requests_per_minute:
+            fractions.append(1.0 - len(self.usage) / limits.requests_per_minute)
+        if limits.tokens_per_minute:
+            fractions.append(1.0 - self.tokens_in_window / limits.tokens_per_minute)
+        if limits.max_concurrency:
+            fractions.append(1.0 - self.in_flight / limits.max_concurrency)
+        return max(0.0, min(fractions))
+
+    def reserve(self, tokens: int, now: float) -> Tuple[float, int]:
+        """Record an admitted request and return its usage entry"""
+        entry = (now, tokens)
+        self.usage.append(entry)
+        self.tokens_in_window += tokens
+        self.in_flight += 1
+        return entry
+
+    def reconcile(self, entry: Tuple[float, int], actual_tokens: int) -> None:
+        """Replace a reservation's estimated tokens with the tokens actually used"""
+        timestamp, estimated = entry
+        # Entries are only ever appended and expired from the left, so scan from the right
+        for i in range(len(self.usage) - 1, -1, -1):
+            if self.usage[i] is entry:
+                self.usage[i] = (timestamp, actual_tokens)
+                self.tokens_in_window += actual_tokens - estimated
+                return
+            if self.usage[i][0] < timestamp:
+                return
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    sequence: int
+    providers: List[str] = field(compare=False)
+    tokens: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+@dataclass
+class SchedulerLease:
+    """Admission granted to a request; pass back to `release` when the call finishes"""
+    provider: str
+    estimated_tokens: int
+    admitted_at: float
+    queue_wait: float
+    _entry: Tuple[float, int] = field(repr=False)
+
+
+class LLMRequestScheduler:
+    """Priority admission control across providers with RPM/TPM budgets
+
+    Lower priority values are admitted first; requests of equal priority are
+    admitted in arrival order. Only the head of the queue is considered for
+    admission so high-priority work is never overtaken.
+    """
+
+    DEFAULT_LATENCY_SECONDS = 5.0
+    LATENCY_SMOOTHING = 0.2
+
+    def __init__(self, limits: Optional[Dict[str, Any]] = None, rate_limit_cooldown: float = 10.0):
+        """
+        Args:
+            limits: Mapping of provider name to ProviderLimits or a dict with
+                requests_per_minute / tokens_per_minute / max_concurrency
+            rate_limit_cooldown: Seconds to pause a provider after it reports a rate limit
+        """
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self._budgets: Dict[str, ProviderBudget] = {}
+        for provider_name, provider_limits in (limits or {}).items():
+            self.configure_provider(provider_name, provider_limits)
+
+        self._queue: List[_Ticket] = []
+        self._sequence = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+
+        # Queue metrics
+        self._admitted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=1000)
+
+    def configure_provider(self, provider_name: str, limits: Any) -> None:
+        """Set or replace the quota for a provider"""
+        if isinstance(limits, dict):
+            limits = ProviderLimits(**limits)
+        budget = self._budgets.get(provider_name)
+        if budget:
+            budget.limits = limits
+        else:
+            self._budgets[provider_name] = ProviderBudget(limits=limits)
+
+    def _budget(self, provider_name: str) -> ProviderBudget:
+        if provider_name not in self._budgets:
+            self._budgets[provider_name] = ProviderBudget(limits=ProviderLimits())
+        return self._budgets[provider_name]
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the scheduler can be built outside a running loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _score(self, provider_name: str, budget: ProviderBudget) -> float:
+        """Expected cost of routing to a provider; lower is better"""
+        latency = budget.latency_ewma if budget.latency_ewma is not None else self.DEFAULT_LATENCY_SECONDS
+        return latency * (budget.in_flight + 1) / max(budget.remaining_fraction(), 0.05)
+
+    def _pick_provider(self, ticket: _Ticket, now: float) -> Tuple[Optional[str], float]:
+        """Choose the best admissible provider, or report how long until one is"""
+        best: Optional[str] = None
+        best_score = float("inf")
+        soonest = float("inf")
+        for provider_name in ticket.providers:
+            budget = self._budget(provider_name)
+            wait = budget.wait_time(ticket.tokens, now)
+            if wait > 0:
+                soonest = min(soonest, wait)
+                continue
+            score = self._score(provider_name, budget)
+            # Strict comparison keeps the caller's preference order on ties
+            if score < best_score:
+                best, best_score = provider_name, score
+        return best, soonest
+
+    def _drop_cancelled_head(self) -> None:
+        while self._queue and self._queue[0].cancelled:
+            heapq.heappop(self._queue)
+
+    async def acquire(self, providers: List[str], estimated_tokens: int, priority: int = 0) -> SchedulerLease:
+        """Wait until one of `providers` has budget and reserve it
+
+        Args:
+            providers: Candidate providers in preference order
+            estimated_tokens: Prompt plus expected completion tokens
+            priority: Lower values are admitted first
+
+        Returns:
+            Lease naming the chosen provider
+        """
+        if not providers:
+            raise ValueError("At least one candidate provider is required")
+
+        condition = self._get_condition()
+        ticket = _Ticket(
+            priority=priority,
+            sequence=next(self._sequence),
+            providers=list(providers),
+            tokens=estimated_tokens,
+            enqueued_at=time.monotonic(),
+        )
+
+        async with condition:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    self._drop_cancelled_head()
+                    timeout: Optional[float] = None
+                    if self._queue[0] is ticket:
+                        now = time.monotonic()
+                        provider_name, soonest = self._pick_provider(ticket, now)
+                        if provider_name is not None:
+                            heapq.heappop(self._queue)
+                            lease = self._admit(ticket, provider_name, now)
+                            # Let the next ticket evaluate its own admission
+                            condition.notify_all()
+                            return lease
+                        timeout = soonest if soonest != float("inf") else None
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if not ticket.cancelled and ticket in self._queue:
+                    ticket.cancelled = True
+                    condition.notify_all()
+                raise
+
+    def _admit(self, ticket: _Ticket, provider_name: str, now: float) -> SchedulerLease:
+        entry = self._budget(provider_name).reserve(ticket.tokens, now)
+        wait = now - ticket.enqueued_at
+        self._admitted += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        self._recent_waits.append(wait)
+        if wait > 1.0:
+            logger.debug(f"LLM request admitted to {provider_name} after {wait:.2f}s in queue")
+        return SchedulerLease(
+            provider=provider_name,
+            estimated_tokens=ticket.tokens,
+            admitted_at=now,
+            queue_wait=wait,
+            _entry=entry,
+        )
+
+    async def release(self, lease: SchedulerLease, actual_tokens: Optional[int] = None,
+                      rate_limited: bool = False, retry_after: Optional[float] = None,
+                      failed: bool = False) -> None:
+        """Return a lease, recording actual usage, latency and failure signals
+
+        Args:
+            lease: Lease returned by `acquire`
+            actual_tokens: Tokens actually consumed, replacing the estimate
+            rate_limited: Provider rejected the call for quota reasons
+            retry_after: Seconds to pause the provider (defaults to the cooldown for rate limits)
+            failed: Call failed for another reason; latency is not recorded
+        """
+        budget = self._budget(lease.provider)
+        now = time.monotonic()
+        budget.in_flight = max(0, budget.in_flight - 1)
+
+        if actual_tokens is not None:
+            budget.reconcile(lease._entry, actual_tokens)
+
+        if rate_limited:
+            budget.rate_limited += 1
+            cooldown = retry_after if retry_after is not None else self.rate_limit_cooldown
+            budget.paused_until = max(budget.paused_until, now + cooldown)
+            logger.warning(f"Pausing {lease.provider} for {cooldown:.1f}s after rate limit")
+        elif failed:
+            if retry_after:
+                budget.paused_until = max(budget.paused_until, now + retry_after)
+        else:
+            latency = now - lease.admitted_at
+            budget.completed += 1
+            if budget.latency_ewma is None:
+                budget.latency_ewma = latency
+            else:
+                budget.latency_ewma += self.LATENCY_SMOOTHING * (latency - budget.latency_ewma)
+
+        condition = self._get_condition()
+        async with condition:
+            condition.notify_all()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for admission"""
+        return sum(1 for ticket in self._queue if not ticket.cancelled)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, wait times and per-provider budget usage"""
+        now = time.monotonic()
+        recent = sorted(self._recent_waits)
+        providers = {}
+        for provider_name, budget in self._budgets.items():
+            budget._expire(now)
+            providers[provider_name] = {
+                "requests_in_window": len(budget.usage),
+                "tokens_in_window": budget.tokens_in_window,
+                "in_flight": budget.in_flight,
+                "remaining_fraction": round(budget.remaining_fraction(), 3),
+                "latency_ewma_s": budget.latency_ewma,
+                "paused_for_s": max(0.0, budget.paused_until - now),
+                "completed": budget.completed,
+                "rate_limited": budget.rate_limited,
+                "limits": {
+                    "requests_per_minute": budget.limits.requests_per_minute,
+                    "tokens_per_minute": budget.limits.tokens_per_minute,
+                    "max_concurrency": budget.limits.max_concurrency,
+                },
+            }
+        return {
+            "queue_depth": self.queue_depth,
+            "admitted": self._admitted,
+            "avg_wait_s": self._total_wait / self._admitted if self._admitted else 0.0,
+            "p95_wait_s": recent[int(len(recent) * 0.95)] if recent else 0.0,
+            "max_wait_s": self._max_wait,
+            "providers": providers,
+        }
@@ -20,6 +20,7 @@ import litellm
 
 # Phase 2B: Import centralized timeout management
 from autocoder_cc.core.timeout_manager import get_timeout_manager, TimeoutType, TimeoutError
+from autocoder_cc.observability.pipeline_profiler import LLM, profiled, span
 
 from .base_provider import LLMRequest, LLMResponse, LLMProviderError
 
@@ -111,6 +112,7 @@ class UnifiedLLMProvider:
         if self.api_keys['anthropic']:
             os.environ['ANTHROPIC_API_KEY'] = self.api_keys['anthropic']
     
+    @profiled("llm.generate", LLM)
     async def generate(self, request: LLMRequest) -> LLMResponse:
         """
         Generate response with automatic fallback
@@ -158,12 +160,13 @@ class UnifiedLLMProvider:
                     return await acompletion(**params)
                 
                 # Make the LiteLLM call with centralized timeout management
-                response = await timeout_manager.run_with_timeout(
-                    operation=make_llm_call,
-                    operation_id=operation_id,
-                    timeout_type=TimeoutType.LLM_GENERATION,
-                    custom_timeout=self.timeout
-                )
+                with span("llm.network", LLM, model=model_config.litellm_name, attempt=attempt + 1) as call_span:
+                    response = await timeout_manager.run_with_timeout(
+                        operation=make_llm_call,
+                        operation_id=operation_id,
+                        timeout_type=TimeoutType.LLM_GENERATION,
+                        custom_timeout=self.timeout
+                    )
                 
                 response_time = time.time() - start_time
                 
@@ -191,6 +194,7 @@ class UnifiedLLMProvider:
                 else:
                     # Fallback token estimation
                     tokens_used = len(request.system_prompt.split()) + len(request.user_prompt.split()) + len(content.split())
+                call_span.annotate(tokens=tokens_used)
                 
                 logger.info(f"✅ Success with {model_config.litellm_name} in {response_time:.2f}s")
                 
@@ -244,6 +248,7 @@ class UnifiedLLMProvider:
         
         raise LLMProviderError(error_msg)
     
+    @profiled("llm.generate", LLM)
     def generate_sync(self, request: LLMRequest) -> LLMResponse:
         """
         Synchronous wrapper for generate() method.
@@ -296,7 +301,8 @@ class UnifiedLLMProvider:
                     signal.alarm(int(self.timeout) if self.timeout else 30)
                 
                 try:
-                    response = litellm.completion(**kwargs)
+                    with span("llm.network", LLM, model=model_config.litellm_name, attempt=attempt + 1) as call_span:
+                        response = litellm.completion(**kwargs)
                 finally:
                     # Cancel alarm
                     if hasattr(signal, 'SIGALRM'):
@@ -305,6 +311,7 @@ class UnifiedLLMProvider:
                 # Extract content and tokens
                 content = response.choices[0].message.content
                 tokens_used = response.usage.total_tokens if response.usage else 0
+                call_span.annotate(tokens=tokens_used)
                 response_time = time.time() - start_time
                 
                 logger.info(f"✅ {model_config.litellm_name} responded in {response_time:.2f}s")
@@ -3,8 +3,17 @@ Autocoder Observability Stack - Enterprise Roadmap v3 Phase 1
 Structured logging, metrics, and tracing for production operations
 """
 from .structured_logging import StructuredLogger, get_logger
-from .metrics import MetricsCollector, get_metrics_collector
-from .tracing import TracingManager, get_tracer
+from autocoder_cc.lazy_imports import lazy_exports
+
+# Metrics and tracing (and the OpenTelemetry setup behind them) load on first use
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'MetricsCollector': '.metrics',
+    'get_metrics_collector': '.metrics',
+    'TracingManager': '.tracing',
+    'get_tracer': '.tracing',
+    'ComponentStats': '.component_stats',
+    'PipelineProfiler': '.pipeline_profiler',
+}, globals())
 
 # Import Tracer from the legacy observability module for compatibility
 try:
@@ -22,5 +31,7 @@ __all__ = [
     'get_metrics_collector',
     'TracingManager',
     'get_tracer',
+    'ComponentStats',
+    'PipelineProfiler',
     'Tracer'
 ]
\ No newline at end of file
@@ -450,7 +450,7 @@ class MetricsCollector:
             return 0
         
         if not tags:
-            return len(series.points)
+            return sum(point.value for point in series.points)
         
         # Filter by tags
         count = 0
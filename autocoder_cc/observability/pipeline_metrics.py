@@ -8,6 +8,7 @@ import time
 from datetime import datetime
 from autocoder_cc.observability.structured_logging import get_logger
 from autocoder_cc.observability.metrics import get_metrics_collector
+from autocoder_cc.observability.pipeline_profiler import begin_span, end_span
 
 logger = get_logger(__name__)
 metrics = get_metrics_collector("pipeline_metrics")
@@ -30,6 +31,7 @@ class PipelineStageMetrics:
     def __init__(self):
         self.stage_timings: Dict[str, float] = {}
         self.stage_start_times: Dict[str, float] = {}
+        self.stage_spans: Dict[str, Any] = {}
         self.stage_errors: Dict[str, List[Exception]] = {}
         self.critical_errors_detected = False
 
@@ -37,6 +39,7 @@ class PipelineStageMetrics:
         """Mark the start of a pipeline stage"""
         stage_name = stage.value
         self.stage_start_times[stage_name] = time.time()
+        self.stage_spans[stage_name] = begin_span(stage_name)
         logger.info(f"Pipeline stage started: {stage_name}", extra={
             "stage": stage_name,
             "event": "stage_start",
@@ -47,6 +50,7 @@ class PipelineStageMetrics:
     def end_stage(self, stage: PipelineStage, success: bool = True, error: Optional[Exception] = None) -> None:
         """Mark the end of a pipeline stage"""
         stage_name = stage.value
+        end_span(self.stage_spans.pop(stage_name, None), error)
 
         # Calculate duration
         if stage_name in self.stage_start_times:
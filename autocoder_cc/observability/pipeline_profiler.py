@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Pipeline Profiler - hierarchical timing for system generation runs
+
+PipelineStageMetrics records when each coarse stage starts and ends. This
+profiler records nested spans inside them (LLM queue wait and network time,
+prompt building, validator and healer passes, file writes) so a generation
+run can be broken down by where its time went:
+
+- a Chrome trace-event timeline (load in chrome://tracing or Perfetto),
+  one track per thread / asyncio task
+- hotspots: spans ranked by self time (time not spent in child spans)
+- self time per category (llm, prompt, validation, healing, io, stage)
+- folded stacks for flame graph tools
+
+Profiling is off unless `enable_profiling()` is called (the CLI's
+`generate --profile trace.json`). While off, `span()` returns a shared no-op
+context manager and `@profiled` adds one global lookup per call.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from autocoder_cc.observability.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Span categories used by the generation pipeline
+STAGE = "stage"
+LLM = "llm"
+PROMPT = "prompt"
+VALIDATION = "validation"
+HEALING = "healing"
+IO = "io"
+
+_profiler: Optional["PipelineProfiler"] = None
+_current_span: contextvars.ContextVar[Optional["_Span"]] = contextvars.ContextVar(
+    "autocoder_pipeline_span", default=None
+)
+
+
+class _NullSpan:
+    """Returned by `span()` while profiling is off"""
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def annotate(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """One timed region; nesting follows the context (thread or asyncio task) it runs in"""
+    __slots__ = ("profiler", "name", "category", "args", "path", "start_ns", "child_ns", "parent", "token", "track")
+
+    def __init__(self, profiler: "PipelineProfiler", name: str, category: str, args: Dict[str, Any]):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+        self.child_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self.parent = _current_span.get()
+        self.path = f"{self.parent.path};{self.name}" if self.parent is not None else self.name
+        self.token = _current_span.set(self)
+        self.track = self.profiler._track()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end_ns = time.perf_counter_ns()
+        try:
+            _current_span.reset(self.token)
+        except ValueError:
+            # Ended from a different context than it began in (begin_span/end_span)
+            _current_span.set(self.parent)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.profiler._finish(self, end_ns)
+        return False
+
+    def annotate(self, **args: Any) -> None:
+        """Attach details known only once the span is running (tokens, sizes, results)"""
+        self.args.update(args)
+
+
+class PipelineProfiler:
+    """Collects spans for one generation run"""
+
+    def __init__(self):
+        self.started_ns = time.perf_counter_ns()
+        self.started_at = time.time()
+        self.stopped_ns: Optional[int] = None
+        # (name, category, path, start_ns, duration_ns, self_ns, track, args)
+        self.events: List[Tuple[str, str, str, int, int, int, int, Dict[str, Any]]] = []
+        self._tracks: Dict[Tuple[int, int], int] = {}
+        self._track_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: str, args: Dict[str, Any]) -> _Span:
+        return _Span(self, name, category, args)
+
+    def _track(self) -> int:
+        """Small integer per thread / asyncio task, used as the trace's tid"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = (threading.get_ident(), id(task) if task is not None else 0)
+        track = self._tracks.get(key)
+        if track is None:
+            with self._lock:
+                track = self._tracks.setdefault(key, len(self._tracks) + 1)
+                name = task.get_name() if task is not None else threading.current_thread().name
+                self._track_names.setdefault(track, name)
+        return track
+
+    def _finish(self, span: _Span, end_ns: int) -> None:
+        duration = end_ns - span.start_ns
+        if span.parent is not None:
+            span.parent.child_ns += duration
+        # Concurrent children (gathered tasks) can overlap, so self time is clamped
+        self.events.append((span.name, span.category, span.path, span.start_ns, duration,
+                            max(duration - span.child_ns, 0), span.track, span.args))
+
+    def record(self, name: str, category: str, duration_s: float, args: Dict[str, Any]) -> None:
+        """Add a span that ended just now, e.g. a wait measured elsewhere"""
+        end_ns = time.perf_counter_ns()
+        span = _Span(self, name, category, args)
+        span.parent = _current_span.get()
+        span.path = f"{span.parent.path};{name}" if span.parent is not None else name
+        span.track = self._track()
+        span.start_ns = end_ns - int(duration_s * 1e9)
+        self._finish(span, end_ns)
+
+    @property
+    def wall_seconds(self) -> float:
+        return ((self.stopped_ns or time.perf_counter_ns()) - self.started_ns) / 1e9
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace-event JSON with one complete ("X") event per span"""
+        pid = os.getpid()
+        trace_events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "autocoder generation"}}
+        ]
+        trace_events += [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": track, "args": {"name": name}}
+            for track, name in sorted(self._track_names.items())
+        ]
+        for name, category, _, start_ns, duration_ns, _, track, args in self.events:
+            trace_events.append({
+                "name": name, "cat": category, "ph": "X", "pid": pid, "tid": track,
+                "ts": (start_ns - self.started_ns) / 1000, "dur": duration_ns / 1000,
+                "args": {key: value if isinstance(value, (int, float, bool, str)) or value is None else str(value)
+                         for key, value in args.items()},
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms",
+                "otherData": {"started_at": self.started_at, "wall_seconds": round(self.wall_seconds, 3)}}
+
+    def hotspots(self, top: int = 20) -> List[Dict[str, Any]]:
+        """Spans grouped by name, ranked by total self time"""
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for name, category, _, _, duration_ns, self_ns, _, _ in self.events:
+            group = groups.setdefault((name, category), [0, 0, 0, 0])
+            group[0] += 1
+            group[1] += duration_ns
+            group[2] += self_ns
+            group[3] = max(group[3], duration_ns)
+        wall_ns = max(self.wall_seconds * 1e9, 1)
+        ranked = sorted(groups.items(), key=lambda item: -item[1][2])[:top]
+        return [
+            {"name": name, "category": category, "calls": calls,
+             "self_s": round(self_ns / 1e9, 3), "total_s": round(total_ns / 1e9, 3),
+             "max_s": round(max_ns / 1e9, 3), "self_percent": round(self_ns * 100 / wall_ns, 1)}
+            for (name, category), (calls, total_ns, self_ns, max_ns) in ranked
+        ]
+
+    def category_totals(self) -> Dict[str, float]:
+        """Self seconds per category; time outside any span is reported as "untracked" """
+        totals: Dict[str, int] = {}
+        root_ns = 0
+        for _, category, path, _, duration_ns, self_ns, _, _ in self.events:
+            totals[category] = totals.get(category, 0) + self_ns
+            if ";" not in path:
+                root_ns += duration_ns
+        result = {category: round(ns / 1e9, 3) for category, ns in sorted(totals.items(), key=lambda i: -i[1])}
+        result["untracked"] = round(max(self.wall_seconds - root_ns / 1e9, 0.0), 3)
+        return result
+
+    def folded_stacks(self) -> List[str]:
+        """`stage;child;grandchild <self microseconds>` lines for flamegraph.pl / speedscope"""
+        stacks: Dict[str, int] = {}
+        for _, _, path, _, _, self_ns, _, _ in self.events:
+            stacks[path] = stacks.get(path, 0) + self_ns
+        return [f"{path} {ns // 1000}" for path, ns in sorted(stacks.items()) if ns >= 1000]
+
+    def summary(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "spans": len(self.events),
+            "self_seconds_by_category": self.category_totals(),
+            "hotspots": self.hotspots(top),
+        }
+
+    def format_summary(self, top: int = 20) -> str:
+        """Plain-text report: where the wall time went, then the top spans by self time"""
+        wall = max(self.wall_seconds, 1e-9)
+        # Concurrent tasks each contribute their own self time, so categories can add up past 100%
+        lines = [f"Generation profile: {self.wall_seconds:.2f}s wall, {len(self.events)} spans", "",
+                 "Self time by category (% of wall, summed over concurrent tasks):"]
+        for category, seconds in self.category_totals().items():
+            lines.append(f"  {category:<12} {seconds:9.2f}s {seconds * 100 / wall:6.1f}%")
+        lines += ["", f"Top {top} hotspots (self time):",
+                  f"  {'self':>9} {'total':>9} {'calls':>6}  span"]
+        for entry in self.hotspots(top):
+            lines.append(f"  {entry['self_s']:8.2f}s {entry['total_s']:8.2f}s {entry['calls']:6d}  "
+                         f"{entry['name']} [{entry['category']}]")
+        return "\n".join(lines)
+
+    def write(self, path: Path) -> Path:
+        """Write the Chrome trace to `path` and folded stacks next to it"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        path.with_suffix(".folded").write_text("\n".join(self.folded_stacks()) + "\n")
+        logger.info(f"Wrote generation profile with {len(self.events)} spans to {path}")
+        return path
+
+
+def enable_profiling() -> PipelineProfiler:
+    """Start collecting spans process-wide; returns the active profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = PipelineProfiler()
+    return _profiler
+
+
+def disable_profiling() -> Optional[PipelineProfiler]:
+    """Stop collecting; returns the profiler that was active, if any"""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stopped_ns = time.perf_counter_ns()
+    return profiler
+
+
+def get_profiler() -> Optional[PipelineProfiler]:
+    return _profiler
+
+
+def span(name: str, category: str = STAGE, **args: Any):
+    """Context manager timing a region; a shared no-op while profiling is off"""
+    profiler = _profiler
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, category, args)
+
+
+def record_span(name: str, category: str, duration_s: float, **args: Any) -> None:
+    """Record a span that just ended and was timed elsewhere (e.g. a scheduler queue wait)"""
+    profiler = _profiler
+    if profiler is not None:
+        profiler.record(name, category, duration_s, args)
+
+
+def begin_span(name: str, category: str = STAGE, **args: Any):
+    """Open a span from code that cannot use `with` (start/end callbacks); close it with `end_span`"""
+    profiler = _profiler
+    if profiler is None:
+        return None
+    return profiler.span(name, category, args).__enter__()
+
+
+def end_span(active_span: Any, error: Optional[BaseException] = None) -> None:
+    if active_span is not None:
+        active_span.__exit__(type(error) if error is not None else None, error, None)
+
+
+def profiled(name: Optional[str] = None, category: str = STAGE) -> Callable:
+    """Decorator timing every call of a sync or async function while profiling is on"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                profiler = _profiler
+                if profiler is None:
+                    return await func(*args, **kwargs)
+                with profiler.span(span_name, category, {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.span(span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
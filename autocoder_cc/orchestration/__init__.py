@@ -45,20 +45,29 @@ print(f"System health: {health.status}")
 - **Production Ready**: Zero-downtime updates, resource limits
 """
 
-from .component import Component, ComponentStatus
-from .harness import (
-    SystemExecutionHarness, 
-    Connection, 
-    HarnessMetrics,
-    ComponentLifecycleState,
-    ComponentHealthStatus,
-    HealthCheckResult,
-    ComponentMetrics,
-    StreamMetrics,
-    HarnessComponent
-)
-from .pipeline_coordinator import PipelineCoordinator, GeneratedSystem
-from .dependency_injection import DependencyContainer, SystemDependencyConfiguration
+# Exports are imported on first use: the pipeline coordinator pulls in the
+# whole generation stack, which a generated system running a harness never needs
+from autocoder_cc.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'Component': '.component',
+    'ComponentStatus': '.component',
+    'SystemExecutionHarness': '.harness',
+    'Connection': '.harness',
+    'HarnessMetrics': '.harness',
+    'ComponentLifecycleState': '.harness',
+    'ComponentHealthStatus': '.harness',
+    'HealthCheckResult': '.harness',
+    'ComponentMetrics': '.harness',
+    'StreamMetrics': '.harness',
+    'HarnessComponent': '.harness',
+    'ReplyRouter': '.request_reply',
+    'CORRELATION_FIELD': '.request_reply',
+    'PipelineCoordinator': '.pipeline_coordinator',
+    'GeneratedSystem': '.pipeline_coordinator',
+    'DependencyContainer': '.dependency_injection',
+    'SystemDependencyConfiguration': '.dependency_injection',
+}, globals())
 
 __all__ = [
     'Component',
@@ -72,6 +81,8 @@ __all__ = [
     'ComponentMetrics',
     'StreamMetrics',
     'HarnessComponent',
+    'ReplyRouter',
+    'CORRELATION_FIELD',
     'PipelineCoordinator',
     'GeneratedSystem',
     'DependencyContainer',
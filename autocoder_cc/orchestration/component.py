@@ -169,6 +169,7 @@ class Component(ABC):
         # Component state
         self._status = ComponentStatus()
         self._shutdown_event = None  # Will be set by harness during setup
+        self._failure_reporter: Optional[Callable[[str], None]] = None  # Will be set by harness before process()
         
         # Tracing support
         self._tracer = None  # Will be set by harness during setup
@@ -295,6 +296,12 @@ class Component(ABC):
         self._status.last_error = error
         self._status.is_healthy = False
     
+    def record_item_failure(self, error: str) -> None:
+        """Record a failed item that was handled in-loop and report it to the harness circuit breaker"""
+        self.record_error(error)
+        if self._failure_reporter is not None:
+            self._failure_reporter(error)
+    
     # Tracing Helper Methods
     
     def create_trace_context(self, operation_name: str = "process") -> TraceContext:
@@ -12,18 +12,25 @@ Now supports dynamic component loading via manifests (Enterprise Roadmap v3).
 
 import anyio
 import logging
+import os
 import signal
 import time
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 
 from autocoder_cc.orchestration.component import Component, ComponentStatus
 from autocoder_cc.orchestration.dynamic_loader import DynamicComponentLoader, ComponentManifest
 from autocoder_cc.observability import get_logger, get_metrics_collector, get_tracer
 from autocoder_cc.observability import Tracer
 from autocoder_cc.error_handling.consistent_handler import get_global_error_metrics, ErrorMetrics, register_error_handler, ConsistentErrorHandler
+from autocoder_cc.checkpoint.checkpoint_manager import CheckpointManager
+from autocoder_cc.checkpoint.coordinator import CheckpointCoordinator, is_checkpointable
+from autocoder_cc.orchestration.request_reply import ReplyRouter
+from autocoder_cc.orchestration.stream_monitor import (
+    BufferAutoTuner, ConnectionMonitor, create_monitored_stream, find_bottleneck
+)
 
 
 class ComponentLifecycleState(Enum):
@@ -68,6 +75,11 @@ class StreamMetrics:
     items_received: int = 0
     buffer_size: int = 0
     backpressure_events: int = 0
+    capacity: float = 0
+    peak_buffer_size: int = 0
+    send_blocked_seconds: float = 0.0
+    throughput_per_second: float = 0.0
+    oldest_item_age_seconds: float = 0.0
 
 
 @dataclass 
@@ -78,6 +90,7 @@ class Connection:
     from_output: str = "default"
     to_input: str = "default"
     max_buffer_size: int = 1000
+    monitor: Optional[ConnectionMonitor] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -95,6 +108,8 @@ class HarnessMetrics:
     cpu_usage_percent: float = 0.0
     active_connections: int = 0
     queue_depths: Dict[str, int] = field(default_factory=dict)
+    stream_metrics: Dict[str, StreamMetrics] = field(default_factory=dict)
+    bottleneck: Optional[Dict[str, Any]] = None
     
     # Centralized error metrics from all components
     component_error_metrics: Dict[str, ErrorMetrics] = field(default_factory=dict)
@@ -409,6 +424,41 @@ class SystemExecutionHarness:
         self._dynamic_loader: Optional[DynamicComponentLoader] = None
         if enable_dynamic_loading:
             self._dynamic_loader = DynamicComponentLoader()
+        
+        # Incremental state checkpointing (opt-in via enable_checkpointing or AUTOCODER_CHECKPOINT_DIR)
+        self._checkpoint_coordinator: Optional[CheckpointCoordinator] = None
+        
+        # Correlated request/reply: one dispatcher per reply stream ("component.stream")
+        self._reply_routers: Dict[str, ReplyRouter] = {}
+        
+        # Buffer auto-tuning (opt-in via enable_buffer_autotuning or AUTOCODER_STREAM_MEMORY_BUDGET_MB)
+        self._buffer_tuner: Optional[BufferAutoTuner] = None
+    
+    def enable_checkpointing(self, checkpoint_dir: Optional[Union[str, Path]] = None,
+                             interval: Optional[float] = None, compact_every: int = 10) -> CheckpointCoordinator:
+        """
+        Checkpoint stateful components periodically and restore them on start.
+        
+        Args:
+            checkpoint_dir: Directory for checkpoint files (default: <data dir>/checkpoints/<harness name>)
+            interval: Seconds between checkpoints (default: the smallest component
+                `checkpoint_interval`, else 60)
+            compact_every: Deltas accumulated per component before compaction
+        """
+        if checkpoint_dir is None:
+            from autocoder_cc.runtime_defaults import get_data_dir
+            checkpoint_dir = get_data_dir() / "checkpoints" / self.name
+        if interval is None:
+            intervals = [
+                component.config.get("checkpoint_interval")
+                for component in self.components.values()
+                if is_checkpointable(component) and component.config.get("checkpoint_interval")
+            ]
+            interval = float(min(intervals)) if intervals else 60.0
+        manager = CheckpointManager(Path(checkpoint_dir), compact_every=compact_every)
+        self._checkpoint_coordinator = CheckpointCoordinator(self, manager, interval=interval)
+        self.logger.info(f"Checkpointing enabled: {checkpoint_dir} every {interval}s")
+        return self._checkpoint_coordinator
     
     async def wait_until_ready(self, timeout: float = 30.0) -> bool:
         """
@@ -781,7 +831,7 @@ class SystemExecutionHarness:
         Args:
             from_output: Source in format "component_name.output_port"
             to_input: Destination in format "component_name.input_port"  
-            max_buffer_size: Maximum buffer size for the stream
+            max_buffer_size: Initial buffer size; the auto-tuner may resize it while running
         """
         # Parse component and port names
         from_comp_name, from_port_name = from_output.split('.')
@@ -793,9 +843,9 @@ class SystemExecutionHarness:
         if to_comp_name not in self.components:
             raise ValueError(f"Component '{to_comp_name}' not registered")
             
-        # Create anyio stream pair
-        send_stream, receive_stream = anyio.create_memory_object_stream(
-            max_buffer_size=max_buffer_size
+        # Create instrumented anyio stream pair (depth, blocked sends, consumer lag)
+        send_stream, receive_stream, monitor = create_monitored_stream(
+            f"{from_output}->{to_input}", max_buffer_size
         )
         
         # Wire streams to component ports
@@ -808,7 +858,8 @@ class SystemExecutionHarness:
             from_output=from_port_name,
             to_component=to_comp_name,
             to_input=to_port_name,
-            max_buffer_size=max_buffer_size
+            max_buffer_size=max_buffer_size,
+            monitor=monitor
         )
         
         self.connections.append(connection)
@@ -960,6 +1011,73 @@ class SystemExecutionHarness:
             self.logger.error(f"Failed to receive data from stream {stream_path}: {e}")
             return None
         
+    async def request_reply(self, request_path: str, reply_path: str, data: Dict[str, Any],
+                            timeout: float = 5.0) -> Optional[Any]:
+        """
+        Send a request into a stream and wait for the reply correlated with it.
+        
+        Unlike send_to_stream followed by receive_from_stream, concurrent callers
+        each receive their own reply: the request carries a `correlation_id` and a
+        dispatcher task routes replies from `reply_path` back by that ID. The
+        reply stream is owned by the dispatcher from the first call on, so do not
+        mix this with receive_from_stream on the same path.
+        
+        Args:
+            request_path: Stream to send to, "component_name.stream_name" (as send_to_stream)
+            reply_path: Stream carrying replies, "component_name.stream_name" (as receive_from_stream)
+            data: Request payload; a copy with `correlation_id` added is sent
+            timeout: Maximum time to wait for the reply (seconds)
+            
+        Returns:
+            The reply item, or None on timeout or error
+            
+        Example:
+            result = await harness.request_reply("api_service.input", "api_service.output", request_data)
+        """
+        try:
+            send_stream = self._resolve_stream(request_path, "send_streams")
+            router = self._get_reply_router(reply_path)
+            if send_stream is None or router is None:
+                return None
+            reply = await router.request(send_stream, data, timeout=timeout)
+            if reply is None:
+                self.logger.warning(f"Timeout waiting for reply on {reply_path} to request on {request_path}")
+            return reply
+        except (TypeError, anyio.ClosedResourceError, anyio.BrokenResourceError) as e:
+            self.logger.error(f"Request/reply via {request_path} -> {reply_path} failed: {e}")
+            return None
+    
+    def _resolve_stream(self, stream_path: str, direction: str) -> Optional[Any]:
+        """Look up "component.stream" in a component's send_streams or receive_streams"""
+        if '.' not in stream_path:
+            self.logger.error(f"Invalid stream path format: {stream_path}. Expected 'component.stream'")
+            return None
+        component_name, stream_name = stream_path.split('.', 1)
+        component = self.components.get(component_name)
+        if component is None:
+            self.logger.error(f"Component not found: {component_name}")
+            return None
+        stream = getattr(component, direction, {}).get(stream_name)
+        if stream is None:
+            self.logger.error(f"Stream not found: {stream_path}")
+        return stream
+    
+    def _get_reply_router(self, reply_path: str) -> Optional[ReplyRouter]:
+        """Reply router for a stream, starting its dispatcher in the harness task group"""
+        router = self._reply_routers.get(reply_path)
+        if router is not None:
+            return router
+        receive_stream = self._resolve_stream(reply_path, "receive_streams")
+        if receive_stream is None:
+            return None
+        if self._task_group is None:
+            self.logger.error(f"Cannot route replies from {reply_path}: harness is not running")
+            return None
+        router = ReplyRouter(receive_stream, name=reply_path)
+        self._reply_routers[reply_path] = router
+        self._task_group.start_soon(router.run)
+        return router
+    
     async def run(self) -> None:
         """
         Start and run the system using anyio structured concurrency.
@@ -988,6 +1106,14 @@ class SystemExecutionHarness:
                     await component.setup(self.get_context())
                     component._status.is_running = True
                 
+                # Restore checkpointed state before any component starts processing
+                if self._checkpoint_coordinator is None and os.getenv("AUTOCODER_CHECKPOINT_DIR"):
+                    self.enable_checkpointing(os.getenv("AUTOCODER_CHECKPOINT_DIR"))
+                if self._checkpoint_coordinator is not None:
+                    await self._checkpoint_coordinator.restore()
+                if self._buffer_tuner is None and os.getenv("AUTOCODER_STREAM_MEMORY_BUDGET_MB"):
+                    self.enable_buffer_autotuning(float(os.getenv("AUTOCODER_STREAM_MEMORY_BUDGET_MB")))
+                
                 # Start and verify all components are ready
                 for name, component in self.components.items():
                     await self._start_component_with_readiness(name, component)
@@ -1004,6 +1130,8 @@ class SystemExecutionHarness:
                 tg.start_soon(self._health_check_monitor)
                 tg.start_soon(self._metrics_updater)
                 tg.start_soon(self._shutdown_monitor)  # Monitor for shutdown signals
+                if self._checkpoint_coordinator is not None:
+                    tg.start_soon(self._checkpoint_coordinator.run)
                 
                 self.logger.info(f"Harness running: {self.name} with {len(self.components)} components")
                 
@@ -1072,6 +1200,20 @@ class SystemExecutionHarness:
         self.logger.info(f"Stopping harness: {self.name}")
         self._running = False
         
+        # Flush stats recorded since the metrics updater last ran
+        try:
+            self._export_component_stats()
+        except Exception as e:
+            self.logger.error(f"Final component stats export failed: {e}")
+        
+        # Final checkpoint before cleanup releases component state
+        if self._checkpoint_coordinator is not None:
+            with anyio.CancelScope(shield=True):
+                try:
+                    await self._checkpoint_coordinator.checkpoint()
+                except Exception as e:
+                    self.logger.error(f"Final checkpoint failed: {e}")
+        
         # Run cleanup for all components
         for name, component in self.components.items():
             try:
@@ -1093,6 +1235,8 @@ class SystemExecutionHarness:
         """Wrapper to run a single component's process loop with circuit breaker."""
         # Initialize circuit breaker for this component
         self._init_circuit_breaker(name)
+        # Items that fail inside the component's own loop are reported here instead of raising
+        component._failure_reporter = lambda error: self._record_item_failure(name)
         
         retry_count = 0
         max_retries = 3
@@ -1175,6 +1319,8 @@ class SystemExecutionHarness:
                 "last_error": status.last_error,
                 "metadata": status.metadata
             }
+            if getattr(component, 'stats', None) is not None:
+                detailed_components[name]["stats"] = component.stats.snapshot()
         
         # Calculate system health
         total_components = len(self.components)
@@ -1293,11 +1439,10 @@ class SystemExecutionHarness:
                 # Update component metrics
                 for name, component in self.components.items():
                     self._metrics.component_metrics[name] = component.get_status()
+                self._export_component_stats()
                 
-                # Update stream queue depths
-                for connection in self.connections:
-                    # In a real implementation, check actual queue depths
-                    self._metrics.queue_depths[f"{connection.from_component}->{connection.to_component}"] = 0
+                # Update per-connection stream metrics, bottleneck and buffer sizes
+                self._update_stream_metrics()
                 
                 # Log metrics periodically
                 if int(self._metrics.uptime_seconds) % 60 == 0:  # Every minute
@@ -1311,6 +1456,58 @@ class SystemExecutionHarness:
                 self.logger.error(f"Metrics updater error: {e}")
                 await anyio.sleep(self._metrics_update_interval)
     
+    def _export_component_stats(self) -> None:
+        """Push each component's hot-path stats block into its metrics collector"""
+        for component in self.components.values():
+            stats = getattr(component, 'stats', None)
+            if stats is not None:
+                stats.export(getattr(component, 'metrics_collector', None))
+    
+    def _update_stream_metrics(self) -> None:
+        """Sample every monitored connection, locate the bottleneck and auto-tune buffers"""
+        samples = {}
+        topology = []
+        for connection in self.connections:
+            monitor = connection.monitor
+            if monitor is None:
+                continue
+            sample = monitor.sample()
+            samples[monitor.name] = sample
+            topology.append((connection.from_component, connection.to_component, sample))
+            self._metrics.queue_depths[f"{connection.from_component}->{connection.to_component}"] = sample["depth"]
+            self._metrics.stream_metrics[monitor.name] = StreamMetrics(
+                items_sent=sample["items_sent"],
+                items_received=sample["items_received"],
+                buffer_size=sample["depth"],
+                backpressure_events=sample["blocked_sends"],
+                capacity=sample["capacity"],
+                peak_buffer_size=sample["window_peak_depth"],
+                send_blocked_seconds=sample["send_blocked_seconds"],
+                throughput_per_second=sample["throughput_per_second"],
+                oldest_item_age_seconds=sample["oldest_item_age_seconds"]
+            )
+        
+        bottleneck = find_bottleneck(topology)
+        self._metrics.bottleneck = bottleneck.to_dict() if bottleneck else None
+        if self._buffer_tuner is not None:
+            self._buffer_tuner.tune({c.monitor.name: c.monitor for c in self.connections if c.monitor}, samples)
+    
+    def enable_buffer_autotuning(self, memory_budget_mb: float = 64.0, item_bytes_estimate: int = 1024,
+                                 min_size: int = 16, max_size: int = 65536) -> BufferAutoTuner:
+        """
+        Resize connection buffers from observed burstiness on each metrics update.
+        
+        The budget bounds the total buffered slots across all connections, at an
+        estimated `item_bytes_estimate` per queued item.
+        """
+        self._buffer_tuner = BufferAutoTuner(
+            memory_budget_mb=memory_budget_mb, item_bytes_estimate=item_bytes_estimate,
+            min_size=min_size, max_size=max_size
+        )
+        self.logger.info(f"Buffer auto-tuning enabled: {memory_budget_mb} MB budget "
+                         f"({self._buffer_tuner.slot_budget} slots)")
+        return self._buffer_tuner
+    
     async def _handle_component_failure(self, component_name: str):
         """Handle component failure with advanced circuit breaker logic"""
         if component_name not in self._circuit_breakers:
@@ -1441,9 +1638,12 @@ class SystemExecutionHarness:
                     {
                         "from": f"{conn.from_component}.{conn.from_output}",
                         "to": f"{conn.to_component}.{conn.to_input}",
-                        "buffer_size": conn.max_buffer_size
+                        "buffer_size": conn.monitor.capacity if conn.monitor else conn.max_buffer_size
                     } for conn in self.connections
-                ]
+                ],
+                "stream_metrics": {name: asdict(m) for name, m in self._metrics.stream_metrics.items()},
+                "bottleneck": self._metrics.bottleneck,
+                "buffer_autotuning": self._buffer_tuner.get_stats() if self._buffer_tuner else None
             }
         }
     
@@ -1482,7 +1682,8 @@ class SystemExecutionHarness:
             "traces": {
                 "active_spans": len(self._tracer.active_spans),
                 "total_traces": len(set(span.context.trace_id for span in self._tracer.spans))
-            }
+            },
+            "request_reply": {path: router.get_stats() for path, router in self._reply_routers.items()}
         }
     
     # Circuit Breaker Implementation
@@ -1525,6 +1726,13 @@ class SystemExecutionHarness:
             cb["last_failure_time"] = time.time()
             cb["success_count"] = 0  # Reset success count on failure
     
+    def _record_item_failure(self, component_name: str) -> None:
+        """Count an item failure handled in-loop by the component and trip the breaker if needed"""
+        self._record_circuit_breaker_failure(component_name)
+        if self._should_open_circuit_breaker(component_name):
+            self._set_circuit_breaker_state(component_name, "open")
+            self.logger.error(f"Circuit breaker OPEN for component {component_name}")
+    
     def _should_open_circuit_breaker(self, component_name: str) -> bool:
         """Check if circuit breaker should be opened"""
         if component_name not in self._circuit_breakers:
@@ -1838,6 +2046,27 @@ class SystemExecutionHarness:
                 "impact": "System may not be processing data efficiently"
             })
         
+        # Pipeline bottleneck from stream backpressure
+        bottleneck = self._metrics.bottleneck
+        if bottleneck:
+            recommendations.append({
+                "id": f"pipeline_bottleneck_{int(current_time)}",
+                "priority": "medium",
+                "category": "performance",
+                "title": f"Pipeline Bottleneck: {bottleneck['component']}",
+                "description": f"Input {bottleneck['connection']} is backed up "
+                               f"({bottleneck['depth']}/{bottleneck['capacity']} queued, oldest item "
+                               f"{bottleneck['oldest_item_age_seconds']:.2f}s old) while its outputs keep flowing",
+                "actions": [
+                    f"1. Profile {bottleneck['component']}.process_item for slow calls",
+                    "2. Move blocking work off the event loop or batch it",
+                    "3. Run more instances of the stage if it is stateless",
+                    "4. Enable buffer auto-tuning only if the backlog is bursty rather than sustained"
+                ],
+                "estimated_time": "15-60 minutes",
+                "impact": "End-to-end latency and throughput are limited by this stage"
+            })
+        
         # Unhealthy components
         unhealthy_components = [name for name, comp in self.components.items() 
                               if not comp.get_status().is_healthy]
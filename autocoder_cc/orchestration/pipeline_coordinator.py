@@ -10,6 +10,7 @@ from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 from autocoder_cc.blueprint_language.system_blueprint_parser import ParsedSystemBlueprint
+from autocoder_cc.components.component_registry import component_registry
 from autocoder_cc.observability import get_logger, get_metrics_collector, get_tracer
 from autocoder_cc.core.module_interfaces import (
     IResourceOrchestrator,
@@ -160,6 +161,13 @@ class PipelineCoordinator:
         """Run pre-generation validation phase"""
         self.logger.info("Running pre-generation validation", operation="pre_validation")
         
+        # Probe external dependencies on this loop; the synchronous registry checks
+        # in the validator are then answered from the preflight cache
+        await component_registry.preflight_dependencies([
+            {'name': comp.name, 'config': comp.config or {}}
+            for comp in system_blueprint.system.components
+        ])
+        
         validation_result = self.blueprint_validator.validate_pre_generation(system_blueprint)
         
         self.logger.info(
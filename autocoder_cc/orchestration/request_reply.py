@@ -0,0 +1,103 @@
+"""
+Correlated request/reply over harness streams.
+
+An HTTP handler bridging into the pipeline sends an item carrying a
+correlation ID and waits for the reply with the same ID. One `ReplyRouter`
+per reply stream owns that stream: its dispatcher task receives every
+reply and hands it to the waiting request, so concurrent requests never see
+each other's results and waiting costs a single event wait instead of a
+polling timeout loop.
+
+Components preserve the ID by returning dict results; ComposedComponent
+copies `correlation_id` from the input item onto dict results that lack it.
+Replies whose request has already timed out, or that carry no known ID, are
+counted and dropped.
+"""
+import itertools
+import os
+from typing import Any, Dict, Mapping, Optional
+
+import anyio
+from anyio.abc import ObjectReceiveStream, ObjectSendStream
+
+from autocoder_cc.observability import get_logger
+
+CORRELATION_FIELD = "correlation_id"
+
+
+class _Waiter:
+    __slots__ = ("event", "reply")
+
+    def __init__(self):
+        self.event = anyio.Event()
+        self.reply: Any = None
+
+
+class ReplyRouter:
+    """Routes replies from one stream to the requests waiting on them"""
+
+    def __init__(self, receive_stream: ObjectReceiveStream, name: str = ""):
+        self.receive_stream = receive_stream
+        self.name = name
+        self.logger = get_logger(f"ReplyRouter.{name}" if name else "ReplyRouter")
+        self._pending: Dict[str, _Waiter] = {}
+        # Process-unique prefix plus a counter: cheaper than a uuid per request
+        self._prefix = f"{os.getpid():x}-{id(self):x}-"
+        self._ids = itertools.count()
+        self.running = False
+
+        self.requests = 0
+        self.replies = 0
+        self.timeouts = 0
+        self.unmatched = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def run(self) -> None:
+        """Dispatcher task: route every reply on the stream to its waiter"""
+        self.running = True
+        try:
+            async for reply in self.receive_stream:
+                cid = reply.get(CORRELATION_FIELD) if isinstance(reply, Mapping) else None
+                waiter = self._pending.pop(cid, None) if cid is not None else None
+                if waiter is None:
+                    self.unmatched += 1
+                    self.logger.debug(f"Dropping reply without a waiting request (correlation_id={cid})")
+                    continue
+                waiter.reply = reply
+                waiter.event.set()
+                self.replies += 1
+        finally:
+            self.running = False
+
+    async def request(self, send_stream: ObjectSendStream, item: Mapping[str, Any],
+                      timeout: float = 5.0) -> Optional[Any]:
+        """Send `item` with a fresh correlation ID and wait for its reply; None on timeout"""
+        if not isinstance(item, Mapping):
+            raise TypeError(f"Correlated requests must be mappings, got {type(item).__name__}")
+        cid = self._prefix + str(next(self._ids))
+        waiter = _Waiter()
+        # Register before sending: the reply can arrive before send() returns
+        self._pending[cid] = waiter
+        self.requests += 1
+        try:
+            with anyio.move_on_after(timeout):
+                await send_stream.send({**item, CORRELATION_FIELD: cid})
+                await waiter.event.wait()
+                return waiter.reply
+            self.timeouts += 1
+            return None
+        finally:
+            # Timed out or cancelled: forget the request so a late reply is dropped
+            self._pending.pop(cid, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "in_flight": len(self._pending),
+            "requests": self.requests,
+            "replies": self.replies,
+            "timeouts": self.timeouts,
+            "unmatched_replies": self.unmatched,
+        }
@@ -0,0 +1,335 @@
+"""
+Instrumented harness connections: queue depth, backpressure and consumer lag.
+
+`create_monitored_stream` returns a send/receive pair wrapping an unbounded
+anyio memory stream. The wrappers enforce the connection's capacity
+themselves, which lets `BufferAutoTuner` resize a live connection, and
+record per connection:
+
+  - depth and peak depth (items sent but not yet received)
+  - time senders spent blocked on a full buffer
+  - throughput between samples
+  - age of the oldest queued item (consumer lag)
+
+One timestamp per in-flight item is kept in a deque that mirrors the
+stream's FIFO order, so per-item overhead is an append and a popleft.
+
+`find_bottleneck` names the slowest stage: the consumer whose input is
+backed up while its own outputs are not blocked downstream.
+"""
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import anyio
+from anyio import WouldBlock
+from anyio.abc import ObjectReceiveStream, ObjectSendStream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+from autocoder_cc.observability import get_logger
+
+_clock = time.perf_counter
+
+
+class ConnectionMonitor:
+    """Shared state of one monitored connection"""
+
+    __slots__ = ("name", "capacity", "send_times", "items_sent", "items_received",
+                 "blocked_sends", "blocked_seconds", "peak_depth", "blocked_senders",
+                 "_space", "_last_sample", "_window_blocked", "_window_peak", "_window_low",
+                 "_quiet_windows")
+
+    def __init__(self, name: str, capacity: float):
+        self.name = name
+        self.capacity = capacity
+        self.send_times: deque = deque()
+        self.items_sent = 0
+        self.items_received = 0
+        self.blocked_sends = 0
+        self.blocked_seconds = 0.0
+        self.peak_depth = 0
+        self.blocked_senders = 0
+        self._space = anyio.Event()
+        # Sampling window state: (time, items_received) at the previous sample
+        self._last_sample: Tuple[float, int] = (_clock(), 0)
+        self._window_blocked = 0.0
+        self._window_peak = 0
+        self._window_low = 0
+        self._quiet_windows = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self.send_times)
+
+    def oldest_age(self, now: Optional[float] = None) -> float:
+        return (now or _clock()) - self.send_times[0] if self.send_times else 0.0
+
+    def _sent(self) -> None:
+        self.send_times.append(_clock())
+        self.items_sent += 1
+        depth = len(self.send_times)
+        if depth > self._window_peak:
+            self._window_peak = depth
+
+    def _received(self) -> None:
+        if self.send_times:
+            self.send_times.popleft()
+        self.items_received += 1
+        depth = len(self.send_times)
+        if depth < self._window_low:
+            self._window_low = depth
+        if self.blocked_senders:
+            self.wake_senders()
+
+    def wake_senders(self) -> None:
+        self._space.set()
+        self._space = anyio.Event()
+
+    async def _wait_for_space(self, inner: MemoryObjectSendStream) -> None:
+        started = _clock()
+        self.blocked_sends += 1
+        self.blocked_senders += 1
+        try:
+            # A closed receiving side is reported by the inner send, so stop waiting then
+            while len(self.send_times) >= self.capacity and inner.statistics().open_receive_streams:
+                await self._space.wait()
+        finally:
+            self.blocked_senders -= 1
+            waited = _clock() - started
+            self.blocked_seconds += waited
+            self._window_blocked += waited
+
+    def sample(self) -> Dict[str, Any]:
+        """Snapshot counters and start a new sampling window"""
+        now = _clock()
+        last_time, last_received = self._last_sample
+        elapsed = max(now - last_time, 1e-9)
+        peak = max(self._window_peak, len(self.send_times))
+        snapshot = {
+            "connection": self.name,
+            "capacity": self.capacity,
+            "depth": len(self.send_times),
+            "window_peak_depth": peak,
+            "window_low_depth": self._window_low,
+            "items_sent": self.items_sent,
+            "items_received": self.items_received,
+            "throughput_per_second": (self.items_received - last_received) / elapsed,
+            "blocked_sends": self.blocked_sends,
+            "send_blocked_seconds": self.blocked_seconds,
+            "window_blocked_fraction": min(1.0, self._window_blocked / elapsed),
+            "oldest_item_age_seconds": self.oldest_age(now),
+        }
+        self.peak_depth = max(self.peak_depth, peak)
+        self._last_sample = (now, self.items_received)
+        self._window_blocked = 0.0
+        self._window_peak = self._window_low = len(self.send_times)
+        return snapshot
+
+
+class MonitoredSendStream(ObjectSendStream):
+    """Send side of a monitored connection; blocks while the monitor's capacity is reached"""
+
+    def __init__(self, inner: MemoryObjectSendStream, monitor: ConnectionMonitor):
+        self._inner = inner
+        self.monitor = monitor
+
+    async def send(self, item: Any) -> None:
+        monitor = self.monitor
+        if len(monitor.send_times) >= monitor.capacity:
+            await monitor._wait_for_space(self._inner)
+        # The inner stream is unbounded, so this only checkpoints and hands the item over
+        await self._inner.send(item)
+        monitor._sent()
+
+    def send_nowait(self, item: Any) -> None:
+        if len(self.monitor.send_times) >= self.monitor.capacity:
+            raise WouldBlock
+        self._inner.send_nowait(item)
+        self.monitor._sent()
+
+    def queued_items(self) -> List[Any]:
+        """Items sent but not yet received, oldest first"""
+        return list(self._inner._state.buffer)
+
+    def requeue(self, items: Iterable[Any]) -> None:
+        """Put items back on the connection regardless of capacity (checkpoint restore)"""
+        for item in items:
+            self._inner.send_nowait(item)
+            self.monitor._sent()
+
+    def clone(self) -> "MonitoredSendStream":
+        return MonitoredSendStream(self._inner.clone(), self.monitor)
+
+    def close(self) -> None:
+        self._inner.close()
+
+    async def aclose(self) -> None:
+        self._inner.close()
+
+    def statistics(self):
+        return self._inner.statistics()._replace(
+            max_buffer_size=self.monitor.capacity, tasks_waiting_send=self.monitor.blocked_senders
+        )
+
+    def __enter__(self) -> "MonitoredSendStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class MonitoredReceiveStream(ObjectReceiveStream):
+    """Receive side of a monitored connection"""
+
+    def __init__(self, inner: MemoryObjectReceiveStream, monitor: ConnectionMonitor):
+        self._inner = inner
+        self.monitor = monitor
+
+    async def receive(self) -> Any:
+        item = await self._inner.receive()
+        self.monitor._received()
+        return item
+
+    def receive_nowait(self) -> Any:
+        item = self._inner.receive_nowait()
+        self.monitor._received()
+        return item
+
+    def clone(self) -> "MonitoredReceiveStream":
+        return MonitoredReceiveStream(self._inner.clone(), self.monitor)
+
+    def close(self) -> None:
+        self._inner.close()
+        self.monitor.wake_senders()  # Blocked senders re-check and hit BrokenResourceError
+
+    async def aclose(self) -> None:
+        self.close()
+
+    def statistics(self):
+        return self._inner.statistics()._replace(
+            max_buffer_size=self.monitor.capacity, tasks_waiting_send=self.monitor.blocked_senders
+        )
+
+    def __enter__(self) -> "MonitoredReceiveStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def create_monitored_stream(name: str, max_buffer_size: float
+                            ) -> Tuple[MonitoredSendStream, MonitoredReceiveStream, ConnectionMonitor]:
+    send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=math.inf)
+    monitor = ConnectionMonitor(name, max_buffer_size)
+    return MonitoredSendStream(send_stream, monitor), MonitoredReceiveStream(receive_stream, monitor), monitor
+
+
+# ------------------------------------------------------------ analysis
+
+@dataclass
+class Bottleneck:
+    """Stage whose input is backed up while its outputs are flowing"""
+    component: str
+    connection: str
+    oldest_item_age_seconds: float
+    depth: int
+    capacity: float
+    blocked_fraction: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "component": self.component,
+            "connection": self.connection,
+            "oldest_item_age_seconds": round(self.oldest_item_age_seconds, 4),
+            "depth": self.depth,
+            "capacity": self.capacity,
+            "upstream_blocked_fraction": round(self.blocked_fraction, 3),
+        }
+
+
+def find_bottleneck(samples: Iterable[Tuple[str, str, Dict[str, Any]]],
+                    backlog_ratio: float = 0.5) -> Optional[Bottleneck]:
+    """Pick the slowest stage from (from_component, to_component, sample) triples.
+
+    A consumer is a candidate when one of its inputs blocked its producer
+    during the window or is at least `backlog_ratio` full, and none of its
+    own outputs blocked it (otherwise the real constraint is further
+    downstream). Candidates are ranked by the age of their oldest queued item.
+    """
+    samples = list(samples)
+    blocked_producers = {src for src, _, s in samples if s["window_blocked_fraction"] > 0}
+    best: Optional[Bottleneck] = None
+    for _, consumer, s in samples:
+        if consumer in blocked_producers:
+            continue
+        backed_up = s["window_blocked_fraction"] > 0 or (
+            s["capacity"] and s["window_peak_depth"] >= backlog_ratio * s["capacity"]
+        )
+        if not backed_up:
+            continue
+        if best is None or s["oldest_item_age_seconds"] > best.oldest_item_age_seconds:
+            best = Bottleneck(consumer, s["connection"], s["oldest_item_age_seconds"], s["depth"],
+                              s["capacity"], s["window_blocked_fraction"])
+    return best
+
+
+class BufferAutoTuner:
+    """Resizes monitored connections from observed burstiness within a memory budget.
+
+    Each sampling window, a connection that blocked its producer but drained
+    to below half capacity at some point (a burst the consumer can absorb)
+    doubles its capacity, as far as the budget allows. A buffer that stays
+    full all window is sustained overload: growing it would only add latency,
+    so it is left for bottleneck reporting. Buffers whose peak stayed under a
+    quarter of capacity for `shrink_after` windows halve, down to `min_size`.
+    """
+
+    def __init__(self, memory_budget_mb: float = 64.0, item_bytes_estimate: int = 1024,
+                 min_size: int = 16, max_size: int = 65536, shrink_after: int = 3):
+        self.slot_budget = int(memory_budget_mb * 1024 * 1024 / max(1, item_bytes_estimate))
+        self.min_size = min_size
+        self.max_size = max_size
+        self.shrink_after = shrink_after
+        self.logger = get_logger("BufferAutoTuner")
+        self.resizes: List[Dict[str, Any]] = []
+
+    def tune(self, monitors: Dict[str, ConnectionMonitor], samples: Dict[str, Dict[str, Any]]) -> None:
+        allocated = sum(m.capacity for m in monitors.values() if math.isfinite(m.capacity))
+        for name, monitor in monitors.items():
+            sample = samples.get(name)
+            if sample is None or not math.isfinite(monitor.capacity):
+                continue
+            capacity = int(monitor.capacity)
+            new_capacity = capacity
+            if sample["window_blocked_fraction"] > 0 and sample["window_low_depth"] < capacity / 2:
+                headroom = self.slot_budget - allocated
+                new_capacity = min(capacity * 2, self.max_size, capacity + max(0, int(headroom)))
+                monitor._quiet_windows = 0
+            elif sample["window_peak_depth"] < capacity / 4:
+                monitor._quiet_windows += 1
+                if monitor._quiet_windows >= self.shrink_after:
+                    new_capacity = max(self.min_size, capacity // 2, sample["window_peak_depth"] * 2)
+                    monitor._quiet_windows = 0
+            else:
+                monitor._quiet_windows = 0
+            if new_capacity != capacity:
+                self._resize(monitor, capacity, new_capacity)
+                allocated += new_capacity - capacity
+
+    def _resize(self, monitor: ConnectionMonitor, old: int, new: int) -> None:
+        monitor.capacity = new
+        if new > old:
+            monitor.wake_senders()
+        self.resizes.append({"connection": monitor.name, "from": old, "to": new, "timestamp": time.time()})
+        del self.resizes[:-100]
+        self.logger.info(f"Resized buffer {monitor.name}: {old} -> {new}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "slot_budget": self.slot_budget,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "recent_resizes": self.resizes[-10:],
+        }
@@ -0,0 +1,20 @@
+"""Generation-time resource allocation, prediction and profiling."""
+from .resource_orchestrator import (
+    PortAllocation,
+    PortAllocator,
+    ResourceAllocation,
+    ResourceManifest,
+    ResourceOrchestrator,
+    ResourceRequirement,
+    ResourceType,
+)
+
+__all__ = [
+    "PortAllocation",
+    "PortAllocator",
+    "ResourceAllocation",
+    "ResourceManifest",
+    "ResourceOrchestrator",
+    "ResourceRequirement",
+    "ResourceType",
+]
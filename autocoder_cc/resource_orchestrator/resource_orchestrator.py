@@ -16,7 +16,7 @@ Phase 2A Enhancement: Integrated with centralized port management
 """
 
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, Iterator, List, Any, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
 import re
@@ -25,12 +25,10 @@ import hashlib
 import os
 import json
 import socket
-import fcntl
-import psutil
-from datetime import datetime, timedelta
 
 # Phase 2A: Import centralized port registry
 from autocoder_cc.core.port_registry import get_port_registry
+from autocoder_cc.core.port_store import PortStore, PortsExhaustedError, get_port_store
 
 
 class ResourceType(Enum):
@@ -82,40 +80,50 @@ class PortAllocator:
     Production-grade port allocation system with conflict resolution and process management.
     
     Features:
-    - File-based locking for concurrent access
-    - Process validation for stale entry cleanup
+    - Host-level reservations in the shared PortStore (also used by PortRegistry)
+    - Bulk allocation of a whole system's ports in one locked transaction
+    - Incremental cleanup of entries left by dead processes
     - Deterministic allocation with conflict resolution
     - Environment-configurable port ranges
     """
     
-    def __init__(self):
+    def __init__(self, store: Optional[PortStore] = None):
         self.port_range = self._get_port_range()
-        self.state_file = Path(os.getenv('AUTOCODER_PORT_STATE_FILE', '~/.autocoder/allocated_ports.json')).expanduser()
         self.max_attempts = int(os.getenv('AUTOCODER_PORT_ATTEMPTS', '50'))
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.store = store or get_port_store()
     
     def _get_port_range(self) -> tuple[int, int]:
         range_str = os.getenv('AUTOCODER_PORT_RANGE', '8000-18000')
         start, end = map(int, range_str.split('-'))
         return start, end
     
-    def allocate_port(self, system: str, component: str) -> int:
-        """Allocate a unique port for the given system component"""
+    def _candidates(self, system: str, component: str) -> Iterator[int]:
+        """Deterministic first guess, then the following ports, up to max_attempts"""
         low, high = self.port_range
         span = high - low + 1
-        
-        # 1. Deterministic first guess
         seed = f"{system}_{component}"
         first_guess = low + (int(hashlib.md5(seed.encode()).hexdigest(), 16) % span)
-        
-        # 2. Try to reserve it with conflict resolution
-        for i in range(self.max_attempts):
-            candidate_port = low + ((first_guess - low + i) % span)
-            
-            if self._is_port_free(candidate_port) and self._reserve_port(candidate_port, system, component):
-                return candidate_port
-        
-        raise RuntimeError(f"Port allocation exhausted after {self.max_attempts} attempts in range {low}-{high}")
+        for i in range(min(self.max_attempts, span)):
+            yield low + ((first_guess - low + i) % span)
+    
+    def allocate_port(self, system: str, component: str) -> int:
+        """Allocate a unique port for the given system component"""
+        return self.allocate_ports(system, [component])[component]
+    
+    def allocate_ports(self, system: str, components: List[str]) -> Dict[str, int]:
+        """Reserve ports for all of a system's components in one transaction"""
+        try:
+            return self.store.reserve(
+                system,
+                {component: self._candidates(system, component) for component in components},
+                is_free=self._is_port_free,
+            )
+        except PortsExhaustedError as e:
+            low, high = self.port_range
+            raise RuntimeError(
+                f"Port allocation exhausted after {self.max_attempts} attempts in range {low}-{high} "
+                f"for {', '.join(e.components)}"
+            ) from e
     
     def _is_port_free(self, port: int) -> bool:
         """Check if port is available by attempting to bind"""
@@ -127,86 +135,9 @@ class PortAllocator:
         except OSError:
             return False
     
-    def _reserve_port(self, port: int, system: str, component: str) -> bool:
-        """Reserve port in host-level registry with file locking"""
-        try:
-            # Cleanup stale entries first
-            self._cleanup_stale_entries()
-            
-            with open(self.state_file, 'a+') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                f.seek(0)
-                
-                # Load existing allocations
-                try:
-                    data = json.load(f) if f.read() else {"ports": {}, "last_cleanup": datetime.utcnow().isoformat()}
-                except json.JSONDecodeError:
-                    data = {"ports": {}, "last_cleanup": datetime.utcnow().isoformat()}
-                
-                # Check if port already allocated
-                if str(port) in data["ports"]:
-                    existing = data["ports"][str(port)]
-                    # If same system/component, allow (restart scenario)
-                    if existing["system"] == system and existing["component"] == component:
-                        return True
-                    return False
-                
-                # Reserve the port
-                data["ports"][str(port)] = {
-                    "system": system,
-                    "component": component,
-                    "pid": os.getpid(),
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                # Write back
-                f.seek(0)
-                f.truncate()
-                json.dump(data, f, indent=2)
-                return True
-                
-        except Exception as e:
-            print(f"Warning: Port reservation failed: {e}")
-            return False
-    
-    def _cleanup_stale_entries(self):
-        """Remove entries for dead processes or old timestamps"""
-        if not self.state_file.exists():
-            return
-            
-        try:
-            with open(self.state_file, 'r+') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                data = json.load(f)
-                
-                # Clean up entries
-                current_time = datetime.utcnow()
-                ports_to_remove = []
-                
-                for port, allocation in data["ports"].items():
-                    # Remove if process dead
-                    if not psutil.pid_exists(allocation["pid"]):
-                        ports_to_remove.append(port)
-                        continue
-                    
-                    # Remove if older than 7 days
-                    alloc_time = datetime.fromisoformat(allocation["timestamp"])
-                    if current_time - alloc_time > timedelta(days=7):
-                        ports_to_remove.append(port)
-                
-                # Remove stale entries
-                for port in ports_to_remove:
-                    del data["ports"][port]
-                
-                data["last_cleanup"] = current_time.isoformat()
-                
-                # Write back
-                f.seek(0)
-                f.truncate()
-                json.dump(data, f, indent=2)
-                
-        except Exception as e:
-            print(f"Warning: Cleanup failed: {e}")
+    def release_system(self, system: str) -> int:
+        """Release every port reserved for `system`"""
+        return self.store.release_system(system)
 
 
 class ResourceOrchestrator:
@@ -279,6 +210,30 @@ class ResourceOrchestrator:
         except RuntimeError as e:
             raise RuntimeError(f"Port allocation failed for component '{component_name}' in system '{system_name}': {e}")
     
+    def allocate_system_ports(self, component_names: List[str], system_name: str) -> Dict[str, int]:
+        """
+        Allocate ports for all of a system's components at once.
+        
+        Args:
+            component_names: Names of the components needing ports
+            system_name: Name of the system the components belong to
+            
+        Returns:
+            Dict mapping component name to allocated port
+            
+        Raises:
+            RuntimeError: If any port cannot be allocated; none are allocated then
+        """
+        try:
+            ports = get_port_registry().allocate_ports(
+                {name: self._determine_component_type(name) for name in component_names},
+                system_id=system_name
+            )
+        except RuntimeError as e:
+            raise RuntimeError(f"Port allocation failed for system '{system_name}': {e}")
+        self.allocated_ports.update(ports.values())
+        return ports
+    
     def _determine_component_type(self, component_name: str) -> Optional[str]:
         """
         Determine component type from component name for optimized port allocation
@@ -511,8 +466,22 @@ class ResourceOrchestrator:
         # Sort by priority (higher first)
         sorted_requirements = sorted(requirements, key=lambda r: r.priority)
         
+        # Reserve every port the system needs in one registry transaction
+        port_components = list(dict.fromkeys(
+            req.component_name for req in sorted_requirements if req.resource_type == ResourceType.NETWORK_PORT
+        ))
+        ports = self.allocate_system_ports(port_components, system_name) if port_components else {}
+        
         for req in sorted_requirements:
-            allocation = self._allocate_single_resource(req, system_name)
+            if req.resource_type == ResourceType.NETWORK_PORT:
+                allocation = ResourceAllocation(
+                    component_name=req.component_name,
+                    resource_type=req.resource_type,
+                    allocated_value=ports[req.component_name],
+                    source="pool"
+                )
+            else:
+                allocation = self._allocate_single_resource(req, system_name)
             if allocation:
                 allocations.append(allocation)
                 
@@ -791,16 +760,11 @@ class ResourceOrchestrator:
             Dict mapping component name to allocated port
         """
         system_name = "default_system"  # Use default if not provided
-        port_allocations = {}
         
-        for component_name in component_names:
-            port = self.allocate_port(component_name, system_name)
-            if port:
-                port_allocations[component_name] = port
-            else:
-                raise ValueError(f"Unable to allocate port for {component_name} - port pool exhausted")
-                
-        return port_allocations
+        try:
+            return self.allocate_system_ports(component_names, system_name)
+        except RuntimeError as e:
+            raise ValueError(f"Unable to allocate ports for {', '.join(component_names)} - port pool exhausted: {e}")
     
     def cleanup_system_resources(self, system_name: str) -> Dict[str, int]:
         """
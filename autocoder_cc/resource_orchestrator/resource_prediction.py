@@ -18,6 +18,7 @@ import json
 
 from autocoder_cc.observability import get_logger, get_metrics_collector, get_tracer
 from autocoder_cc.blueprint_language.system_blueprint_parser import ParsedSystemBlueprint, ParsedComponent
+from .resource_profiling import ComponentResourceProfile, ProfileStore
 
 logger = get_logger(__name__)
 
@@ -242,9 +243,19 @@ class PortAllocator:
 
 
 class ResourceEstimator:
-    """Estimates resource requirements for components and systems"""
+    """Estimates resource requirements for components and systems.
+
+    Measured profiles (see resource_profiling) take precedence when they were
+    measured from the component's current code (matching code hash); the static
+    per-type table is the fallback for components that have not been profiled,
+    have changed since, or whose source file can no longer be found.
+    """
     
-    def __init__(self):
+    def __init__(self, profile_store: Optional[ProfileStore] = None):
+        self.profile_store = profile_store if profile_store is not None else ProfileStore()
+        # component name -> "measured:v<N>" or "static", from the last estimate
+        self.estimate_sources: Dict[str, str] = {}
+        self._runtime_memory_mb = 0.0
         self.component_profiles: Dict[str, Dict[str, float]] = {
             "Source": {
                 "memory_mb": 50,
@@ -298,8 +309,14 @@ class ResourceEstimator:
         self.system_overhead_factor = 1.2  # 20% overhead for system processes
         self.peak_load_factor = 1.5  # 50% buffer for peak loads
     
-    def estimate_component_resources(self, component: ParsedComponent) -> Dict[str, float]:
-        """Estimate resources for a single component"""
+    def estimate_component_resources(self, component: ParsedComponent,
+                                     code_hash: Optional[str] = None) -> Dict[str, float]:
+        """Estimate resources for a single component
+        
+        A measured profile is used while the source file it was measured from
+        is unchanged. `code_hash` (resource_profiling.code_hash_of_file)
+        instead selects the profile measured from that code.
+        """
         component_type = component.type
         base_profile = self.component_profiles.get(component_type, self.component_profiles["Transformer"])
         
@@ -310,7 +327,28 @@ class ResourceEstimator:
         for resource, base_value in base_profile.items():
             estimated_resources[resource] = base_value * scaling_factor
         
-        return estimated_resources
+        if code_hash is not None:
+            measured = self.profile_store.load(component.name, component_type, code_hash=code_hash)
+        else:
+            measured = self.profile_store.load_current(component.name, component_type)
+        if measured is None:
+            self.estimate_sources[component.name] = "static"
+            return estimated_resources
+        
+        self.estimate_sources[component.name] = f"measured:v{measured.version}"
+        self._runtime_memory_mb = max(self._runtime_memory_mb, measured.rss_baseline_mb)
+        return self._apply_measured_profile(component, measured, estimated_resources)
+    
+    def _apply_measured_profile(self, component: ParsedComponent, measured: ComponentResourceProfile,
+                                static_estimate: Dict[str, float]) -> Dict[str, float]:
+        """Resources from a measured profile; disk is not profiled and keeps the static estimate"""
+        expected_rate = (component.config or {}).get('expected_rate')
+        return {
+            "memory_mb": measured.memory_mb,
+            "cpu_percent": measured.cpu_percent_at(expected_rate),
+            "disk_mb": static_estimate["disk_mb"],
+            "network_mbps": measured.network_mbps_at(expected_rate),
+        }
     
     def _calculate_scaling_factor(self, component: ParsedComponent) -> float:
         """Calculate scaling factor based on component configuration"""
@@ -354,6 +392,7 @@ class ResourceEstimator:
         total_network = 0
         
         component_estimates = {}
+        self._runtime_memory_mb = 0.0
         
         # Estimate resources for each component
         for component in system_blueprint.system.components:
@@ -365,6 +404,9 @@ class ResourceEstimator:
             total_disk += component_resources.get('disk_mb', 0)
             total_network += component_resources.get('network_mbps', 0)
         
+        # Measured profiles exclude the interpreter and harness, which the system pays for once
+        total_memory += self._runtime_memory_mb
+        
         # Apply system overhead and peak load factors
         total_memory *= self.system_overhead_factor * self.peak_load_factor
         total_cpu *= self.system_overhead_factor
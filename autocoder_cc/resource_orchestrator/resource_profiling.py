@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Resource Profiling - measured component profiles for ResourceEstimator
+
+Drives a component through the SystemExecutionHarness with a synthetic load
+generator and measures what it actually costs: CPU time, RSS, allocation
+rate, throughput and bytes in/out per item. Results are written as versioned
+JSON profiles that ResourceEstimator prefers over its static per-type table.
+
+The timed run wires `synthetic_load -> <component> -> profile_drain` with
+harness.connect and runs the component through the harness' own process
+wrapper. Allocation is measured afterwards in a separate tracemalloc pass over
+a sample of items, so tracing overhead never inflates the CPU figures.
+
+Profiles live under `AUTOCODER_RESOURCE_PROFILES_DIR`
+(default `~/.autocoder/resource_profiles`) as
+`<component_type>/<component_name>/v<N>.json`; each run adds a version.
+Every profile records the path and hash of the component's source file, and
+the estimator only uses a profile whose source file still has that hash.
+"""
+import gc
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import anyio
+import psutil
+
+from autocoder_cc.observability import get_logger
+from autocoder_cc.orchestration.component import Component
+
+logger = get_logger(__name__)
+
+PROFILE_FORMAT = 1
+_MB = 1024 * 1024
+
+
+@dataclass
+class ComponentResourceProfile:
+    """Measured resource usage of one component under synthetic load"""
+    component_name: str
+    component_type: str
+    component_class: str
+    code_hash: str
+    items_in: int
+    items_processed: int
+    items_out: int
+    load_rate: Optional[float]  # items/s offered; None means as fast as the component accepts
+    duration_s: float
+    throughput_items_per_s: float
+    cpu_seconds: float
+    cpu_ms_per_item: float
+    cpu_percent: float  # of one core, at the offered load
+    rss_baseline_mb: float
+    rss_peak_mb: float
+    memory_mb: float  # working set attributable to the component
+    alloc_bytes_per_item: Optional[float]
+    allocation_rate_mb_s: Optional[float]
+    bytes_in_per_item: float
+    bytes_out_per_item: float
+    source_path: str = ""  # file code_hash was taken from; empty if only bytecode was available
+    version: int = 0
+    measured_at: str = ""
+    format: int = PROFILE_FORMAT
+
+    def cpu_percent_at(self, rate: Optional[float]) -> float:
+        """CPU percent of one core at `rate` items/s (the profiled load when None)"""
+        if rate is None:
+            return self.cpu_percent
+        return self.cpu_ms_per_item * rate / 10
+
+    def network_mbps_at(self, rate: Optional[float]) -> float:
+        """Megabits/s moved through the component's ports at `rate` items/s"""
+        rate = self.throughput_items_per_s if rate is None else rate
+        return (self.bytes_in_per_item + self.bytes_out_per_item) * rate * 8 / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ComponentResourceProfile":
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+class ProfileStore:
+    """Versioned profiles on disk, one JSON file per profiling run"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or os.getenv(
+            "AUTOCODER_RESOURCE_PROFILES_DIR", "~/.autocoder/resource_profiles"
+        )).expanduser()
+        self._latest: Dict[Tuple[str, str], Optional[ComponentResourceProfile]] = {}
+
+    def _dir(self, component_type: str, component_name: str) -> Path:
+        return self.directory / component_type / component_name
+
+    def versions(self, component_name: str, component_type: str) -> List[int]:
+        directory = self._dir(component_type, component_name)
+        if not directory.is_dir():
+            return []
+        return sorted(
+            int(path.stem[1:]) for path in directory.glob("v*.json") if path.stem[1:].isdigit()
+        )
+
+    def load(self, component_name: str, component_type: str, version: Optional[int] = None,
+             code_hash: Optional[str] = None) -> Optional[ComponentResourceProfile]:
+        """
+        A specific profile version, or the latest when `version` is None.
+
+        With `code_hash`, the latest profile measured from that code; None if the
+        component has changed since it was last profiled.
+        """
+        if version is None:
+            key = (component_type, component_name)
+            if key not in self._latest:
+                versions = self.versions(component_name, component_type)
+                self._latest[key] = self.load(component_name, component_type, versions[-1]) if versions else None
+            latest = self._latest[key]
+            if code_hash is None or latest is None or latest.code_hash == code_hash:
+                return latest
+            # The code may have been reverted to an earlier profiled version
+            for older in reversed(self.versions(component_name, component_type)[:-1]):
+                profile = self.load(component_name, component_type, older)
+                if profile is not None and profile.code_hash == code_hash:
+                    return profile
+            return None
+        path = self._dir(component_type, component_name) / f"v{version}.json"
+        try:
+            with open(path) as f:
+                return ComponentResourceProfile.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable resource profile {path}: {e}")
+            return None
+
+    def load_current(self, component_name: str, component_type: str) -> Optional[ComponentResourceProfile]:
+        """
+        The latest profile whose recorded source file still hashes to its
+        `code_hash`; None if the component changed since it was profiled or its
+        source can no longer be found.
+        """
+        latest = self.load(component_name, component_type)
+        if latest is None:
+            return None
+        if latest.source_path and os.path.isfile(latest.source_path):
+            current = code_hash_of_file(latest.source_path)
+            return self.load(component_name, component_type, code_hash=current)
+        return None
+
+    def save(self, profile: ComponentResourceProfile) -> ComponentResourceProfile:
+        """Write `profile` as the next version of its component"""
+        directory = self._dir(profile.component_type, profile.component_name)
+        directory.mkdir(parents=True, exist_ok=True)
+        versions = self.versions(profile.component_name, profile.component_type)
+        profile.version = (versions[-1] if versions else 0) + 1
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".profile.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(profile.to_dict(), f, indent=2)
+            os.replace(tmp, directory / f"v{profile.version}.json")
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._latest[(profile.component_type, profile.component_name)] = profile
+        return profile
+
+
+class SyntheticLoad:
+    """Items offered to a component during profiling"""
+
+    def __init__(self, items: int = 2000, rate: Optional[float] = None, payload_bytes: int = 256,
+                 samples: Optional[List[Any]] = None):
+        self.items = items
+        self.rate = rate
+        self.payload_bytes = payload_bytes
+        self.samples = samples
+
+    def generate(self) -> List[Any]:
+        """All items up front, so generating them is not part of the measured run"""
+        if self.samples:
+            return [self.samples[i % len(self.samples)] for i in range(self.items)]
+        payload = "x" * self.payload_bytes
+        return [
+            {"id": i, "value": i * 0.5, "name": f"item-{i}", "timestamp": time.time(), "payload": payload}
+            for i in range(self.items)
+        ]
+
+
+class _LoadSource(Component):
+    """Sends the synthetic items at the configured rate, then closes its output"""
+
+    def __init__(self, name: str, items: List[Any], rate: Optional[float]):
+        super().__init__(name, {})
+        self.items = items
+        self.rate = rate
+        self.sent = 0
+
+    async def process(self) -> None:
+        stream = self.send_streams["output"]
+        started = time.perf_counter()
+        async with stream:
+            for item in self.items:
+                if self.rate:
+                    delay = started + self.sent / self.rate - time.perf_counter()
+                    if delay > 0:
+                        await anyio.sleep(delay)
+                await stream.send(item)
+                self.sent += 1
+
+
+class _ProfileDrain(Component):
+    """Consumes the profiled component's output, sizing a sample of items"""
+
+    def __init__(self, name: str, size_samples: int = 100):
+        super().__init__(name, {})
+        self.size_samples = size_samples
+        self.received = 0
+        self.sampled_bytes = 0
+
+    async def process(self) -> None:
+        async for item in self.receive_streams["input"]:
+            if self.received < self.size_samples:
+                self.sampled_bytes += _item_bytes(item)
+            self.received += 1
+
+    @property
+    def bytes_per_item(self) -> float:
+        sampled = min(self.received, self.size_samples)
+        return self.sampled_bytes / sampled if sampled else 0.0
+
+
+def _item_bytes(item: Any) -> int:
+    try:
+        return len(json.dumps(item, default=str))
+    except (TypeError, ValueError):
+        return len(str(item))
+
+
+def code_hash_of_file(path: Any) -> str:
+    """Hash of a component source file, comparable with a profile's `code_hash`"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+def _source_file(component: Any) -> Optional[str]:
+    """Absolute path of the file defining the component's class, if it can be found"""
+    try:
+        source_file = inspect.getsourcefile(type(component))
+    except TypeError:
+        source_file = None
+    if not source_file:
+        # Generated modules loaded from a file path are not in sys.modules; their code objects know the file
+        source_file = next((
+            member.__code__.co_filename for member in vars(type(component)).values()
+            if hasattr(member, "__code__")
+        ), None)
+    if source_file and os.path.isfile(source_file):
+        return os.path.abspath(source_file)
+    return None
+
+
+def _code_hash(component: Any) -> str:
+    """Hash of the file defining the component's class, falling back to its methods' bytecode"""
+    source_file = _source_file(component)
+    if source_file:
+        return code_hash_of_file(source_file)
+    code = b"".join(
+        member.__code__.co_code for _, member in sorted(vars(type(component)).items())
+        if hasattr(member, "__code__")
+    )
+    return hashlib.sha256(code).hexdigest()[:16]
+
+
+def component_type_of(component: Any) -> str:
+    component_type = getattr(component, "component_type", None)
+    if not component_type or component_type == "Unknown":
+        component_type = (getattr(component, "config", None) or {}).get("type") or type(component).__name__
+    return component_type
+
+
+class ComponentProfiler:
+    """Profiles components through the harness under synthetic load"""
+
+    def __init__(self, store: Optional[ProfileStore] = None, sample_interval: float = 0.02,
+                 allocation_samples: int = 200, max_duration: float = 60.0):
+        self.store = store
+        self.sample_interval = sample_interval
+        self.allocation_samples = allocation_samples
+        self.max_duration = max_duration
+        self._process = psutil.Process()
+
+    def _rss_mb(self) -> float:
+        return self._process.memory_info().rss / _MB
+
+    async def profile(self, name: str, component: Component, load: Optional[SyntheticLoad] = None,
+                      save: bool = True) -> ComponentResourceProfile:
+        """Run `component` through a harness under `load` and measure it"""
+        from autocoder_cc.orchestration.harness import SystemExecutionHarness
+
+        load = load or SyntheticLoad()
+        items = load.generate()
+        source = _LoadSource("synthetic_load", items, load.rate)
+        drain = _ProfileDrain("profile_drain")
+
+        harness = SystemExecutionHarness(f"profile-{name}", enable_dynamic_loading=False)
+        for registered_name, registered in (("synthetic_load", source), (name, component), ("profile_drain", drain)):
+            harness.register_component(registered_name, registered)
+        harness.connect("synthetic_load.output", f"{name}.input")
+        harness.connect(f"{name}.output", "profile_drain.input")
+        for registered_name, registered in harness.components.items():
+            await registered.setup(harness.get_context())
+            await harness._start_component_with_readiness(registered_name, registered)
+
+        processed_before = component._status.items_processed
+        gc.collect()
+        rss_baseline = rss_peak = self._rss_mb()
+        finished_at: Optional[float] = None
+
+        async def sample_rss() -> None:
+            nonlocal rss_peak
+            while True:
+                rss_peak = max(rss_peak, self._rss_mb())
+                await anyio.sleep(self.sample_interval)
+
+        async def run_component() -> None:
+            nonlocal finished_at
+            await harness._run_component(name, component)
+            finished_at = time.perf_counter()
+            # Nothing else closes the component's outputs; this ends the drain
+            for stream in component.send_streams.values():
+                await stream.aclose()
+
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(sample_rss)
+                # Components that never finish on their own (sources, servers) are cut off
+                with anyio.move_on_after(self.max_duration):
+                    async with anyio.create_task_group() as run:
+                        run.start_soon(source.process)
+                        run.start_soon(run_component)
+                        run.start_soon(drain.process)
+                tg.cancel_scope.cancel()
+            duration = (finished_at or time.perf_counter()) - started
+            cpu_seconds = time.process_time() - cpu_started
+            rss_peak = max(rss_peak, self._rss_mb())
+        finally:
+            for registered in harness.components.values():
+                try:
+                    await registered.cleanup()
+                except Exception as e:
+                    logger.warning(f"Cleanup of {registered.name} after profiling failed: {e}")
+
+        processed = component._status.items_processed - processed_before or drain.received
+        alloc_per_item, traced_peak_mb = await self._measure_allocations(component, items)
+        per_second = processed / duration if duration > 0 else 0.0
+
+        profile = ComponentResourceProfile(
+            component_name=name,
+            component_type=component_type_of(component),
+            component_class=f"{type(component).__module__}.{type(component).__qualname__}",
+            code_hash=_code_hash(component),
+            source_path=_source_file(component) or "",
+            items_in=source.sent,
+            items_processed=processed,
+            items_out=drain.received,
+            load_rate=load.rate,
+            duration_s=round(duration, 4),
+            throughput_items_per_s=round(per_second, 2),
+            cpu_seconds=round(cpu_seconds, 4),
+            cpu_ms_per_item=round(cpu_seconds * 1000 / max(processed, 1), 4),
+            cpu_percent=round(cpu_seconds / duration * 100, 2) if duration > 0 else 0.0,
+            rss_baseline_mb=round(rss_baseline, 2),
+            rss_peak_mb=round(rss_peak, 2),
+            memory_mb=round(max(rss_peak - rss_baseline, traced_peak_mb), 2),
+            alloc_bytes_per_item=None if alloc_per_item is None else round(alloc_per_item, 1),
+            allocation_rate_mb_s=None if alloc_per_item is None else round(alloc_per_item * per_second / _MB, 3),
+            bytes_in_per_item=round(sum(_item_bytes(item) for item in items[:100]) / max(min(len(items), 100), 1), 1),
+            bytes_out_per_item=round(drain.bytes_per_item, 1),
+            measured_at=datetime.now(timezone.utc).isoformat(),
+        )
+        if save and self.store is not None:
+            self.store.save(profile)
+        logger.info(
+            f"Profiled {name}: {profile.throughput_items_per_s} items/s, {profile.cpu_ms_per_item} ms CPU/item, "
+            f"{profile.memory_mb} MB working set"
+        )
+        return profile
+
+    async def _measure_allocations(self, component: Any, items: List[Any]) -> Tuple[Optional[float], float]:
+        """Bytes allocated per process_item call and peak traced MB, over a sample of items"""
+        process_item = getattr(component, "process_item", None)
+        if process_item is None or not items:
+            return None, 0.0
+        sample = items[:self.allocation_samples]
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            allocated = 0
+            run_peak = 0
+            base = tracemalloc.get_traced_memory()[0]
+            for item in sample:
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                try:
+                    await process_item(item)
+                except Exception:
+                    pass  # Failures still allocate; they are what the component costs
+                current, peak = tracemalloc.get_traced_memory()
+                allocated += peak - before
+                run_peak = max(run_peak, peak - base)
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        return allocated / len(sample), run_peak / _MB
+
+    async def profile_directory(self, component_dir: str, load: Optional[SyntheticLoad] = None,
+                                save: bool = True) -> List[ComponentResourceProfile]:
+        """Profile every generated component discovered in `component_dir`, one at a time"""
+        from autocoder_cc.orchestration.harness import SystemExecutionHarness
+
+        discovery = SystemExecutionHarness("profile-discovery", enable_dynamic_loading=False)
+        profiles = []
+        for name, component in discovery._discover_components_simple(component_dir).items():
+            try:
+                profiles.append(await self.profile(name, component, load, save))
+            except Exception as e:
+                logger.error(f"Profiling component {name} failed: {e}")
+        return profiles
+
+
+def profile_components(component_dir: str, items: int = 2000, rate: Optional[float] = None,
+                       payload_bytes: int = 256, profiles_dir: Optional[str] = None,
+                       samples: Optional[Iterable[Any]] = None) -> List[ComponentResourceProfile]:
+    """Blocking entry point: profile a generated system's components and store the results"""
+    profiler = ComponentProfiler(ProfileStore(profiles_dir))
+    load = SyntheticLoad(items, rate, payload_bytes, list(samples) if samples is not None else None)
+    return anyio.run(profiler.profile_directory, component_dir, load)
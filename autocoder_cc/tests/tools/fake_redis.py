@@ -0,0 +1,114 @@
+"""In-memory stand-in for the async Redis client used by the CQRS query cache in tests."""
+import fnmatch
+import time
+from typing import Any, Dict, List, Optional, Set
+
+
+class FakeRedisPipeline:
+    """Queues commands and runs them on execute(), like redis.asyncio's Pipeline."""
+
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[tuple] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> List[Any]:
+        commands, self.commands = self.commands, []
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+class FakeRedis:
+    """
+    The subset of the redis.asyncio API QueryHandler/QueryCache use: strings,
+    sets, TTLs, SCAN/SSCAN iteration and non-transactional pipelines.
+    Values are stored as given (use with decode_responses=True semantics).
+    """
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.expires_at: Dict[str, float] = {}
+        self.commands: Dict[str, int] = {}
+
+    def _count(self, command: str) -> None:
+        self.commands[command] = self.commands.get(command, 0) + 1
+
+    def _live(self, key: str) -> bool:
+        deadline = self.expires_at.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires_at.pop(key, None)
+        return key in self.data
+
+    async def get(self, key: str) -> Optional[str]:
+        self._count("get")
+        return self.data[key] if self._live(key) else None
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        self._count("set")
+        self.data[key] = value
+        self.expires_at.pop(key, None)
+        if ex is not None:
+            self.expires_at[key] = time.monotonic() + ex
+        return True
+
+    async def setex(self, key: str, ttl: int, value: Any) -> bool:
+        self._count("setex")
+        self.data[key] = value
+        self.expires_at[key] = time.monotonic() + ttl
+        return True
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        self._count("expire")
+        if not self._live(key):
+            return False
+        self.expires_at[key] = time.monotonic() + ttl
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self._count("delete")
+        deleted = 0
+        for key in keys:
+            if self._live(key):
+                del self.data[key]
+                deleted += 1
+            self.expires_at.pop(key, None)
+        return deleted
+
+    async def sadd(self, key: str, *members: str) -> int:
+        self._count("sadd")
+        self._live(key)
+        members_set: Set[str] = self.data.setdefault(key, set())
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        return added
+
+    async def smembers(self, key: str) -> Set[str]:
+        self._count("smembers")
+        return set(self.data[key]) if self._live(key) else set()
+
+    async def scan_iter(self, match: str = "*", count: Optional[int] = None):
+        self._count("scan")
+        for key in list(self.data):
+            if self._live(key) and fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def sscan_iter(self, key: str, match: str = "*", count: Optional[int] = None):
+        self._count("sscan")
+        for member in list(self.data[key]) if self._live(key) else []:
+            if fnmatch.fnmatchcase(member, match):
+                yield member
+
+    async def keys(self, pattern: str = "*") -> List[str]:
+        self._count("keys")
+        return [key for key in list(self.data) if self._live(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    def pipeline(self, transaction: bool = True) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
+
+    async def close(self) -> None:
+        pass
@@ -6,6 +6,7 @@ NO MOCKS - Components communicate with actual instances
 import asyncio
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import importlib
 import importlib.util
 import sys
 
@@ -43,11 +44,22 @@ class IntegrationTestHarness:
     def __init__(self):
         self.message_bus = AsyncMessageBus()
         self.components = {}
+        self.last_load_error: Optional[str] = None
+        self._saved_import_state = None
         self.logger = get_logger("IntegrationTestHarness")
     
     async def load_system(self, components_dir: Path) -> bool:
         """Load and wire all components from a system"""
+        # Start from a clean slate so repeated loads don't accumulate stale instances
+        self.components = {}
+        self.message_bus = AsyncMessageBus()
+        self.last_load_error = None
+        self._save_import_state(components_dir)
         try:
+            # Siblings (observability, communication, other components) may have changed since a
+            # previous load; drop the cached modules so they are re-executed from disk
+            self._evict_sibling_modules(components_dir)
+            
             # Add the components directory to path so imports work
             if str(components_dir) not in sys.path:
                 sys.path.insert(0, str(components_dir))
@@ -106,11 +118,46 @@ class IntegrationTestHarness:
             return len(self.components) > 0
             
         except Exception as e:
+            self.last_load_error = str(e)
             self.logger.error(f"Failed to load system: {e}")
             import traceback
             traceback.print_exc()
             return False
     
+    def _save_import_state(self, components_dir: Path) -> None:
+        """Remember sys.path and the sibling module entries this load will replace"""
+        if self._saved_import_state is not None:
+            return
+        names = ["communication"]
+        for path in components_dir.glob("*.py"):
+            names += [path.stem, f"component_{path.stem}"]
+        self._saved_import_state = (list(sys.path), {name: sys.modules.get(name) for name in names})
+    
+    def restore_import_state(self) -> None:
+        """Undo this harness's sys.path and sys.modules changes so other systems can load theirs"""
+        if self._saved_import_state is None:
+            return
+        saved_path, saved_modules = self._saved_import_state
+        sys.path[:] = saved_path
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self._saved_import_state = None
+    
+    @staticmethod
+    def _evict_sibling_modules(components_dir: Path) -> None:
+        """Remove previously imported modules that were loaded from `components_dir`"""
+        directory = Path(components_dir).resolve()
+        for path in components_dir.glob("*.py"):
+            sys.modules.pop(f"component_{path.stem}", None)
+            module = sys.modules.get(path.stem)
+            module_file = getattr(module, "__file__", None)
+            if module_file and Path(module_file).resolve().parent == directory:
+                del sys.modules[path.stem]
+        importlib.invalidate_caches()
+    
     def _instantiate_component(self, module, component_name: str):
         """Instantiate a component from its module"""
         # Find the component class - prioritize Generated classes
@@ -167,18 +214,29 @@ class IntegrationTestHarness:
                 return name
         return "todo_store"  # Default fallback
     
-    async def test_component_in_system(self, component_name: str, test_data: List[Dict]) -> Dict[str, Any]:
-        """Test a component within the live system context"""
+    async def test_component_in_system(self, component_name: str, test_data: List[Dict],
+                                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Test a component within the live system context
+        
+        Args:
+            component_name: Name of the loaded component to exercise
+            test_data: Items passed to the component's process_item one at a time
+            timeout: Optional per-test-case timeout in seconds
+        """
         if component_name not in self.components:
             return {"success": False, "error": f"Component {component_name} not found"}
         
         component = self.components[component_name]
         results = []
+        timed_out = False
         
         for test_case in test_data:
             try:
-                result = await component.process_item(test_case)
+                result = await asyncio.wait_for(component.process_item(test_case), timeout)
                 results.append({"success": True, "result": result})
+            except asyncio.TimeoutError:
+                timed_out = True
+                results.append({"success": False, "error": f"Timed out after {timeout}s"})
             except Exception as e:
                 results.append({"success": False, "error": str(e)})
         
@@ -188,16 +246,20 @@ class IntegrationTestHarness:
             "total_tests": len(test_data),
             "passed": success_count,
             "success_rate": success_count / len(test_data) * 100,
-            "results": results
+            "results": results,
+            "timed_out": timed_out
         }
     
     async def cleanup(self):
-        """Clean up all components"""
-        for name, component in self.components.items():
-            if hasattr(component, 'cleanup'):
-                await component.cleanup()
-            elif hasattr(component, 'teardown'):
-                await component.teardown()
+        """Clean up all components and restore the import state they were loaded into"""
+        try:
+            for name, component in self.components.items():
+                if hasattr(component, 'cleanup'):
+                    await component.cleanup()
+                elif hasattr(component, 'teardown'):
+                    await component.teardown()
+        finally:
+            self.restore_import_state()
 
 class MessageBusAdapter:
     """Adapter to make message bus look like a communicator"""
@@ -0,0 +1,74 @@
+"""Checkpoint/restore of component state together with items queued between components."""
+import anyio
+
+from autocoder_cc.checkpoint.checkpoint_manager import CheckpointManager
+from autocoder_cc.checkpoint.coordinator import CheckpointCoordinator
+from autocoder_cc.checkpoint.state import StateDelta
+from autocoder_cc.orchestration.harness import SystemExecutionHarness
+
+
+class Counter:
+    """Checkpointable stand-in that sums the items it has consumed"""
+
+    def __init__(self):
+        self.send_streams = {}
+        self.receive_streams = {}
+        self.total = 0
+
+    async def consume(self, count: int) -> None:
+        for _ in range(count):
+            self.total += await self.receive_streams["input"].receive()
+
+    def checkpoint_delta(self):
+        return {"totals": StateDelta.full({"total": self.total})}
+
+    def restore_checkpoint(self, state):
+        self.total = state.get("totals", {}).get("total", 0)
+
+
+def _harness():
+    harness = SystemExecutionHarness("checkpoint_test", enable_dynamic_loading=False)
+    harness.register_component("producer", Counter())
+    harness.register_component("consumer", Counter())
+    harness.connect("producer.output", "consumer.input", max_buffer_size=100)
+    return harness
+
+
+def test_restore_requeues_in_flight_items(tmp_path):
+    async def run_original():
+        harness = _harness()
+        coordinator = CheckpointCoordinator(harness, CheckpointManager(tmp_path))
+        for value in range(1, 11):
+            await harness.components["producer"].send_streams["output"].send(value)
+        # 1..4 are consumed before the cut, 5..10 are still queued on the connection
+        await harness.components["consumer"].consume(4)
+        await coordinator.checkpoint()
+        await harness.components["consumer"].consume(6)
+        return harness.components["consumer"].total
+
+    async def run_restored():
+        harness = _harness()
+        coordinator = CheckpointCoordinator(harness, CheckpointManager(tmp_path))
+        assert await coordinator.restore() == 1
+        consumer = harness.components["consumer"]
+        assert consumer.total == 10
+        with anyio.fail_after(5):
+            await consumer.consume(6)
+        return consumer.total
+
+    assert anyio.run(run_original) == 55
+    assert anyio.run(run_restored) == 55
+
+
+def test_channel_files_kept_for_committed_epoch_only(tmp_path):
+    async def main():
+        harness = _harness()
+        manager = CheckpointManager(tmp_path)
+        coordinator = CheckpointCoordinator(harness, manager)
+        await harness.components["producer"].send_streams["output"].send(1)
+        await coordinator.checkpoint()
+        await coordinator.checkpoint()
+        assert sorted(p.name for p in tmp_path.glob("channels-*")) == [manager.channels_file(2).name]
+        assert coordinator.committed_epoch()["in_flight_items"] == 1
+
+    anyio.run(main)
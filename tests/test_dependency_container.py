@@ -0,0 +1,62 @@
+"""Resolution counting and aggregate metric reporting in EnhancedDependencyContainer."""
+import threading
+
+from autocoder_cc.core.dependency_container import EnhancedDependencyContainer, Lifecycle
+
+
+class Service:
+    pass
+
+
+class Handler:
+    pass
+
+
+def _reported(container, baseline):
+    # The metrics collector is shared between containers, so compare against a baseline
+    return container.metrics.get_counter_value("dependencies_resolved") - baseline
+
+
+def test_resolutions_counted_across_threads():
+    container = EnhancedDependencyContainer()
+    container.register(Service, Service, lifecycle=Lifecycle.SINGLETON)
+    container.register(Handler, Handler, lifecycle=Lifecycle.TRANSIENT)
+
+    def resolve_many():
+        for _ in range(2000):
+            container.resolve(Service)
+            container.resolve(Handler)
+
+    threads = [threading.Thread(target=resolve_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = container.get_statistics()
+    assert stats["performance"]["total_resolutions"] == 16000
+    # Reading the total does not count as a resolution
+    assert container.get_statistics()["performance"]["total_resolutions"] == 16000
+
+
+def test_resolution_metric_reported_in_aggregate():
+    container = EnhancedDependencyContainer()
+    container.register(Service, Service, lifecycle=Lifecycle.SINGLETON)
+    baseline = container.metrics.get_counter_value("dependencies_resolved")
+    for _ in range(100):
+        container.resolve(Service)
+    assert _reported(container, baseline) == 0
+
+    container.get_statistics()
+    assert _reported(container, baseline) == 100
+    container.get_statistics()
+    assert _reported(container, baseline) == 100
+
+
+def test_sampled_resolution_reports_count():
+    container = EnhancedDependencyContainer(observability_sample_rate=0.1)
+    container.register(Handler, Handler, lifecycle=Lifecycle.TRANSIENT)
+    baseline = container.metrics.get_counter_value("dependencies_resolved")
+    for _ in range(10):
+        container.resolve(Handler)
+    assert _reported(container, baseline) == 10
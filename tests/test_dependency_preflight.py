@@ -0,0 +1,60 @@
+"""Dependency preflight called synchronously from inside a running event loop."""
+from types import SimpleNamespace
+
+import anyio
+import pytest
+
+from autocoder_cc.blueprint_language.processors.blueprint_validator import BlueprintValidator
+from autocoder_cc.components import component_registry as registry_module
+from autocoder_cc.components.component_registry import ComponentRegistry, ComponentRegistryError
+from autocoder_cc.components.dependency_preflight import DependencyPreflight
+
+# Nothing listens here, so the probe fails fast with a refused connection
+CLOSED_DATABASE = "postgresql://u:p@127.0.0.1:5999/db"
+
+
+def _database_config():
+    return {"database": {"type": "postgresql", "connection_string": CLOSED_DATABASE}}
+
+
+def test_run_sync_probes_from_running_loop():
+    dependencies = {"store": [{"type": "database", "name": "postgresql",
+                               "connection_string": CLOSED_DATABASE, "required": True}]}
+
+    async def main():
+        return DependencyPreflight(timeout=1.0).run_sync(dependencies)
+
+    report = anyio.run(main)
+    assert report.probes and not any(probe.available for probe in report.probes)
+
+
+def test_registry_dependency_check_in_loop_reports_unavailable():
+    registry = ComponentRegistry()
+
+    async def main():
+        registry._validate_external_dependencies("store", _database_config())
+
+    with pytest.raises(ComponentRegistryError, match="Required dependencies not available"):
+        anyio.run(main)
+
+
+def test_blueprint_validator_in_loop(monkeypatch):
+    registry = ComponentRegistry()
+    monkeypatch.setattr(registry_module, "component_registry", registry)
+    monkeypatch.setattr(
+        "autocoder_cc.blueprint_language.processors.blueprint_validator.component_registry", registry
+    )
+    blueprint = SimpleNamespace(system=SimpleNamespace(
+        name="preflight_system",
+        components=[SimpleNamespace(name="store", type="Store", config=_database_config())],
+        bindings=[],
+    ))
+
+    async def main():
+        # Async callers preflight on their own loop first, as the pipeline coordinator does
+        await registry.preflight_dependencies([{"name": "store", "config": _database_config()}])
+        return BlueprintValidator()._validate_component_registry(blueprint)
+
+    errors = anyio.run(main)
+    assert any("Required dependencies not available" in error for error in errors)
+    assert not any("event loop" in error for error in errors)
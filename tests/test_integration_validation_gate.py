@@ -0,0 +1,45 @@
+"""Isolation defaults and scheduling of the integration validation gate."""
+import anyio
+
+from autocoder_cc.blueprint_language.integration_validation_gate import IntegrationValidationGate
+
+PASSED = {"total_tests": 3, "passed": 3, "success_rate": 100.0, "results": []}
+
+
+def test_in_loop_is_default(monkeypatch):
+    monkeypatch.delenv("VALIDATION_ISOLATION", raising=False)
+    assert IntegrationValidationGate(incremental=False).isolation == "task"
+
+
+def test_in_loop_and_process_groups_run_concurrently(tmp_path, monkeypatch):
+    for stem in ("fast", "stalled"):
+        (tmp_path / f"{stem}.py").write_text(f"class {stem.title()}:\n    pass\n")
+    monkeypatch.delenv("VALIDATION_ISOLATION", raising=False)
+    gate = IntegrationValidationGate(incremental=False)
+    # Timed out in a previous round, so it is tested in a worker process
+    gate.process_isolated_components.add("stalled")
+    worker_started = anyio.Event()
+    calls = []
+
+    async def in_loop(components_dir, names, limiter, outcomes):
+        calls.append(("loop", names))
+        # Only completes if the worker-process group was started alongside
+        await worker_started.wait()
+        for name in names:
+            outcomes[name] = {"component": name, **PASSED}
+
+    async def in_process(components_dir, name):
+        calls.append(("process", [name]))
+        worker_started.set()
+        return {"component": name, **PASSED}
+
+    monkeypatch.setattr(gate, "_test_in_loop", in_loop)
+    monkeypatch.setattr(gate, "_test_in_process", in_process)
+
+    async def main():
+        with anyio.fail_after(5):
+            return await gate.validate_system(tmp_path, "system")
+
+    result = anyio.run(main)
+    assert sorted(calls) == [("loop", ["fast"]), ("process", ["stalled"])]
+    assert result.passed_components == 2
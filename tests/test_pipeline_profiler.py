@@ -0,0 +1,91 @@
+"""Span nesting, self time and trace output of the pipeline profiler."""
+import asyncio
+import json
+import time
+
+import pytest
+
+from autocoder_cc.observability import pipeline_profiler
+from autocoder_cc.observability.pipeline_profiler import (
+    IO, LLM, STAGE, disable_profiling, enable_profiling, profiled, span
+)
+
+
+@pytest.fixture
+def profiler():
+    disable_profiling()
+    active = enable_profiling()
+    yield active
+    disable_profiling()
+
+
+def _events(profiler):
+    return {path: (category, duration, self_ns, track, args)
+            for _, category, path, _, duration, self_ns, track, args in profiler.events}
+
+
+def test_disabled_span_is_shared_noop():
+    disable_profiling()
+    assert span("anything") is span("other")
+    assert pipeline_profiler.get_profiler() is None
+
+
+def test_nested_spans_record_paths_and_self_time(profiler):
+    @profiled("write_files", category=IO)
+    def write_files():
+        time.sleep(0.01)
+
+    with span("generate", STAGE, system="demo"):
+        with span("llm_call", LLM) as call:
+            time.sleep(0.02)
+            call.annotate(tokens=120)
+        write_files()
+
+    events = _events(profiler)
+    assert set(events) == {"generate", "generate;llm_call", "generate;write_files"}
+    category, duration, self_ns, _, args = events["generate"]
+    children = events["generate;llm_call"][1] + events["generate;write_files"][1]
+    assert category == STAGE and args == {"system": "demo"}
+    assert self_ns == duration - children
+    assert events["generate;llm_call"][4] == {"tokens": 120}
+    assert events["generate;write_files"][0] == IO
+    assert profiler.folded_stacks()[0].startswith("generate ")
+
+
+def test_concurrent_tasks_nest_under_parent_on_own_tracks(profiler):
+    @profiled(category=LLM)
+    async def call_model():
+        await asyncio.sleep(0.01)
+
+    async def main():
+        with span("generate"):
+            await asyncio.gather(call_model(), call_model())
+
+    asyncio.run(main())
+    paths = [event[2] for event in profiler.events]
+    child_paths = [path for path in paths if path != "generate"]
+    assert len(child_paths) == 2
+    assert all(path.startswith("generate;") and path.endswith("call_model") for path in child_paths)
+    tracks = {event[6] for event in profiler.events if event[2] != "generate"}
+    assert len(tracks) == 2
+
+
+def test_chrome_trace_written_with_folded_stacks(profiler, tmp_path):
+    with span("generate"):
+        with span("validate", "validation", component=object()):
+            time.sleep(0.001)
+    disable_profiling()
+
+    path = profiler.write(tmp_path / "trace.json")
+    trace = json.loads(path.read_text())
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    metadata = {event["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+    assert metadata == {"process_name", "thread_name"}
+    by_name = {event["name"]: event for event in complete}
+    assert set(by_name) == {"generate", "validate"}
+    parent, child = by_name["generate"], by_name["validate"]
+    # The child lies inside its parent on the same track
+    assert child["tid"] == parent["tid"]
+    assert parent["ts"] <= child["ts"] and child["ts"] + child["dur"] <= parent["ts"] + parent["dur"]
+    assert child["cat"] == "validation" and isinstance(child["args"]["component"], str)
+    assert (tmp_path / "trace.folded").read_text().splitlines()[-1].startswith("generate;validate ")
@@ -0,0 +1,47 @@
+"""Time-based and shutdown flushes of the live projection loop."""
+import anyio
+
+from autocoder_cc.components.cqrs.projection_engine import (
+    OFFSET_FIELD, MemoryProjectionStore, Projection, ProjectionEngine
+)
+
+
+def _events(count):
+    return [{"aggregate_id": f"order-{i}", "data": {"total": i}, OFFSET_FIELD: i + 1} for i in range(count)]
+
+
+def test_idle_stream_flushes_after_interval():
+    store = MemoryProjectionStore()
+    engine = ProjectionEngine(Projection("orders"), store, flush_interval=0.1)
+
+    async def main():
+        send, receive = anyio.create_memory_object_stream(100)
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(engine.run, receive)
+            for event in _events(5):
+                await send.send(event)
+            # No further events: the flush must happen on its own
+            await anyio.sleep(0.5)
+            assert len(store.projections.get("orders", {})) == 5
+            assert store.offsets["orders"] == 5
+            await send.aclose()
+
+    anyio.run(main)
+
+
+def test_cancellation_flushes_pending_changes():
+    store = MemoryProjectionStore()
+    engine = ProjectionEngine(Projection("orders"), store, flush_interval=60)
+
+    async def main():
+        send, receive = anyio.create_memory_object_stream(100)
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(engine.run, receive)
+            for event in _events(3):
+                await send.send(event)
+            await anyio.sleep(0.05)
+            assert "orders" not in store.projections
+            tg.cancel_scope.cancel()
+
+    anyio.run(main)
+    assert len(store.projections["orders"]) == 3
@@ -0,0 +1,78 @@
+"""Single-flight query caching and event-driven tag invalidation in QueryHandler."""
+import anyio
+
+from autocoder_cc.components.cqrs.query_cache import LIST_QUERIES_TAG
+from autocoder_cc.components.cqrs.query_handler import QueryHandler
+from autocoder_cc.tests.tools.fake_redis import FakeRedis
+
+
+class OrdersQueryHandler(QueryHandler):
+    """Counts computations; each one takes long enough for callers to overlap"""
+
+    def __init__(self):
+        super().__init__("orders", {"redis_url": "redis://unused"})
+        self.redis = FakeRedis()
+        self.computed = []
+
+    async def _execute_query(self, query_data):
+        query_type = query_data["query_type"]
+        params = query_data.get("params", {})
+
+        async def compute():
+            self.computed.append((query_type, params.get("id")))
+            await anyio.sleep(0.05)
+            return {"query_type": query_type, "version": len(self.computed)}
+
+        return await self._cached_query(query_type, params, compute)
+
+
+def test_concurrent_identical_queries_share_one_computation():
+    handler = OrdersQueryHandler()
+    results = []
+
+    async def query(n):
+        results.append(await handler._handle_query({"query_id": f"q{n}", "query_type": "list_orders"}))
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            for n in range(10):
+                tg.start_soon(query, n)
+
+    anyio.run(main)
+    assert handler.computed == [("list_orders", None)]
+    tiers = sorted(result["metadata"]["cache_tier"] for result in results)
+    assert tiers == ["computed"] + ["shared"] * 9
+    assert handler.cache.get_stats()["shared_misses"] == 9
+
+
+def test_event_invalidates_list_queries_and_its_aggregate_only():
+    handler = OrdersQueryHandler()
+    queries_in, queries = anyio.create_memory_object_stream(10)
+    events_in, events = anyio.create_memory_object_stream(10)
+    results, results_out = anyio.create_memory_object_stream(10)
+    handler.receive_streams = {"queries": queries, "events": events}
+    handler.send_streams = {"results": results}
+
+    async def ask(query_type, **params):
+        await queries_in.send({"query_type": query_type, "params": params})
+        with anyio.fail_after(5):
+            return (await results_out.receive())["metadata"]["cache_tier"]
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(handler.process)
+            assert await ask("list_orders") == "computed"
+            assert await ask("get_order", id="a1") == "computed"
+            assert await ask("get_order", id="a2") == "computed"
+            assert await ask("list_orders") == "l1"
+            assert await handler.redis.smembers(handler.cache.tag_key(LIST_QUERIES_TAG))
+
+            await events_in.send({"event_type": "order_updated", "aggregate_id": "a1"})
+            await anyio.sleep(0.01)
+            assert await ask("list_orders") == "computed"
+            assert await ask("get_order", id="a1") == "computed"
+            assert await ask("get_order", id="a2") == "l1"
+            await queries_in.aclose()
+
+    anyio.run(main)
+    assert handler.cache.get_stats()["invalidations"] == 1
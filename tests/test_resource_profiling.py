@@ -0,0 +1,46 @@
+"""Measured resource profiles are used only while the profiled code is unchanged."""
+from autocoder_cc.blueprint_language.blueprint_parser import ParsedComponent
+from autocoder_cc.resource_orchestrator.resource_prediction import ResourceEstimator
+from autocoder_cc.resource_orchestrator.resource_profiling import (
+    ComponentResourceProfile, ProfileStore, code_hash_of_file
+)
+
+
+def _profile(source_path, memory_mb=42.0):
+    return ComponentResourceProfile(
+        component_name="enricher", component_type="Transformer", component_class="components.Enricher",
+        code_hash=code_hash_of_file(source_path), items_in=100, items_processed=100, items_out=100,
+        load_rate=None, duration_s=1.0, throughput_items_per_s=100.0, cpu_seconds=0.1,
+        cpu_ms_per_item=1.0, cpu_percent=10.0, rss_baseline_mb=30.0, rss_peak_mb=80.0,
+        memory_mb=memory_mb, alloc_bytes_per_item=None, allocation_rate_mb_s=None,
+        bytes_in_per_item=100.0, bytes_out_per_item=100.0, source_path=str(source_path),
+    )
+
+
+def test_estimator_uses_profile_while_source_unchanged(tmp_path):
+    source = tmp_path / "enricher.py"
+    source.write_text("class Enricher:\n    pass\n")
+    store = ProfileStore(str(tmp_path / "profiles"))
+    store.save(_profile(source))
+    component = ParsedComponent(name="enricher", type="Transformer")
+
+    estimator = ResourceEstimator(store)
+    assert estimator.estimate_component_resources(component)["memory_mb"] == 42.0
+    assert estimator.estimate_sources["enricher"] == "measured:v1"
+
+    source.write_text("class Enricher:\n    cache = {}\n")
+    estimator.estimate_component_resources(component)
+    assert estimator.estimate_sources["enricher"] == "static"
+
+
+def test_reverted_source_uses_older_profile(tmp_path):
+    source = tmp_path / "enricher.py"
+    source.write_text("class Enricher:\n    pass\n")
+    store = ProfileStore(str(tmp_path / "profiles"))
+    store.save(_profile(source, memory_mb=10.0))
+    source.write_text("class Enricher:\n    cache = {}\n")
+    store.save(_profile(source, memory_mb=90.0))
+    source.write_text("class Enricher:\n    pass\n")
+
+    estimator = ResourceEstimator(store)
+    assert estimator.estimate_component_resources(ParsedComponent(name="enricher", type="Transformer"))["memory_mb"] == 10.0
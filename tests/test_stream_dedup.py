@@ -0,0 +1,93 @@
+"""Bloom filter sizing under bursts and exact dedup checkpoint round trips."""
+from autocoder_cc.checkpoint.state import resolve_value
+from autocoder_cc.components.stream_dedup import BloomDeduplicator, ExactDeduplicator
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _persist(deltas, state):
+    """Apply checkpoint deltas to a plain dict, as the checkpoint writer would"""
+    for name, delta in deltas.items():
+        target = state.setdefault(name, {})
+        if delta.cleared:
+            target.clear()
+        for key in delta.deleted:
+            target.pop(key, None)
+        target.update((key, resolve_value(value)) for key, value in delta.changes.items())
+
+
+def test_bloom_false_positive_rate_holds_under_burst():
+    dedup = BloomDeduplicator(expected_items=10_000, false_positive_rate=0.01, ttl=3600, clock=Clock())
+    # Five times the expected items per TTL, all within one generation interval
+    for i in range(50_000):
+        dedup.check_and_add(f"burst-{i}")
+    assert dedup.get_stats()["rotations"] >= 14
+    # The most recent generations' worth of keys is still remembered. A few were
+    # reported as (false) duplicates on arrival and so were never recorded.
+    remembered = sum(not dedup.check_and_add(f"burst-{i}") for i in range(45_000, 50_000))
+    assert remembered >= 4_950
+
+    fresh = 20_000
+    false_positives = sum(not dedup.check_and_add(f"fresh-{i}") for i in range(fresh))
+    assert false_positives / fresh < 0.02
+
+
+def test_bloom_without_ttl_never_forgets():
+    dedup = BloomDeduplicator(expected_items=100, false_positive_rate=0.01)
+    for i in range(500):
+        dedup.check_and_add(f"key-{i}")
+    assert dedup.get_stats()["rotations"] == 0
+    assert not any(dedup.check_and_add(f"key-{i}") for i in range(500))
+
+
+def test_exact_checkpoint_round_trip_across_rotation():
+    clock = Clock()
+    dedup = ExactDeduplicator(ttl=30, generations=4, clock=clock)
+    state = {}
+    for i in range(100):
+        dedup.check_and_add(f"a-{i}")
+    _persist(dedup.checkpoint_delta(), state)
+
+    clock.now += 10
+    for i in range(50):
+        dedup.check_and_add(f"b-{i}")
+    deltas = dedup.checkpoint_delta()
+    # Only hashes added since the previous checkpoint are captured
+    assert sum(len(resolve_value(v)) for v in deltas["segments"].changes.values()) == 50
+    # Keys added after the capture are not part of it
+    dedup.check_and_add("late")
+    _persist(deltas, state)
+
+    restored = ExactDeduplicator(ttl=30, generations=4, clock=clock)
+    restored.restore(state)
+    assert restored.get_stats()["tracked_keys"] == 150
+    assert not restored.check_and_add("a-0")
+    assert not restored.check_and_add("b-49")
+    assert restored.check_and_add("late")
+    # Restored hashes are not captured again, only the one added since
+    segments = restored.checkpoint_delta()["segments"].changes.values()
+    assert [len(resolve_value(value)) for value in segments] == [1]
+
+
+def test_exact_dropped_generation_segments_are_deleted():
+    clock = Clock()
+    dedup = ExactDeduplicator(ttl=2, generations=2, clock=clock)
+    state = {}
+    dedup.check_and_add("old")
+    _persist(dedup.checkpoint_delta(), state)
+
+    clock.now += 5
+    dedup.check_and_add("new")
+    _persist(dedup.checkpoint_delta(), state)
+    assert len(state["segments"]) == 1
+
+    restored = ExactDeduplicator(ttl=2, generations=2, clock=clock)
+    restored.restore(state)
+    assert restored.check_and_add("old")
+    assert not restored.check_and_add("new")
@@ -0,0 +1,85 @@
+"""Incremental revalidation scope of the validation result cache."""
+from types import SimpleNamespace
+
+import anyio
+
+from autocoder_cc.blueprint_language.integration_validation_gate import IntegrationValidationGate
+from autocoder_cc.blueprint_language.validation_result_cache import (
+    ValidationResultCache, dependencies_from_bindings
+)
+
+COMPONENT = '''
+class {name}:
+    def __init__(self, name, config=None):
+        self.name = name
+
+    async def process_item(self, item):
+        return {body}
+'''
+
+# source -> processor -> sink
+BINDINGS = [
+    SimpleNamespace(from_component="source", to_components=["processor"]),
+    SimpleNamespace(from_component="processor", to_components=["sink"]),
+]
+
+
+def _write(components_dir, stem, body="item", extra=""):
+    (components_dir / f"{stem}.py").write_text(COMPONENT.format(name=stem.title(), body=body) + extra)
+
+
+def _gate(monkeypatch, tested):
+    gate = IntegrationValidationGate(result_cache=ValidationResultCache(), incremental=True)
+
+    async def record(components_dir, names, limiter, outcomes):
+        for name in names:
+            tested.append(name)
+            outcomes[name] = {"component": name, "total_tests": 3, "passed": 3,
+                              "success_rate": 100.0, "results": []}
+
+    async def record_one(components_dir, name, limiter, outcomes):
+        await record(components_dir, [name], limiter, outcomes)
+
+    monkeypatch.setattr(gate, "_test_in_loop", record)
+    monkeypatch.setattr(gate, "_run_in_process", record_one)
+    return gate
+
+
+def test_binding_edges_are_directed():
+    assert dependencies_from_bindings(BINDINGS) == {"processor": {"source"}, "sink": {"processor"}}
+
+
+def test_interface_edit_revalidates_only_direct_consumer(tmp_path, monkeypatch):
+    for stem in ("source", "processor", "sink"):
+        _write(tmp_path, stem)
+    tested = []
+    gate = _gate(monkeypatch, tested)
+
+    first = anyio.run(gate.validate_system, tmp_path, "chain", BINDINGS)
+    assert sorted(tested) == ["processor", "sink", "source"]
+    assert first.revalidated_components == 3
+
+    tested.clear()
+    _write(tmp_path, "source", extra="\n    async def flush(self):\n        pass\n")
+    second = anyio.run(gate.validate_system, tmp_path, "chain")
+    assert sorted(tested) == ["processor", "source"]
+    assert second.reused_components == 1
+
+
+def test_body_edit_revalidates_only_edited_component(tmp_path, monkeypatch):
+    for stem in ("source", "processor", "sink"):
+        _write(tmp_path, stem)
+    tested = []
+    gate = _gate(monkeypatch, tested)
+    anyio.run(gate.validate_system, tmp_path, "chain", BINDINGS)
+
+    tested.clear()
+    _write(tmp_path, "processor", body="dict(item, seen=True)")
+    anyio.run(gate.validate_system, tmp_path, "chain")
+    assert tested == ["processor"]
+
+    # The tail of the chain has no consumers
+    tested.clear()
+    _write(tmp_path, "sink", extra="\ndef helper(value):\n    return value\n")
+    anyio.run(gate.validate_system, tmp_path, "chain")
+    assert tested == ["sink"]